@@ -1,4 +1,5 @@
 import os
+import tempfile
 from typing import Optional
 from urllib.parse import quote_plus
 
@@ -18,10 +19,85 @@ class Config:
 
     # JWT配置
     JWT_COOKIE_NAME: str = "jwt_token"
+    # 验证模式: remote(每次请求由用户中心验证) / local(本地验证签名和有效期，用户信息按subject缓存)
+    JWT_VERIFY_MODE: str = os.getenv("JWT_VERIFY_MODE", "remote")
+    JWT_SECRET: str = os.getenv("JWT_SECRET", "")
+    JWT_KEY_FILE: str = os.getenv("JWT_KEY_FILE", "")
+    JWT_JWKS_FILE: str = os.getenv("JWT_JWKS_FILE", "")
+    JWT_ALGORITHMS: str = os.getenv("JWT_ALGORITHMS", "HS512")
+    JWT_AUDIENCE: str = os.getenv("JWT_AUDIENCE", "")
+    JWT_ISSUER: str = os.getenv("JWT_ISSUER", "")
+    JWT_SUBJECT_CLAIM: str = os.getenv("JWT_SUBJECT_CLAIM", "userId")
+    JWT_LEEWAY: int = int(os.getenv("JWT_LEEWAY", "0"))
+
+    # 认证缓存配置（AUTH_CACHE_TTL<=0 表示禁用缓存，AUTH_CACHE_REDIS_TTL 不超过 AUTH_CACHE_TTL）
+    AUTH_CACHE_TTL: float = float(os.getenv("AUTH_CACHE_TTL", "60"))
+    AUTH_CACHE_MAX_SIZE: int = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))
+    AUTH_CACHE_REDIS_TTL: int = int(os.getenv("AUTH_CACHE_REDIS_TTL", "60"))
+    AUTH_CACHE_USE_REDIS: bool = os.getenv("AUTH_CACHE_USE_REDIS", "true").lower() == "true"
 
     # API配置
     API_TIMEOUT: int = int(os.getenv("API_TIMEOUT", "30"))
 
+    # HTTP连接池配置（用户中心、AIGC网盘等外部服务共用）
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+    # URL下载配置
+    URL_FETCH_MAX_BYTES: int = int(os.getenv("URL_FETCH_MAX_BYTES", str(50 * 1024 * 1024)))
+    URL_FETCH_TIMEOUT: float = float(os.getenv("URL_FETCH_TIMEOUT", "30"))
+    URL_FETCH_SPOOL_MAX_SIZE: int = int(os.getenv("URL_FETCH_SPOOL_MAX_SIZE", str(8 * 1024 * 1024)))
+    # 多图下载（拼接、合成GIF）的并发数、单主机连接数和总字节预算
+    URL_FETCH_MAX_CONCURRENCY: int = int(os.getenv("URL_FETCH_MAX_CONCURRENCY", "8"))
+    URL_FETCH_PER_HOST_LIMIT: int = int(os.getenv("URL_FETCH_PER_HOST_LIMIT", "4"))
+    URL_FETCH_TOTAL_MAX_BYTES: int = int(os.getenv("URL_FETCH_TOTAL_MAX_BYTES", str(200 * 1024 * 1024)))
+
+    # 处理结果缓存配置（二级缓存后端: disk / redis / none）
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RESULT_CACHE_MEMORY_BYTES: int = int(os.getenv("RESULT_CACHE_MEMORY_BYTES", str(256 * 1024 * 1024)))
+    RESULT_CACHE_MAX_ITEM_BYTES: int = int(os.getenv("RESULT_CACHE_MAX_ITEM_BYTES", str(20 * 1024 * 1024)))
+    RESULT_CACHE_BACKEND: str = os.getenv("RESULT_CACHE_BACKEND", "disk")
+    RESULT_CACHE_DIR: str = os.getenv(
+        "RESULT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "image_tools_api_result_cache")
+    )
+    RESULT_CACHE_TTL: int = int(os.getenv("RESULT_CACHE_TTL", "86400"))
+    RESULT_CACHE_UPLOAD_TTL: int = int(os.getenv("RESULT_CACHE_UPLOAD_TTL", "86400"))
+    # 结果版本（参与缓存键计算），为空时按app源码和图像库版本自动计算
+    RESULT_CACHE_VERSION: str = os.getenv("RESULT_CACHE_VERSION", "")
+
+    # 处理管道配置
+    PIPELINE_MAX_OPERATIONS: int = int(os.getenv("PIPELINE_MAX_OPERATIONS", "20"))
+
+    # 批量处理配置
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+    # 大半径高斯模糊配置
+    # sigma较大时先缩小、模糊再放大，相对 cv2.GaussianBlur 允许的最大误差（色阶）；0表示禁用金字塔加速
+    BLUR_PYRAMID_MAX_ERROR: float = float(os.getenv("BLUR_PYRAMID_MAX_ERROR", "1.0"))
+
+    # GIF处理配置
+    # 单个动画允许解码的最大帧数，以及所有帧画布像素数之和的上限（逐帧流式处理，内存只与单帧大小有关）
+    GIF_MAX_FRAMES: int = int(os.getenv("GIF_MAX_FRAMES", "1000"))
+    GIF_MAX_PIXELS: int = int(os.getenv("GIF_MAX_PIXELS", str(2_000_000_000)))
+    # 动画逐帧并行处理时每个计算任务包含的帧数
+    GIF_FRAME_CHUNK_SIZE: int = int(os.getenv("GIF_FRAME_CHUNK_SIZE", "4"))
+    # 动画WebP输出时缓存的帧像素数之和的上限（libwebp需要一次性接收所有帧，每像素占4字节）
+    WEBP_MAX_PIXELS: int = int(os.getenv("WEBP_MAX_PIXELS", str(64_000_000)))
+
+    # ffmpeg配置（视频转GIF）
+    # 可执行文件路径；单次转换的超时时间（秒）；每个ffmpeg进程的解码、滤镜和编码线程数上限
+    FFMPEG_PATH: str = os.getenv("FFMPEG_PATH", "ffmpeg")
+    FFMPEG_TIMEOUT: float = float(os.getenv("FFMPEG_TIMEOUT", "120"))
+    FFMPEG_THREADS: int = int(os.getenv("FFMPEG_THREADS", "2"))
+
+    # 字体配置
+    # 除系统字体目录外额外扫描的字体目录（逗号分隔）；已加载字体对象的缓存条目数（按路径和字号）
+    FONT_DIRS: str = os.getenv("FONT_DIRS", "")
+    FONT_CACHE_SIZE: int = int(os.getenv("FONT_CACHE_SIZE", "64"))
+
     # 计费配置
     DEFAULT_TOKEN_COST: int = int(os.getenv("DEFAULT_TOKEN_COST", "1"))
 
@@ -43,6 +119,13 @@ class Config:
     REDIS_PASSWORD: str = os.getenv("REDIS_PASSWORD", "")
     REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
 
+    # 计算任务执行器配置（CPU密集型图片处理）
+    # 模式: process(进程池，失败时回退线程池) / thread(线程池) / inline(直接在事件循环中执行，仅用于调试)
+    COMPUTE_EXECUTOR_MODE: str = os.getenv("COMPUTE_EXECUTOR_MODE", "process")
+    COMPUTE_MAX_WORKERS: int = int(os.getenv("COMPUTE_MAX_WORKERS", str(os.cpu_count() or 2)))
+    COMPUTE_MP_START_METHOD: str = os.getenv("COMPUTE_MP_START_METHOD", "spawn")
+    COMPUTE_SLOW_TASK_MS: int = int(os.getenv("COMPUTE_SLOW_TASK_MS", "5000"))
+
     @classmethod
     def get_user_center_headers(cls) -> dict:
         """获取用户中心API请求头"""
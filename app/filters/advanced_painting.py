@@ -1,6 +1,7 @@
 import cv2
 import numpy as np
 from .utils import process_image, add_texture, adjust_contrast
+from ..utils.blur import gaussian_blur
 
 
 def _acrylic_painting_filter(img: np.ndarray, brush_size: int = 7, texture_strength: float = 0.3) -> np.ndarray:
@@ -29,7 +30,7 @@ def _tempera_filter(img: np.ndarray, opacity: float = 0.8) -> np.ndarray:
     img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
     
     # 轻微模糊
-    blurred = cv2.GaussianBlur(img_bgr, (3, 3), 0)
+    blurred = gaussian_blur(img_bgr, ksize=3)
     
     # 降低饱和度，增加透明感
     hsv = cv2.cvtColor(blurred, cv2.COLOR_BGR2HSV)
@@ -83,8 +84,8 @@ def _glazing_filter(img: np.ndarray, transparency: float = 0.3) -> np.ndarray:
     img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
     
     # 创建多个色彩层
-    layer1 = cv2.GaussianBlur(img_bgr, (5, 5), 0)
-    layer2 = cv2.GaussianBlur(img_bgr, (9, 9), 0)
+    layer1 = gaussian_blur(img_bgr, ksize=5)
+    layer2 = gaussian_blur(img_bgr, ksize=9)
     
     # 混合图层
     blended = cv2.addWeighted(layer1, 0.6, layer2, 0.4, 0)
@@ -1,6 +1,8 @@
 import numpy as np
 import cv2
 from .utils import process_image, add_texture
+from .quantize import quantize_colors
+from ..utils.blur import gaussian_blur
 
 
 def _colored_pencil_filter(img: np.ndarray, line_size: int = 7, blur_value: int = 7,
@@ -32,7 +34,7 @@ def _colored_pencil_filter(img: np.ndarray, line_size: int = 7, blur_value: int
     
     # 保持颜色，但增强边缘
     img_gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-    img_gray_blur = cv2.GaussianBlur(img_gray, (blur_value, blur_value), 0)
+    img_gray_blur = gaussian_blur(img_gray, ksize=blur_value)
     
     # 使用Canny边缘检测来获取线条
     edges = cv2.Canny(img_gray_blur, edge_threshold, edge_threshold * 2)
@@ -45,19 +47,13 @@ def _colored_pencil_filter(img: np.ndarray, line_size: int = 7, blur_value: int
     edges = cv2.dilate(edges, kernel, iterations=1)
     
     # 边缘模糊使线条看起来更自然
-    edges = cv2.GaussianBlur(edges, (blur_value, blur_value), 0)
+    edges = gaussian_blur(edges, ksize=blur_value)
     
     # 创建彩色铅笔效果
     # 1. 将原始图像颜色量化
     # 这里使用K-means聚类来减少颜色数量
-    Z = img_bgr.reshape((-1, 3))
-    Z = np.float32(Z)
-    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
     K = 8  # 颜色数量
-    _, labels, centers = cv2.kmeans(Z, K, None, criteria, 10, cv2.KMEANS_RANDOM_CENTERS)
-    centers = np.uint8(centers)
-    res = centers[labels.flatten()]
-    quantized = res.reshape((img_bgr.shape))
+    quantized = quantize_colors(img_bgr, K)
     
     # 2. 边缘与量化后的图像混合
     edges_colored = cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
@@ -1,6 +1,7 @@
 import numpy as np
 import cv2
 from .utils import process_image
+from ..utils.blur import gaussian_blur
 
 
 def _cutout_filter(img: np.ndarray, levels: int = 5, edge_thickness: int = 2, 
@@ -31,7 +32,7 @@ def _cutout_filter(img: np.ndarray, levels: int = 5, edge_thickness: int = 2,
     
     # 步骤1: 提取边缘
     gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    blurred = gaussian_blur(gray, ksize=5)
     edges = cv2.Canny(blurred, edge_threshold, edge_threshold * 2)
     
     # 加粗边缘
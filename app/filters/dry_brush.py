@@ -1,10 +1,13 @@
 import numpy as np
 import cv2
 from .utils import process_image, add_texture, adjust_contrast
+from .quantize import quantize_colors
+from ..utils.edge_preserving import smooth_edge_preserving
 
 
 def _dry_brush_filter(img: np.ndarray, brush_size: int = 5, detail_level: int = 25,
-                    texture_strength: float = 0.15, contrast: float = 1.5) -> np.ndarray:
+                    texture_strength: float = 0.15, contrast: float = 1.5,
+                    smoothing: str = "auto") -> np.ndarray:
     """
     实现干画笔效果滤镜
     
@@ -14,6 +17,7 @@ def _dry_brush_filter(img: np.ndarray, brush_size: int = 5, detail_level: int =
         detail_level: 细节级别，值越小细节越多
         texture_strength: 纹理强度
         contrast: 对比度调整
+        smoothing: 保边平滑方法，auto（直径较大时用导向滤波）/ bilateral / guided
         
     Returns:
         处理后的图像数组
@@ -33,8 +37,8 @@ def _dry_brush_filter(img: np.ndarray, brush_size: int = 5, detail_level: int =
     # 应用中值滤波模拟干画笔效果
     median = cv2.medianBlur(img_bgr, brush_size)
     
-    # 使用双边滤波保留边缘
-    bilateral = cv2.bilateralFilter(median, 9, 75, 75)
+    # 使用保边平滑保留边缘
+    bilateral = smooth_edge_preserving(median, 9, 75, 75, smoothing)
     
     # 锐化图像以增强笔触效果
     kernel = np.array([[-1, -1, -1],
@@ -43,15 +47,8 @@ def _dry_brush_filter(img: np.ndarray, brush_size: int = 5, detail_level: int =
     sharpened = cv2.filter2D(bilateral, -1, kernel)
     
     # 颜色量化来模拟干笔颜料效果
-    # 减少颜色数量
-    Z = sharpened.reshape((-1, 3))
-    Z = np.float32(Z)
-    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
-    K = detail_level  # 颜色数量
-    _, labels, centers = cv2.kmeans(Z, K, None, criteria, 10, cv2.KMEANS_RANDOM_CENTERS)
-    centers = np.uint8(centers)
-    res = centers[labels.flatten()]
-    quantized = res.reshape((sharpened.shape))
+    # 减少颜色数量（颜色数量为detail_level）
+    quantized = quantize_colors(sharpened, detail_level)
     
     # 增强边缘
     edges = cv2.Canny(cv2.cvtColor(quantized, cv2.COLOR_BGR2GRAY), 50, 150)
@@ -84,7 +81,7 @@ def _dry_brush_filter(img: np.ndarray, brush_size: int = 5, detail_level: int =
 
 def apply_dry_brush(image_bytes: bytes, brush_size: int = 5, detail_level: int = 25,
                   texture_strength: float = 0.15, contrast: float = 1.5, 
-                  intensity: float = 1.0) -> bytes:
+                  intensity: float = 1.0, smoothing: str = "auto") -> bytes:
     """
     应用干画笔滤镜到图像
     
@@ -95,6 +92,7 @@ def apply_dry_brush(image_bytes: bytes, brush_size: int = 5, detail_level: int =
         texture_strength: 纹理强度
         contrast: 对比度调整
         intensity: 效果强度
+        smoothing: 保边平滑方法，auto（直径较大时用导向滤波）/ bilateral / guided
         
     Returns:
         处理后图片的字节数据
@@ -113,5 +111,6 @@ def apply_dry_brush(image_bytes: bytes, brush_size: int = 5, detail_level: int =
         brush_size=brush_size,
         detail_level=detail_level,
         texture_strength=texture_strength,
-        contrast=contrast
+        contrast=contrast,
+        smoothing=smoothing
     ) 
\ No newline at end of file
@@ -1,6 +1,7 @@
 import numpy as np
 import cv2
 from .utils import process_image, add_texture
+from ..utils.blur import gaussian_blur
 
 
 def _fresco_filter(img: np.ndarray, roughness: float = 0.8, cracks: float = 0.6, 
@@ -30,7 +31,7 @@ def _fresco_filter(img: np.ndarray, roughness: float = 0.8, cracks: float = 0.6,
     img_bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
     
     # 步骤1: 模糊以模拟壁画的平滑表面
-    blurred = cv2.GaussianBlur(img_bgr, (5, 5), 0)
+    blurred = gaussian_blur(img_bgr, ksize=5)
     
     # 步骤2: 降低饱和度模拟老化
     hsv = cv2.cvtColor(blurred, cv2.COLOR_BGR2HSV)
@@ -57,7 +58,7 @@ def _fresco_filter(img: np.ndarray, roughness: float = 0.8, cracks: float = 0.6,
         texture[crack_mask] = crack_intensity[crack_mask]
     
     # 模糊纹理使其看起来更自然
-    texture = cv2.GaussianBlur(texture, (5, 5), 0)
+    texture = gaussian_blur(texture, ksize=5)
     
     # 将纹理应用到图像上
     texture_bgr = cv2.cvtColor(texture, cv2.COLOR_GRAY2BGR)
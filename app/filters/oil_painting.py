@@ -2,9 +2,11 @@ import cv2
 import numpy as np
 from typing import Tuple, Optional
 from .utils import process_image
+from ..utils.edge_preserving import smooth_edge_preserving
 
 
-def _oil_painting_filter(img: np.ndarray, radius: int = 5, intensity: float = 10.0) -> np.ndarray:
+def _oil_painting_filter(img: np.ndarray, radius: int = 5, intensity: float = 10.0,
+                         smoothing: str = "auto") -> np.ndarray:
     """
     实现油画效果滤镜
     
@@ -12,6 +14,7 @@ def _oil_painting_filter(img: np.ndarray, radius: int = 5, intensity: float = 10
         img: 输入图像的numpy数组
         radius: 邻域半径，值越大效果越明显
         intensity: 量化强度，值越大颜色分块效果越明显
+        smoothing: 保边平滑方法，auto（直径较大时用导向滤波）/ bilateral / guided
         
     Returns:
         处理后的图像数组
@@ -31,8 +34,8 @@ def _oil_painting_filter(img: np.ndarray, radius: int = 5, intensity: float = 10
     
     # 应用油画效果
     # 使用简化的油画效果实现，因为cv2.xphoto在某些版本中不可用
-    # 使用双边滤波模拟油画效果
-    oil_painting = cv2.bilateralFilter(img_bgr, radius * 2, intensity * 10, intensity * 10)
+    # 使用保边平滑模拟油画效果
+    oil_painting = smooth_edge_preserving(img_bgr, radius * 2, intensity * 10, intensity * 10, smoothing)
     
     # 添加一些量化效果
     oil_painting = (oil_painting // int(intensity)) * int(intensity)
@@ -50,7 +53,8 @@ def _oil_painting_filter(img: np.ndarray, radius: int = 5, intensity: float = 10
     return result
 
 
-def apply_oil_painting(image_bytes: bytes, radius: int = 5, intensity: float = 10.0) -> bytes:
+def apply_oil_painting(image_bytes: bytes, radius: int = 5, intensity: float = 10.0,
+                       smoothing: str = "auto") -> bytes:
     """
     应用油画滤镜到图像
     
@@ -58,6 +62,7 @@ def apply_oil_painting(image_bytes: bytes, radius: int = 5, intensity: float = 1
         image_bytes: 输入图片的字节数据
         radius: 邻域半径，值越大效果越明显
         intensity: 量化强度，值越大颜色分块效果越明显
+        smoothing: 保边平滑方法，auto（直径较大时用导向滤波）/ bilateral / guided
         
     Returns:
         处理后图片的字节数据
@@ -66,5 +71,6 @@ def apply_oil_painting(image_bytes: bytes, radius: int = 5, intensity: float = 1
         image_bytes,
         _oil_painting_filter,
         radius=radius,
-        intensity=intensity
+        intensity=intensity,
+        smoothing=smoothing
     ) 
\ No newline at end of file
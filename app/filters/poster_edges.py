@@ -1,6 +1,7 @@
 import numpy as np
 import cv2
 from .utils import process_image, adjust_contrast
+from .quantize import quantize_colors
 
 
 def _poster_edges_filter(img: np.ndarray, posterize_levels: int = 6, 
@@ -39,13 +40,7 @@ def _poster_edges_filter(img: np.ndarray, posterize_levels: int = 6,
     
     # 颜色量化（减少颜色数量）
     # 使用k-means聚类进行更好的颜色量化
-    Z = enhanced_bgr.reshape((-1, 3))
-    Z = np.float32(Z)
-    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
-    _, labels, centers = cv2.kmeans(Z, posterize_levels, None, criteria, 10, cv2.KMEANS_RANDOM_CENTERS)
-    centers = np.uint8(centers)
-    res = centers[labels.flatten()]
-    posterized = res.reshape((enhanced_bgr.shape))
+    posterized = quantize_colors(enhanced_bgr, posterize_levels)
     
     # 边缘检测
     gray = cv2.cvtColor(enhanced_bgr, cv2.COLOR_BGR2GRAY)
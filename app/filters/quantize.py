@@ -0,0 +1,176 @@
+"""
+颜色量化
+在分层抽样的像素上拟合k-means调色板，再通过预先计算的三维颜色立方体查找表
+把所有像素映射到最近的调色板颜色，避免对整张图片的每个像素做k-means迭代。
+供干画笔、海报边缘、粗糙蜡笔、彩色铅笔等绘画类滤镜共用。
+"""
+import functools
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# 拟合调色板时的最大采样像素数
+QUANTIZE_SAMPLE_PIXELS = 64 * 1024
+
+# k-means的重复次数（取紧凑度最好的一次）
+QUANTIZE_ATTEMPTS = 3
+
+# 颜色立方体每个通道的位数（6位即64x64x64个格子）
+COLOR_CUBE_BITS = 6
+
+# 颜色立方体缓存的条目数（按调色板缓存）
+COLOR_CUBE_CACHE_SIZE = 32
+
+_KMEANS_CRITERIA = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
+
+
+def sample_pixels(pixels: np.ndarray, sample_size: int = QUANTIZE_SAMPLE_PIXELS,
+                  seed: Optional[int] = 0) -> np.ndarray:
+    """
+    分层抽样：把像素按顺序均分为sample_size段，每段随机取一个
+
+    Args:
+        pixels: 形状为 (N, 3) 的像素数组
+        sample_size: 采样数量，像素数不超过该值时返回全部像素
+        seed: 随机种子，None表示不固定
+
+    Returns:
+        形状为 (M, 3) 的采样像素
+    """
+    count = len(pixels)
+    if count <= sample_size:
+        return pixels
+    step = count / sample_size
+    rng = np.random.default_rng(seed)
+    offsets = rng.random(sample_size) * step
+    indices = (np.arange(sample_size) * step + offsets).astype(np.int64)
+    return pixels[np.minimum(indices, count - 1)]
+
+
+def fit_palette(img: np.ndarray, n_colors: int, sample_size: int = QUANTIZE_SAMPLE_PIXELS,
+                attempts: int = QUANTIZE_ATTEMPTS, seed: Optional[int] = 0) -> np.ndarray:
+    """
+    在抽样像素上用k-means拟合调色板
+
+    Args:
+        img: 形状为 (H, W, 3) 的uint8图像（RGB或BGR均可，调色板与输入通道顺序一致）
+        n_colors: 调色板颜色数量
+        sample_size: 最大采样像素数
+        attempts: k-means重复次数
+        seed: 抽样随机种子
+
+    Returns:
+        形状为 (K, 3) 的uint8调色板，K不超过n_colors和采样像素数
+    """
+    samples = np.float32(sample_pixels(img.reshape(-1, 3), sample_size, seed))
+    n_colors = max(1, min(n_colors, len(samples)))
+    _, _, centers = cv2.kmeans(samples, n_colors, None, _KMEANS_CRITERIA, attempts, cv2.KMEANS_PP_CENTERS)
+    return np.clip(np.rint(centers), 0, 255).astype(np.uint8)
+
+
+@functools.lru_cache(maxsize=COLOR_CUBE_CACHE_SIZE)
+def _color_cube(palette_bytes: bytes, bits: int) -> np.ndarray:
+    palette = np.frombuffer(palette_bytes, dtype=np.uint8).reshape(-1, 3).astype(np.float32)
+    cells = 1 << bits
+    # 每个格子覆盖的整数色阶 [i * step, (i + 1) * step - 1] 的中心
+    step = 256 // cells
+    levels = np.arange(cells, dtype=np.float32) * step + (step - 1) / 2
+
+    # 逐个调色板颜色比较；距离按通道可分离，用三个一维数组广播相加
+    best_index = np.zeros((cells, cells, cells), dtype=np.uint8)
+    best_distance = np.full((cells, cells, cells), np.inf, dtype=np.float32)
+    distance = np.empty_like(best_distance)
+    closer = np.empty(best_distance.shape, dtype=bool)
+    for index, color in enumerate(palette):
+        d0, d1, d2 = (np.square(levels - value) for value in color)
+        np.add(d0[:, None, None], d1[None, :, None], out=distance)
+        distance += d2[None, None, :]
+        np.less(distance, best_distance, out=closer)
+        np.copyto(best_distance, distance, where=closer)
+        best_index[closer] = index
+    best_index = best_index.ravel()
+    best_index.setflags(write=False)
+    return best_index
+
+
+def build_color_cube(palette: np.ndarray, bits: int = COLOR_CUBE_BITS) -> np.ndarray:
+    """
+    预先计算颜色立方体：每个格子对应离格子中心最近的调色板颜色序号
+
+    Args:
+        palette: 形状为 (K, 3) 的uint8调色板，K不超过256
+        bits: 每个通道的位数
+
+    Returns:
+        长度为 2**(3*bits) 的只读uint8序号表，下标为 (c0 >> s) << 2b | (c1 >> s) << b | (c2 >> s)
+    """
+    palette = np.ascontiguousarray(palette, dtype=np.uint8)
+    if not 1 <= len(palette) <= 256:
+        raise ValueError(f"调色板颜色数量必须在1-256之间: {len(palette)}")
+    if not 1 <= bits <= 8:
+        raise ValueError(f"颜色立方体位数必须在1-8之间: {bits}")
+    return _color_cube(palette.tobytes(), bits)
+
+
+def map_to_palette(img: np.ndarray, palette: np.ndarray, bits: int = COLOR_CUBE_BITS) -> np.ndarray:
+    """
+    通过颜色立方体把每个像素映射到调色板颜色
+
+    Args:
+        img: 形状为 (H, W, 3) 的uint8图像
+        palette: 形状为 (K, 3) 的uint8调色板
+        bits: 颜色立方体每个通道的位数
+
+    Returns:
+        与输入形状相同的uint8图像
+    """
+    cube = build_color_cube(palette, bits)
+    # 每个格子直接对应的颜色，像素只需一次查表
+    cube_colors = np.ascontiguousarray(palette, dtype=np.uint8)[cube]
+    return np.take(cube_colors, _cube_index(img, bits), axis=0)
+
+
+def map_to_indices(img: np.ndarray, palette: np.ndarray, bits: int = COLOR_CUBE_BITS) -> np.ndarray:
+    """
+    通过颜色立方体把每个像素映射到调色板颜色序号（用于生成P模式图片）
+
+    Args:
+        img: 形状为 (H, W, 3) 的uint8图像（也可以是RGBA，只使用前三个通道）
+        palette: 形状为 (K, 3) 的uint8调色板
+        bits: 颜色立方体每个通道的位数
+
+    Returns:
+        形状为 (H, W) 的uint8序号数组
+    """
+    return np.take(build_color_cube(palette, bits), _cube_index(img, bits))
+
+
+def _cube_index(img: np.ndarray, bits: int) -> np.ndarray:
+    # 各通道色阶 -> 格子序号中该通道的贡献
+    levels = np.arange(256, dtype=np.int32) >> (8 - bits)
+    index = np.take(levels << (2 * bits), img[..., 0])
+    index |= np.take(levels << bits, img[..., 1])
+    index |= np.take(levels, img[..., 2])
+    return index
+
+
+def quantize_colors(img: np.ndarray, n_colors: int, sample_size: int = QUANTIZE_SAMPLE_PIXELS,
+                    attempts: int = QUANTIZE_ATTEMPTS, bits: int = COLOR_CUBE_BITS,
+                    seed: Optional[int] = 0) -> np.ndarray:
+    """
+    颜色量化：抽样拟合调色板后通过颜色立方体映射所有像素
+
+    Args:
+        img: 形状为 (H, W, 3) 的uint8图像（RGB或BGR均可）
+        n_colors: 颜色数量
+        sample_size: 拟合调色板时的最大采样像素数
+        attempts: k-means重复次数
+        bits: 颜色立方体每个通道的位数
+        seed: 抽样随机种子
+
+    Returns:
+        量化后的图像，形状和通道顺序与输入相同
+    """
+    palette = fit_palette(img, n_colors, sample_size, attempts, seed)
+    return map_to_palette(img, palette, bits)
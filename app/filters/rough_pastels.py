@@ -1,6 +1,7 @@
 import numpy as np
 import cv2
 from .utils import process_image, add_texture
+from .quantize import quantize_colors
 
 
 def _rough_pastels_filter(img: np.ndarray, stroke_size: int = 3, color_levels: int = 8,
@@ -44,13 +45,7 @@ def _rough_pastels_filter(img: np.ndarray, stroke_size: int = 3, color_levels: i
         median = cv2.filter2D(median, -1, kernel)
     
     # 步骤4: 颜色量化减少色彩数量
-    Z = median.reshape((-1, 3))
-    Z = np.float32(Z)
-    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
-    _, labels, centers = cv2.kmeans(Z, color_levels, None, criteria, 10, cv2.KMEANS_RANDOM_CENTERS)
-    centers = np.uint8(centers)
-    res = centers[labels.flatten()]
-    quantized = res.reshape((median.shape))
+    quantized = quantize_colors(median, color_levels)
     
     # 步骤5: 添加粗糙纹理
     # 首先转换为RGB
@@ -2,6 +2,7 @@ import cv2
 import numpy as np
 from PIL import Image, ImageFilter
 from .utils import process_image
+from ..utils.blur import gaussian_blur
 
 
 def _emboss_filter(img: np.ndarray, strength: float = 1.0, angle: float = 45.0) -> np.ndarray:
@@ -77,7 +78,7 @@ def _neon_glow_filter(img: np.ndarray, glow_radius: int = 5, intensity: float =
     edges = cv2.dilate(edges, kernel, iterations=1)
     
     # 高斯模糊创建发光效果
-    glow = cv2.GaussianBlur(edges.astype(np.float32), (0, 0), glow_radius)
+    glow = gaussian_blur(edges.astype(np.float32), glow_radius)
     
     # 创建彩色发光效果
     if len(img.shape) == 3:
@@ -136,7 +137,7 @@ def _glass_effect_filter(img: np.ndarray, displacement: int = 10) -> np.ndarray:
         result = img[y_new, x_new]
     
     # 轻微模糊以平滑效果
-    result = cv2.GaussianBlur(result, (3, 3), 0)
+    result = gaussian_blur(result, ksize=3)
     
     return result
 
@@ -104,7 +104,8 @@ def get_texture_noise(size: Tuple[int, int], scale: float = 1.0, seed: int = Non
         np.random.seed(seed)
     
     # 创建噪声
-    noise = np.random.normal(0, scale, (*size, 1)) * 255
+    width, height = size
+    noise = np.random.normal(0, scale, (height, width, 1)) * 255
     noise = np.clip(noise, 0, 255).astype(np.uint8)
     return noise
 
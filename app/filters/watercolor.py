@@ -1,10 +1,11 @@
 import numpy as np
 import cv2
 from .utils import process_image, add_texture
+from ..utils.edge_preserving import smooth_edge_preserving
 
 
 def _watercolor_filter(img: np.ndarray, sigma_s: float = 60, sigma_r: float = 0.6, 
-                      texture_strength: float = 0.1) -> np.ndarray:
+                      texture_strength: float = 0.1, smoothing: str = "auto") -> np.ndarray:
     """
     实现水彩画效果滤镜
     
@@ -13,6 +14,7 @@ def _watercolor_filter(img: np.ndarray, sigma_s: float = 60, sigma_r: float = 0.
         sigma_s: 空间窗口半径，控制平滑度
         sigma_r: 色彩空间窗口半径，控制颜色保留程度
         texture_strength: 纹理强度
+        smoothing: 保边平滑方法，auto（直径较大时用导向滤波）/ bilateral / guided
         
     Returns:
         处理后的图像数组
@@ -32,8 +34,8 @@ def _watercolor_filter(img: np.ndarray, sigma_s: float = 60, sigma_r: float = 0.
     else:
         img_bgr = img_color
     
-    # 使用双边滤波进行平滑，保留边缘
-    smoothed = cv2.bilateralFilter(img_bgr, 0, sigma_r * 100, sigma_s)
+    # 使用保边平滑，保留边缘
+    smoothed = smooth_edge_preserving(img_bgr, 0, sigma_r * 100, sigma_s, smoothing)
     
     # 边缘检测
     edges = cv2.Canny(cv2.cvtColor(smoothed, cv2.COLOR_BGR2GRAY), 100, 200)
@@ -60,7 +62,8 @@ def _watercolor_filter(img: np.ndarray, sigma_s: float = 60, sigma_r: float = 0.
 
 
 def apply_watercolor(image_bytes: bytes, sigma_s: float = 60, sigma_r: float = 0.6, 
-                    texture_strength: float = 0.1, intensity: float = 1.0) -> bytes:
+                    texture_strength: float = 0.1, intensity: float = 1.0,
+                    smoothing: str = "auto") -> bytes:
     """
     应用水彩滤镜到图像
     
@@ -70,6 +73,7 @@ def apply_watercolor(image_bytes: bytes, sigma_s: float = 60, sigma_r: float = 0
         sigma_r: 色彩空间窗口半径，控制颜色保留程度
         texture_strength: 纹理强度
         intensity: 效果强度
+        smoothing: 保边平滑方法，auto（直径较大时用导向滤波）/ bilateral / guided
         
     Returns:
         处理后图片的字节数据
@@ -80,5 +84,6 @@ def apply_watercolor(image_bytes: bytes, sigma_s: float = 60, sigma_r: float = 0
         intensity=intensity,
         sigma_s=sigma_s,
         sigma_r=sigma_r,
-        texture_strength=texture_strength
+        texture_strength=texture_strength,
+        smoothing=smoothing
     ) 
\ No newline at end of file
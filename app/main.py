@@ -8,12 +8,20 @@ from pydantic import ValidationError
 from .routers import watermark_main, resize, filter, art_filter, perspective, blend, stitch, format
 from .routers import overlay, mask, gif, advanced_text, annotation, canvas, color
 from .routers import noise, pixelate, text_to_image, ai_text_to_image, auth_example, billing, image_info
+from .routers import pipeline, batch
 from .routers.transform.main import router as transform_router
 from .routers.enhance.main import router as enhance_router
 from .routers.crop.main import router as crop_router
 from .middleware.auth_middleware import AuthMiddleware
 from .schemas.response_models import ApiResponse
 from .utils.logger import logger
+from .utils.compute_executor import compute_executor
+from .utils.http_client import http_client_manager
+from .utils.fonts import font_registry
+from .services.user_center_client import user_center_client
+from .services.aigc_storage_client import aigc_storage_client
+from .services.auth_cache import api_token_user_cache
+from .services.result_cache import result_cache
 
 app = FastAPI(
     title="Image Tools API",
@@ -59,6 +67,24 @@ app.include_router(ai_text_to_image.router)
 app.include_router(auth_example.router)
 app.include_router(billing.router)
 app.include_router(image_info.router)
+app.include_router(pipeline.router)
+app.include_router(batch.router)
+
+@app.on_event("startup")
+async def startup_event():
+    """应用启动：预先创建计算任务执行池和外部服务HTTP连接池，建立字体索引"""
+    compute_executor.start()
+    font_registry.scan()
+    # 预先创建共享HTTP客户端，首个请求无需再初始化连接池
+    user_center_client.client
+    aigc_storage_client.client
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """应用关闭：释放计算任务执行池和HTTP连接池"""
+    await http_client_manager.close_all()
+    compute_executor.shutdown()
 
 # 添加静态文件服务，用于提供示例文件
 app.mount("/api/examples", StaticFiles(directory="public/examples"), name="examples")
@@ -88,7 +114,10 @@ async def health_check():
         "version": "1.0.0",
         "status": "running",
         "database": {},
-        "redis": {}
+        "redis": {},
+        "compute_executor": compute_executor.get_stats(),
+        "auth_cache": api_token_user_cache.get_stats(),
+        "result_cache": result_cache.get_stats()
     }
     
     # 检查MySQL连接
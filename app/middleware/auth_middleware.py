@@ -6,6 +6,8 @@ import re
 from datetime import datetime
 
 from ..services.user_center_client import user_center_client
+from ..services.auth_cache import api_token_user_cache, jwt_subject_user_cache
+from ..services.jwt_verifier import jwt_verifier
 from ..schemas.user_models import User, UserStatus
 from ..config import config
 from ..utils.logger import logger
@@ -91,22 +93,43 @@ class AuthMiddleware(BaseHTTPMiddleware):
         if authorization:
             api_token = self._extract_api_token(authorization)
             if api_token:
-                user = await user_center_client.get_user_by_api_token(api_token)
+                user = await api_token_user_cache.get_or_load(
+                    api_token, user_center_client.get_user_by_api_token
+                )
                 if user:
-                    logger.info(f"通过API token认证用户: {user.nickname}")
+                    logger.debug(f"通过API token认证用户: {user.nickname}")
                     return user
 
         # 2. 从cookie中获取jwt_token
         jwt_token = request.cookies.get(config.JWT_COOKIE_NAME)
         if jwt_token:
-            user = await user_center_client.get_user_by_jwt_token(jwt_token)
+            user = await self._get_user_by_jwt_token(jwt_token)
             if user:
-                logger.info(f"通过JWT token认证用户: {user.nickname}")
+                logger.debug(f"通过JWT token认证用户: {user.nickname}")
                 return user
 
         logger.warning("未找到有效的认证信息")
         return None
     
+    async def _get_user_by_jwt_token(self, jwt_token: str) -> Optional[User]:
+        """根据JWT获取用户：本地模式下先校验签名和有效期，用户信息按subject缓存"""
+        if not jwt_verifier.enabled:
+            return await user_center_client.get_user_by_jwt_token(jwt_token)
+
+        claims = jwt_verifier.verify(jwt_token)
+        if not claims:
+            return None
+
+        subject = jwt_verifier.get_subject(claims)
+        if not subject:
+            logger.warning("JWT中缺少用户标识")
+            return None
+
+        # 签名已在本地验证，仅在缓存未命中时向用户中心补全用户信息
+        return await jwt_subject_user_cache.get_or_load(
+            subject, lambda _: user_center_client.get_user_by_jwt_token(jwt_token)
+        )
+
     def _extract_api_token(self, authorization: str) -> Optional[str]:
         """从Authorization头中提取API token"""
         if not authorization:
@@ -120,6 +143,11 @@ class AuthMiddleware(BaseHTTPMiddleware):
         return authorization.strip()
 
 
+async def invalidate_api_token(api_token: str):
+    """使API token的认证缓存失效（token重置、用户禁用或余额变动需立即生效时调用）"""
+    await api_token_user_cache.invalidate(api_token)
+
+
 def get_current_user(request: Request) -> User:
     """获取当前用户（用于依赖注入）"""
     if not hasattr(request.state, 'user'):
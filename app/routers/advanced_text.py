@@ -5,6 +5,7 @@ from ..services.text_service import TextService
 from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.image_utils import ImageUtils
+from ..services.result_cache import run_cached
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..schemas.user_models import User
 from ..middleware.auth_middleware import get_current_user, get_current_api_token
@@ -59,7 +60,8 @@ async def add_text(
             remark=f"文字添加处理({text[:20]}...)"
         )
         contents = await file.read()
-        result_bytes = TextService.add_text(
+        result_bytes = await run_cached(
+            TextService.add_text,
             image_bytes=contents,
             text=text,
             position=position,
@@ -144,8 +146,9 @@ async def add_text_by_url(
             estimated_tokens=10,
             remark=f"文字添加处理({request.text[:20]}...)"
         )
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result_bytes = TextService.add_text(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result_bytes = await run_cached(
+            TextService.add_text,
             image_bytes=contents,
             text=request.text,
             position=request.position,
@@ -6,6 +6,7 @@ from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.billing_utils import calculate_upload_only_billing, calculate_url_download_billing, generate_operation_remark
 from ..utils.image_utils import ImageUtils
+from ..services.result_cache import run_cached
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..middleware.auth_middleware import get_current_api_token
 from typing import Optional
@@ -42,7 +43,8 @@ async def add_annotation(
     """
     try:
         contents = await file.read()
-        result_bytes = AnnotationService.add_annotation(
+        result_bytes = await run_cached(
+            AnnotationService.add_annotation,
             image_bytes=contents,
             annotation_type=annotation_type,
             text=text,
@@ -100,8 +102,9 @@ async def add_annotation_by_url(
     为URL图片添加标注并上传到AIGC网盘
     """
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result_bytes = AnnotationService.add_annotation(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result_bytes = await run_cached(
+            AnnotationService.add_annotation,
             image_bytes=contents,
             annotation_type=request.annotation_type,
             text=request.text,
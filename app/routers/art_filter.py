@@ -5,6 +5,7 @@ from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.billing_utils import calculate_upload_only_billing, calculate_url_download_billing, generate_operation_remark
 from ..utils.image_utils import ImageUtils
+from ..utils.compute_executor import run_compute
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..middleware.auth_middleware import get_current_api_token
 from typing import Optional
@@ -36,7 +37,8 @@ async def apply_art_filter(
     """
     try:
         contents = await file.read()
-        result_bytes = ArtisticFilters.apply_filter(
+        result_bytes = await run_compute(
+            ArtisticFilters.apply_filter,
             image_bytes=contents,
             filter_type=filter_type,
             intensity=intensity,
@@ -103,9 +105,10 @@ async def apply_art_filter_by_url(
                 raise HTTPException(status_code=404, detail=f"本地文件不存在: {file_path}")
         else:
             # 完整URL，下载图片
-            contents, content_type = ImageUtils.download_image_from_url(request.image_url)
+            contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
 
-        result_bytes = ArtisticFilters.apply_filter(
+        result_bytes = await run_compute(
+            ArtisticFilters.apply_filter,
             image_bytes=contents,
             filter_type=request.filter_type,
             intensity=request.intensity,
@@ -0,0 +1,251 @@
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body, Depends
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from ..services.batch_service import BatchItem, BatchProcessor
+from ..services.image_service import ImageService
+from ..services.filter_service import FilterService
+from ..services.resize_service import ResizeService
+from ..utils.billing_utils import calculate_upload_only_billing, calculate_url_download_billing
+from ..utils.compute_executor import run_compute
+from ..utils.url_fetcher import url_fetcher
+from ..services.result_cache import run_cached
+from ..schemas.request_models import FilterType
+from ..schemas.response_models import ErrorResponse
+from ..schemas.user_models import User
+from ..middleware.auth_middleware import get_current_user, get_current_api_token
+from ..config import config
+from typing import Callable, Dict, List, Optional
+from pydantic import BaseModel
+
+
+class BatchResizeByUrlRequest(BaseModel):
+    """批量调整图片大小的URL请求模型"""
+    image_urls: List[str]
+    width: Optional[int] = None
+    height: Optional[int] = None
+    maintain_aspect: Optional[bool] = True
+    quality: Optional[int] = 90
+
+
+class BatchFilterByUrlRequest(BaseModel):
+    """批量滤镜的URL请求模型"""
+    image_urls: List[str]
+    filter_type: str
+    intensity: Optional[float] = 1.0
+
+
+router = APIRouter(
+    tags=["batch"],
+    responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _check_batch_size(count: int):
+    if count == 0:
+        raise HTTPException(status_code=400, detail="至少需要一张图片")
+    if count > config.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"图片数量超过限制: {count} > {config.BATCH_MAX_ITEMS}")
+
+
+def _upload_billing(input_size: int, result_size: int) -> Dict:
+    return calculate_upload_only_billing(primary_file_size=input_size, result_size=result_size)
+
+
+def _url_billing(input_size: int, result_size: int) -> Dict:
+    return calculate_url_download_billing(input_size, result_size)
+
+
+async def _read_files(files: List[UploadFile]) -> List[BatchItem]:
+    """读取上传的文件，非图片文件记为失败条目"""
+    items = []
+    for index, file in enumerate(files):
+        if not file.content_type or not file.content_type.startswith("image/"):
+            items.append(BatchItem(index, file.filename, error="上传的文件不是图片格式"))
+            continue
+        items.append(BatchItem(index, file.filename, content=await file.read(), content_type=file.content_type))
+    return items
+
+
+async def _download_urls(urls: List[str]) -> List[BatchItem]:
+    """并发下载所有URL，单个下载失败记为失败条目"""
+    results = await url_fetcher.fetch_many(urls, return_exceptions=True)
+    items = []
+    for index, (url, result) in enumerate(zip(urls, results)):
+        if isinstance(result, BaseException):
+            items.append(BatchItem(index, url, error=str(result) or type(result).__name__))
+            continue
+        with result:
+            items.append(BatchItem(index, url, content=result.content, content_type=result.content_type))
+    return items
+
+
+async def _start_batch(
+    items: List[BatchItem],
+    api_token: str,
+    api_path: str,
+    operation_type: str,
+    parameters: Dict,
+    process: Callable,
+    billing_func: Callable,
+    remark: str
+) -> StreamingResponse:
+    """聚合预扣费后以NDJSON流式返回逐条结果，响应结束（包括客户端断开）后在后台任务中结算"""
+    processor = BatchProcessor(
+        api_token=api_token,
+        api_path=api_path,
+        operation_type=operation_type,
+        parameters=parameters,
+        process=process,
+        billing_func=billing_func
+    )
+    if not await processor.pre_charge(items, remark):
+        raise HTTPException(
+            status_code=402,
+            detail="余额不足或预扣费失败，请检查账户余额"
+        )
+    return StreamingResponse(
+        processor.stream(items),
+        media_type=NDJSON_MEDIA_TYPE,
+        background=BackgroundTask(processor.finish)
+    )
+
+
+def _resize_process(width, height, maintain_aspect, quality) -> Callable:
+    async def process(contents: bytes) -> bytes:
+        return await run_cached(
+            ResizeService.resize_image,
+            image_bytes=contents,
+            width=width,
+            height=height,
+            maintain_ratio=maintain_aspect,
+            quality=quality,
+        )
+    return process
+
+
+def _filter_process(filter_type: str, intensity: float) -> Callable:
+    try:
+        filter_enum = FilterType(filter_type)
+    except ValueError:
+        valid_filters = ", ".join([f.value for f in FilterType])
+        raise HTTPException(status_code=400, detail=f"无效的滤镜类型。支持的滤镜有: {valid_filters}")
+
+    runner = run_compute if filter_enum.value in FilterService.NON_DETERMINISTIC_FILTERS else run_cached
+
+    async def process(contents: bytes) -> bytes:
+        return await runner(
+            ImageService.apply_filter,
+            image_bytes=contents,
+            filter_type=filter_enum.value,
+            intensity=intensity,
+        )
+    return process
+
+
+@router.post("/api/v1/batch/resize")
+async def batch_resize(
+    files: List[UploadFile] = File(...),
+    width: Optional[int] = Form(None),
+    height: Optional[int] = Form(None),
+    maintain_aspect: Optional[bool] = Form(True),
+    quality: Optional[int] = Form(90),
+    current_user: User = Depends(get_current_user),
+    api_token: str = Depends(get_current_api_token)
+):
+    """
+    批量调整上传图片的大小并上传到AIGC网盘，结果以NDJSON逐行返回
+    一次聚合预扣费，按成功图片的实际费用结算（每张：基础费用100Token + 上传费用50Token/MB）
+    """
+    _check_batch_size(len(files))
+    items = await _read_files(files)
+    return await _start_batch(
+        items,
+        api_token=api_token,
+        api_path="/api/v1/batch/resize",
+        operation_type="resize",
+        parameters={"width": width, "height": height, "maintain_aspect": maintain_aspect, "quality": quality},
+        process=_resize_process(width, height, maintain_aspect, quality),
+        billing_func=_upload_billing,
+        remark=f"批量图片缩放 - {len(files)}张"
+    )
+
+
+@router.post("/api/v1/batch/resize-by-url")
+async def batch_resize_by_url(
+    request: BatchResizeByUrlRequest = Body(..., description="批量调整图片大小的URL请求参数"),
+    current_user: User = Depends(get_current_user),
+    api_token: str = Depends(get_current_api_token)
+):
+    """
+    批量调整URL图片的大小并上传到AIGC网盘，结果以NDJSON逐行返回
+    """
+    _check_batch_size(len(request.image_urls))
+    items = await _download_urls(request.image_urls)
+    return await _start_batch(
+        items,
+        api_token=api_token,
+        api_path="/api/v1/batch/resize-by-url",
+        operation_type="resize",
+        parameters={
+            "width": request.width,
+            "height": request.height,
+            "maintain_aspect": request.maintain_aspect,
+            "quality": request.quality
+        },
+        process=_resize_process(request.width, request.height, request.maintain_aspect, request.quality),
+        billing_func=_url_billing,
+        remark=f"批量URL图片缩放 - {len(request.image_urls)}张"
+    )
+
+
+@router.post("/api/v1/batch/filter")
+async def batch_filter(
+    files: List[UploadFile] = File(...),
+    filter_type: str = Form(...),
+    intensity: Optional[float] = Form(1.0),
+    current_user: User = Depends(get_current_user),
+    api_token: str = Depends(get_current_api_token)
+):
+    """
+    对上传的多张图片应用同一滤镜并上传到AIGC网盘，结果以NDJSON逐行返回
+    一次聚合预扣费，按成功图片的实际费用结算（每张：基础费用100Token + 上传费用50Token/MB）
+    """
+    _check_batch_size(len(files))
+    process = _filter_process(filter_type, intensity)
+    items = await _read_files(files)
+    return await _start_batch(
+        items,
+        api_token=api_token,
+        api_path="/api/v1/batch/filter",
+        operation_type="filter",
+        parameters={"filter_type": filter_type, "intensity": intensity},
+        process=process,
+        billing_func=_upload_billing,
+        remark=f"批量滤镜处理({filter_type}) - {len(files)}张"
+    )
+
+
+@router.post("/api/v1/batch/filter-by-url")
+async def batch_filter_by_url(
+    request: BatchFilterByUrlRequest = Body(..., description="批量滤镜的URL请求参数"),
+    current_user: User = Depends(get_current_user),
+    api_token: str = Depends(get_current_api_token)
+):
+    """
+    对多个URL图片应用同一滤镜并上传到AIGC网盘，结果以NDJSON逐行返回
+    """
+    _check_batch_size(len(request.image_urls))
+    process = _filter_process(request.filter_type, request.intensity)
+    items = await _download_urls(request.image_urls)
+    return await _start_batch(
+        items,
+        api_token=api_token,
+        api_path="/api/v1/batch/filter-by-url",
+        operation_type="filter",
+        parameters={"filter_type": request.filter_type, "intensity": request.intensity},
+        process=process,
+        billing_func=_url_billing,
+        remark=f"批量URL滤镜处理({request.filter_type}) - {len(request.image_urls)}张"
+    )
@@ -5,6 +5,7 @@ from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.image_utils import ImageUtils
 from ..utils.billing_utils import calculate_dual_upload_billing, calculate_url_download_billing, generate_operation_remark
+from ..services.result_cache import run_cached
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..middleware.auth_middleware import get_current_api_token
 from typing import Optional
@@ -44,7 +45,8 @@ async def blend_images(
         base_size = len(base_contents)
         blend_size = len(blend_contents)
         
-        result_bytes = BlendService.blend_images(
+        result_bytes = await run_cached(
+            BlendService.blend_images,
             base_image_bytes=base_contents,
             blend_image_bytes=blend_contents,
             blend_mode=blend_mode,
@@ -141,8 +143,8 @@ async def blend_images_by_url(
     """
     call_id = None
     try:
-        base_contents, base_content_type = ImageUtils.download_image_from_url(request.base_image_url)
-        blend_contents, _ = ImageUtils.download_image_from_url(request.blend_image_url)
+        base_contents, base_content_type = await ImageUtils.download_image_from_url(request.base_image_url)
+        blend_contents, _ = await ImageUtils.download_image_from_url(request.blend_image_url)
         
         base_size = len(base_contents)
         blend_size = len(blend_contents)
@@ -152,7 +154,8 @@ async def blend_images_by_url(
         billing_info = calculate_url_download_billing(total_download_size)
         estimated_tokens = billing_info["total_cost"]
         
-        result_bytes = BlendService.blend_images(
+        result_bytes = await run_cached(
+            BlendService.blend_images,
             base_image_bytes=base_contents,
             blend_image_bytes=blend_contents,
             blend_mode=request.blend_mode,
@@ -5,6 +5,7 @@ from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.image_utils import ImageUtils
 from ..utils.billing_utils import calculate_upload_only_billing, calculate_url_download_billing, generate_operation_remark
+from ..services.result_cache import run_cached
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..middleware.auth_middleware import get_current_api_token
 from typing import Optional
@@ -45,7 +46,8 @@ async def process_canvas(
         contents = await file.read()
         file_size = len(contents)
         
-        result_bytes = CanvasService.process_canvas(
+        result_bytes = await run_cached(
+            CanvasService.process_canvas,
             image_bytes=contents,
             canvas_type=canvas_type,
             background_color=background_color,
@@ -157,7 +159,7 @@ async def process_canvas_by_url(
                 raise HTTPException(status_code=404, detail=f"本地文件不存在: {file_path}")
         else:
             # 完整URL，下载图片
-            contents, content_type = ImageUtils.download_image_from_url(request.image_url)
+            contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
 
         download_size = len(contents)
         
@@ -200,7 +202,8 @@ async def process_canvas_by_url(
                 detail="余额不足或预扣费失败，请检查账户余额"
             )
 
-        result_bytes = CanvasService.process_canvas(
+        result_bytes = await run_cached(
+            CanvasService.process_canvas,
             image_bytes=contents,
             canvas_type=request.canvas_type,
             background_color=request.background_color,
@@ -5,6 +5,7 @@ from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service, BillingCallType
 from ..utils.image_utils import ImageUtils
 from ..utils.billing_utils import calculate_url_download_billing, generate_operation_remark
+from ..services.result_cache import run_cached
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..schemas.user_models import User
 from ..middleware.auth_middleware import get_current_user, get_current_api_token
@@ -78,26 +79,30 @@ async def adjust_color(
         contents = await file.read()
         # 根据adjustment_type调用相应的方法
         if adjustment_type == "brightness":
-            result_bytes = ColorService.adjust_color(
+            result_bytes = await run_cached(
+                ColorService.adjust_color,
                 image_bytes=contents,
                 brightness=intensity * 50,  # 将intensity转换为亮度值
                 quality=quality,
             )
         elif adjustment_type == "contrast":
-            result_bytes = ColorService.adjust_color(
+            result_bytes = await run_cached(
+                ColorService.adjust_color,
                 image_bytes=contents,
                 contrast=intensity * 50,  # 将intensity转换为对比度值
                 quality=quality,
             )
         elif adjustment_type == "saturation":
-            result_bytes = ColorService.adjust_color(
+            result_bytes = await run_cached(
+                ColorService.adjust_color,
                 image_bytes=contents,
                 saturation=intensity * 50,  # 将intensity转换为饱和度值
                 quality=quality,
             )
         else:
             # 使用apply_color_effect方法处理其他效果
-            result_bytes = ColorService.apply_color_effect(
+            result_bytes = await run_cached(
+                ColorService.apply_color_effect,
                 image_bytes=contents,
                 effect_type=adjustment_type,
                 intensity=intensity,
@@ -193,39 +198,44 @@ async def adjust_color_by_url(
                 raise HTTPException(status_code=404, detail=f"本地文件不存在: {file_path}")
         else:
             # 完整URL，下载图片
-            contents, content_type = ImageUtils.download_image_from_url(request.image_url)
+            contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
 
         # 获取原始图片大小
         original_size = len(contents)
 
         # 根据adjustment_type调用相应的方法
         if request.adjustment_type == "brightness":
-            result_bytes = ColorService.adjust_color(
+            result_bytes = await run_cached(
+                ColorService.adjust_color,
                 image_bytes=contents,
                 brightness=request.intensity * 50,
                 quality=request.quality,
             )
         elif request.adjustment_type == "contrast":
-            result_bytes = ColorService.adjust_color(
+            result_bytes = await run_cached(
+                ColorService.adjust_color,
                 image_bytes=contents,
                 contrast=request.intensity * 50,
                 quality=request.quality,
             )
         elif request.adjustment_type == "saturation":
-            result_bytes = ColorService.adjust_color(
+            result_bytes = await run_cached(
+                ColorService.adjust_color,
                 image_bytes=contents,
                 saturation=request.intensity * 50,
                 quality=request.quality,
             )
         elif request.adjustment_type == "hue":
-            result_bytes = ColorService.adjust_color(
+            result_bytes = await run_cached(
+                ColorService.adjust_color,
                 image_bytes=contents,
                 hue=request.hue_shift,
                 quality=request.quality,
             )
         else:
             # 使用apply_color_effect方法处理其他效果
-            result_bytes = ColorService.apply_color_effect(
+            result_bytes = await run_cached(
+                ColorService.apply_color_effect,
                 image_bytes=contents,
                 effect_type=request.adjustment_type,
                 intensity=request.intensity,
@@ -7,6 +7,7 @@ from ...utils.billing_utils import (
     calculate_upload_only_billing, calculate_url_download_billing,
     generate_operation_remark
 )
+from ...services.result_cache import run_cached
 from ...schemas.response_models import ErrorResponse, ImageProcessResponse, FileInfo, ApiResponse
 from ...schemas.user_models import User
 from ...middleware.auth_middleware import get_current_user, get_current_api_token
@@ -114,7 +115,8 @@ async def crop_image(
                 x = (img_width - width) // 2
                 y = (img_height - height) // 2
 
-            result_bytes = CropService.crop_rectangle(
+            result_bytes = await run_cached(
+                CropService.crop_rectangle,
                 image_bytes=contents,
                 x=x,
                 y=y,
@@ -123,7 +125,8 @@ async def crop_image(
                 quality=quality,
             )
         elif crop_type == "smart_center":
-            result_bytes = CropService.crop_smart_center(
+            result_bytes = await run_cached(
+                CropService.crop_smart_center,
                 image_bytes=contents,
                 target_width=width or 300,
                 target_height=height or 300,
@@ -199,7 +202,7 @@ async def crop_image_by_url(
         )
         
         # 下载图片
-        contents = ImageUtils.download_image_from_url(request.image_url)
+        contents, _ = await ImageUtils.download_image_from_url(request.image_url)
 
         # 处理图片 - 根据裁剪类型调用不同方法
         if request.crop_type == "rectangle" or request.crop_type == "center":
@@ -217,7 +220,8 @@ async def crop_image_by_url(
             else:
                 x, y, width, height = request.x, request.y, request.width, request.height
 
-            result_bytes = CropService.crop_rectangle(
+            result_bytes = await run_cached(
+                CropService.crop_rectangle,
                 image_bytes=contents,
                 x=x,
                 y=y,
@@ -226,7 +230,8 @@ async def crop_image_by_url(
                 quality=request.quality,
             )
         elif request.crop_type == "smart_center":
-            result_bytes = CropService.crop_smart_center(
+            result_bytes = await run_cached(
+                CropService.crop_smart_center,
                 image_bytes=contents,
                 target_width=request.width or 300,
                 target_height=request.height or 300,
@@ -2,6 +2,7 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body
 from typing import Optional
 from ...services.image_service import ImageService
 from ...utils.image_utils import ImageUtils
+from ...services.result_cache import run_cached
 from ...schemas.request_models import CropRectangleRequest
 from ...schemas.response_models import ErrorResponse, ApiResponse
 from fastapi.responses import Response
@@ -33,7 +34,8 @@ async def crop_rectangle(
     """矩形裁剪图片"""
     try:
         contents = await file.read()
-        result = ImageService.crop_rectangle(
+        result = await run_cached(
+            ImageService.crop_rectangle,
             image_bytes=contents,
             x=x,
             y=y,
@@ -69,8 +71,9 @@ async def crop_rectangle_by_url(
 ):
     """矩形裁剪URL图片"""
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result = ImageService.crop_rectangle(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result = await run_cached(
+            ImageService.crop_rectangle,
             image_bytes=contents,
             x=request.x,
             y=request.y,
@@ -2,6 +2,7 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body
 from typing import Optional
 from ...services.image_service import ImageService
 from ...utils.image_utils import ImageUtils
+from ...services.result_cache import run_cached
 from ...schemas.response_models import ErrorResponse, ApiResponse
 from pydantic import BaseModel
 import base64
@@ -31,7 +32,8 @@ async def crop_circle(
     """圆形裁剪图片"""
     try:
         contents = await file.read()
-        result = ImageService.crop_circle(
+        result = await run_cached(
+            ImageService.crop_circle,
             image_bytes=contents,
             center_x=center_x,
             center_y=center_y,
@@ -65,8 +67,9 @@ async def crop_circle_by_url(
 ):
     """圆形裁剪URL图片"""
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result = ImageService.crop_circle(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result = await run_cached(
+            ImageService.crop_circle,
             image_bytes=contents,
             center_x=request.center_x,
             center_y=request.center_y,
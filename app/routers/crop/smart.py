@@ -2,6 +2,7 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body
 from typing import Optional
 from ...services.image_service import ImageService
 from ...utils.image_utils import ImageUtils
+from ...services.result_cache import run_cached
 from ...schemas.response_models import ErrorResponse, ApiResponse
 from fastapi.responses import Response
 from pydantic import BaseModel
@@ -28,7 +29,8 @@ async def crop_smart(
     """智能居中裁剪图片到指定尺寸"""
     try:
         contents = await file.read()
-        result = ImageService.crop_smart_center(
+        result = await run_cached(
+            ImageService.crop_smart_center,
             image_bytes=contents,
             target_width=target_width,
             target_height=target_height,
@@ -44,8 +46,9 @@ async def crop_smart_by_url(
 ):
     """智能居中裁剪URL图片到指定尺寸"""
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result = ImageService.crop_smart_center(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result = await run_cached(
+            ImageService.crop_smart_center,
             image_bytes=contents,
             target_width=request.target_width,
             target_height=request.target_height,
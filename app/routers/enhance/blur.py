@@ -3,7 +3,8 @@ from ...services.enhance_service import EnhanceService
 from ...schemas.response_models import ErrorResponse, ApiResponse
 from fastapi.responses import Response
 from ...utils.image_utils import ImageUtils
-from typing import Optional
+from ...services.result_cache import run_cached
+from typing import Literal, Optional
 from pydantic import BaseModel
 
 class MotionBlurByUrlRequest(BaseModel):
@@ -20,6 +21,7 @@ class RadialBlurByUrlRequest(BaseModel):
     center_y: Optional[int] = None
     strength: float = 0.1
     quality: int = 90
+    mode: Literal["box", "zoom"] = "box"
 
 class SurfaceBlurByUrlRequest(BaseModel):
     """表面模糊URL请求模型"""
@@ -43,7 +45,8 @@ async def motion_blur(
     """运动模糊效果"""
     try:
         contents = await file.read()
-        result = EnhanceService.motion_blur(
+        result = await run_cached(
+            EnhanceService.motion_blur,
             image_bytes=contents,
             angle=angle,
             length=length,
@@ -69,8 +72,9 @@ async def motion_blur_by_url(
 ):
     """运动模糊效果（URL方式）"""
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result = EnhanceService.motion_blur(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result = await run_cached(
+            EnhanceService.motion_blur,
             image_bytes=contents,
             angle=request.angle,
             length=request.length,
@@ -95,18 +99,21 @@ async def radial_blur(
     file: UploadFile = File(...),
     center_x: Optional[int] = Form(None, description="模糊中心X坐标（默认图片中心）"),
     center_y: Optional[int] = Form(None, description="模糊中心Y坐标（默认图片中心）"),
-    strength: float = Form(0.1, ge=0, le=1, description="模糊强度"),
-    quality: int = Form(90, ge=1, le=100, description="输出图像质量 (1-100)")
+    strength: float = Form(0.1, ge=0, le=1, description="模糊强度（0-1）：box模式下1对应图片角落处的模糊半径为对角线的10%，zoom模式为缩放比例"),
+    quality: int = Form(90, ge=1, le=100, description="输出图像质量 (1-100)"),
+    mode: Literal["box", "zoom"] = Form("box", description="模糊模式：box（随距离增大的盒式模糊）/ zoom（沿半径方向的缩放模糊）")
 ):
     """径向模糊效果"""
     try:
         contents = await file.read()
-        result = EnhanceService.radial_blur(
+        result = await run_cached(
+            EnhanceService.radial_blur,
             image_bytes=contents,
             center_x=center_x,
             center_y=center_y,
             strength=strength,
-            quality=quality
+            quality=quality,
+            mode=mode
         )
         # 将图片转换为base64编码返回
         import base64
@@ -128,13 +135,15 @@ async def radial_blur_by_url(
 ):
     """径向模糊效果（URL方式）"""
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result = EnhanceService.radial_blur(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result = await run_cached(
+            EnhanceService.radial_blur,
             image_bytes=contents,
             center_x=request.center_x,
             center_y=request.center_y,
             strength=request.strength,
-            quality=request.quality
+            quality=request.quality,
+            mode=request.mode
         )
         # 将图片转换为base64编码返回
         import base64
@@ -160,7 +169,8 @@ async def surface_blur(
     """表面模糊（保留边缘）"""
     try:
         contents = await file.read()
-        result = EnhanceService.surface_blur(
+        result = await run_cached(
+            EnhanceService.surface_blur,
             image_bytes=contents,
             radius=radius,
             threshold=threshold,
@@ -186,8 +196,9 @@ async def surface_blur_by_url(
 ):
     """表面模糊（保留边缘）（URL方式）"""
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result = EnhanceService.surface_blur(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result = await run_cached(
+            EnhanceService.surface_blur,
             image_bytes=contents,
             radius=request.radius,
             threshold=request.threshold,
@@ -4,6 +4,7 @@ from ...services.enhance_service import EnhanceService
 from ...services.file_upload_service import file_upload_service
 from ...utils.image_utils import ImageUtils
 from ...utils.logger import logger
+from ...services.result_cache import run_cached
 from ...schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ...middleware.auth_middleware import get_current_api_token
 from typing import Optional
@@ -35,7 +36,8 @@ async def enhance_image(
 
     try:
         contents = await file.read()
-        result_bytes = EnhanceService.apply_enhance_effect(
+        result_bytes = await run_cached(
+            EnhanceService.apply_enhance_effect,
             image_bytes=contents,
             effect_type=enhance_type,
             intensity=intensity,
@@ -88,8 +90,9 @@ async def enhance_image_by_url(
     增强URL图片并上传到AIGC网盘
     """
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result_bytes = EnhanceService.apply_enhance_effect(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result_bytes = await run_cached(
+            EnhanceService.apply_enhance_effect,
             image_bytes=contents,
             effect_type=request.enhance_type,
             intensity=request.intensity,
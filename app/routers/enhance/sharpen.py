@@ -4,6 +4,7 @@ from ...services.enhance_service import EnhanceService
 from ...schemas.response_models import ErrorResponse, ApiResponse
 from fastapi.responses import Response
 from ...utils.image_utils import ImageUtils
+from ...services.result_cache import run_cached
 from typing import Optional
 from pydantic import BaseModel
 
@@ -46,7 +47,8 @@ async def unsharp_mask(
     """USM锐化（非锐化遮罩）"""
     try:
         contents = await file.read()
-        result = EnhanceService.unsharp_mask(
+        result = await run_cached(
+            EnhanceService.unsharp_mask,
             image_bytes=contents,
             radius=radius,
             amount=amount,
@@ -73,8 +75,9 @@ async def unsharp_mask_by_url(
 ):
     """USM锐化（非锐化遮罩）"""
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result = EnhanceService.unsharp_mask(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result = await run_cached(
+            EnhanceService.unsharp_mask,
             image_bytes=contents,
             radius=request.radius,
             amount=request.amount,
@@ -106,7 +109,8 @@ async def smart_sharpen(
     """智能锐化"""
     try:
         contents = await file.read()
-        result = EnhanceService.smart_sharpen(
+        result = await run_cached(
+            EnhanceService.smart_sharpen,
             image_bytes=contents,
             amount=amount,
             radius=radius,
@@ -133,8 +137,9 @@ async def smart_sharpen_by_url(
 ):
     """智能锐化"""
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result = EnhanceService.smart_sharpen(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result = await run_cached(
+            EnhanceService.smart_sharpen,
             image_bytes=contents,
             amount=request.amount,
             radius=request.radius,
@@ -165,7 +170,8 @@ async def edge_sharpen(
     """边缘锐化"""
     try:
         contents = await file.read()
-        result = EnhanceService.edge_sharpen(
+        result = await run_cached(
+            EnhanceService.edge_sharpen,
             image_bytes=contents,
             strength=strength,
             edge_threshold=edge_threshold,
@@ -191,8 +197,9 @@ async def edge_sharpen_by_url(
 ):
     """边缘锐化"""
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result = EnhanceService.edge_sharpen(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result = await run_cached(
+            EnhanceService.edge_sharpen,
             image_bytes=contents,
             strength=request.strength,
             edge_threshold=request.edge_threshold,
@@ -3,10 +3,13 @@ import random
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body, Depends
 from fastapi.responses import Response
 from ..services.image_service import ImageService
+from ..services.filter_service import FilterService
 from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.image_utils import ImageUtils
 from ..utils.billing_utils import calculate_upload_only_billing, calculate_url_download_billing, generate_operation_remark
+from ..utils.compute_executor import run_compute
+from ..services.result_cache import run_cached
 from ..schemas.request_models import FilterType
 from ..schemas.response_models import ErrorResponse, ImageProcessResponse, FileInfo, ApiResponse
 from ..schemas.user_models import User
@@ -147,8 +150,11 @@ async def apply_filter(
         contents = await file.read()
         original_size = len(contents)
 
-        # 处理图片
-        result_bytes = ImageService.apply_filter(
+        # 处理图片（动图逐帧并行处理，输出GIF）
+        animated = ImageUtils.is_animated(contents)
+        runner = run_compute if filter_enum.value in FilterService.NON_DETERMINISTIC_FILTERS else run_cached
+        result_bytes = await runner(
+            ImageService.apply_filter_animated if animated else ImageService.apply_filter,
             image_bytes=contents,
             filter_type=filter_enum.value,
             intensity=intensity,
@@ -201,7 +207,7 @@ async def apply_filter(
             operation_type="filter",
             parameters=parameters,
             original_filename=file.filename,
-            content_type=file.content_type or "image/jpeg"
+            content_type="image/gif" if animated else (file.content_type or "image/jpeg")
         )
 
         if not upload_response:
@@ -264,7 +270,7 @@ async def apply_filter_by_url(
                 raise HTTPException(status_code=404, detail=f"本地文件不存在: {file_path}")
         else:
             # 完整URL，下载图片
-            contents, content_type = ImageUtils.download_image_from_url(request.image_url)
+            contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
 
         try:
             filter_enum = FilterType(request.filter_type)
@@ -272,7 +278,10 @@ async def apply_filter_by_url(
             valid_filters = ", ".join([f.value for f in FilterType])
             raise HTTPException(status_code=400, detail=f"无效的滤镜类型。支持的滤镜有: {valid_filters}")
 
-        result_bytes = ImageService.apply_filter(
+        animated = ImageUtils.is_animated(contents)
+        runner = run_compute if filter_enum.value in FilterService.NON_DETERMINISTIC_FILTERS else run_cached
+        result_bytes = await runner(
+            ImageService.apply_filter_animated if animated else ImageService.apply_filter,
             image_bytes=contents,
             filter_type=filter_enum.value,
             intensity=request.intensity,
@@ -327,7 +336,7 @@ async def apply_filter_by_url(
             operation_type="filter",
             parameters=parameters,
             original_filename=None,
-            content_type=content_type or "image/jpeg"
+            content_type="image/gif" if animated else (content_type or "image/jpeg")
         )
 
         if not upload_response:
@@ -3,6 +3,7 @@ from ..services.format_service import FormatService
 from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.image_utils import ImageUtils
+from ..services.result_cache import run_cached
 from ..schemas.response_models import ErrorResponse, ImageProcessResponse, FileInfo, ApiResponse
 from ..schemas.user_models import User
 from ..middleware.auth_middleware import get_current_user, get_current_api_token
@@ -49,7 +50,8 @@ async def convert_format(
         contents = await file.read()
 
         # 处理图片
-        result_bytes = FormatService.convert_format(
+        result_bytes = await run_cached(
+            FormatService.convert_format,
             image_bytes=contents,
             target_format=output_format,
             quality=quality,
@@ -124,10 +126,11 @@ async def convert_format_by_url(
             remark=f"URL格式转换处理({request.output_format})"
         )
         # 下载图片
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
 
         # 处理图片
-        result_bytes = FormatService.convert_format(
+        result_bytes = await run_cached(
+            FormatService.convert_format,
             image_bytes=contents,
             target_format=request.output_format,
             quality=request.quality,
@@ -2,8 +2,11 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body, Depends
 from fastapi.responses import Response
 from ..services.gif_service import GifService
+from ..services.gif.formats import CONTENT_TYPES, normalize_output_format, output_filename
 from ..services.file_upload_service import file_upload_service
 from ..utils.image_utils import ImageUtils
+from ..utils.compute_executor import run_compute
+from ..services.result_cache import run_cached
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..middleware.auth_middleware import get_current_api_token
 from typing import Optional, List
@@ -14,6 +17,7 @@ class GifByUrlRequest(BaseModel):
     image_url: str
     fps: Optional[int] = 10
     quality: Optional[int] = 90
+    output_format: Optional[str] = "gif"
 
 class VideoToGifRequest(BaseModel):
     """视频转GIF请求模型"""
@@ -24,6 +28,7 @@ class VideoToGifRequest(BaseModel):
     height: Optional[int] = None
     start_time: Optional[float] = 0
     duration: Optional[float] = None
+    output_format: Optional[str] = "gif"
 
 class CreateGifByUrlRequest(BaseModel):
     """图片合成GIF URL请求模型"""
@@ -32,6 +37,7 @@ class CreateGifByUrlRequest(BaseModel):
     loop: Optional[int] = 0
     quality: Optional[int] = 90
     optimize: Optional[bool] = True
+    output_format: Optional[str] = "gif"
 
 class ExtractGifByUrlRequest(BaseModel):
     """GIF帧提取URL请求模型"""
@@ -47,6 +53,14 @@ router = APIRouter(
     responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
 )
 
+
+def validate_output_format(output_format: Optional[str]) -> str:
+    """校验输出格式，不支持时返回400"""
+    try:
+        return normalize_output_format(output_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/api/v1/gif")
 async def process_gif(
     file: UploadFile = File(...),
@@ -54,12 +68,14 @@ async def process_gif(
     quality: Optional[int] = Form(90),
     width: Optional[int] = Form(None),
     height: Optional[int] = Form(None),
+    output_format: Optional[str] = Form("gif", description="输出格式(gif/webp/mp4)"),
     api_token: str = Depends(get_current_api_token)
 ):
     """
     处理上传的GIF文件或视频文件并上传到AIGC网盘
     """
 
+    output_format = validate_output_format(output_format)
     try:
         contents = await file.read()
 
@@ -82,22 +98,26 @@ async def process_gif(
 
         if is_video:
             # 视频转GIF
-            result_bytes = GifService.video_to_gif(
+            result_bytes = await run_cached(
+                GifService.video_to_gif,
                 video_bytes=contents,
                 fps=fps,
                 quality=quality,
                 width=width,
-                height=height
+                height=height,
+                output_format=output_format
             )
             operation_type = "video_to_gif"
         else:
             # GIF处理
-            result_bytes = GifService.process_gif(
+            result_bytes = await run_cached(
+                GifService.process_gif,
                 gif_bytes=contents,
                 fps=fps,
                 quality=quality,
                 width=width,
-                height=height
+                height=height,
+                output_format=output_format
             )
             operation_type = "gif_process"
 
@@ -107,7 +127,8 @@ async def process_gif(
             "quality": quality,
             "width": width,
             "height": height,
-            "is_video": is_video
+            "is_video": is_video,
+            "output_format": output_format
         }
 
         # 上传到网盘
@@ -117,7 +138,7 @@ async def process_gif(
             operation_type=operation_type,
             parameters=parameters,
             original_filename=file.filename,
-            content_type="image/gif"
+            content_type=CONTENT_TYPES[output_format]
         )
 
         if not upload_response:
@@ -147,18 +168,22 @@ async def process_gif_by_url(
     """
     处理URL GIF文件并上传到AIGC网盘
     """
+    output_format = validate_output_format(request.output_format)
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result_bytes = GifService.process_gif(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result_bytes = await run_cached(
+            GifService.process_gif,
             gif_bytes=contents,
             fps=request.fps,
             quality=request.quality,
+            output_format=output_format,
         )
 
         # 准备上传参数
         parameters = {
             "fps": request.fps,
             "quality": request.quality,
+            "output_format": output_format,
             "source_url": request.image_url
         }
 
@@ -169,7 +194,7 @@ async def process_gif_by_url(
             operation_type="gif_process",
             parameters=parameters,
             original_filename=None,
-            content_type="image/gif"
+            content_type=CONTENT_TYPES[output_format]
         )
 
         if not upload_response:
@@ -201,21 +226,25 @@ async def video_to_gif(
     height: Optional[int] = Form(None),
     start_time: Optional[float] = Form(0),
     duration: Optional[float] = Form(None),
+    output_format: Optional[str] = Form("gif", description="输出格式(gif/webp/mp4)"),
     api_token: str = Depends(get_current_api_token)
 ):
     """
-    将上传的视频文件转换为GIF并上传到AIGC网盘
+    将上传的视频文件转换为GIF（或动画WebP、MP4）并上传到AIGC网盘
     """
+    output_format = validate_output_format(output_format)
     try:
         contents = await file.read()
-        result_bytes = GifService.video_to_gif(
+        result_bytes = await run_cached(
+            GifService.video_to_gif,
             video_bytes=contents,
             fps=fps,
             quality=quality,
             width=width,
             height=height,
             start_time=start_time,
-            duration=duration
+            duration=duration,
+            output_format=output_format
         )
 
         # 准备上传参数
@@ -225,7 +254,8 @@ async def video_to_gif(
             "width": width,
             "height": height,
             "start_time": start_time,
-            "duration": duration
+            "duration": duration,
+            "output_format": output_format
         }
 
         # 上传到网盘
@@ -235,7 +265,7 @@ async def video_to_gif(
             operation_type="video_to_gif",
             parameters=parameters,
             original_filename=file.filename,
-            content_type="image/gif"
+            content_type=CONTENT_TYPES[output_format]
         )
 
         if not upload_response:
@@ -265,16 +295,19 @@ async def video_to_gif_by_url(
     """
     将视频URL转换为GIF并上传到AIGC网盘
     """
+    output_format = validate_output_format(request.output_format)
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.video_url)
-        result_bytes = GifService.video_to_gif(
+        contents, content_type = await ImageUtils.download_image_from_url(request.video_url, allow_video=True)
+        result_bytes = await run_cached(
+            GifService.video_to_gif,
             video_bytes=contents,
             fps=request.fps,
             quality=request.quality,
             width=request.width,
             height=request.height,
             start_time=request.start_time,
-            duration=request.duration
+            duration=request.duration,
+            output_format=output_format
         )
 
         # 准备上传参数
@@ -285,6 +318,7 @@ async def video_to_gif_by_url(
             "height": request.height,
             "start_time": request.start_time,
             "duration": request.duration,
+            "output_format": output_format,
             "source_url": request.video_url
         }
 
@@ -295,7 +329,7 @@ async def video_to_gif_by_url(
             operation_type="video_to_gif",
             parameters=parameters,
             original_filename=None,
-            content_type="image/gif"
+            content_type=CONTENT_TYPES[output_format]
         )
 
         if not upload_response:
@@ -324,11 +358,13 @@ async def create_gif_from_images(
     loop: Optional[int] = Form(0, description="循环次数(0为无限循环)"),
     quality: Optional[int] = Form(90, description="输出质量"),
     optimize: Optional[bool] = Form(True, description="是否优化"),
+    output_format: Optional[str] = Form("gif", description="输出格式(gif/webp/mp4)"),
     api_token: str = Depends(get_current_api_token)
 ):
     """
-    将多张图片合成为GIF动画并上传到AIGC网盘
+    将多张图片合成为GIF动画（或动画WebP、MP4）并上传到AIGC网盘
     """
+    output_format = validate_output_format(output_format)
     try:
         if len(files) < 2:
             raise HTTPException(status_code=400, detail="至少需要2张图片才能创建GIF")
@@ -341,11 +377,14 @@ async def create_gif_from_images(
             images.append(image)
         
         # 创建GIF
-        result_bytes = GifService.images_to_gif(
+        result_bytes = await run_compute(
+            GifService.images_to_gif,
             images=images,
             duration=duration,
             loop=loop,
-            optimize=optimize
+            optimize=optimize,
+            output_format=output_format,
+            quality=quality
         )
         
         # 准备上传参数
@@ -354,6 +393,7 @@ async def create_gif_from_images(
             "loop": loop,
             "quality": quality,
             "optimize": optimize,
+            "output_format": output_format,
             "frame_count": len(images)
         }
         
@@ -363,8 +403,8 @@ async def create_gif_from_images(
             api_token=api_token,
             operation_type="create_gif",
             parameters=parameters,
-            original_filename=f"created_gif_{len(images)}_frames.gif",
-            content_type="image/gif"
+            original_filename=output_filename(f"created_gif_{len(images)}_frames", output_format),
+            content_type=CONTENT_TYPES[output_format]
         )
         
         if not upload_response:
@@ -394,23 +434,24 @@ async def create_gif_from_urls(
     """
     从URL图片列表创建GIF动画并上传到AIGC网盘
     """
+    output_format = validate_output_format(request.output_format)
     try:
         if len(request.image_urls) < 2:
             raise HTTPException(status_code=400, detail="至少需要2张图片才能创建GIF")
         
-        # 下载所有图片
-        images = []
-        for url in request.image_urls:
-            contents, _ = ImageUtils.download_image_from_url(url)
-            image = ImageUtils.bytes_to_image(contents)
-            images.append(image)
+        # 并发下载所有图片（保持输入顺序）
+        downloaded = await ImageUtils.download_images_from_urls(request.image_urls)
+        images = [image for image, _ in downloaded]
         
         # 创建GIF
-        result_bytes = GifService.images_to_gif(
+        result_bytes = await run_compute(
+            GifService.images_to_gif,
             images=images,
             duration=request.duration,
             loop=request.loop,
-            optimize=request.optimize
+            optimize=request.optimize,
+            output_format=output_format,
+            quality=request.quality
         )
         
         # 准备上传参数
@@ -419,6 +460,7 @@ async def create_gif_from_urls(
             "loop": request.loop,
             "quality": request.quality,
             "optimize": request.optimize,
+            "output_format": output_format,
             "frame_count": len(images),
             "source_urls": request.image_urls
         }
@@ -429,8 +471,8 @@ async def create_gif_from_urls(
             api_token=api_token,
             operation_type="create_gif",
             parameters=parameters,
-            original_filename=f"created_gif_{len(images)}_frames.gif",
-            content_type="image/gif"
+            original_filename=output_filename(f"created_gif_{len(images)}_frames", output_format),
+            content_type=CONTENT_TYPES[output_format]
         )
         
         if not upload_response:
@@ -468,31 +510,24 @@ async def extract_gif_frames(
     try:
         contents = await file.read()
         
-        # 提取GIF帧
-        frames = GifService.gif_to_images(contents)
-        
-        if not frames:
-            raise HTTPException(status_code=400, detail="GIF文件中没有找到有效帧")
-        
-        # 应用帧范围和步长
-        total_frames = len(frames)
+        # 逐帧解码并只编码选中的帧（按帧范围和步长）
+        encoded_frames, total_frames = await run_compute(
+            GifService.extract_frames, contents, output_format, quality, start_frame, end_frame, step
+        )
         end_frame = end_frame if end_frame is not None else total_frames
         end_frame = min(end_frame, total_frames)
         
-        selected_frames = frames[start_frame:end_frame:step]
-        
-        if not selected_frames:
+        if not encoded_frames:
             raise HTTPException(status_code=400, detail="根据指定参数没有提取到任何帧")
         
-        # 转换帧为字节数据
-        frame_files = []
-        for i, frame in enumerate(selected_frames):
-            frame_bytes = ImageUtils.image_to_bytes(frame, format=output_format, quality=quality)
-            frame_files.append({
+        frame_files = [
+            {
                 "data": frame_bytes,
-                "filename": f"frame_{start_frame + i * step:04d}.{output_format.lower()}",
+                "filename": f"frame_{index:04d}.{output_format.lower()}",
                 "content_type": f"image/{output_format.lower()}"
-            })
+            }
+            for index, frame_bytes in encoded_frames
+        ]
         
         # 准备上传参数
         parameters = {
@@ -502,7 +537,7 @@ async def extract_gif_frames(
             "end_frame": end_frame,
             "step": step,
             "total_frames": total_frames,
-            "extracted_frames": len(selected_frames)
+            "extracted_frames": len(encoded_frames)
         }
         
         # 批量上传帧图片
@@ -546,33 +581,27 @@ async def extract_gif_frames_by_url(
     """
     try:
         # 下载GIF文件
-        contents, _ = ImageUtils.download_image_from_url(request.gif_url)
+        contents, _ = await ImageUtils.download_image_from_url(request.gif_url)
         
-        # 提取GIF帧
-        frames = GifService.gif_to_images(contents)
-        
-        if not frames:
-            raise HTTPException(status_code=400, detail="GIF文件中没有找到有效帧")
-        
-        # 应用帧范围和步长
-        total_frames = len(frames)
+        # 逐帧解码并只编码选中的帧（按帧范围和步长）
+        encoded_frames, total_frames = await run_compute(
+            GifService.extract_frames, contents, request.output_format, request.quality,
+            request.start_frame, request.end_frame, request.step
+        )
         end_frame = request.end_frame if request.end_frame is not None else total_frames
         end_frame = min(end_frame, total_frames)
         
-        selected_frames = frames[request.start_frame:end_frame:request.step]
-        
-        if not selected_frames:
+        if not encoded_frames:
             raise HTTPException(status_code=400, detail="根据指定参数没有提取到任何帧")
         
-        # 转换帧为字节数据
-        frame_files = []
-        for i, frame in enumerate(selected_frames):
-            frame_bytes = ImageUtils.image_to_bytes(frame, format=request.output_format, quality=request.quality)
-            frame_files.append({
+        frame_files = [
+            {
                 "data": frame_bytes,
-                "filename": f"frame_{request.start_frame + i * request.step:04d}.{request.output_format.lower()}",
+                "filename": f"frame_{index:04d}.{request.output_format.lower()}",
                 "content_type": f"image/{request.output_format.lower()}"
-            })
+            }
+            for index, frame_bytes in encoded_frames
+        ]
         
         # 准备上传参数
         parameters = {
@@ -582,7 +611,7 @@ async def extract_gif_frames_by_url(
             "end_frame": end_frame,
             "step": request.step,
             "total_frames": total_frames,
-            "extracted_frames": len(selected_frames),
+            "extracted_frames": len(encoded_frames),
             "source_url": request.gif_url
         }
         
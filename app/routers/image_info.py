@@ -5,6 +5,7 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Body, Depends
 from ..services.image_info_service import ImageInfoService
 from ..services.billing_service import billing_service
 from ..utils.image_utils import ImageUtils
+from ..utils.compute_executor import run_compute
 from ..schemas.response_models import ErrorResponse, ApiResponse
 from ..schemas.user_models import User
 from ..middleware.auth_middleware import get_current_user, get_current_api_token
@@ -57,7 +58,7 @@ async def get_image_info(
         image = Image.open(io.BytesIO(contents))
 
         # 获取图片信息
-        image_info = ImageInfoService.get_image_info(image, contents)
+        image_info = await run_compute(ImageInfoService.get_image_info, image, contents)
 
         # 计算费用
         estimated_tokens = BASE_COST
@@ -147,7 +148,7 @@ async def get_image_info_by_url(
                 raise HTTPException(status_code=404, detail=f"本地文件不存在: {file_path}")
         else:
             # 完整URL，下载图片
-            contents, _ = ImageUtils.download_image_from_url(request.image_url)
+            contents, _ = await ImageUtils.download_image_from_url(request.image_url)
 
         original_size = len(contents)
 
@@ -155,7 +156,7 @@ async def get_image_info_by_url(
         image = Image.open(io.BytesIO(contents))
 
         # 获取图片信息
-        image_info = ImageInfoService.get_image_info(image, contents)
+        image_info = await run_compute(ImageInfoService.get_image_info, image, contents)
 
         # 计算费用
         estimated_tokens = BASE_COST
@@ -7,6 +7,7 @@ from typing import Optional
 from ..services.mask_service import MaskService
 from ..services.file_upload_service import file_upload_service
 from ..utils.image_utils import ImageUtils
+from ..services.result_cache import run_cached
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..middleware.auth_middleware import get_current_api_token
 from pydantic import BaseModel
@@ -43,7 +44,8 @@ async def apply_mask(
 
     try:
         contents = await file.read()
-        result_bytes = MaskService.apply_mask(
+        result_bytes = await run_cached(
+            MaskService.apply_mask,
             image_bytes=contents,
             mask_type=mask_type,
             feather=feather,
@@ -103,8 +105,9 @@ async def apply_mask_by_url(
     为URL图片应用遮罩效果并上传到AIGC网盘
     """
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result_bytes = MaskService.apply_mask(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result_bytes = await run_cached(
+            MaskService.apply_mask,
             image_bytes=contents,
             mask_type=request.mask_type,
             feather=request.feather,
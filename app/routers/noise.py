@@ -5,6 +5,7 @@ from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.image_utils import ImageUtils
 from ..utils.billing_utils import calculate_upload_only_billing, calculate_url_download_billing
+from ..utils.compute_executor import run_compute
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..schemas.user_models import User
 from ..middleware.auth_middleware import get_current_user, get_current_api_token
@@ -42,7 +43,8 @@ async def reduce_noise(
         contents = await file.read()
         original_size = len(contents)
 
-        result_bytes = NoiseService.add_noise(
+        result_bytes = await run_compute(
+            NoiseService.add_noise,
             image_bytes=contents,
             noise_type=noise_type,
             intensity=intensity,
@@ -145,10 +147,11 @@ async def reduce_noise_by_url(
     call_id = None
 
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
         download_size = len(contents)
         
-        result_bytes = NoiseService.add_noise(
+        result_bytes = await run_compute(
+            NoiseService.add_noise,
             image_bytes=contents,
             noise_type=request.noise_type,
             intensity=request.intensity,
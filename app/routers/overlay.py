@@ -10,6 +10,8 @@ from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.image_utils import ImageUtils
 from ..utils.billing_utils import calculate_upload_only_billing, calculate_url_download_billing, calculate_dual_upload_billing, generate_operation_remark
+from ..utils.compute_executor import run_compute
+from ..services.result_cache import run_cached
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..middleware.auth_middleware import get_current_api_token
 from pydantic import BaseModel
@@ -66,7 +68,8 @@ async def add_overlay(
 
     try:
         contents = await file.read()
-        result_bytes = OverlayService.add_overlay(
+        result_bytes = await run_cached(
+            OverlayService.add_overlay,
             image_bytes=contents,
             overlay_type=overlay_type,
             opacity=opacity,
@@ -125,7 +128,7 @@ async def add_overlay_by_url(
         if image_url.startswith('/examples/'):
             image_url = f"http://localhost:58889{image_url}"
 
-        contents, content_type = ImageUtils.download_image_from_url(image_url)
+        contents, content_type = await ImageUtils.download_image_from_url(image_url)
 
         # 准备参数
         kwargs = {}
@@ -158,7 +161,8 @@ async def add_overlay_by_url(
                 'border_style': request.border_style
             })
 
-        result_bytes = OverlayService.add_overlay(
+        result_bytes = await run_cached(
+            OverlayService.add_overlay,
             image_bytes=contents,
             overlay_type=request.overlay_type,
             quality=request.quality,
@@ -218,7 +222,8 @@ async def add_logo(
     try:
         base_img = await ImageService.load_image(base_image)
         logo_img = await ImageService.load_image(logo_image)
-        result = OverlayService.add_logo(
+        result = await run_compute(
+            OverlayService.add_logo,
             base_img, logo_img, position, opacity, size_ratio, padding
         )
 
@@ -275,13 +280,14 @@ async def add_logo_by_url(
 ):
     """通过URL添加Logo叠加并上传到AIGC网盘"""
     try:
-        base_contents, _ = ImageUtils.download_image_from_url(request.base_image_url)
-        logo_contents, _ = ImageUtils.download_image_from_url(request.logo_image_url)
+        base_contents, _ = await ImageUtils.download_image_from_url(request.base_image_url)
+        logo_contents, _ = await ImageUtils.download_image_from_url(request.logo_image_url)
 
         base_img = Image.open(io.BytesIO(base_contents))
         logo_img = Image.open(io.BytesIO(logo_contents))
 
-        result = OverlayService.add_logo(
+        result = await run_compute(
+            OverlayService.add_logo,
             base_img, logo_img,
             request.position,
             request.opacity,
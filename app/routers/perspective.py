@@ -5,6 +5,7 @@ from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.billing_utils import calculate_upload_only_billing, calculate_url_download_billing, generate_operation_remark
 from ..utils.image_utils import ImageUtils
+from ..services.result_cache import run_cached
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..middleware.auth_middleware import get_current_api_token
 from typing import Optional
@@ -39,7 +40,8 @@ async def correct_perspective(
         contents = await file.read()
         file_size = len(contents)
         
-        result_bytes = PerspectiveService.process_perspective(
+        result_bytes = await run_cached(
+            PerspectiveService.process_perspective,
             image_bytes=contents,
             points=points,
             auto_document=auto_document,
@@ -144,7 +146,7 @@ async def correct_perspective_by_url(
                 raise HTTPException(status_code=404, detail=f"本地文件不存在: {file_path}")
         else:
             # 完整URL，下载图片
-            contents, content_type = ImageUtils.download_image_from_url(request.image_url)
+            contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
 
         download_size = len(contents)
         
@@ -152,7 +154,8 @@ async def correct_perspective_by_url(
         billing_info = calculate_url_download_billing(download_size)
         estimated_tokens = billing_info["total_cost"]
 
-        result_bytes = PerspectiveService.process_perspective(
+        result_bytes = await run_cached(
+            PerspectiveService.process_perspective,
             image_bytes=contents,
             points=request.points,
             auto_document=request.auto_document,
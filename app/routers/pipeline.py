@@ -0,0 +1,296 @@
+import json
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body, Depends
+from ..services.pipeline_service import PipelineService
+from ..services.file_upload_service import file_upload_service
+from ..services.billing_service import billing_service
+from ..utils.image_utils import ImageUtils
+from ..utils.billing_utils import calculate_upload_only_billing, calculate_url_download_billing, generate_operation_remark
+from ..utils.compute_executor import run_compute
+from ..utils.url_fetcher import sniff_content_type
+from ..services.result_cache import run_cached
+from ..schemas.response_models import ErrorResponse, FileInfo, ApiResponse
+from ..schemas.user_models import User
+from ..middleware.auth_middleware import get_current_user, get_current_api_token
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class PipelineOperation(BaseModel):
+    """处理管道中的单个操作"""
+    op: str = Field(..., description="操作名称: resize / crop / crop_circle / crop_smart_center / rotate / flip / transform / filter / watermark")
+    params: Dict[str, Any] = Field(default_factory=dict, description="操作参数，与对应服务方法的参数一致")
+
+
+class PipelineByUrlRequest(BaseModel):
+    """处理管道URL请求模型"""
+    image_url: str
+    operations: List[PipelineOperation]
+    output_format: Optional[str] = "auto"
+    quality: Optional[int] = 90
+
+
+router = APIRouter(
+    tags=["pipeline"],
+    responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+)
+
+
+def _parse_operations(operations: str) -> List[Dict[str, Any]]:
+    """解析表单中JSON格式的操作列表"""
+    try:
+        items = json.loads(operations)
+        if not isinstance(items, list):
+            raise ValueError("operations必须是JSON数组")
+        return [PipelineOperation(**item).dict() for item in items]
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"操作列表格式错误: {str(e)}")
+
+
+def _validate_operations(operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """校验操作列表并返回参数已按类型转换的列表，无效时返回400"""
+    try:
+        return PipelineService.validate_operations(operations)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _run_pipeline(
+    contents: bytes,
+    operations: List[Dict[str, Any]],
+    output_format: str,
+    quality: int
+) -> bytes:
+    """执行管道，结果可复现时使用结果缓存"""
+    runner = run_cached if PipelineService.is_deterministic(operations) else run_compute
+    return await runner(
+        PipelineService.run_pipeline,
+        image_bytes=contents,
+        operations=operations,
+        output_format=output_format,
+        quality=quality,
+    )
+
+
+@router.get("/api/v1/pipeline/operations")
+async def list_pipeline_operations():
+    """
+    列出处理管道支持的操作及其参数
+    """
+    return ApiResponse.success(
+        message="获取管道操作列表成功",
+        data={
+            "operations": {op: PipelineService._get_params(op) for op in PipelineService.OPERATIONS},
+            "output_formats": ["auto", *PipelineService.OUTPUT_FORMATS]
+        }
+    )
+
+
+@router.post("/api/v1/pipeline")
+async def run_pipeline(
+    file: UploadFile = File(...),
+    operations: str = Form(..., description='JSON数组，如 [{"op": "resize", "params": {"width": 800}}, {"op": "filter", "params": {"filter_type": "sepia"}}]'),
+    output_format: Optional[str] = Form("auto"),
+    quality: Optional[int] = Form(90),
+    current_user: User = Depends(get_current_user),
+    api_token: str = Depends(get_current_api_token)
+):
+    """
+    对上传图片依次执行多个操作，只解码、编码、扣费和上传一次
+    需要认证访问，按照基础费用100Token + 上传费用50Token/MB计费
+    """
+    api_path = "/api/v1/pipeline"
+    call_id = None
+
+    try:
+        if not file.content_type or not file.content_type.startswith("image/"):
+            raise HTTPException(status_code=400, detail="上传的文件不是图片格式")
+
+        operation_list = _parse_operations(operations)
+        operation_list = _validate_operations(operation_list)
+        steps = [operation["op"] for operation in operation_list]
+
+        # 读取上传的文件
+        contents = await file.read()
+        original_size = len(contents)
+
+        # 处理图片
+        result_bytes = await _run_pipeline(contents, operation_list, output_format, quality)
+        result_size = len(result_bytes)
+
+        # 计算预估费用
+        billing_info = calculate_upload_only_billing(primary_file_size=original_size, result_size=result_size)
+        estimated_tokens = billing_info["total_cost"]
+
+        # 准备请求上下文
+        context = {
+            "steps": steps,
+            "operations": operation_list,
+            "output_format": output_format,
+            "quality": quality,
+            "original_filename": file.filename,
+            "original_size": original_size,
+            "result_size": result_size,
+            "billing_breakdown": billing_info["breakdown"]
+        }
+
+        # 预扣费
+        call_id = await billing_service.pre_charge(
+            api_token=api_token,
+            api_path=api_path,
+            context=context,
+            estimated_tokens=estimated_tokens,
+            remark=f"处理管道({' -> '.join(steps)}) - {file.filename}"
+        )
+
+        if not call_id:
+            raise HTTPException(
+                status_code=402,
+                detail="余额不足或预扣费失败，请检查账户余额"
+            )
+
+        # 上传到网盘
+        upload_response = await file_upload_service.upload_processed_image(
+            image_bytes=result_bytes,
+            api_token=api_token,
+            operation_type="pipeline",
+            parameters=context,
+            original_filename=file.filename,
+            content_type=sniff_content_type(result_bytes[:32]) or file.content_type
+        )
+
+        if not upload_response:
+            raise HTTPException(status_code=500, detail="文件上传到网盘失败")
+
+        # 构造响应
+        file_info = FileInfo(**upload_response["file"])
+
+        return ApiResponse.success(
+            message="处理管道执行并上传成功",
+            data={
+                "file_info": file_info.dict(),
+                "processing_info": {
+                    **context,
+                    "billing_info": billing_info,
+                    "call_id": call_id,
+                    "tokens_consumed": estimated_tokens
+                }
+            }
+        )
+
+    except HTTPException:
+        # HTTP异常直接抛出，但需要退费
+        if call_id:
+            await billing_service.refund_all(call_id, "HTTP异常，退还费用")
+        raise
+    except Exception as e:
+        # 业务逻辑执行失败，返还Token
+        if call_id:
+            await billing_service.refund_all(call_id, f"处理管道执行失败: {str(e)}")
+        return ApiResponse.error(
+            message=f"处理管道执行失败: {str(e)}",
+            code=500
+        )
+
+
+@router.post("/api/v1/pipeline-by-url")
+async def run_pipeline_by_url(
+    request: PipelineByUrlRequest = Body(..., description="处理管道URL请求参数"),
+    current_user: User = Depends(get_current_user),
+    api_token: str = Depends(get_current_api_token)
+):
+    """
+    对URL图片依次执行多个操作并上传到AIGC网盘
+    """
+    api_path = "/api/v1/pipeline-by-url"
+    call_id = None
+
+    try:
+        operation_list = [operation.dict() for operation in request.operations]
+        operation_list = _validate_operations(operation_list)
+        steps = [operation["op"] for operation in operation_list]
+
+        # 下载图片
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        original_size = len(contents)
+
+        # 处理图片
+        result_bytes = await _run_pipeline(contents, operation_list, request.output_format, request.quality)
+        result_size = len(result_bytes)
+
+        # 计算预估费用
+        billing_info = calculate_url_download_billing(original_size, result_size)
+        estimated_tokens = billing_info["total_cost"]
+
+        # 准备请求上下文
+        context = {
+            "steps": steps,
+            "operations": operation_list,
+            "output_format": request.output_format,
+            "quality": request.quality,
+            "source_url": request.image_url,
+            "original_size": original_size,
+            "result_size": result_size,
+            "billing_breakdown": billing_info["breakdown"]
+        }
+
+        # 生成详细备注
+        remark = generate_operation_remark(
+            api_path, f"处理管道({' -> '.join(steps)})", billing_info,
+            图片URL=request.image_url[:50] + "..." if len(request.image_url) > 50 else request.image_url
+        )
+
+        # 预扣费
+        call_id = await billing_service.pre_charge(
+            api_token=api_token,
+            api_path=api_path,
+            context=context,
+            estimated_tokens=estimated_tokens,
+            remark=remark
+        )
+
+        if not call_id:
+            raise HTTPException(
+                status_code=402,
+                detail="余额不足或预扣费失败，请检查账户余额"
+            )
+
+        # 上传到网盘
+        upload_response = await file_upload_service.upload_processed_image(
+            image_bytes=result_bytes,
+            api_token=api_token,
+            operation_type="pipeline",
+            parameters=context,
+            original_filename=None,
+            content_type=sniff_content_type(result_bytes[:32]) or content_type or "image/jpeg"
+        )
+
+        if not upload_response:
+            raise HTTPException(status_code=500, detail="文件上传到网盘失败")
+
+        # 构造响应
+        file_info = FileInfo(**upload_response["file"])
+
+        return ApiResponse.success(
+            message="处理管道执行并上传成功",
+            data={
+                "file_info": file_info.dict(),
+                "processing_info": {
+                    **context,
+                    "billing_info": billing_info,
+                    "call_id": call_id,
+                    "tokens_consumed": estimated_tokens
+                }
+            }
+        )
+
+    except HTTPException:
+        if call_id:
+            await billing_service.refund_all(call_id, "HTTP异常，退还费用")
+        raise
+    except Exception as e:
+        if call_id:
+            await billing_service.refund_all(call_id, f"处理管道执行失败: {str(e)}")
+        return ApiResponse.error(
+            message=f"处理管道执行失败: {str(e)}",
+            code=500
+        )
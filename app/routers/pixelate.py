@@ -5,6 +5,7 @@ from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.image_utils import ImageUtils
 from ..utils.billing_utils import calculate_upload_only_billing, generate_operation_remark
+from ..services.result_cache import run_cached
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..middleware.auth_middleware import get_current_api_token
 from typing import Optional
@@ -78,14 +79,16 @@ async def pixelate_image(
         if region:
             # 如果指定了区域，使用区域像素化
             # 这里简化处理，实际应该解析region参数
-            result_bytes = PixelateService.pixelate_full(
+            result_bytes = await run_cached(
+                PixelateService.pixelate_full,
                 image_bytes=contents,
                 pixel_size=block_size,
                 quality=quality,
             )
         else:
             # 全图像素化
-            result_bytes = PixelateService.pixelate_full(
+            result_bytes = await run_cached(
+                PixelateService.pixelate_full,
                 image_bytes=contents,
                 pixel_size=block_size,
                 quality=quality,
@@ -145,7 +148,7 @@ async def pixelate_image_by_url(
     """
     call_id = None
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
         
         # 计算预估费用
         from ..utils.billing_utils import calculate_url_download_billing
@@ -187,14 +190,16 @@ async def pixelate_image_by_url(
         # 根据region参数选择处理方法
         if request.region:
             # 如果指定了区域，使用区域像素化
-            result_bytes = PixelateService.pixelate_full(
+            result_bytes = await run_cached(
+                PixelateService.pixelate_full,
                 image_bytes=contents,
                 pixel_size=request.block_size,
                 quality=request.quality,
             )
         else:
             # 全图像素化
-            result_bytes = PixelateService.pixelate_full(
+            result_bytes = await run_cached(
+                PixelateService.pixelate_full,
                 image_bytes=contents,
                 pixel_size=request.block_size,
                 quality=request.quality,
@@ -6,6 +6,7 @@ from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.image_utils import ImageUtils
 from ..utils.billing_utils import calculate_resize_billing
+from ..services.result_cache import run_cached
 from ..schemas.response_models import ErrorResponse, ImageProcessResponse, FileInfo, ApiResponse
 from ..schemas.user_models import User
 from ..middleware.auth_middleware import get_current_user, get_current_api_token
@@ -51,7 +52,8 @@ async def resize_image(
         original_size = len(contents)
 
         # 处理图片
-        result_bytes = ResizeService.resize_image(
+        result_bytes = await run_cached(
+            ResizeService.resize_image,
             image_bytes=contents,
             width=width,
             height=height,
@@ -161,7 +163,7 @@ async def resize_image_by_url(
                 raise HTTPException(status_code=404, detail=f"本地文件不存在: {file_path}")
         else:
             # 完整URL，下载图片
-            contents, _ = ImageUtils.download_image_from_url(request.image_url)
+            contents, _ = await ImageUtils.download_image_from_url(request.image_url)
 
         # 计算预估费用
         billing_info = calculate_url_download_billing(len(contents))
@@ -200,7 +202,8 @@ async def resize_image_by_url(
             )
 
         # 处理图片
-        result_bytes = ResizeService.resize_image(
+        result_bytes = await run_cached(
+            ResizeService.resize_image,
             image_bytes=contents,
             width=request.width,
             height=request.height,
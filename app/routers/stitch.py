@@ -5,6 +5,7 @@ from ..services.file_upload_service import file_upload_service
 from ..services.billing_service import billing_service
 from ..utils.image_utils import ImageUtils
 from ..utils.billing_utils import calculate_upload_only_billing, calculate_url_download_billing, generate_operation_remark
+from ..utils.compute_executor import run_compute
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..middleware.auth_middleware import get_current_api_token
 from typing import Optional, List
@@ -15,6 +16,7 @@ class StitchByUrlRequest(BaseModel):
     image_urls: List[str]
     direction: str
     spacing: Optional[int] = 0
+    resize_mode: Optional[str] = "none"
     quality: Optional[int] = 90
 
 router = APIRouter(
@@ -27,6 +29,7 @@ async def stitch_images(
     files: List[UploadFile] = File(...),
     direction: str = Form(...),
     spacing: Optional[int] = Form(0),
+    resize_mode: Optional[str] = Form("none"),
     quality: Optional[int] = Form(90),
     api_token: str = Depends(get_current_api_token)
 ):
@@ -45,34 +48,27 @@ async def stitch_images(
             filenames.append(file.filename)
             total_size += len(content)
 
-        # 将字节数据转换为PIL Image对象
-        images = []
-        for content in contents:
-            image = ImageUtils.bytes_to_image(content)
-            images.append(image)
-        
-        result_image = StitchService.stitch_images(
-            images=images,
+        # 按目标尺寸缩小加载并拼接，结果为JPEG字节数据
+        result_bytes = await run_compute(
+            StitchService.stitch_image_bytes,
+            images_bytes=contents,
             direction=direction,
             spacing=spacing,
+            resize_mode=resize_mode,
             quality=quality,
         )
-        
-        # 将结果转换为字节
-        result_bytes = ImageUtils.image_to_bytes(result_image, format="JPEG", quality=quality)
         result_size = len(result_bytes)
 
         # 计算预估费用（多文件上传，按结果大小计费）
         # 使用第一张图片大小作为主文件大小
-        first_image_size = len(await images[0].read())
-        await images[0].seek(0)  # 重置文件指针
-        billing_info = calculate_upload_only_billing(primary_file_size=first_image_size, result_size=result_size)
+        billing_info = calculate_upload_only_billing(primary_file_size=len(contents[0]), result_size=result_size)
         estimated_tokens = billing_info["total_cost"]
 
         # 准备上传参数
         parameters = {
             "direction": direction,
             "spacing": spacing,
+            "resize_mode": resize_mode,
             "quality": quality,
             "image_count": len(files),
             "filenames": filenames,
@@ -151,22 +147,20 @@ async def stitch_images_by_url(
     call_id = None
     try:
         # 下载并转换图片
-        images = []
-        total_download_size = 0
-        for url in request.image_urls:
-            content, _ = ImageUtils.download_image_from_url(url)
-            total_download_size += len(content)
-            image = ImageUtils.bytes_to_image(content)
-            images.append(image)
+        downloaded = await ImageUtils.download_images_from_urls(request.image_urls)
+        images = [image for image, _ in downloaded]
+        total_download_size = sum(size for _, size in downloaded)
 
         # 计算预估费用
         billing_info = calculate_url_download_billing(total_download_size)
         estimated_tokens = billing_info["total_cost"]
 
-        result_image = StitchService.stitch_images(
+        result_image = await run_compute(
+            StitchService.stitch_images,
             images=images,
             direction=request.direction,
             spacing=request.spacing,
+            resize_mode=request.resize_mode,
             quality=request.quality,
         )
         
@@ -177,6 +171,7 @@ async def stitch_images_by_url(
         parameters = {
             "direction": request.direction,
             "spacing": request.spacing,
+            "resize_mode": request.resize_mode,
             "quality": request.quality,
             "image_count": len(request.image_urls),
             "image_urls": request.image_urls,
@@ -7,6 +7,7 @@ import os
 from ..services.text_to_image_service import TextToImageService
 from ..services.file_upload_service import file_upload_service
 from ..utils.logger import logger
+from ..utils.fonts import font_registry, FONT_ALIASES
 from ..schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ..middleware.auth_middleware import get_current_api_token
 
@@ -262,21 +263,9 @@ async def get_background_presets():
 
 @router.get("/fonts")
 async def get_available_fonts():
-    """获取可用的字体列表"""
-    fonts = [
-        "Arial",
-        "Helvetica",
-        "Times New Roman",
-        "Georgia",
-        "Verdana",
-        "Tahoma",
-        "Trebuchet MS",
-        "Impact",
-        "Comic Sans MS",
-        "Courier New"
-    ]
-    
+    """获取可用的字体列表（启动时扫描到的已安装字体族，以及可映射到已安装字体的常用字体名）"""
     return JSONResponse({
         "status": "success",
-        "fonts": fonts
-    })
\ No newline at end of file
+        "fonts": font_registry.list_families(),
+        "aliases": [names[0] for names in FONT_ALIASES.values()]
+    })
@@ -2,6 +2,7 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body
 from typing import Optional
 from ...services.image_service import ImageService
 from ...utils.image_utils import ImageUtils
+from ...services.result_cache import run_cached
 from ...schemas.response_models import ErrorResponse, ApiResponse
 from fastapi.responses import Response
 from pydantic import BaseModel
@@ -24,7 +25,8 @@ async def flip_horizontal(
     """水平翻转图片（镜像）"""
     try:
         contents = await file.read()
-        result = ImageService.flip_horizontal(
+        result = await run_cached(
+            ImageService.flip_horizontal,
             image_bytes=contents,
             quality=quality,
         )
@@ -51,8 +53,9 @@ async def flip_horizontal_by_url(
 ):
     """水平翻转URL图片"""
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result = ImageService.flip_horizontal(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result = await run_cached(
+            ImageService.flip_horizontal,
             image_bytes=contents,
             quality=request.quality,
         )
@@ -81,7 +84,8 @@ async def flip_vertical(
     """垂直翻转图片"""
     try:
         contents = await file.read()
-        result = ImageService.flip_vertical(
+        result = await run_cached(
+            ImageService.flip_vertical,
             image_bytes=contents,
             quality=quality,
         )
@@ -108,8 +112,9 @@ async def flip_vertical_by_url(
 ):
     """垂直翻转URL图片"""
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result = ImageService.flip_vertical(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result = await run_cached(
+            ImageService.flip_vertical,
             image_bytes=contents,
             quality=request.quality,
         )
@@ -4,6 +4,7 @@ from ...services.transform_service import TransformService
 from ...services.file_upload_service import file_upload_service
 from ...services.billing_service import billing_service
 from ...utils.image_utils import ImageUtils
+from ...services.result_cache import run_cached
 from ...schemas.response_models import ErrorResponse, ApiResponse, ImageProcessResponse, FileInfo
 from ...schemas.user_models import User
 from ...middleware.auth_middleware import get_current_user, get_current_api_token
@@ -50,7 +51,8 @@ async def transform_image(
             estimated_cost=10
         )
         contents = await file.read()
-        result_bytes = TransformService.transform_image(
+        result_bytes = await run_cached(
+            TransformService.transform_image,
             image_bytes=contents,
             transform_type=transform_type,
             angle=angle,
@@ -141,9 +143,10 @@ async def transform_image_by_url(
                 raise HTTPException(status_code=404, detail=f"本地文件不存在: {file_path}")
         else:
             # 完整URL，下载图片
-            contents, content_type = ImageUtils.download_image_from_url(request.image_url)
+            contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
 
-        result_bytes = TransformService.transform_image(
+        result_bytes = await run_cached(
+            TransformService.transform_image,
             image_bytes=contents,
             transform_type=request.transform_type,
             angle=request.angle,
@@ -2,6 +2,7 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body
 from typing import Optional
 from ...services.transform_service import TransformService
 from ...utils.image_utils import ImageUtils
+from ...services.result_cache import run_cached
 from ...schemas.response_models import ErrorResponse, ApiResponse
 from fastapi.responses import Response
 from pydantic import BaseModel
@@ -28,7 +29,8 @@ async def rotate_image(
     """旋转图片"""
     try:
         contents = await file.read()
-        result = TransformService.rotate_image(
+        result = await run_cached(
+            TransformService.rotate_image,
             image_bytes=contents,
             angle=angle,
             expand=expand,
@@ -57,8 +59,9 @@ async def rotate_image_by_url(
 ):
     """旋转URL图片"""
     try:
-        contents, content_type = ImageUtils.download_image_from_url(request.image_url)
-        result = TransformService.rotate_image(
+        contents, content_type = await ImageUtils.download_image_from_url(request.image_url)
+        result = await run_cached(
+            TransformService.rotate_image,
             image_bytes=contents,
             angle=request.angle,
             expand=request.expand,
@@ -9,6 +9,7 @@ from app.utils.billing_utils import (
     calculate_dual_upload_billing, calculate_mixed_mode_billing,
     generate_operation_remark
 )
+from app.utils.compute_executor import run_compute
 from app.schemas.response_models import ErrorResponse, ImageProcessResponse, FileInfo, ApiResponse
 from app.schemas.user_models import User
 from app.middleware.auth_middleware import get_current_user, get_current_api_token
@@ -98,7 +99,8 @@ async def add_image_watermark(
         watermark_image = Image.open(io.BytesIO(watermark_content))
 
         # 调用LogoWatermarkService处理图片水印
-        result_image = LogoWatermarkService.add_image_watermark(
+        result_image = await run_compute(
+            LogoWatermarkService.add_image_watermark,
             base_image,
             watermark_image,
             opacity=opacity,
@@ -178,8 +180,8 @@ async def add_image_watermark_by_url(
     call_id = None
     try:
         # 下载主图片和水印图片
-        image_content = ImageUtils.download_image_from_url(request.image_url)
-        watermark_content = ImageUtils.download_image_from_url(request.watermark_image_url)
+        image_content, _ = await ImageUtils.download_image_from_url(request.image_url)
+        watermark_content, _ = await ImageUtils.download_image_from_url(request.watermark_image_url)
         
         # 验证图片大小
         if not ImageUtils.is_valid_image_size(image_content):
@@ -226,7 +228,8 @@ async def add_image_watermark_by_url(
             )
         
         # 处理图片水印
-        result_bytes = WatermarkService.add_image_watermark(
+        result_bytes = await run_compute(
+            WatermarkService.add_image_watermark,
             image_content,
             watermark_content,
             request.position,
@@ -12,6 +12,7 @@ from app.schemas.response_models import ErrorResponse, ImageProcessResponse, Fil
 from app.schemas.user_models import User
 from app.middleware.auth_middleware import get_current_user, get_current_api_token
 from app.utils.logger import logger
+from app.utils.compute_executor import run_compute
 from .models import WatermarkByUrlRequest
 from typing import Optional
 
@@ -102,8 +103,10 @@ async def add_watermark(
                 detail="余额不足或预扣费失败，请检查账户余额"
             )
 
-        # 处理水印
-        result_bytes = WatermarkService.add_watermark(
+        # 处理水印（动图逐帧并行处理，输出GIF）
+        animated = ImageUtils.is_animated(image_content)
+        result_bytes = await run_compute(
+            WatermarkService.add_watermark_animated if animated else WatermarkService.add_watermark,
             image_content,
             watermark_text,
             position,
@@ -150,7 +153,7 @@ async def add_watermark(
             operation_type="watermark",
             parameters=parameters,
             original_filename=image.filename,
-            content_type=image.content_type or "image/jpeg"
+            content_type="image/gif" if animated else (image.content_type or "image/jpeg")
         )
 
         if not upload_response:
@@ -204,7 +207,7 @@ async def add_watermark_by_url(
     call_id = None
     try:
         # 下载图片
-        image_content, content_type = ImageUtils.download_image_from_url(request.image_url)
+        image_content, content_type = await ImageUtils.download_image_from_url(request.image_url)
         
         # 验证图片大小 (临时禁用)
         # if not ImageUtils.is_valid_image_size(image_content):
@@ -246,8 +249,10 @@ async def add_watermark_by_url(
                 detail="余额不足或预扣费失败，请检查账户余额"
             )
         
-        # 处理水印
-        result_bytes = WatermarkService.add_watermark(
+        # 处理水印（动图逐帧并行处理，输出GIF）
+        animated = ImageUtils.is_animated(image_content)
+        result_bytes = await run_compute(
+            WatermarkService.add_watermark_animated if animated else WatermarkService.add_watermark,
             image_content,
             request.watermark_text,
             request.position,
@@ -279,7 +284,7 @@ async def add_watermark_by_url(
                 "opacity": request.opacity
             },
             original_filename=f"watermark_{ImageUtils.get_filename_from_url(request.image_url)}",
-            content_type="image/jpeg"
+            content_type="image/gif" if animated else "image/jpeg"
         )
 
         if not upload_response:
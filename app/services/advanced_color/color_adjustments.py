@@ -7,6 +7,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from utils.logger import logger
+from utils.point_ops import apply_point_ops
 
 # 尝试导入cv2，如果失败则使用替代方案
 try:
@@ -43,24 +44,8 @@ class ColorAdjustments:
             if curve_points is None:
                 curve_points = [(0, 0), (64, 48), (128, 128), (192, 208), (255, 255)]
             
-            # 创建查找表
-            lut = []
-            for i in range(256):
-                # 线性插值计算曲线值
-                value = ColorAdjustments._interpolate_curve(i, curve_points)
-                # 应用强度
-                adjusted_value = int(i + (value - i) * intensity)
-                lut.append(max(0, min(255, adjusted_value)))
-            
-            # 应用查找表
-            if CV2_AVAILABLE:
-                img_array = np.array(img)
-                for channel in range(3):
-                    img_array[:, :, channel] = np.array(lut)[img_array[:, :, channel]]
-                result_img = Image.fromarray(img_array)
-            else:
-                # 使用PIL的point方法
-                result_img = img.point(lut * 3)
+            # 曲线编译为查找表（按控制点和强度缓存），一次遍历像素
+            result_img = apply_point_ops(img, [("curve", curve_points, intensity)])
             
             output = io.BytesIO()
             result_img.save(output, format='JPEG', quality=90)
@@ -126,24 +111,3 @@ class ColorAdjustments:
         except Exception as e:
             logger.error(f"通道混合失败: {str(e)}")
             raise
-    
-    @staticmethod
-    def _interpolate_curve(x: int, points: list) -> int:
-        """插值计算曲线值"""
-        # 找到x所在的区间
-        for i in range(len(points) - 1):
-            x1, y1 = points[i]
-            x2, y2 = points[i + 1]
-            
-            if x1 <= x <= x2:
-                # 线性插值
-                if x2 == x1:
-                    return y1
-                t = (x - x1) / (x2 - x1)
-                return int(y1 + t * (y2 - y1))
-        
-        # 超出范围的情况
-        if x < points[0][0]:
-            return points[0][1]
-        else:
-            return points[-1][1]
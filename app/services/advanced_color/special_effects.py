@@ -1,12 +1,13 @@
 """特殊效果功能"""
 import numpy as np
-from PIL import Image, ImageEnhance
+from PIL import Image
 import io
 from typing import Tuple
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from utils.logger import logger
+from utils.point_ops import apply_point_ops
 
 # 尝试导入cv2，如果失败则使用替代方案
 try:
@@ -104,17 +105,12 @@ class SpecialEffects:
             if img.mode != 'RGB':
                 img = img.convert('RGB')
             
-            # 增强对比度
-            enhancer = ImageEnhance.Contrast(img)
-            result = enhancer.enhance(1.5 * intensity)
-            
-            # 增强饱和度
-            enhancer = ImageEnhance.Color(result)
-            result = enhancer.enhance(2.0 * intensity)
-            
-            # 调整亮度
-            enhancer = ImageEnhance.Brightness(result)
-            result = enhancer.enhance(1.2 * intensity)
+            # 增强对比度 -> 增强饱和度 -> 调整亮度（合并为一次逐像素运算）
+            result = apply_point_ops(img, [
+                ("contrast", 1.5 * intensity),
+                ("color", 2.0 * intensity),
+                ("brightness", 1.2 * intensity),
+            ])
             
             if CV2_AVAILABLE:
                 # 应用色相偏移创建霓虹效果
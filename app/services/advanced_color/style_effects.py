@@ -1,12 +1,13 @@
 """风格效果功能"""
 import numpy as np
-from PIL import Image, ImageEnhance
+from PIL import Image
 import io
 from typing import Tuple
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from utils.logger import logger
+from utils.point_ops import apply_point_ops
 
 # 尝试导入cv2，如果失败则使用替代方案
 try:
@@ -82,13 +83,11 @@ class StyleEffects:
             
             result = Image.fromarray(img_array.astype(np.uint8))
             
-            # 应用对比度
-            enhancer = ImageEnhance.Contrast(result)
-            result = enhancer.enhance(1 + (config["contrast"] - 1) * intensity)
-            
-            # 应用饱和度
-            enhancer = ImageEnhance.Color(result)
-            result = enhancer.enhance(1 + (config["saturation"] - 1) * intensity)
+            # 应用对比度和饱和度（合并为一次逐像素运算）
+            result = apply_point_ops(result, [
+                ("contrast", 1 + (config["contrast"] - 1) * intensity),
+                ("color", 1 + (config["saturation"] - 1) * intensity),
+            ])
             
             output = io.BytesIO()
             result.save(output, format="JPEG", quality=90)
@@ -186,13 +185,11 @@ class StyleEffects:
             result_array = np.clip(result_array, 0, 255).astype(np.uint8)
             result = Image.fromarray(result_array)
             
-            # 应用对比度
-            enhancer = ImageEnhance.Contrast(result)
-            result = enhancer.enhance(1 + (config["contrast"] - 1) * intensity)
-            
-            # 应用饱和度
-            enhancer = ImageEnhance.Color(result)
-            result = enhancer.enhance(1 + (config["saturation"] - 1) * intensity)
+            # 应用对比度和饱和度（合并为一次逐像素运算）
+            result = apply_point_ops(result, [
+                ("contrast", 1 + (config["contrast"] - 1) * intensity),
+                ("color", 1 + (config["saturation"] - 1) * intensity),
+            ])
             
             output = io.BytesIO()
             result.save(output, format="JPEG", quality=90)
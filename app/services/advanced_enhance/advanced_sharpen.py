@@ -4,6 +4,7 @@ import numpy as np
 import cv2
 from typing import Optional
 from ...utils.logger import logger
+from ...utils.blur import gaussian_blur
 
 
 class AdvancedSharpen:
@@ -29,7 +30,7 @@ class AdvancedSharpen:
             img_array = np.array(img, dtype=np.float32)
             
             # 应用高斯模糊
-            blurred = cv2.GaussianBlur(img_array, (0, 0), radius)
+            blurred = gaussian_blur(img_array, radius)
             
             # 计算高通滤波结果
             high_pass = img_array - blurred
@@ -87,7 +88,7 @@ class AdvancedSharpen:
             adaptive_mask = np.where(edge_magnitude > threshold, intensity, 0)
             
             # 应用高通滤波
-            blurred = cv2.GaussianBlur(img_array, (0, 0), 1.0)
+            blurred = gaussian_blur(img_array, 1.0)
             high_pass = img_array - blurred
             
             # 根据边缘强度应用锐化
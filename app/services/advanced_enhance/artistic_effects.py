@@ -4,6 +4,8 @@ import numpy as np
 import cv2
 from typing import Optional
 from ...utils.logger import logger
+from ...utils.edge_preserving import smooth_edge_preserving
+from ...utils.blur import gaussian_blur
 
 
 class ArtisticEffects:
@@ -29,7 +31,7 @@ class ArtisticEffects:
             img_array = np.array(img, dtype=np.float32)
             
             # 创建发光效果
-            blurred = cv2.GaussianBlur(img_array, (radius * 2 + 1, radius * 2 + 1), radius / 3)
+            blurred = gaussian_blur(img_array, radius / 3, radius * 2 + 1)
             
             # 混合原图和模糊图
             glow_effect = img_array + intensity * blurred
@@ -68,7 +70,7 @@ class ArtisticEffects:
             
             # 应用柔化效果
             blur_radius = int(softness * 10) + 1
-            soft_img = cv2.GaussianBlur(img_array, (blur_radius, blur_radius), blur_radius / 3)
+            soft_img = gaussian_blur(img_array, blur_radius / 3, blur_radius)
             
             # 混合原图和柔化图
             dreamy = img_array * (1 - softness) + soft_img * softness
@@ -94,7 +96,8 @@ class ArtisticEffects:
     
     @staticmethod
     def apply_portrait_enhance(image_bytes: bytes, skin_smooth: float = 0.3, 
-                              eye_enhance: float = 0.5, teeth_whiten: float = 0.3) -> bytes:
+                              eye_enhance: float = 0.5, teeth_whiten: float = 0.3,
+                              smoothing: str = "auto") -> bytes:
         """
         人像增强
         
@@ -103,6 +106,7 @@ class ArtisticEffects:
             skin_smooth: 皮肤平滑程度
             eye_enhance: 眼部增强强度
             teeth_whiten: 牙齿美白强度
+            smoothing: 磨皮的保边平滑方法，auto（直径较大时用导向滤波）/ bilateral / guided
             
         Returns:
             处理后的图片字节数据
@@ -113,11 +117,11 @@ class ArtisticEffects:
             img = Image.open(io.BytesIO(image_bytes))
             img_array = np.array(img, dtype=np.float32)
             
-            # 皮肤平滑（双边滤波）
+            # 皮肤平滑（保边平滑）
             if skin_smooth > 0:
                 smooth_kernel = int(skin_smooth * 20) + 5
-                smoothed = cv2.bilateralFilter(img_array.astype('uint8'), smooth_kernel, 
-                                             skin_smooth * 100, skin_smooth * 100).astype(np.float32)
+                smoothed = smooth_edge_preserving(img_array.astype('uint8'), smooth_kernel,
+                                                  skin_smooth * 100, skin_smooth * 100, smoothing).astype(np.float32)
                 img_array = img_array * (1 - skin_smooth) + smoothed * skin_smooth
             
             # 眼部增强（增加对比度和锐化）
@@ -171,7 +175,7 @@ class ArtisticEffects:
             
             # 清晰度增强（USM锐化）
             if clarity > 0:
-                blurred = cv2.GaussianBlur(img_array, (0, 0), 1.0)
+                blurred = gaussian_blur(img_array, 1.0)
                 high_freq = img_array - blurred
                 img_array += clarity * high_freq
             
@@ -4,19 +4,21 @@ import numpy as np
 import cv2
 from typing import Optional
 from ...utils.logger import logger
+from ...utils.edge_preserving import smooth_edge_preserving
 
 
 class StructureEnhance:
     """结构增强"""
     
     @staticmethod
-    def apply_structure_enhance(image_bytes: bytes, intensity: float = 1.0) -> bytes:
+    def apply_structure_enhance(image_bytes: bytes, intensity: float = 1.0, smoothing: str = "auto") -> bytes:
         """
         结构增强
         
         Args:
             image_bytes: 输入图片字节数据
             intensity: 增强强度
+            smoothing: 保边平滑方法，auto（直径较大时用导向滤波）/ bilateral / guided
             
         Returns:
             处理后的图片字节数据
@@ -27,8 +29,8 @@ class StructureEnhance:
             img = Image.open(io.BytesIO(image_bytes))
             img_array = np.array(img, dtype=np.float32)
             
-            # 使用双边滤波保持边缘
-            bilateral = cv2.bilateralFilter(img_array.astype('uint8'), 9, 75, 75).astype(np.float32)
+            # 使用保边平滑保持边缘
+            bilateral = smooth_edge_preserving(img_array.astype('uint8'), 9, 75, 75, smoothing).astype(np.float32)
             
             # 计算结构信息
             structure = img_array - bilateral
@@ -49,9 +49,9 @@ class AdvancedEnhanceService:
     
     # 结构增强方法
     @staticmethod
-    def apply_structure_enhance(image_bytes: bytes, intensity: float = 1.0) -> bytes:
+    def apply_structure_enhance(image_bytes: bytes, intensity: float = 1.0, smoothing: str = "auto") -> bytes:
         """结构增强"""
-        return StructureEnhance.apply_structure_enhance(image_bytes, intensity)
+        return StructureEnhance.apply_structure_enhance(image_bytes, intensity, smoothing)
     
     @staticmethod
     def apply_micro_contrast(image_bytes: bytes, radius: int = 10, intensity: float = 1.0) -> bytes:
@@ -93,9 +93,10 @@ class AdvancedEnhanceService:
     
     @staticmethod
     def apply_portrait_enhance(image_bytes: bytes, skin_smooth: float = 0.3, 
-                              eye_enhance: float = 0.5, teeth_whiten: float = 0.3) -> bytes:
+                              eye_enhance: float = 0.5, teeth_whiten: float = 0.3,
+                              smoothing: str = "auto") -> bytes:
         """人像增强"""
-        return ArtisticEffects.apply_portrait_enhance(image_bytes, skin_smooth, eye_enhance, teeth_whiten)
+        return ArtisticEffects.apply_portrait_enhance(image_bytes, skin_smooth, eye_enhance, teeth_whiten, smoothing)
     
     @staticmethod
     def apply_landscape_enhance(image_bytes: bytes, clarity: float = 0.8, 
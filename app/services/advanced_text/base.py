@@ -1,7 +1,7 @@
 """高级文字服务基础工具类"""
 from PIL import ImageFont
 from typing import Tuple, Optional
-from ...utils.logger import logger
+from ...utils.fonts import font_registry
 
 
 class AdvancedTextBase:
@@ -14,46 +14,18 @@ class AdvancedTextBase:
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
     
     @staticmethod
-    def load_font(font_family: str, font_size: int) -> ImageFont.FreeTypeFont:
-        """加载字体
+    def load_font(font_family: str, font_size: int, text: Optional[str] = None) -> ImageFont.ImageFont:
+        """加载字体（通过全局字体注册表，按路径和字号缓存）
         
         Args:
             font_family: 字体系列
             font_size: 字体大小
+            text: 要绘制的文字，包含中文时自动使用中文字体
             
         Returns:
             字体对象
         """
-        # 尝试常见的字体路径
-        font_paths = {
-            "Arial": ["arial.ttf", "/System/Library/Fonts/Arial.ttf"],
-            "Helvetica": ["helvetica.ttf", "/System/Library/Fonts/Helvetica.ttf"],
-            "Times New Roman": ["times.ttf", "/System/Library/Fonts/Times.ttf"],
-            "Courier New": ["cour.ttf", "/System/Library/Fonts/Courier.ttf"],
-            "Georgia": ["georgia.ttf", "/System/Library/Fonts/Georgia.ttf"],
-            "Verdana": ["verdana.ttf", "/System/Library/Fonts/Verdana.ttf"],
-            "Impact": ["impact.ttf", "/System/Library/Fonts/Impact.ttf"],
-            "Comic Sans MS": ["comic.ttf", "/System/Library/Fonts/Comic Sans MS.ttf"]
-        }
-        
-        font = None
-        if font_family in font_paths:
-            for path in font_paths[font_family]:
-                try:
-                    font = ImageFont.truetype(path, font_size)
-                    break
-                except:
-                    continue
-        
-        # 如果找不到指定字体，尝试默认字体
-        if font is None:
-            try:
-                font = ImageFont.truetype("arial.ttf", font_size)
-            except:
-                font = ImageFont.load_default()
-                logger.warning(f"无法加载字体 {font_family}，使用默认字体")
-        
-        return font
+        return font_registry.get_font(font_family, font_size, text)
     
     @staticmethod
     def calculate_text_position(
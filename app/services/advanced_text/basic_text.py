@@ -60,7 +60,7 @@ class BasicTextService:
             width, height = img.size
             
             # 加载字体
-            font = AdvancedTextBase.load_font(font_family, font_size)
+            font = AdvancedTextBase.load_font(font_family, font_size, text)
             
             # 解析颜色
             text_color = AdvancedTextBase.hex_to_rgb(font_color)
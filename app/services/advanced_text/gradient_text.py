@@ -2,6 +2,7 @@
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 from typing import Tuple
+from ...utils import gradients
 from ...utils.logger import logger
 from .base import AdvancedTextBase
 
@@ -37,7 +38,7 @@ class GradientTextService:
             img = image.copy()
             
             # 加载字体
-            font = AdvancedTextBase.load_font("Arial", font_size)
+            font = AdvancedTextBase.load_font("Arial", font_size, text)
             
             # 创建文字图层
             text_layer = Image.new('RGBA', img.size, (0, 0, 0, 0))
@@ -48,28 +49,13 @@ class GradientTextService:
             text_width = bbox[2] - bbox[0]
             text_height = bbox[3] - bbox[1]
             
-            # 创建渐变
-            gradient = Image.new('RGBA', (text_width, text_height), (0, 0, 0, 0))
-            gradient_array = np.zeros((text_height, text_width, 4), dtype=np.uint8)
-            
-            for y in range(text_height):
-                for x in range(text_width):
-                    if gradient_direction == "horizontal":
-                        progress = x / text_width
-                    elif gradient_direction == "vertical":
-                        progress = y / text_height
-                    elif gradient_direction == "diagonal":
-                        progress = (x + y) / (text_width + text_height)
-                    else:
-                        progress = 0
-                    
-                    # 计算渐变颜色
-                    r = int(start_color[0] + (end_color[0] - start_color[0]) * progress)
-                    g = int(start_color[1] + (end_color[1] - start_color[1]) * progress)
-                    b = int(start_color[2] + (end_color[2] - start_color[2]) * progress)
-                    gradient_array[y, x] = [r, g, b, 255]
-            
-            gradient = Image.fromarray(gradient_array)
+            # 创建渐变（未知方向时使用起始颜色）
+            if gradient_direction in ("horizontal", "vertical", "diagonal"):
+                angle = gradients.DIRECTION_ANGLES[gradient_direction]
+                progress = gradients.linear((text_width, text_height), angle)
+            else:
+                progress = np.zeros((text_height, text_width), dtype=np.float32)
+            gradient = gradients.gradient_image(progress, start_color, end_color, 1.0, 1.0)
             
             # 创建文字蒙版
             mask = Image.new('L', (text_width, text_height), 0)
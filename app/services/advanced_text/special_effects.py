@@ -41,7 +41,7 @@ class SpecialEffectsTextService:
             img = image.copy()
             
             # 加载字体
-            font = AdvancedTextBase.load_font("Arial", font_size)
+            font = AdvancedTextBase.load_font("Arial", font_size, text)
             
             # 创建文字图层
             if img.mode != 'RGBA':
@@ -138,7 +138,7 @@ class SpecialEffectsTextService:
             img = image.copy()
             
             # 加载字体
-            font = AdvancedTextBase.load_font("Arial", font_size)
+            font = AdvancedTextBase.load_font("Arial", font_size, text)
             
             draw = ImageDraw.Draw(img)
             
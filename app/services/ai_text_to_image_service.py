@@ -7,6 +7,7 @@ from PIL import Image
 import io
 import base64
 from ..utils.logger import logger
+from ..utils.fonts import font_registry
 
 class AITextToImageService:
     def __init__(self):
@@ -36,7 +37,7 @@ class AITextToImageService:
     async def generate_with_dummy_service(self, prompt: str, **kwargs) -> str:
         """使用虚拟服务生成图片（用于演示）"""
         # 这是一个演示方法，创建一个带有提示词的简单图片
-        from PIL import Image, ImageDraw, ImageFont
+        from PIL import Image, ImageDraw
         
         width = kwargs.get('width', 512)
         height = kwargs.get('height', 512)
@@ -53,12 +54,6 @@ class AITextToImageService:
             b = int(200 * (1 - ratio) + 150 * ratio)
             draw.line([(0, y), (width, y)], fill=(r, g, b))
         
-        # 添加文字说明
-        try:
-            font = ImageFont.load_default()
-        except:
-            font = None
-        
         # 添加提示词文本
         text_lines = [
             "AI生成图片演示",
@@ -67,6 +62,9 @@ class AITextToImageService:
             "请配置真实AI服务"
         ]
         
+        # 添加文字说明（说明文字为中文，使用中文字体）
+        font = font_registry.get_font("Chinese", 20, "".join(text_lines))
+        
         y_offset = height // 4
         for line in text_lines:
             bbox = draw.textbbox((0, 0), line, font=font) if font else (0, 0, 100, 20)
@@ -2,6 +2,7 @@ import httpx
 import io
 from typing import Optional, Dict, Any
 from ..utils.logger import logger
+from ..utils.http_client import http_client_manager
 
 
 class AIGCStorageClient:
@@ -10,6 +11,11 @@ class AIGCStorageClient:
     def __init__(self, base_url: str = "https://aigc-network-disk.aigchub.vip"):
         self.base_url = base_url
         self.timeout = 30
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """应用生命周期内复用的HTTP客户端"""
+        return http_client_manager.get_client("aigc_storage", timeout=self.timeout)
     
     async def upload_file(
         self,
@@ -57,13 +63,12 @@ class AIGCStorageClient:
                 "tags": tags
             }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    url,
-                    headers=headers,
-                    files=files,
-                    data=data
-                )
+            response = await self.client.post(
+                url,
+                headers=headers,
+                files=files,
+                data=data
+            )
             
             if response.status_code != 200:
                 logger.error(f"文件上传失败: HTTP {response.status_code} - {response.text}")
@@ -0,0 +1,240 @@
+"""
+认证用户缓存
+两级缓存（进程内TTL/LRU + 可选Redis）用户信息，并合并同一凭证的并发查询，
+热点token的认证不再需要每次请求都访问用户中心。
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from ..config import config
+from ..schemas.user_models import User
+from ..utils.logger import logger
+
+
+class UserCache:
+    """按凭证哈希缓存User对象的两级缓存"""
+
+    REDIS_KEY_PREFIX = "image_tools_api:auth"
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float = 60,
+        max_size: int = 10000,
+        redis_ttl: int = 60,
+        use_redis: bool = True,
+        credential_is_token: bool = True
+    ):
+        """
+        Args:
+            namespace: 缓存命名空间（如 api_token），用于区分不同凭证类型
+            ttl: 进程内缓存有效期（秒），<=0 表示禁用缓存
+            max_size: 进程内缓存最大条目数，超出后按LRU淘汰
+            redis_ttl: Redis缓存有效期（秒），不超过进程内缓存有效期，
+                保证token被吊销后所有进程最多在ttl秒内停止放行
+            use_redis: 是否启用Redis二级缓存
+            credential_is_token: 凭证是否就是用户的api_token。Redis中不保存api_token，
+                读取时用凭证还原；凭证不是api_token时无法还原，只使用进程内缓存
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_size = max(1, max_size)
+        self.redis_ttl = max(1, int(min(redis_ttl, ttl))) if ttl > 0 else redis_ttl
+        self.use_redis = use_redis and credential_is_token
+
+        self._local: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def hash_credential(credential: str) -> str:
+        """计算凭证的哈希值，缓存键中不出现明文凭证"""
+        return hashlib.sha256(credential.encode("utf-8")).hexdigest()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.REDIS_KEY_PREFIX}:{self.namespace}:{key}"
+
+    # ------------------------------------------------------------------
+    # 进程内缓存
+    # ------------------------------------------------------------------
+    def _get_local(self, key: str) -> Optional[User]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            self._local.pop(key, None)
+            return None
+        self._local.move_to_end(key)
+        return user
+
+    def _set_local(self, key: str, user: User):
+        self._local[key] = (time.monotonic() + self.ttl, user)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Redis缓存
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _get_redis():
+        from ..database import redis_client
+        return redis_client
+
+    async def _get_remote(self, key: str, credential: str) -> Optional[User]:
+        if not self.use_redis:
+            return None
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return None
+        try:
+            data = await asyncio.to_thread(redis_client.get, self._redis_key(key))
+            if data:
+                # Redis中不保存api_token，用请求携带的凭证还原
+                fields = json.loads(data)
+                fields["api_token"] = credential
+                return User(**fields)
+        except Exception as e:
+            logger.warning(f"读取Redis认证缓存失败: {str(e)}")
+        return None
+
+    async def _set_remote(self, key: str, user: User):
+        if not self.use_redis:
+            return
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return
+        try:
+            await asyncio.to_thread(redis_client.setex, self._redis_key(key), self.redis_ttl,
+                                    user.json(exclude={"api_token"}))
+        except Exception as e:
+            logger.warning(f"写入Redis认证缓存失败: {str(e)}")
+
+    async def _delete_remote(self, key: str):
+        if not self.use_redis:
+            return
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return
+        try:
+            await asyncio.to_thread(redis_client.delete, self._redis_key(key))
+        except Exception as e:
+            logger.warning(f"删除Redis认证缓存失败: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------------
+    async def get_or_load(
+        self,
+        credential: str,
+        loader: Callable[[str], Awaitable[Optional[User]]]
+    ) -> Optional[User]:
+        """
+        获取凭证对应的用户，依次查询进程内缓存、Redis缓存，最后调用loader
+
+        同一凭证的并发未命中只会触发一次loader调用，其他请求等待同一结果。
+        loader返回None（凭证无效或用户中心异常）时不缓存。
+
+        Args:
+            credential: 凭证明文（api_token、JWT subject等）
+            loader: 缓存未命中时加载用户的协程函数
+
+        Returns:
+            用户信息，加载失败时返回None
+        """
+        if not self.enabled:
+            return await loader(credential)
+
+        key = self.hash_credential(credential)
+        user = self._get_local(key)
+        if user is not None:
+            self._hits += 1
+            return user
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # 发起查询的请求被取消（如客户端断开），由当前请求自行加载
+                if not in_flight.cancelled():
+                    raise
+                return await loader(credential)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            user = await self._get_remote(key, credential)
+            if user is not None:
+                self._redis_hits += 1
+            else:
+                self._misses += 1
+                user = await loader(credential)
+                if user is not None:
+                    await self._set_remote(key, user)
+            if user is not None:
+                self._set_local(key, user)
+            future.set_result(user)
+            return user
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 避免没有其他等待者时出现 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def invalidate(self, credential: str):
+        """使凭证对应的缓存失效（如token被重置、用户被禁用时调用）"""
+        key = self.hash_credential(credential)
+        self._local.pop(key, None)
+        await self._delete_remote(key)
+        logger.info(f"认证缓存已失效: {self.namespace}")
+
+    def clear_local(self):
+        """清空进程内缓存"""
+        self._local.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存命中统计"""
+        return {
+            "size": len(self._local),
+            "hits": self._hits,
+            "redis_hits": self._redis_hits,
+            "misses": self._misses,
+        }
+
+
+# API token 认证缓存
+api_token_user_cache = UserCache(
+    namespace="api_token",
+    ttl=config.AUTH_CACHE_TTL,
+    max_size=config.AUTH_CACHE_MAX_SIZE,
+    redis_ttl=config.AUTH_CACHE_REDIS_TTL,
+    use_redis=config.AUTH_CACHE_USE_REDIS
+)
+
+# JWT subject 用户信息缓存（本地验证JWT后的用户信息补全）
+# 凭证是用户标识而不是api_token，只使用进程内缓存
+jwt_subject_user_cache = UserCache(
+    namespace="jwt_subject",
+    ttl=config.AUTH_CACHE_TTL,
+    max_size=config.AUTH_CACHE_MAX_SIZE,
+    redis_ttl=config.AUTH_CACHE_REDIS_TTL,
+    use_redis=config.AUTH_CACHE_USE_REDIS,
+    credential_is_token=False
+)
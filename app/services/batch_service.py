@@ -0,0 +1,255 @@
+"""
+批量处理服务
+对多张图片应用同一操作：一次聚合预扣费，在计算池上并发处理，
+每张图片完成后立即上传并以NDJSON逐行返回结果，单张失败不影响其余图片，
+最后按成功条目的实际费用结算。响应须以 finish 作为后台任务，
+客户端在响应体开始前或中途断开时也能结算。
+"""
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from ..config import config
+from ..schemas.response_models import FileInfo
+from ..utils.logger import logger
+from ..utils.url_fetcher import sniff_content_type
+from .billing_service import billing_service
+from .file_upload_service import file_upload_service
+
+
+class BatchItem:
+    """批量请求中的单张图片"""
+
+    def __init__(
+        self,
+        index: int,
+        name: str,
+        content: Optional[bytes] = None,
+        content_type: Optional[str] = None,
+        error: Optional[str] = None
+    ):
+        """
+        Args:
+            index: 在请求中的序号（从0开始）
+            name: 文件名或URL
+            content: 图片字节数据，读取/下载失败时为None
+            content_type: 图片MIME类型
+            error: 读取/下载失败的原因
+        """
+        self.index = index
+        self.name = name
+        self.content = content
+        self.content_type = content_type
+        self.error = error
+
+
+class BatchProcessor:
+    """一次批量请求的处理与结算"""
+
+    def __init__(
+        self,
+        api_token: str,
+        api_path: str,
+        operation_type: str,
+        parameters: Dict[str, Any],
+        process: Callable[[bytes], Awaitable[bytes]],
+        billing_func: Callable[[int, int], Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ):
+        """
+        Args:
+            api_token: 用户API token
+            api_path: API路径
+            operation_type: 上传网盘时的操作类型（如 resize、filter）
+            parameters: 所有图片共用的处理参数
+            process: 处理单张图片的协程函数（输入字节 -> 结果字节）
+            billing_func: 单张图片的计费函数 (输入大小, 结果大小) -> 计费详情
+            max_concurrency: 同时处理的图片数，默认使用配置值
+        """
+        self.api_token = api_token
+        self.api_path = api_path
+        self.operation_type = operation_type
+        self.parameters = parameters
+        self.process = process
+        self.billing_func = billing_func
+        self.max_concurrency = max_concurrency or config.BATCH_MAX_CONCURRENCY
+
+        self.call_id: Optional[str] = None
+        self.estimated_tokens = 0
+        self._context: Dict[str, Any] = {}
+        self._actual_tokens = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._tasks: List[asyncio.Task] = []
+        # 结算任务由处理器持有引用，发起结算的协程被取消时结算仍会完成
+        self._settle_task: Optional[asyncio.Task] = None
+
+    def estimate(self, items: List[BatchItem]) -> int:
+        """按输入大小估算所有有效图片的总费用"""
+        return sum(
+            self.billing_func(len(item.content), len(item.content))["total_cost"]
+            for item in items if item.content is not None
+        )
+
+    async def pre_charge(self, items: List[BatchItem], remark: str) -> bool:
+        """
+        聚合预扣费，没有有效图片时不扣费
+
+        Returns:
+            是否可以继续处理（预扣费失败时返回False）
+        """
+        self.estimated_tokens = self.estimate(items)
+        if self.estimated_tokens == 0:
+            return True
+
+        self._context = {
+            **self.parameters,
+            "batch_size": len(items),
+            "valid_items": sum(1 for item in items if item.content is not None),
+            "estimated_tokens": self.estimated_tokens,
+        }
+        self.call_id = await billing_service.pre_charge(
+            api_token=self.api_token,
+            api_path=self.api_path,
+            context=self._context,
+            estimated_tokens=self.estimated_tokens,
+            remark=remark
+        )
+        return self.call_id is not None
+
+    async def _process_item(self, item: BatchItem) -> Dict[str, Any]:
+        """处理并上传单张图片，返回该条目的结果"""
+        result_bytes = await self.process(item.content)
+        content_type = sniff_content_type(result_bytes[:32]) or item.content_type or "image/jpeg"
+
+        upload_response = await file_upload_service.upload_processed_image(
+            image_bytes=result_bytes,
+            api_token=self.api_token,
+            operation_type=self.operation_type,
+            parameters={**self.parameters, "batch_index": item.index},
+            original_filename=item.name,
+            content_type=content_type
+        )
+        if not upload_response:
+            raise Exception("文件上传到网盘失败")
+
+        billing_info = self.billing_func(len(item.content), len(result_bytes))
+        tokens = billing_info["total_cost"]
+        # 上传成功即计入实际费用，客户端中途断开时也能正确结算
+        self._actual_tokens += tokens
+        self._succeeded += 1
+
+        return {
+            "type": "item",
+            "index": item.index,
+            "name": item.name,
+            "success": True,
+            "file_info": FileInfo(**upload_response["file"]).dict(),
+            "original_size": len(item.content),
+            "result_size": len(result_bytes),
+            "tokens": tokens,
+        }
+
+    def _error_result(self, item: BatchItem, message: str) -> Dict[str, Any]:
+        self._failed += 1
+        return {
+            "type": "item",
+            "index": item.index,
+            "name": item.name,
+            "success": False,
+            "error": message,
+        }
+
+    def _start_settle(self) -> asyncio.Task:
+        """启动结算任务（只启动一次）"""
+        if self._settle_task is None:
+            self._settle_task = asyncio.create_task(self._settle())
+        return self._settle_task
+
+    async def _settle(self) -> Optional[str]:
+        """按成功条目的实际费用结算"""
+        if self.call_id is None:
+            return None
+
+        self.call_id = await billing_service.settle_batch(
+            call_id=self.call_id,
+            api_token=self.api_token,
+            api_path=self.api_path,
+            context={**self._context, "succeeded": self._succeeded, "failed": self._failed},
+            estimated_tokens=self.estimated_tokens,
+            actual_tokens=self._actual_tokens,
+            remark=f"批量{self.operation_type}结算 - 成功{self._succeeded}张"
+        )
+        logger.info(
+            f"批量处理结算完成: {self.api_path}, 成功{self._succeeded}张, 失败{self._failed}张, "
+            f"预扣{self.estimated_tokens}, 实际{self._actual_tokens} tokens"
+        )
+        return self.call_id
+
+    async def finish(self) -> Optional[str]:
+        """
+        响应结束后的结算（作为StreamingResponse的后台任务执行）
+
+        正常结束时stream已经结算，这里不再重复；客户端中途断开时取消未完成的图片，
+        等待其结束后按已上传成功的图片结算；响应体未开始迭代时没有任何图片被处理，整笔退费。
+        """
+        if self._settle_task is not None:
+            return await self._settle_task
+        pending = [task for task in self._tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self.call_id is not None:
+            logger.warning(f"批量处理被中断: {self.api_path}, 已成功{self._succeeded}张")
+        return await self._start_settle()
+
+    @staticmethod
+    def _line(data: Dict[str, Any]) -> str:
+        return json.dumps(data, ensure_ascii=False, default=str) + "\n"
+
+    async def stream(self, items: List[BatchItem]) -> AsyncIterator[str]:
+        """
+        并发处理所有图片，按完成顺序逐行输出NDJSON
+
+        输出依次为：一行start、每张图片一行item（含index，按完成顺序）、一行summary。
+        客户端中途断开时由 finish 取消未完成的图片并按已成功的图片结算。
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(item: BatchItem) -> Dict[str, Any]:
+            if item.content is None:
+                return self._error_result(item, item.error or "图片读取失败")
+            async with semaphore:
+                try:
+                    return await self._process_item(item)
+                except Exception as e:
+                    logger.error(f"批量处理第{item.index}张图片失败: {str(e)}")
+                    return self._error_result(item, str(e))
+
+        self._tasks = tasks = [asyncio.create_task(run(item)) for item in items]
+        try:
+            yield self._line({
+                "type": "start",
+                "total": len(items),
+                "call_id": self.call_id,
+                "estimated_tokens": self.estimated_tokens,
+            })
+
+            for next_done in asyncio.as_completed(tasks):
+                yield self._line(await next_done)
+
+            call_id = await asyncio.shield(self._start_settle())
+            yield self._line({
+                "type": "summary",
+                "total": len(items),
+                "succeeded": self._succeeded,
+                "failed": self._failed,
+                "call_id": call_id,
+                "estimated_tokens": self.estimated_tokens,
+                "tokens_consumed": self._actual_tokens if call_id else 0,
+            })
+        finally:
+            # 生成器被关闭时不再继续处理，结算由 finish 完成
+            for task in tasks:
+                task.cancel()
@@ -155,6 +155,64 @@ class BillingService:
             logger.warning(f"追加扣费异常，但继续执行: {str(e)}")
             return True
 
+    async def settle_batch(
+        self,
+        call_id: str,
+        api_token: str,
+        api_path: str,
+        context: Dict[str, Any],
+        estimated_tokens: int,
+        actual_tokens: int,
+        remark: str = ""
+    ) -> Optional[str]:
+        """
+        批量请求结算：按实际成功条目的费用调整聚合预扣费
+
+        用户中心只支持整笔退费和追加扣费，因此实际费用低于预扣费时，
+        先整笔退费再按实际费用重新扣费。
+
+        Args:
+            call_id: 聚合预扣费的调用ID
+            api_token: 用户API token
+            api_path: API路径
+            context: 请求上下文（重新扣费时使用）
+            estimated_tokens: 预扣的token数量
+            actual_tokens: 成功条目的实际token数量之和
+            remark: 备注
+
+        Returns:
+            最终生效的调用ID，全部失败（已整笔退费）或重新扣费失败时返回None
+        """
+        if actual_tokens <= 0:
+            await self.refund_all(call_id, "批量处理全部失败，返还Token")
+            return None
+
+        if actual_tokens > estimated_tokens:
+            await self.charge_more(
+                call_id,
+                actual_tokens - estimated_tokens,
+                remark=f"批量处理实际费用超出预估，追加扣除{actual_tokens - estimated_tokens} Token"
+            )
+            return call_id
+
+        if actual_tokens == estimated_tokens:
+            return call_id
+
+        if not await self.refund_all(call_id, "批量处理部分失败，按成功条目重新结算"):
+            logger.error(f"批量结算退费失败，保留预扣费: {call_id}")
+            return call_id
+
+        new_call_id = await self.pre_charge(
+            api_token=api_token,
+            api_path=api_path,
+            context=context,
+            estimated_tokens=actual_tokens,
+            remark=remark or f"{api_path}批量结算"
+        )
+        if not new_call_id:
+            logger.error(f"批量结算重新扣费失败: {api_path}, {actual_tokens} tokens")
+        return new_call_id
+
     async def confirm_charge(self, call_id: str, api_token: str) -> bool:
         """
         确认扣费 - 完成预扣费流程
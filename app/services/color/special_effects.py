@@ -2,6 +2,7 @@ from PIL import Image, ImageEnhance
 import io
 import numpy as np
 from typing import Tuple
+from ...utils import gradients
 from ...utils.logger import logger
 
 
@@ -159,33 +160,8 @@ class SpecialEffects:
             img_array = np.array(img, dtype=np.float32)
             height, width = img_array.shape[:2]
             
-            # 创建彩虹渐变
-            rainbow_array = np.zeros_like(img_array)
-            
-            for y in range(height):
-                hue = (y / height) * 360  # 0-360度色相
-                
-                # HSV到RGB转换（简化版）
-                c = 1.0
-                x = c * (1 - abs((hue / 60) % 2 - 1))
-                m = 0
-                
-                if 0 <= hue < 60:
-                    r, g, b = c, x, 0
-                elif 60 <= hue < 120:
-                    r, g, b = x, c, 0
-                elif 120 <= hue < 180:
-                    r, g, b = 0, c, x
-                elif 180 <= hue < 240:
-                    r, g, b = 0, x, c
-                elif 240 <= hue < 300:
-                    r, g, b = x, 0, c
-                else:
-                    r, g, b = c, 0, x
-                
-                rainbow_array[y, :, 0] = (r + m) * 255
-                rainbow_array[y, :, 1] = (g + m) * 255
-                rainbow_array[y, :, 2] = (b + m) * 255
+            # 创建彩虹渐变（色相从上到下0-360度）
+            rainbow_array = gradients.hue_colors(gradients.linear((width, height), 90.0))
             
             # 混合原图和彩虹效果
             result_array = img_array * (1 - intensity) + rainbow_array * intensity
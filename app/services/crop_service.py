@@ -1,7 +1,9 @@
 from PIL import Image, ImageDraw
 import io
+import math
 from typing import Optional, Tuple, List
 from ..utils.logger import logger
+from ..utils.image_utils import ImageUtils
 
 
 class CropService:
@@ -31,6 +33,17 @@ class CropService:
         
         return x, y, width, height
     
+    @staticmethod
+    def crop_rectangle_pil(
+        img: Image.Image,
+        x: int, y: int, width: int, height: int
+    ) -> Image.Image:
+        """矩形裁剪已解码图片（供处理管道等内存调用使用）"""
+        x, y, width, height = CropService._validate_crop_area(
+            img.size, x, y, width, height
+        )
+        return img.crop((x, y, x + width, y + height))
+
     @staticmethod
     def crop_rectangle(
         image_bytes: bytes,
@@ -56,14 +69,8 @@ class CropService:
         try:
             img = Image.open(io.BytesIO(image_bytes))
             
-            # 验证裁剪区域
-            x, y, width, height = CropService._validate_crop_area(
-                img.size, x, y, width, height
-            )
-            
             # 执行裁剪
-            crop_box = (x, y, x + width, y + height)
-            cropped_img = img.crop(crop_box)
+            cropped_img = CropService.crop_rectangle_pil(img, x, y, width, height)
             
             # 保存并返回
             output = io.BytesIO()
@@ -77,6 +84,39 @@ class CropService:
             logger.error(f"矩形裁剪失败: {e}")
             raise
     
+    @staticmethod
+    def crop_circle_pil(
+        img: Image.Image,
+        center_x: int, center_y: int, radius: int
+    ) -> Image.Image:
+        """圆形裁剪已解码图片，返回带透明背景的RGBA图片"""
+        img = img.convert("RGBA")
+
+        # 创建圆形蒙版
+        mask = Image.new("L", img.size, 0)
+        draw = ImageDraw.Draw(mask)
+
+        # 绘制圆形
+        left = center_x - radius
+        top = center_y - radius
+        right = center_x + radius
+        bottom = center_y + radius
+
+        draw.ellipse([left, top, right, bottom], fill=255)
+
+        # 应用蒙版
+        result = Image.new("RGBA", img.size, (0, 0, 0, 0))
+        result.paste(img, mask=mask)
+
+        # 裁剪到圆形边界框
+        crop_box = (
+            max(0, left),
+            max(0, top),
+            min(img.width, right),
+            min(img.height, bottom)
+        )
+        return result.crop(crop_box)
+
     @staticmethod
     def crop_circle(
         image_bytes: bytes,
@@ -99,32 +139,8 @@ class CropService:
         logger.info(f"圆形裁剪: center=({center_x}, {center_y}), radius={radius}")
         
         try:
-            img = Image.open(io.BytesIO(image_bytes)).convert("RGBA")
-            
-            # 创建圆形蒙版
-            mask = Image.new("L", img.size, 0)
-            draw = ImageDraw.Draw(mask)
-            
-            # 绘制圆形
-            left = center_x - radius
-            top = center_y - radius
-            right = center_x + radius
-            bottom = center_y + radius
-            
-            draw.ellipse([left, top, right, bottom], fill=255)
-            
-            # 应用蒙版
-            result = Image.new("RGBA", img.size, (0, 0, 0, 0))
-            result.paste(img, mask=mask)
-            
-            # 裁剪到圆形边界框
-            crop_box = (
-                max(0, left),
-                max(0, top),
-                min(img.width, right),
-                min(img.height, bottom)
-            )
-            result = result.crop(crop_box)
+            img = Image.open(io.BytesIO(image_bytes))
+            result = CropService.crop_circle_pil(img, center_x, center_y, radius)
             
             # 保存并返回
             output = io.BytesIO()
@@ -196,6 +212,36 @@ class CropService:
             logger.error(f"多边形裁剪失败: {e}")
             raise
     
+    @staticmethod
+    def crop_smart_center_pil(
+        img: Image.Image,
+        target_width: int, target_height: int
+    ) -> Image.Image:
+        """智能居中裁剪已解码图片（供处理管道等内存调用使用）"""
+        # 计算原图和目标的比例
+        original_ratio = img.width / img.height
+        target_ratio = target_width / target_height
+
+        if original_ratio > target_ratio:
+            # 原图更宽，需要裁剪左右
+            new_width = int(img.height * target_ratio)
+            new_height = img.height
+            x = (img.width - new_width) // 2
+            y = 0
+        else:
+            # 原图更高，需要裁剪上下
+            new_width = img.width
+            new_height = int(img.width / target_ratio)
+            x = 0
+            y = (img.height - new_height) // 2
+
+        # 执行裁剪
+        crop_box = (x, y, x + new_width, y + new_height)
+        cropped_img = img.crop(crop_box)
+
+        # 调整到目标尺寸
+        return cropped_img.resize((target_width, target_height), Image.LANCZOS)
+
     @staticmethod
     def crop_smart_center(
         image_bytes: bytes,
@@ -218,34 +264,22 @@ class CropService:
         
         try:
             img = Image.open(io.BytesIO(image_bytes))
+            source_format = img.format
             
-            # 计算原图和目标的比例
-            original_ratio = img.width / img.height
-            target_ratio = target_width / target_height
-            
-            if original_ratio > target_ratio:
-                # 原图更宽，需要裁剪左右
-                new_width = int(img.height * target_ratio)
-                new_height = img.height
-                x = (img.width - new_width) // 2
-                y = 0
-            else:
-                # 原图更高，需要裁剪上下
-                new_width = img.width
-                new_height = int(img.width / target_ratio)
-                x = 0
-                y = (img.height - new_height) // 2
-            
-            # 执行裁剪
-            crop_box = (x, y, x + new_width, y + new_height)
-            cropped_img = img.crop(crop_box)
+            # 裁剪区域缩放到目标尺寸的比例，据此以最低成本解码整张图片
+            scale = max(
+                target_width / min(img.width, img.height * target_width / target_height),
+                target_height / min(img.height, img.width * target_height / target_width)
+            )
+            img = ImageUtils.decode_for_size(
+                img, (math.ceil(img.width * scale), math.ceil(img.height * scale))
+            )
             
-            # 调整到目标尺寸
-            resized_img = cropped_img.resize((target_width, target_height), Image.LANCZOS)
+            resized_img = CropService.crop_smart_center_pil(img, target_width, target_height)
             
             # 保存并返回
             output = io.BytesIO()
-            format = img.format if img.format else "JPEG"
+            format = source_format if source_format else "JPEG"
             resized_img.save(output, format=format, quality=quality)
             
             logger.info("智能居中裁剪成功")
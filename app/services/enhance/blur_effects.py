@@ -76,13 +76,108 @@ class BlurEffects:
             logger.error(f"运动模糊失败: {str(e)}")
             raise
     
+    # 变半径盒式模糊每次处理的行数，限制索引数组的内存占用
+    RADIAL_BLUR_CHUNK_ROWS = 64
+
+    # 缩放模糊的最大叠加次数（采样数为 2 ** 次数）
+    ZOOM_BLUR_MAX_PASSES = 8
+
+    # 径向盒式模糊强度为1时，中心到角落距离处的模糊半径占图片对角线的比例
+    RADIAL_BLUR_MAX_RADIUS_RATIO = 0.1
+
+    @staticmethod
+    def _variable_box_blur(img_array: np.ndarray, radius: np.ndarray) -> np.ndarray:
+        """
+        变半径盒式模糊：用积分图（summed-area table）在O(1)时间内求每个像素
+        (2r+1)x(2r+1) 窗口（超出边界部分裁掉）的均值，半径为0的像素保持原值，
+        计算量与半径无关
+
+        Args:
+            img_array: (高, 宽) 或 (高, 宽, 通道) 的uint8数组
+            radius: (高, 宽) 的整数半径数组
+
+        Returns:
+            与输入形状相同的uint8数组
+        """
+        height, width = img_array.shape[:2]
+        pixels = img_array.reshape(height, width, -1)
+        channels = pixels.shape[2]
+
+        # 积分图首行首列补0：table[y, x] = pixels[:y, :x] 之和。
+        # 无符号整数溢出按模回绕，只要整图之和不超过类型上限，窗口和的加减结果仍然精确，
+        # 因此不超过约1600万像素时用uint32以减少内存
+        dtype = np.uint32 if 255 * height * width < 2 ** 32 else np.uint64
+        table = np.zeros((height + 1, width + 1, channels), dtype=dtype)
+        np.cumsum(np.cumsum(pixels, axis=0, dtype=dtype), axis=1, out=table[1:, 1:])
+        flat = table.reshape(-1, channels)
+        stride = width + 1
+
+        result = np.empty_like(pixels)
+        index_type = np.int32 if table.shape[0] * stride < 2 ** 31 else np.int64
+        columns = np.arange(width, dtype=index_type)[None, :]
+        for start in range(0, height, BlurEffects.RADIAL_BLUR_CHUNK_ROWS):
+            stop = min(height, start + BlurEffects.RADIAL_BLUR_CHUNK_ROWS)
+            rows = np.arange(start, stop, dtype=index_type)[:, None]
+            # 半径为0时窗口只有像素本身，均值即原值，无需单独处理
+            r = radius[start:stop].astype(index_type)
+
+            y1 = np.maximum(rows - r, 0)
+            y2 = np.minimum(rows + r + 1, height)
+            x1 = np.maximum(columns - r, 0)
+            x2 = np.minimum(columns + r + 1, width)
+
+            sums = (
+                np.take(flat, (y2 * stride + x2).ravel(), axis=0)
+                - np.take(flat, (y1 * stride + x2).ravel(), axis=0)
+                - np.take(flat, (y2 * stride + x1).ravel(), axis=0)
+                + np.take(flat, (y1 * stride + x1).ravel(), axis=0)
+            )
+            counts = ((y2 - y1) * (x2 - x1)).reshape(-1, 1).astype(np.float32)
+            means = (sums.astype(np.float32) / counts).astype(np.uint8)
+            result[start:stop] = means.reshape(stop - start, width, channels)
+
+        return result.reshape(img_array.shape)
+
+    @staticmethod
+    def _zoom_blur(img: Image.Image, center: Tuple[float, float], strength: float) -> Image.Image:
+        """
+        缩放（镜头推拉）模糊：每个像素取其到中心连线上、缩放比例在 [1 - strength, 1] 之间的采样均值
+
+        每次把当前结果与按中心缩放后的自身平均，缩放比例逐次翻倍，
+        n 次叠加得到 2 ** n 个等间距采样，只需 n 次重采样。
+        """
+        strength = min(max(strength, 0.0), 0.99)
+        if strength == 0:
+            return img.copy()
+
+        cx, cy = center
+        width, height = img.size
+        max_shift = strength * max(
+            np.hypot(cx, cy), np.hypot(width - cx, cy), np.hypot(cx, height - cy), np.hypot(width - cx, height - cy)
+        )
+        passes = int(min(BlurEffects.ZOOM_BLUR_MAX_PASSES, max(1, np.ceil(np.log2(max(max_shift, 2))))))
+
+        result = img
+        for k in range(passes):
+            # 第k次的缩放比例为 (1 - strength) ** (2**k / 2**passes)
+            scale = (1 - strength) ** (2 ** k / 2 ** passes)
+            zoomed = result.transform(
+                img.size,
+                Image.AFFINE,
+                (scale, 0, cx * (1 - scale), 0, scale, cy * (1 - scale)),
+                resample=Image.BILINEAR
+            )
+            result = Image.blend(result, zoomed, 0.5)
+        return result
+
     @staticmethod
     def radial_blur(
         image_bytes: bytes,
         center_x: Optional[int] = None,
         center_y: Optional[int] = None,
-        strength: float = 5.0,
-        quality: int = 90
+        strength: float = 0.1,
+        quality: int = 90,
+        mode: str = "box"
     ) -> bytes:
         """
         径向模糊效果
@@ -91,18 +186,26 @@ class BlurEffects:
             image_bytes: 输入图片的字节数据
             center_x: 模糊中心X坐标（None为图像中心）
             center_y: 模糊中心Y坐标（None为图像中心）
-            strength: 模糊强度
+            strength: 模糊强度（0-1）。box模式下模糊半径随到中心的距离线性增加，
+                      强度为1时图像角落处的半径为对角线的 RADIAL_BLUR_MAX_RADIUS_RATIO；
+                      zoom模式下为缩放比例
             quality: 输出图像质量 (1-100)
+            mode: box（变半径盒式模糊）/ zoom（沿半径方向的缩放模糊）
             
         Returns:
             处理后图片的字节数据
         """
-        logger.info(f"径向模糊: center=({center_x}, {center_y}), strength={strength}")
+        logger.info(f"径向模糊: center=({center_x}, {center_y}), strength={strength}, mode={mode}")
         
         try:
+            if mode not in ("box", "zoom"):
+                raise ValueError(f"不支持的径向模糊模式: {mode}")
+            strength = min(max(strength, 0.0), 1.0)
+
             img = Image.open(io.BytesIO(image_bytes))
-            img_array = np.array(img)
-            height, width = img_array.shape[:2]
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            width, height = img.size
             
             # 设置默认中心点
             if center_x is None:
@@ -110,38 +213,22 @@ class BlurEffects:
             if center_y is None:
                 center_y = height // 2
             
-            # 创建距离映射
-            y, x = np.ogrid[:height, :width]
-            distance = np.sqrt((x - center_x)**2 + (y - center_y)**2)
-            
-            # 归一化距离
-            max_distance = np.sqrt(width**2 + height**2) / 2
-            normalized_distance = distance / max_distance
-            
-            # 计算模糊半径（基于距离）
-            blur_radius = normalized_distance * strength
-            
-            # 应用径向模糊
-            result = img_array.copy().astype(np.float32)
-            
-            for i in range(height):
-                for j in range(width):
-                    radius = int(blur_radius[i, j])
-                    if radius > 0:
-                        # 创建局部模糊区域
-                        y1 = max(0, i - radius)
-                        y2 = min(height, i + radius + 1)
-                        x1 = max(0, j - radius)
-                        x2 = min(width, j + radius + 1)
-                        
-                        # 计算平均值
-                        if len(img_array.shape) == 3:
-                            for c in range(img_array.shape[2]):
-                                result[i, j, c] = np.mean(img_array[y1:y2, x1:x2, c])
-                        else:
-                            result[i, j] = np.mean(img_array[y1:y2, x1:x2])
-            
-            result_img = Image.fromarray(result.astype('uint8'))
+            if mode == "zoom":
+                result_img = BlurEffects._zoom_blur(img, (center_x, center_y), strength)
+            else:
+                # 创建距离映射
+                y, x = np.ogrid[:height, :width]
+                distance = np.sqrt((x - center_x)**2 + (y - center_y)**2)
+                
+                # 归一化距离
+                max_distance = np.sqrt(width**2 + height**2) / 2
+                normalized_distance = distance / max_distance
+                
+                # 计算模糊半径（基于距离），按图片尺寸把0-1的强度换算为像素
+                max_radius = strength * BlurEffects.RADIAL_BLUR_MAX_RADIUS_RATIO * 2 * max_distance
+                blur_radius = (normalized_distance * max_radius).astype(np.int64)
+                
+                result_img = Image.fromarray(BlurEffects._variable_box_blur(np.array(img), blur_radius))
             
             output = io.BytesIO()
             result_img.save(output, format='JPEG', quality=quality)
@@ -3,6 +3,7 @@ import io
 import numpy as np
 from typing import Optional, Tuple
 from ...utils.logger import logger
+from ...utils.blur import gaussian_blur_image
 from .blur_effects import BlurEffects
 from .sharpen_effects import SharpenEffects
 
@@ -45,8 +46,9 @@ class MainEnhance:
                     image_bytes,
                     center_x=kwargs.get('center_x'),
                     center_y=kwargs.get('center_y'),
-                    strength=kwargs.get('strength', 5.0),
-                    quality=quality
+                    strength=kwargs.get('strength', 0.1),
+                    quality=quality,
+                    mode=kwargs.get('mode', 'box')
                 )
             elif effect_type == 'surface_blur':
                 return BlurEffects.surface_blur(
@@ -124,7 +126,7 @@ class MainEnhance:
             elif effect_type == 'blur':
                 # 模糊
                 radius = max(0.1, intensity * 2)
-                img = img.filter(ImageFilter.GaussianBlur(radius=radius))
+                img = gaussian_blur_image(img, radius)
             
             elif effect_type == 'smooth':
                 # 平滑
@@ -4,6 +4,7 @@ import numpy as np
 import cv2
 from typing import Optional, Tuple
 from ...utils.logger import logger
+from ...utils.blur import gaussian_blur
 
 
 class SharpenEffects:
@@ -37,7 +38,7 @@ class SharpenEffects:
             img_array = np.array(img, dtype=np.float32)
             
             # 创建模糊版本
-            blurred = cv2.GaussianBlur(img_array, (0, 0), radius)
+            blurred = gaussian_blur(img_array, radius)
             
             # 计算差值（高频信息）
             high_freq = img_array - blurred
@@ -113,7 +114,7 @@ class SharpenEffects:
             
             # 创建自适应锐化掩模
             blur_radius = max(0.5, radius)
-            blurred = cv2.GaussianBlur(img_array, (0, 0), blur_radius)
+            blurred = gaussian_blur(img_array, blur_radius)
             
             # 计算高频信息
             high_freq = img_array - blurred
@@ -18,9 +18,9 @@ class EnhanceService:
 
     @staticmethod
     def radial_blur(image_bytes: bytes, center_x: Optional[int] = None, center_y: Optional[int] = None,
-                   strength: float = 5.0, quality: int = 90) -> bytes:
-        """径向模糊效果"""
-        return BlurEffects.radial_blur(image_bytes, center_x, center_y, strength, quality)
+                   strength: float = 0.1, quality: int = 90, mode: str = "box") -> bytes:
+        """径向模糊效果（box: 变半径盒式模糊，zoom: 缩放模糊）"""
+        return BlurEffects.radial_blur(image_bytes, center_x, center_y, strength, quality, mode)
 
     @staticmethod
     def surface_blur(image_bytes: bytes, radius: int = 5, threshold: int = 15, quality: int = 90) -> bytes:
@@ -3,6 +3,7 @@ import os
 from typing import Optional, Dict, Any, Tuple
 from ..services.aigc_storage_client import aigc_storage_client
 from ..services.oss_client import OSSClient
+from ..services.result_cache import result_cache
 from ..config import config
 from ..utils.logger import logger
 
@@ -53,7 +54,8 @@ class FileUploadService:
             "image/bmp": "bmp",
             "image/webp": "webp",
             "image/tiff": "tiff",
-            "image/svg+xml": "svg"
+            "image/svg+xml": "svg",
+            "video/mp4": "mp4"
         }
         
         return content_type_map.get(content_type.lower(), "jpg")
@@ -105,6 +107,11 @@ class FileUploadService:
             if filter_type:
                 base_description += f"，应用滤镜：{filter_type}"
         
+        elif operation_type == "pipeline":
+            steps = parameters.get("steps")
+            if steps:
+                base_description += f"，处理步骤：{' -> '.join(steps)}"
+        
         return base_description
     
     def generate_tags(self, operation_type: str, parameters: Dict[str, Any] = None) -> str:
@@ -155,6 +162,12 @@ class FileUploadService:
             上传成功时返回完整的网盘响应，失败时返回None
         """
         try:
+            # 同一用户之前上传过完全相同的结果时，直接复用网盘文件记录
+            cached_response = await result_cache.get_upload(image_bytes, content_type, api_token)
+            if cached_response:
+                logger.info(f"复用已上传的相同结果，跳过上传, 操作类型: {operation_type}")
+                return cached_response
+
             # 生成文件名
             file_extension = self.get_file_extension_from_content_type(content_type)
             filename = self.generate_filename(original_filename, file_extension)
@@ -179,6 +192,7 @@ class FileUploadService:
 
             if upload_response:
                 logger.info(f"AIGC网盘上传成功: {filename}")
+                await result_cache.set_upload(image_bytes, content_type, api_token, upload_response)
                 return upload_response
 
             # AIGC网盘上传失败，检查是否有OSS配置
@@ -1,6 +1,7 @@
 from PIL import Image
 import io
 from ..utils.logger import logger
+from .gif.parallel import process_animation
 
 # 导入所有滤镜模块
 from .filters.basic_filters import BasicFilters
@@ -16,6 +17,86 @@ from .filters.creative_filters import CreativeFilters
 class FilterService:
     """基础滤镜服务 - 重构后的主入口"""
 
+    # 滤镜处理函数映射
+    FILTER_MAP = {
+        "grayscale": BasicFilters._apply_grayscale,
+        "sepia": BasicFilters._apply_sepia,
+        "blur": BasicFilters._apply_blur,
+        "sharpen": BasicFilters._apply_sharpen,
+        "brightness": BasicFilters._apply_brightness,
+        "contrast": BasicFilters._apply_contrast,
+        "saturate": ColorFilters._apply_saturate,
+        "desaturate": ColorFilters._apply_desaturate,
+        "warm": ColorFilters._apply_warm,
+        "cool": ColorFilters._apply_cool,
+        "vintage": ColorFilters._apply_vintage,
+        "hueshift": ColorFilters._apply_hueshift,
+        "gamma": ColorFilters._apply_gamma,
+        "levels": ColorFilters._apply_levels,
+        "emboss": ArtisticFilters._apply_emboss,
+        "posterize": ArtisticFilters._apply_posterize,
+        "solarize": ArtisticFilters._apply_solarize,
+        "invert": ArtisticFilters._apply_invert,
+        "edge_enhance": ArtisticFilters._apply_edge_enhance,
+        "smooth": ArtisticFilters._apply_smooth,
+        "detail": ArtisticFilters._apply_detail,
+        "monochrome": BlackwhiteFilters._apply_monochrome,
+        "dramatic_bw": BlackwhiteFilters._apply_dramatic_bw,
+        "infrared": BlackwhiteFilters._apply_infrared,
+        "high_contrast_bw": BlackwhiteFilters._apply_high_contrast_bw,
+        "film_grain": VintageFilters._apply_film_grain,
+        "retro": VintageFilters._apply_retro,
+        "polaroid": VintageFilters._apply_polaroid,
+        "lomo": VintageFilters._apply_lomo,
+        "analog": VintageFilters._apply_analog,
+        "crossprocess": VintageFilters._apply_crossprocess,
+        "dream": SpecialFilters._apply_dream,
+        "glow": SpecialFilters._apply_glow,
+        "soft_focus": SpecialFilters._apply_soft_focus,
+        "noise": SpecialFilters._apply_noise,
+        "vignette": SpecialFilters._apply_vignette,
+        "mosaic": SpecialFilters._apply_mosaic,
+        "find_edges": EdgeFilters._apply_find_edges,
+        "contour": EdgeFilters._apply_contour,
+        "edge_enhance_more": EdgeFilters._apply_edge_enhance_more,
+        "smooth_more": EdgeFilters._apply_smooth_more,
+        "unsharp_mask": EdgeFilters._apply_unsharp_mask,
+        "pencil": CreativeFilters._apply_pencil,
+        "sketch": CreativeFilters._apply_sketch,
+        "cartoon": CreativeFilters._apply_cartoon,
+        "hdr": CreativeFilters._apply_hdr,
+        "cyberpunk": CreativeFilters._apply_cyberpunk,
+        "noir": CreativeFilters._apply_noir,
+        "faded": CreativeFilters._apply_faded,
+        "pastel": CreativeFilters._apply_pastel,
+    }
+
+    # 带随机噪点的滤镜每次结果不同
+    NON_DETERMINISTIC_FILTERS = {"film_grain", "analog", "noise"}
+
+    @staticmethod
+    def apply_filter_pil(
+        img: Image.Image,
+        filter_type: str,
+        intensity: float = 1.0
+    ) -> Image.Image:
+        """
+        对已解码图片应用滤镜（供处理管道等内存调用使用）
+
+        Args:
+            img: PIL图片
+            filter_type: 滤镜类型
+            intensity: 效果强度
+
+        Returns:
+            处理后的PIL图片，未知滤镜类型时原样返回
+        """
+        filter_func = FilterService.FILTER_MAP.get(filter_type)
+        if filter_func is None:
+            logger.warning(f"未知的滤镜类型: {filter_type}")
+            return img
+        return filter_func(img, intensity)
+
     @staticmethod
     def apply_filter(
         image_bytes: bytes,
@@ -38,65 +119,7 @@ class FilterService:
         try:
             img = Image.open(io.BytesIO(image_bytes))
             
-            # 滤镜处理函数映射
-            filter_map = {
-            "grayscale": BasicFilters._apply_grayscale,
-            "sepia": BasicFilters._apply_sepia,
-            "blur": BasicFilters._apply_blur,
-            "sharpen": BasicFilters._apply_sharpen,
-            "brightness": BasicFilters._apply_brightness,
-            "contrast": BasicFilters._apply_contrast,
-            "saturate": ColorFilters._apply_saturate,
-            "desaturate": ColorFilters._apply_desaturate,
-            "warm": ColorFilters._apply_warm,
-            "cool": ColorFilters._apply_cool,
-            "vintage": ColorFilters._apply_vintage,
-            "hueshift": ColorFilters._apply_hueshift,
-            "gamma": ColorFilters._apply_gamma,
-            "levels": ColorFilters._apply_levels,
-            "emboss": ArtisticFilters._apply_emboss,
-            "posterize": ArtisticFilters._apply_posterize,
-            "solarize": ArtisticFilters._apply_solarize,
-            "invert": ArtisticFilters._apply_invert,
-            "edge_enhance": ArtisticFilters._apply_edge_enhance,
-            "smooth": ArtisticFilters._apply_smooth,
-            "detail": ArtisticFilters._apply_detail,
-            "monochrome": BlackwhiteFilters._apply_monochrome,
-            "dramatic_bw": BlackwhiteFilters._apply_dramatic_bw,
-            "infrared": BlackwhiteFilters._apply_infrared,
-            "high_contrast_bw": BlackwhiteFilters._apply_high_contrast_bw,
-            "film_grain": VintageFilters._apply_film_grain,
-            "retro": VintageFilters._apply_retro,
-            "polaroid": VintageFilters._apply_polaroid,
-            "lomo": VintageFilters._apply_lomo,
-            "analog": VintageFilters._apply_analog,
-            "crossprocess": VintageFilters._apply_crossprocess,
-            "dream": SpecialFilters._apply_dream,
-            "glow": SpecialFilters._apply_glow,
-            "soft_focus": SpecialFilters._apply_soft_focus,
-            "noise": SpecialFilters._apply_noise,
-            "vignette": SpecialFilters._apply_vignette,
-            "mosaic": SpecialFilters._apply_mosaic,
-            "find_edges": EdgeFilters._apply_find_edges,
-            "contour": EdgeFilters._apply_contour,
-            "edge_enhance_more": EdgeFilters._apply_edge_enhance_more,
-            "smooth_more": EdgeFilters._apply_smooth_more,
-            "unsharp_mask": EdgeFilters._apply_unsharp_mask,
-            "pencil": CreativeFilters._apply_pencil,
-            "sketch": CreativeFilters._apply_sketch,
-            "cartoon": CreativeFilters._apply_cartoon,
-            "hdr": CreativeFilters._apply_hdr,
-            "cyberpunk": CreativeFilters._apply_cyberpunk,
-            "noir": CreativeFilters._apply_noir,
-            "faded": CreativeFilters._apply_faded,
-            "pastel": CreativeFilters._apply_pastel,
-            }
-            
-            if filter_type not in filter_map:
-                logger.warning(f"未知的滤镜类型: {filter_type}")
-                filtered_img = img
-            else:
-                filtered_img = filter_map[filter_type](img, intensity)
+            filtered_img = FilterService.apply_filter_pil(img, filter_type, intensity)
             
             # 保存并返回
             output = io.BytesIO()
@@ -108,4 +131,39 @@ class FilterService:
             
         except Exception as e:
             logger.error(f"应用滤镜失败: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    @staticmethod
+    async def apply_filter_animated(
+        image_bytes: bytes,
+        filter_type: str,
+        intensity: float = 1.0
+    ) -> bytes:
+        """
+        对动图的每一帧应用滤镜，各帧按块分发到计算执行器并行处理
+
+        Args:
+            image_bytes: 输入动图（GIF/WebP等）的字节数据
+            filter_type: 滤镜类型
+            intensity: 效果强度
+
+        Returns:
+            处理后GIF的字节数据
+        """
+        logger.info(f"动图逐帧应用滤镜: {filter_type}, 强度: {intensity}")
+
+        try:
+            img = Image.open(io.BytesIO(image_bytes))
+            result = await process_animation(
+                image_bytes,
+                FilterService.apply_filter_pil,
+                args=(filter_type, intensity),
+                loop=img.info.get("loop", 0)
+            )
+
+            logger.info("动图滤镜应用成功")
+            return result
+
+        except Exception as e:
+            logger.error(f"动图应用滤镜失败: {e}")
+            raise
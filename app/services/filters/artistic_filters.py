@@ -30,6 +30,7 @@ class ArtisticFilters:
         from ...filters.pencil_sketch import apply_pencil_sketch
         from ...filters.watercolor import apply_watercolor
         from ...filters.special_effects import apply_neon_glow
+        from ...filters.dry_brush import apply_dry_brush
         from ..filter_service import FilterService
 
         if filter_type == "oil_painting":
@@ -54,6 +55,13 @@ class ArtisticFilters:
                 texture_strength=0.1,
                 intensity=intensity
             )
+        elif filter_type == "dry_brush":
+            return apply_dry_brush(
+                image_bytes=image_bytes,
+                brush_size=5,
+                detail_level=25,
+                intensity=intensity
+            )
         elif filter_type == "cartoon":
             # 使用基础滤镜服务的卡通效果
             from ..filter_service import FilterService
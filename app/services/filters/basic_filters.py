@@ -1,6 +1,62 @@
 from PIL import Image, ImageFilter, ImageEnhance, ImageOps, ImageDraw
 import random
-from typing import Callable
+import numpy as np
+from typing import Callable, Optional, Tuple
+from ...utils.blur import gaussian_blur_image
+
+
+def split_alpha(img: Image.Image) -> Tuple[Image.Image, Optional[Image.Image]]:
+    """
+    将图片拆分为颜色部分和透明通道
+
+    RGBA/LA/带透明色的P模式返回 (RGB或L图片, alpha通道)，
+    其余模式返回 (RGB或L图片, None)。
+    """
+    if img.mode == "P":
+        img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+    if img.mode in ("RGBA", "LA", "PA"):
+        alpha = img.getchannel("A")
+        return img.convert("L" if img.mode == "LA" else "RGB"), alpha
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    return img, None
+
+
+def merge_alpha(img: Image.Image, alpha: Optional[Image.Image]) -> Image.Image:
+    """将split_alpha拆出的透明通道合并回处理后的图片"""
+    if alpha is None:
+        return img
+    result = img.convert("LA" if img.mode == "L" else "RGBA")
+    result.putalpha(alpha)
+    return result
+
+
+# 分块处理的像素数，限制大图加噪时int16临时数组的内存占用
+GRAIN_CHUNK_PIXELS = 4 * 1024 * 1024
+
+
+def add_grain(img: Image.Image, amount: int) -> Image.Image:
+    """
+    给图片添加单色颗粒噪点：每个像素的所有颜色通道加上同一个 [-amount, amount] 内的均匀随机整数
+
+    RGB/L图片直接处理，RGBA/LA/P保留透明通道，其余模式先转换为RGB。
+    """
+    img, alpha = split_alpha(img)
+    pixels = np.array(img)
+    if amount > 0:
+        rng = np.random.default_rng()
+        height, width = pixels.shape[:2]
+        rows = max(1, GRAIN_CHUNK_PIXELS // max(1, width))
+        for start in range(0, height, rows):
+            block = pixels[start:start + rows].astype(np.int16)
+            noise = rng.integers(-amount, amount, size=block.shape[:2], endpoint=True, dtype=np.int16)
+            if block.ndim == 3:
+                noise = noise[:, :, None]
+            block += noise
+            np.clip(block, 0, 255, out=block)
+            pixels[start:start + rows] = block
+    return merge_alpha(Image.fromarray(pixels), alpha)
+
 
 class BasicFilters:
     """基础滤镜"""
@@ -23,26 +79,26 @@ class BasicFilters:
     @staticmethod
     @staticmethod
     def _apply_sepia(img: Image.Image, intensity: float) -> Image.Image:
-        """应用棕褐色滤镜"""
+        """应用棕褐色滤镜（灰度值经三张查找表映射到R/G/B，保留透明通道）"""
+        img, alpha = split_alpha(img)
         img_gray = img.convert("L")
-        img_sepia = Image.new("RGB", img.size)
-        
-        for x in range(img.width):
-            for y in range(img.height):
-                gray_value = img_gray.getpixel((x, y))
-                r = min(int(gray_value * 1.07 * intensity), 255)
-                g = min(int(gray_value * 0.74 * intensity), 255)
-                b = min(int(gray_value * 0.43 * intensity), 255)
-                img_sepia.putpixel((x, y), (r, g, b))
-        
-        return img_sepia
+
+        def channel_lut(factor: float) -> list:
+            return [max(0, min(int(value * factor * intensity), 255)) for value in range(256)]
+
+        img_sepia = Image.merge("RGB", (
+            img_gray.point(channel_lut(1.07)),
+            img_gray.point(channel_lut(0.74)),
+            img_gray.point(channel_lut(0.43))
+        ))
+        return merge_alpha(img_sepia, alpha)
     
     @staticmethod
     @staticmethod
     def _apply_blur(img: Image.Image, intensity: float) -> Image.Image:
         """应用模糊滤镜"""
         blur_radius = max(1, int(5 * intensity))
-        return img.filter(ImageFilter.GaussianBlur(radius=blur_radius))
+        return gaussian_blur_image(img, blur_radius)
     
     @staticmethod
     @staticmethod
@@ -1,6 +1,7 @@
 from PIL import Image, ImageFilter, ImageEnhance, ImageOps, ImageDraw
 import random
-from typing import Callable
+from typing import Callable, List
+from ...utils.point_ops import apply_point_ops
 
 class ColorFilters:
     """色彩效果滤镜"""
@@ -19,41 +20,39 @@ class ColorFilters:
         enhancer = ImageEnhance.Color(img)
         return enhancer.enhance(1.0 - intensity * 0.8)
     
+    @staticmethod
+    def _warm_ops(intensity: float) -> List[tuple]:
+        """暖色调的逐像素操作：增强红、绿通道，减弱蓝通道"""
+        return [("scale", (1 + intensity * 0.1, 1 + intensity * 0.05, 1 - intensity * 0.1))]
+
+    @staticmethod
+    def _sepia_ops(intensity: float) -> List[tuple]:
+        """棕褐色的逐像素操作：灰度值按通道系数映射到R/G/B"""
+        return [("grayscale",), ("scale", (1.07 * intensity, 0.74 * intensity, 0.43 * intensity))]
+
     @staticmethod
     @staticmethod
     def _apply_warm(img: Image.Image, intensity: float) -> Image.Image:
         """暖色调"""
-        r, g, b = img.split()
-        r = r.point(lambda x: min(255, int(x * (1 + intensity * 0.1))))
-        g = g.point(lambda x: min(255, int(x * (1 + intensity * 0.05))))
-        b = b.point(lambda x: max(0, int(x * (1 - intensity * 0.1))))
-        return Image.merge('RGB', (r, g, b))
+        return apply_point_ops(img, ColorFilters._warm_ops(intensity))
     
     @staticmethod
     @staticmethod
     def _apply_cool(img: Image.Image, intensity: float) -> Image.Image:
         """冷色调"""
-        r, g, b = img.split()
-        r = r.point(lambda x: max(0, int(x * (1 - intensity * 0.1))))
-        g = g.point(lambda x: min(255, int(x * (1 + intensity * 0.05))))
-        b = b.point(lambda x: min(255, int(x * (1 + intensity * 0.1))))
-        return Image.merge('RGB', (r, g, b))
+        return apply_point_ops(img, [("scale", (1 - intensity * 0.1, 1 + intensity * 0.05, 1 + intensity * 0.1))])
     
     @staticmethod
     @staticmethod
     def _apply_vintage(img: Image.Image, intensity: float) -> Image.Image:
         """复古效果"""
-        # 应用棕褐色效果
-        from .basic_filters import BasicFilters
-        sepia = BasicFilters._apply_sepia(img, intensity * 0.6)
-        # 降低饱和度
-        enhancer = ImageEnhance.Color(sepia)
-        vintage = enhancer.enhance(0.8)
-        # 降低对比度
-        enhancer = ImageEnhance.Contrast(vintage)
-        vintage = enhancer.enhance(0.9)
-        # 添加暖色调
-        return ColorFilters._apply_warm(vintage, intensity * 0.3)
+        # 棕褐色 -> 降低饱和度 -> 降低对比度 -> 暖色调，合并为一次逐像素运算
+        return apply_point_ops(img, [
+            *ColorFilters._sepia_ops(intensity * 0.6),
+            ("color", 0.8),
+            ("contrast", 0.9),
+            *ColorFilters._warm_ops(intensity * 0.3),
+        ])
     
     @staticmethod
     @staticmethod
@@ -74,7 +73,7 @@ class ColorFilters:
     def _apply_gamma(img: Image.Image, intensity: float) -> Image.Image:
         """伽马校正"""
         gamma = 0.5 + intensity * 1.5  # 0.5 to 2.0
-        return img.point(lambda x: int(255 * (x / 255) ** (1 / gamma)))
+        return apply_point_ops(img, [("gamma", gamma)])
     
     @staticmethod
     @staticmethod
@@ -1,6 +1,8 @@
 from PIL import Image, ImageFilter, ImageEnhance, ImageOps, ImageDraw
 import random
 from typing import Callable
+from ...utils.point_ops import apply_point_ops
+from ...utils.blur import gaussian_blur_image
 
 class CreativeFilters:
     """创意效果滤镜"""
@@ -14,7 +16,7 @@ class CreativeFilters:
         # 反转
         inverted = ImageOps.invert(gray)
         # 模糊
-        blurred = inverted.filter(ImageFilter.GaussianBlur(radius=5))
+        blurred = gaussian_blur_image(inverted, 5)
         # 反转回来
         pencil = ImageOps.invert(blurred)
         # 与原图混合
@@ -50,72 +52,37 @@ class CreativeFilters:
     @staticmethod
     def _apply_hdr(img: Image.Image, intensity: float) -> Image.Image:
         """HDR效果"""
-        # 增强对比度
-        enhancer = ImageEnhance.Contrast(img)
-        hdr = enhancer.enhance(1.5)
-        # 增加饱和度
-        enhancer = ImageEnhance.Color(hdr)
-        hdr = enhancer.enhance(1.3)
-        # 调整亮度
-        enhancer = ImageEnhance.Brightness(hdr)
-        hdr = enhancer.enhance(1.1)
-        return hdr
+        # 增强对比度 -> 增加饱和度 -> 调整亮度
+        return apply_point_ops(img, [("contrast", 1.5), ("color", 1.3), ("brightness", 1.1)])
     
     @staticmethod
     @staticmethod
     def _apply_cyberpunk(img: Image.Image, intensity: float) -> Image.Image:
         """赛博朋克效果"""
-        # 增强对比度
-        enhancer = ImageEnhance.Contrast(img)
-        cyber = enhancer.enhance(1.4)
-        # 调整颜色通道
-        r, g, b = cyber.split()
-        r = r.point(lambda x: min(255, int(x * (1 + intensity * 0.3))))
-        g = g.point(lambda x: min(255, int(x * (1 + intensity * 0.2))))
-        b = b.point(lambda x: min(255, int(x * (1 + intensity * 0.5))))
-        return Image.merge('RGB', (r, g, b))
+        # 增强对比度 -> 调整颜色通道
+        return apply_point_ops(img, [
+            ("contrast", 1.4),
+            ("scale", (1 + intensity * 0.3, 1 + intensity * 0.2, 1 + intensity * 0.5)),
+        ])
     
     @staticmethod
     @staticmethod
     def _apply_noir(img: Image.Image, intensity: float) -> Image.Image:
         """黑色电影效果"""
-        # 转换为黑白
-        noir = img.convert('L')
-        # 增强对比度
-        enhancer = ImageEnhance.Contrast(noir)
-        noir = enhancer.enhance(1.5)
-        # 降低亮度
-        enhancer = ImageEnhance.Brightness(noir)
-        noir = enhancer.enhance(0.9)
-        return noir.convert('RGB')
+        # 转换为黑白 -> 增强对比度 -> 降低亮度
+        return apply_point_ops(img, [("grayscale",), ("contrast", 1.5), ("brightness", 0.9)])
     
     @staticmethod
     @staticmethod
     def _apply_faded(img: Image.Image, intensity: float) -> Image.Image:
         """褪色效果"""
-        # 降低饱和度
-        enhancer = ImageEnhance.Color(img)
-        faded = enhancer.enhance(0.5)
-        # 增加亮度
-        enhancer = ImageEnhance.Brightness(faded)
-        faded = enhancer.enhance(1.2)
-        # 降低对比度
-        enhancer = ImageEnhance.Contrast(faded)
-        faded = enhancer.enhance(0.8)
-        return faded
+        # 降低饱和度 -> 增加亮度 -> 降低对比度
+        return apply_point_ops(img, [("color", 0.5), ("brightness", 1.2), ("contrast", 0.8)])
     
     @staticmethod
     @staticmethod
     def _apply_pastel(img: Image.Image, intensity: float) -> Image.Image:
         """柔和色彩效果"""
-        # 降低饱和度
-        enhancer = ImageEnhance.Color(img)
-        pastel = enhancer.enhance(0.7)
-        # 增加亮度
-        enhancer = ImageEnhance.Brightness(pastel)
-        pastel = enhancer.enhance(1.1)
-        # 降低对比度
-        enhancer = ImageEnhance.Contrast(pastel)
-        pastel = enhancer.enhance(0.9)
-        return pastel
+        # 降低饱和度 -> 增加亮度 -> 降低对比度
+        return apply_point_ops(img, [("color", 0.7), ("brightness", 1.1), ("contrast", 0.9)])
     
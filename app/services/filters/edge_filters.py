@@ -1,6 +1,7 @@
 from PIL import Image, ImageFilter, ImageEnhance, ImageOps, ImageDraw
 import random
 from typing import Callable
+from ...utils.blur import gaussian_blur_image
 
 class EdgeFilters:
     """边缘处理滤镜"""
@@ -46,7 +47,7 @@ class EdgeFilters:
     def _apply_unsharp_mask(img: Image.Image, intensity: float) -> Image.Image:
         """反锐化遮罩"""
         # 创建模糊版本
-        blurred = img.filter(ImageFilter.GaussianBlur(radius=2))
+        blurred = gaussian_blur_image(img, 2)
         # 计算差异
         diff = Image.blend(img, blurred, -intensity)
         return diff
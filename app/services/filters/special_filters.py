@@ -1,6 +1,9 @@
-from PIL import Image, ImageFilter, ImageEnhance, ImageOps, ImageDraw
+from PIL import Image, ImageEnhance, ImageOps
 import random
 from typing import Callable
+from .basic_filters import add_grain
+from ...utils import gradients
+from ...utils.blur import gaussian_blur_image
 
 class SpecialFilters:
     """特殊效果滤镜"""
@@ -24,7 +27,7 @@ class SpecialFilters:
     def _apply_glow(img: Image.Image, intensity: float) -> Image.Image:
         """发光效果"""
         # 创建发光效果
-        glow = img.filter(ImageFilter.GaussianBlur(radius=int(intensity * 10)))
+        glow = gaussian_blur_image(img, int(intensity * 10))
         # 增加亮度
         enhancer = ImageEnhance.Brightness(glow)
         glow = enhancer.enhance(1.5)
@@ -36,7 +39,7 @@ class SpecialFilters:
     def _apply_soft_focus(img: Image.Image, intensity: float) -> Image.Image:
         """柔焦效果"""
         blur_radius = int(intensity * 5)
-        soft = img.filter(ImageFilter.GaussianBlur(radius=blur_radius))
+        soft = gaussian_blur_image(img, blur_radius)
         # 与原图混合
         return Image.blend(img, soft, 0.5)
     
@@ -44,32 +47,13 @@ class SpecialFilters:
     @staticmethod
     def _apply_noise(img: Image.Image, intensity: float) -> Image.Image:
         """噪点效果"""
-        return FilterService._apply_film_grain(img, intensity)
+        return add_grain(img, int(intensity * 20))
     
     @staticmethod
     @staticmethod
     def _apply_vignette(img: Image.Image, intensity: float) -> Image.Image:
-        """暗角效果"""
-        width, height = img.size
-        # 创建暗角遮罩
-        mask = Image.new('L', (width, height), 0)
-        draw = ImageDraw.Draw(mask)
-        
-        # 计算中心点和半径
-        center_x, center_y = width // 2, height // 2
-        max_radius = min(width, height) // 2
-        
-        # 绘制径向渐变
-        for radius in range(max_radius, 0, -1):
-            alpha = int(255 * (1 - (radius / max_radius) * intensity))
-            draw.ellipse(
-                [center_x - radius, center_y - radius, center_x + radius, center_y + radius],
-                fill=alpha
-            )
-        
-        # 应用遮罩
-        vignette = Image.new('RGB', img.size, (0, 0, 0))
-        return Image.composite(img, vignette, mask)
+        """暗角效果：从中心到短边一半处线性变暗，外侧保持最大暗度"""
+        return gradients.apply_vignette(img, intensity)
     
     @staticmethod
     @staticmethod
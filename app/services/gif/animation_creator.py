@@ -1,8 +1,9 @@
 """GIF动画创建功能"""
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from typing import Tuple
 import numpy as np
 from app.utils.logger import logger
+from app.utils.fonts import font_registry
 
 
 class AnimationCreator:
@@ -44,11 +45,8 @@ class AnimationCreator:
             
             images = []
             
-            # 尝试加载字体
-            try:
-                font = ImageFont.truetype("arial.ttf", font_size)
-            except:
-                font = ImageFont.load_default()
+            # 加载字体
+            font = font_registry.get_font("Arial", font_size, text)
             
             for i in range(frames):
                 # 创建帧
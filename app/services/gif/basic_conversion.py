@@ -1,9 +1,17 @@
 """GIF基础转换功能"""
-from PIL import Image, ImageSequence
+from PIL import Image
 from typing import List, Tuple, Optional
 import io
 import numpy as np
 from app.utils.logger import logger
+from .encoder import (
+    GIF_PALETTE_SAMPLE_PIXELS,
+    GifEncoder,
+    fit_palette_from_samples,
+    palette_sample_positions,
+    sample_frame_pixels
+)
+from .formats import create_writer
 
 
 class BasicConversion:
@@ -14,90 +22,59 @@ class BasicConversion:
         images: List[Image.Image],
         duration: int = 500,
         loop: int = 0,
-        optimize: bool = True
+        optimize: bool = True,
+        output_format: str = "gif",
+        quality: Optional[int] = None
     ) -> bytes:
         """
-        将图片列表转换为GIF动画
+        将图片列表转换为GIF动画（或动画WebP、MP4）
         
         Args:
             images: 图片列表
             duration: 每帧持续时间（毫秒）
             loop: 循环次数（0为无限循环）
-            optimize: 是否优化
+            optimize: 是否优化（GIF只写出与上一帧相比变化的区域）
+            output_format: 输出格式（gif / webp / mp4）
+            quality: WebP/MP4的质量（1-100）
             
         Returns:
-            GIF字节数据
+            输出格式的字节数据
         """
-        logger.info(f"将{len(images)}张图片转换为GIF，持续时间: {duration}ms")
+        logger.info(f"将{len(images)}张图片转换为{output_format.upper()}，持续时间: {duration}ms")
         
         try:
             if not images:
                 raise ValueError("图片列表不能为空")
             
-            # 确保所有图片尺寸一致
+            # 所有图片尺寸与第一张一致，逐张转换，不再额外保存一份转换后的列表
             first_size = images[0].size
-            processed_images = []
             
-            for i, img in enumerate(images):
+            def prepare(img: Image.Image) -> np.ndarray:
                 if img.size != first_size:
                     # 调整尺寸到第一张图片的大小
                     img = img.resize(first_size, Image.Resampling.LANCZOS)
-                
-                # 转换为RGB模式（GIF需要）
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                processed_images.append(img)
+                return np.asarray(img.convert('RGBA'))
             
-            # 创建GIF
             output = io.BytesIO()
-            processed_images[0].save(
-                output,
-                format='GIF',
-                save_all=True,
-                append_images=processed_images[1:],
-                duration=duration,
-                loop=loop,
-                optimize=optimize
-            )
+            if output_format == "gif":
+                # 从均匀抽取的图片中采样像素拟合全局调色板
+                positions = palette_sample_positions(len(images))
+                per_frame = GIF_PALETTE_SAMPLE_PIXELS // len(positions)
+                palette = fit_palette_from_samples(
+                    [sample_frame_pixels(prepare(images[i]), per_frame) for i in positions], 255
+                )
+                # 优化时只写出与上一帧相比变化的区域
+                writer = GifEncoder(output, palette, loop, delta=optimize)
+            else:
+                writer = create_writer(output_format, output, loop, quality)
+            
+            # 逐帧写出
+            for img in images:
+                writer.add_frame(prepare(img), duration)
+            writer.close()
             
             return output.getvalue()
             
         except Exception as e:
             logger.error(f"图片转GIF失败: {str(e)}")
             raise
-    
-    @staticmethod
-    def gif_to_images(gif_bytes: bytes) -> List[Image.Image]:
-        """
-        将GIF动画分解为图片列表
-        
-        Args:
-            gif_bytes: GIF字节数据
-            
-        Returns:
-            图片列表
-        """
-        logger.info("将GIF分解为图片序列")
-        
-        try:
-            gif = Image.open(io.BytesIO(gif_bytes))
-            
-            if not getattr(gif, 'is_animated', False):
-                # 静态图片，直接返回
-                return [gif.copy()]
-            
-            frames = []
-            for frame in ImageSequence.Iterator(gif):
-                # 复制帧并转换为RGB
-                frame_copy = frame.copy()
-                if frame_copy.mode != 'RGB':
-                    frame_copy = frame_copy.convert('RGB')
-                frames.append(frame_copy)
-            
-            logger.info(f"成功提取{len(frames)}帧")
-            return frames
-            
-        except Exception as e:
-            logger.error(f"GIF分解失败: {str(e)}")
-            raise
@@ -0,0 +1,113 @@
+"""GIF综合处理功能（调整帧率、尺寸和颜色数）"""
+from typing import Optional, Tuple
+import functools
+from app.utils.logger import logger
+from .parallel import process_animation
+from .streaming import open_animation, resize_frame, stream_gif
+
+
+def quality_to_colors(quality: Optional[int]) -> int:
+    """把质量（1-100）换算为GIF颜色数（2-256），质量为空时使用256色"""
+    if not quality:
+        return 256
+    return max(2, min(256, round(256 * quality / 100)))
+
+
+def target_size(
+    size: Tuple[int, int],
+    width: Optional[int] = None,
+    height: Optional[int] = None
+) -> Tuple[int, int]:
+    """计算目标尺寸：只指定宽或高时保持原始比例"""
+    original_width, original_height = size
+    if width and height:
+        return width, height
+    if width:
+        return width, max(1, round(original_height * width / original_width))
+    if height:
+        return max(1, round(original_width * height / original_height)), height
+    return original_width, original_height
+
+
+class ComprehensiveProcessor:
+    """GIF综合处理功能"""
+
+    @staticmethod
+    def process_gif(
+        gif_bytes: bytes,
+        fps: Optional[int] = None,
+        quality: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        output_format: str = "gif"
+    ) -> bytes:
+        """
+        处理GIF文件：按实际帧时长调整帧率、缩放尺寸、按质量减少颜色数，逐帧流式处理
+
+        Args:
+            gif_bytes: GIF字节数据
+            fps: 目标帧率（None表示保持原帧率）
+            quality: 质量（1-100），GIF决定输出颜色数，WebP/MP4决定编码质量
+            width: 目标宽度（只指定宽或高时保持比例）
+            height: 目标高度
+            output_format: 输出格式（gif / webp / mp4）
+
+        Returns:
+            处理后的字节数据
+        """
+        logger.info(f"处理GIF: FPS={fps}, 质量={quality}, 尺寸={width}x{height}")
+
+        try:
+            gif, _ = open_animation(gif_bytes)
+            size = target_size(gif.size, width, height)
+            transform = functools.partial(resize_frame, size=size) if size != gif.size else None
+
+            return stream_gif(
+                gif_bytes,
+                transform=transform,
+                target_fps=fps,
+                max_colors=quality_to_colors(quality),
+                loop=gif.info.get('loop', 0),
+                output_format=output_format,
+                quality=quality
+            )
+
+        except Exception as e:
+            logger.error(f"处理GIF失败: {str(e)}")
+            raise
+
+    @staticmethod
+    async def process_gif_parallel(
+        gif_bytes: bytes,
+        fps: Optional[int] = None,
+        quality: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        output_format: str = "gif"
+    ) -> bytes:
+        """
+        处理GIF文件，参数与process_gif一致；需要缩放时各帧按块分发到计算执行器并行缩放
+
+        Returns:
+            处理后的字节数据
+        """
+        logger.info(f"并行处理GIF: FPS={fps}, 质量={quality}, 尺寸={width}x{height}")
+
+        try:
+            gif, _ = open_animation(gif_bytes)
+            size = target_size(gif.size, width, height)
+
+            return await process_animation(
+                gif_bytes,
+                resize_frame if size != gif.size else None,
+                kwargs={"size": size},
+                target_fps=fps,
+                max_colors=quality_to_colors(quality),
+                loop=gif.info.get('loop', 0),
+                output_format=output_format,
+                quality=quality
+            )
+
+        except Exception as e:
+            logger.error(f"并行处理GIF失败: {str(e)}")
+            raise
@@ -0,0 +1,254 @@
+"""GIF编码功能：全局调色板、帧间差异裁剪与按实际帧时长抽帧"""
+from PIL import Image, GifImagePlugin
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from app.filters.quantize import sample_pixels, map_to_indices
+
+# 拟合全局调色板时最多抽取的帧数（均匀分布在整个动画中）
+GIF_PALETTE_SAMPLE_FRAMES = 16
+
+# 拟合全局调色板时的最大采样像素数
+GIF_PALETTE_SAMPLE_PIXELS = 32 * 1024
+
+# alpha低于该值的像素视为透明
+GIF_ALPHA_THRESHOLD = 128
+
+# 帧处置方式：1 保留当前帧（下一帧叠加在上面），2 恢复为背景（透明）
+DISPOSAL_KEEP = 1
+DISPOSAL_BACKGROUND = 2
+
+
+def decimate_frames(
+    frames: Iterable[Tuple[np.ndarray, int]],
+    target_fps: Optional[int]
+) -> Iterator[Tuple[np.ndarray, int]]:
+    """
+    按实际帧时长抽帧：在时间轴上每 1000 / target_fps 毫秒保留第一个开始的帧，
+    被丢弃帧的时长累加到前一个保留帧上，动画总时长不变
+
+    Args:
+        frames: (帧, 时长毫秒) 序列
+        target_fps: 目标帧率，为空或不低于原帧率时保留所有帧
+
+    Yields:
+        (帧, 合并后的时长毫秒)
+    """
+    interval = 1000 / target_fps if target_fps and target_fps > 0 else 0
+    pending = None
+    elapsed = 0.0
+    next_tick = 0.0
+    for frame, duration in frames:
+        if pending is None or elapsed >= next_tick - 1e-6:
+            if pending is not None:
+                yield pending[0], pending[1]
+            pending = [frame, duration]
+            if interval:
+                next_tick = (elapsed // interval + 1) * interval
+        else:
+            pending[1] += duration
+        elapsed += duration
+    if pending is not None:
+        yield pending[0], pending[1]
+
+
+def sample_frame_pixels(frame: np.ndarray, count: int) -> np.ndarray:
+    """
+    从一帧中分层抽样不透明像素，用于拟合全局调色板
+
+    Args:
+        frame: 形状为 (H, W, 4) 的RGBA或 (H, W, 3) 的RGB uint8数组
+        count: 最大采样数
+
+    Returns:
+        形状为 (N, 3) 的uint8像素数组
+    """
+    channels = frame.shape[2] if frame.ndim == 3 else 1
+    pixels = frame.reshape(-1, channels)
+    if channels == 4:
+        pixels = pixels[pixels[:, 3] >= GIF_ALPHA_THRESHOLD]
+    return sample_pixels(pixels[:, :3], max(1, count))
+
+
+def fit_palette_from_samples(samples: Sequence[np.ndarray], max_colors: int) -> np.ndarray:
+    """
+    用中位切分在采样像素上拟合所有帧共用的调色板
+
+    Args:
+        samples: 各帧的采样像素（形状 (N, 3)）
+        max_colors: 调色板颜色数量（不含透明色）
+
+    Returns:
+        形状为 (K, 3) 的uint8调色板，1 <= K <= max_colors
+    """
+    samples = [pixels for pixels in samples if len(pixels)]
+    if not samples:
+        return np.zeros((1, 3), dtype=np.uint8)
+
+    pixels = np.ascontiguousarray(np.concatenate(samples))
+    strip = Image.fromarray(pixels.reshape(-1, 1, 3))
+    quantized = strip.quantize(colors=max(1, min(max_colors, 255)), method=Image.Quantize.MEDIANCUT)
+    count = int(np.asarray(quantized).max()) + 1
+    return np.array(quantized.getpalette()[:count * 3], dtype=np.uint8).reshape(-1, 3)
+
+
+def palette_sample_positions(frame_count: int) -> List[int]:
+    """拟合全局调色板时抽取的帧序号（均匀分布在整个动画中）"""
+    if frame_count <= GIF_PALETTE_SAMPLE_FRAMES:
+        return list(range(frame_count))
+    positions = np.linspace(0, frame_count - 1, GIF_PALETTE_SAMPLE_FRAMES)
+    return sorted({int(round(position)) for position in positions})
+
+
+class _PendingFrame:
+    """已确定内容、等待下一帧决定处置方式后再写出的帧"""
+
+    def __init__(self, indices: np.ndarray, rect: Tuple[int, int, int, int], data: np.ndarray,
+                 duration: int):
+        self.indices = indices
+        self.rect = rect
+        self.data = data
+        self.duration = duration
+        self.disposal = DISPOSAL_KEEP
+
+
+class GifEncoder:
+    """
+    逐帧写入GIF：所有帧共用一个全局调色板（通过颜色立方体查表映射），
+    每帧只写出与上一帧相比变化的矩形区域，区域内未变化的像素填充透明色以提高LZW压缩率。
+    帧内容先在缓冲中保留一帧，完全相同的帧只累加时长；源帧出现透明区域时，
+    上一帧改为恢复背景（透明）处置。
+    """
+
+    def __init__(self, fp: BinaryIO, palette: np.ndarray, loop: Optional[int] = 0, delta: bool = True):
+        """
+        Args:
+            fp: 输出流
+            palette: 形状为 (K, 3) 的uint8调色板，K不超过255（最后一个序号留作透明色）
+            loop: 循环次数（0为无限循环，None为只播放一次）
+            delta: 是否只写出变化区域，False时每帧写出完整画面
+        """
+        palette = np.ascontiguousarray(palette, dtype=np.uint8)
+        if not 1 <= len(palette) <= 255:
+            raise ValueError(f"GIF调色板颜色数量必须在1-255之间: {len(palette)}")
+        self.fp = fp
+        self.palette = palette
+        self.transparent_index = len(palette)
+        self.loop = loop
+        self.delta = delta
+        self.frame_count = 0
+        self._palette_bytes = np.concatenate([palette, np.zeros((1, 3), dtype=np.uint8)]).tobytes()
+        self._pending: Optional[_PendingFrame] = None
+        self._elapsed_ms = 0
+        self._header_written = False
+
+    def map_frame(self, frame: np.ndarray) -> np.ndarray:
+        """把RGBA（或RGB）帧映射为调色板序号，透明像素使用透明色序号"""
+        indices = map_to_indices(frame, self.palette)
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            indices[frame[..., 3] < GIF_ALPHA_THRESHOLD] = self.transparent_index
+        return indices.astype(np.uint8, copy=False)
+
+    def add_frame(self, frame: np.ndarray, duration: int):
+        """
+        添加一帧
+
+        Args:
+            frame: 形状为 (H, W, 4) 的RGBA或 (H, W, 3) 的RGB uint8数组，所有帧尺寸相同
+            duration: 帧时长（毫秒）
+        """
+        self.add_indexed_frame(self.map_frame(frame), duration)
+
+    def add_indexed_frame(self, indices: np.ndarray, duration: int):
+        """添加已映射为调色板序号的帧"""
+        pending = self._pending
+        if pending is None:
+            height, width = indices.shape
+            self._pending = _PendingFrame(indices, (0, 0, width, height), indices, duration)
+            return
+        if indices.shape != pending.indices.shape:
+            raise ValueError(f"GIF帧尺寸不一致: {indices.shape[::-1]} != {pending.indices.shape[::-1]}")
+
+        transparent = self.transparent_index
+        canvas = pending.indices
+        changed = indices != canvas
+        if not changed.any():
+            # 与上一帧完全相同，只延长上一帧的时长
+            pending.duration += duration
+            return
+
+        # 当前帧中变为透明的像素无法通过叠加实现，上一帧改为恢复背景处置，
+        # 其矩形扩大到覆盖这些像素，处置后矩形内变为透明
+        cleared = changed & (indices == transparent)
+        if cleared.any():
+            pending.rect = _union(pending.rect, _bbox(cleared))
+            left, top, right, bottom = pending.rect
+            pending.data = pending.indices[top:bottom, left:right]
+            pending.disposal = DISPOSAL_BACKGROUND
+            canvas = canvas.copy()
+            canvas[top:bottom, left:right] = transparent
+            changed = indices != canvas
+
+        self._flush()
+        if not self.delta:
+            height, width = indices.shape
+            self._pending = _PendingFrame(indices, (0, 0, width, height), indices, duration)
+            return
+        left, top, right, bottom = rect = _bbox(changed)
+        data = indices[top:bottom, left:right].copy()
+        data[~changed[top:bottom, left:right]] = transparent
+        self._pending = _PendingFrame(indices, rect, data, duration)
+
+    def close(self):
+        """写出最后一帧和文件结束符"""
+        self._flush()
+        if not self._header_written:
+            raise ValueError("GIF没有任何帧")
+        self.fp.write(b";")
+
+    def _flush(self):
+        pending = self._pending
+        if pending is None:
+            return
+        if not self._header_written:
+            self._write_header(pending.indices.shape)
+
+        # GIF帧时长以10毫秒为单位，按累计时间取整避免误差累积
+        start = self._elapsed_ms
+        self._elapsed_ms += pending.duration
+        duration = (round(self._elapsed_ms / 10) - round(start / 10)) * 10
+
+        frame = self._to_image(pending.data)
+        for chunk in GifImagePlugin.getdata(
+            frame, offset=pending.rect[:2],
+            duration=duration, disposal=pending.disposal, transparency=self.transparent_index
+        ):
+            self.fp.write(chunk)
+        self.frame_count += 1
+        self._pending = None
+
+    def _write_header(self, shape: Tuple[int, int]):
+        height, width = shape
+        screen = self._to_image(np.full((height, width), self.transparent_index, dtype=np.uint8))
+        info = {"background": self.transparent_index, "transparency": self.transparent_index}
+        if self.loop is not None:
+            info["loop"] = self.loop
+        header, _ = GifImagePlugin.getheader(screen, info=info)
+        for chunk in header:
+            self.fp.write(chunk)
+        self._header_written = True
+
+    def _to_image(self, indices: np.ndarray) -> Image.Image:
+        height, width = indices.shape
+        image = Image.frombytes("P", (width, height), np.ascontiguousarray(indices).tobytes())
+        image.putpalette(self._palette_bytes)
+        return image
+
+
+def _bbox(mask: np.ndarray) -> Tuple[int, int, int, int]:
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
+def _union(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
@@ -0,0 +1,272 @@
+"""动画输出格式：GIF / 动画WebP / H.264 MP4，各写出器与 GifEncoder 接口一致（add_frame / close）"""
+from PIL import Image
+from fractions import Fraction
+from typing import BinaryIO, List, Optional
+import os
+import subprocess
+import tempfile
+import numpy as np
+from app.config import config
+from app.utils.logger import logger
+
+OUTPUT_FORMATS = ("gif", "webp", "mp4")
+
+CONTENT_TYPES = {
+    "gif": "image/gif",
+    "webp": "image/webp",
+    "mp4": "video/mp4",
+}
+
+# MP4输出的最高帧率：帧时长短于 1000/MP4_MAX_FPS 毫秒时按该帧率取整
+MP4_MAX_FPS = 60
+
+# MP4没有透明通道，透明像素合成到该背景色上
+MP4_BACKGROUND = (255, 255, 255)
+
+
+def normalize_output_format(output_format: Optional[str]) -> str:
+    """校验并规范化输出格式（大小写不敏感，空值为gif）"""
+    output_format = (output_format or "gif").lower()
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"不支持的输出格式: {output_format}，支持: {', '.join(OUTPUT_FORMATS)}")
+    return output_format
+
+
+def output_filename(stem: str, output_format: str) -> str:
+    """按输出格式生成文件名"""
+    return f"{stem}.{output_format}"
+
+
+def quality_to_crf(quality: Optional[int]) -> int:
+    """把质量（1-100）换算为x264的CRF（质量90约为21，越小画质越高）"""
+    quality = 90 if quality is None else max(1, min(100, quality))
+    return max(0, min(51, round(18 + (100 - quality) * 0.33)))
+
+
+class WebPWriter:
+    """
+    动画WebP写出器：由libwebp做帧间差异，支持透明通道。
+    只有第一帧为关键帧（Pillow默认每3-5帧插入一个关键帧，静止背景会被反复完整编码），
+    并允许每帧在有损和无损之间选择体积更小的方式。
+    libwebp的动画编码器需要一次性接收所有帧，帧在close时统一编码；
+    缓存的帧像素数之和受 max_pixels 限制，与GIF/MP4逐帧写出时一样控制内存上限，
+    与上一帧完全相同的帧只累加时长，不重复缓存。
+    """
+
+    def __init__(self, fp: BinaryIO, loop: Optional[int] = 0, quality: Optional[int] = 80,
+                 lossless: bool = False, method: int = 4, max_pixels: Optional[int] = None):
+        """
+        Args:
+            fp: 输出流
+            loop: 循环次数（0为无限循环，None为只播放一次）
+            quality: 质量（1-100）
+            lossless: 是否无损编码
+            method: 压缩速度与体积的权衡（0最快，6体积最小）
+            max_pixels: 缓存的帧像素数之和的上限，默认使用配置，<=0 表示不限制
+        """
+        self.fp = fp
+        self.loop = loop
+        self.quality = 80 if quality is None else quality
+        self.lossless = lossless
+        self.method = method
+        self.max_pixels = config.WEBP_MAX_PIXELS if max_pixels is None else max_pixels
+        self.frame_count = 0
+        self._frames: List[Image.Image] = []
+        self._durations: List[int] = []
+        self._pixels = 0
+
+    def add_frame(self, frame: np.ndarray, duration: int):
+        """添加一帧（RGBA或RGB uint8数组），超出像素预算时抛出ValueError"""
+        duration = max(1, int(duration))
+        if self._frames and np.array_equal(frame, np.asarray(self._frames[-1])):
+            self._durations[-1] += duration
+            return
+
+        height, width = frame.shape[:2]
+        self._pixels += width * height
+        if self.max_pixels and self._pixels > self.max_pixels:
+            count = len(self._frames) + 1
+            self._frames.clear()
+            raise ValueError(
+                f"WebP动画像素数超过限制: 第{count}帧({width}x{height})后累计{self._pixels}像素, "
+                f"上限{self.max_pixels}像素，请降低帧率或尺寸"
+            )
+        self._frames.append(Image.fromarray(frame))
+        self._durations.append(duration)
+        self.frame_count += 1
+
+    def close(self):
+        """编码并写出所有帧"""
+        if not self._frames:
+            raise ValueError("WebP没有任何帧")
+        first, *rest = self._frames
+        first.save(
+            self.fp,
+            format="WEBP",
+            save_all=True,
+            append_images=rest,
+            duration=self._durations,
+            loop=1 if self.loop is None else self.loop,
+            quality=self.quality,
+            lossless=self.lossless,
+            method=self.method,
+            kmin=0,
+            kmax=0,
+            allow_mixed=not self.lossless
+        )
+        self._frames.clear()
+
+
+class Mp4Writer:
+    """
+    H.264 MP4写出器：逐帧把RGB原始像素写入ffmpeg标准输入，内存中不保留帧。
+
+    MP4使用固定帧率，帧率取第一帧时长对应的帧率（不超过MP4_MAX_FPS），
+    时长不同的帧按累计时间重复写入，重复帧在H.264中几乎不占空间。
+    """
+
+    def __init__(self, fp: BinaryIO, quality: Optional[int] = 90, threads: Optional[int] = None,
+                 timeout: Optional[float] = None, preset: str = "veryfast"):
+        """
+        Args:
+            fp: 输出流
+            quality: 质量（1-100），换算为CRF
+            threads: ffmpeg编码线程数上限，默认使用配置
+            timeout: 写完所有帧后等待ffmpeg结束的超时时间（秒），默认使用配置
+            preset: x264编码速度预设
+        """
+        self.fp = fp
+        self.crf = quality_to_crf(quality)
+        self.threads = threads or config.FFMPEG_THREADS
+        self.timeout = config.FFMPEG_TIMEOUT if timeout is None else timeout
+        self.preset = preset
+        self.frame_count = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._rate: Optional[Fraction] = None
+        self._elapsed_ms = 0
+        self._written = 0
+        self._size = None
+        self._output = None
+        self._stderr = None
+
+    def add_frame(self, frame: np.ndarray, duration: int):
+        """添加一帧（RGBA或RGB uint8数组，所有帧尺寸相同）"""
+        rgb = _flatten_alpha(frame)
+        height, width = rgb.shape[:2]
+        if self._process is None:
+            rate = Fraction(1000, max(1, int(duration)))
+            self._rate = min(rate, Fraction(MP4_MAX_FPS))
+            self._start((width, height))
+        elif (width, height) != self._size:
+            raise ValueError(f"MP4帧尺寸不一致: {(width, height)} != {self._size}")
+
+        # 按累计时间计算该帧需要写入的次数，避免取整误差累积
+        self._elapsed_ms += duration
+        target = max(self._written + 1, round(self._elapsed_ms * self._rate / 1000))
+        data = np.ascontiguousarray(rgb).tobytes()
+        try:
+            for _ in range(target - self._written):
+                self._process.stdin.write(data)
+        except BrokenPipeError:
+            self._fail()
+        self._written = target
+        self.frame_count += 1
+
+    def close(self):
+        """结束编码并把MP4写入输出流"""
+        if self._process is None:
+            raise ValueError("MP4没有任何帧")
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=self.timeout or None)
+        except BrokenPipeError:
+            pass
+        except subprocess.TimeoutExpired:
+            self._cleanup()
+            raise RuntimeError(f"MP4编码超时: 超过{self.timeout}秒")
+        if self._process.returncode != 0:
+            self._fail()
+        try:
+            with open(self._output, "rb") as f:
+                self.fp.write(f.read())
+        finally:
+            self._cleanup()
+
+    def _start(self, size):
+        width, height = self._size = size
+        # 输出写入临时文件以便 faststart 把索引移到文件头，浏览器可边下载边播放
+        handle, self._output = tempfile.mkstemp(suffix=".mp4")
+        os.close(handle)
+        self._stderr = tempfile.TemporaryFile()
+        cmd = [
+            config.FFMPEG_PATH, "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}",
+            "-r", f"{self._rate.numerator}/{self._rate.denominator}", "-i", "pipe:0",
+            # yuv420p要求宽高为偶数
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-c:v", "libx264", "-preset", self.preset, "-crf", str(self.crf),
+            "-pix_fmt", "yuv420p", "-threads", str(self.threads),
+            "-movflags", "+faststart", self._output
+        ]
+        logger.info(f"执行ffmpeg命令: {' '.join(cmd)}")
+        try:
+            self._process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                             stderr=self._stderr)
+        except FileNotFoundError:
+            self._cleanup()
+            raise RuntimeError(f"未找到ffmpeg可执行文件: {config.FFMPEG_PATH}")
+
+    def _fail(self):
+        message = ""
+        if self._stderr is not None:
+            self._process.wait()
+            self._stderr.seek(0)
+            message = self._stderr.read().decode("utf-8", errors="replace")[-2000:]
+        self._cleanup()
+        logger.error(f"ffmpeg错误: {message}")
+        raise RuntimeError(f"MP4编码失败: {message}")
+
+    def _cleanup(self):
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
+        if self._output and os.path.exists(self._output):
+            os.unlink(self._output)
+        self._output = None
+
+    def __del__(self):
+        # 编码中途出错时（未调用close）终止ffmpeg并删除临时文件
+        self._cleanup()
+
+
+def create_writer(output_format: str, fp: BinaryIO, loop: Optional[int] = 0,
+                  quality: Optional[int] = None):
+    """
+    创建WebP或MP4写出器（GIF需要先拟合调色板，直接使用 GifEncoder）
+
+    Args:
+        output_format: "webp" 或 "mp4"
+        fp: 输出流
+        loop: 循环次数（MP4忽略）
+        quality: 质量（1-100）
+    """
+    if output_format == "webp":
+        return WebPWriter(fp, loop, quality)
+    if output_format == "mp4":
+        return Mp4Writer(fp, quality)
+    raise ValueError(f"不支持的写出器格式: {output_format}")
+
+
+def _flatten_alpha(frame: np.ndarray) -> np.ndarray:
+    """把RGBA帧按alpha合成到背景色上，返回RGB数组"""
+    if frame.ndim != 3 or frame.shape[2] != 4:
+        return frame
+    alpha = frame[..., 3:4]
+    if alpha.min() == 255:
+        return frame[..., :3]
+    background = np.array(MP4_BACKGROUND, dtype=np.uint16)
+    rgb = (frame[..., :3].astype(np.uint16) * alpha + background * (255 - alpha) + 127) // 255
+    return rgb.astype(np.uint8)
@@ -1,8 +1,9 @@
 """GIF优化处理功能"""
-from PIL import Image, ImageSequence
 from typing import Optional
-import io
+import functools
 from app.utils.logger import logger
+from .parallel import process_animation
+from .streaming import open_animation, resize_frame, stream_gif
 
 
 class Optimization:
@@ -13,81 +14,100 @@ class Optimization:
         gif_bytes: bytes,
         max_colors: int = 128,
         resize_factor: float = 1.0,
-        target_fps: Optional[int] = None
+        target_fps: Optional[int] = None,
+        output_format: str = "gif",
+        quality: Optional[int] = None
     ) -> bytes:
         """
-        优化GIF文件大小
+        优化GIF文件大小（也可转为体积更小的动画WebP或MP4）
         
         Args:
             gif_bytes: 原始GIF字节数据
             max_colors: 最大颜色数
             resize_factor: 缩放比例
-            target_fps: 目标帧率
+            target_fps: 目标帧率（按每帧的实际时长抽帧）
+            output_format: 输出格式（gif / webp / mp4）
+            quality: WebP/MP4的质量（1-100）
             
         Returns:
-            优化后的GIF字节数据
+            优化后的字节数据
         """
         logger.info(f"优化GIF: 最大颜色数={max_colors}, 缩放比例={resize_factor}, 目标FPS={target_fps}")
         
         try:
-            gif = Image.open(io.BytesIO(gif_bytes))
-            frames = []
-            durations = []
+            # 只读取文件头获取尺寸，逐帧流式处理
+            gif, _ = open_animation(gif_bytes)
+            transform = None
+            if resize_factor != 1.0:
+                new_size = (
+                    max(1, int(gif.width * resize_factor)),
+                    max(1, int(gif.height * resize_factor))
+                )
+                transform = functools.partial(resize_frame, size=new_size)
             
-            # 获取原始帧信息
-            original_duration = gif.info.get('duration', 100)
-            
-            # 处理每一帧
-            frame_count = 0
-            for i, frame in enumerate(ImageSequence.Iterator(gif)):
-                # 如果设置了目标FPS，可能需要跳过一些帧
-                if target_fps and i % (30 // target_fps) != 0:
-                    continue
-                
-                # 缩放
-                if resize_factor != 1.0:
-                    new_size = (
-                        int(frame.width * resize_factor),
-                        int(frame.height * resize_factor)
-                    )
-                    frame = frame.resize(new_size, Image.Resampling.LANCZOS)
-                
-                # 减少颜色数
-                if frame.mode != 'P':
-                    frame = frame.convert('P', palette=Image.ADAPTIVE, colors=max_colors)
-                else:
-                    # 重新量化已经是P模式的图片
-                    frame = frame.quantize(colors=max_colors)
-                
-                frames.append(frame)
-                durations.append(frame.info.get('duration', original_duration))
-                frame_count += 1
-            
-            if not frames:
-                raise ValueError("优化后没有剩余帧")
-            
-            # 保存优化后的GIF
-            output = io.BytesIO()
-            frames[0].save(
-                output,
-                format='GIF',
-                save_all=True,
-                append_images=frames[1:],
-                duration=durations,
+            # 所有帧共用一个调色板，按实际帧时长抽帧，只写出与上一帧相比变化的区域
+            result = stream_gif(
+                gif_bytes,
+                transform=transform,
+                target_fps=target_fps,
+                max_colors=max_colors,
                 loop=gif.info.get('loop', 0),
-                optimize=True
+                output_format=output_format,
+                quality=quality
             )
             
             original_size = len(gif_bytes)
-            optimized_size = output.tell()
+            optimized_size = len(result)
             compression_ratio = (1 - optimized_size / original_size) * 100
             
             logger.info(
                 f"GIF优化成功: {original_size}字节 -> {optimized_size}字节 "
-                f"(压缩率{compression_ratio:.1f}%), {frame_count}帧"
+                f"(压缩率{compression_ratio:.1f}%)"
+            )
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"优化GIF失败: {str(e)}")
+            raise
+    
+    @staticmethod
+    async def optimize_gif_parallel(
+        gif_bytes: bytes,
+        max_colors: int = 128,
+        resize_factor: float = 1.0,
+        target_fps: Optional[int] = None,
+        output_format: str = "gif",
+        quality: Optional[int] = None
+    ) -> bytes:
+        """
+        优化GIF文件大小，参数与optimize_gif一致；需要缩放时各帧按块分发到计算执行器并行缩放
+        
+        Returns:
+            优化后的字节数据
+        """
+        logger.info(f"并行优化GIF: 最大颜色数={max_colors}, 缩放比例={resize_factor}, 目标FPS={target_fps}")
+        
+        try:
+            gif, _ = open_animation(gif_bytes)
+            new_size = (
+                max(1, int(gif.width * resize_factor)),
+                max(1, int(gif.height * resize_factor))
+            )
+            
+            result = await process_animation(
+                gif_bytes,
+                resize_frame if resize_factor != 1.0 else None,
+                kwargs={"size": new_size},
+                target_fps=target_fps,
+                max_colors=max_colors,
+                loop=gif.info.get('loop', 0),
+                output_format=output_format,
+                quality=quality
             )
             
-            return output.getvalue()
+            logger.info(f"GIF优化成功: {len(gif_bytes)}字节 -> {len(result)}字节")
+            return result
             
         except Exception as e:
             logger.error(f"优化GIF失败: {str(e)}")
@@ -0,0 +1,193 @@
+"""动画逐帧并行处理功能：把单帧处理函数按块分发到计算执行器，按原顺序重组后再映射调色板写出"""
+from PIL import Image, ImageSequence
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import asyncio
+import io
+import itertools
+import numpy as np
+from app.config import config
+from app.utils.compute_executor import compute_executor, run_compute
+from app.utils.logger import logger
+from .encoder import (
+    GIF_PALETTE_SAMPLE_PIXELS,
+    GifEncoder,
+    decimate_frames,
+    fit_palette_from_samples,
+    palette_sample_positions,
+    sample_frame_pixels
+)
+from .formats import create_writer
+from .streaming import iter_frames, open_animation
+
+# 单帧处理函数：第一个参数为PIL图片，返回处理后的PIL图片（进程池模式下需可pickle）
+FrameFunction = Callable[..., Image.Image]
+
+
+def apply_frame_function(
+    frames: List[np.ndarray],
+    func: FrameFunction,
+    args: Sequence[Any] = (),
+    kwargs: Optional[Dict[str, Any]] = None
+) -> List[np.ndarray]:
+    """
+    在计算执行器中对一块帧依次调用单帧处理函数
+
+    处理函数返回不带透明通道的图片（如水印输出RGB）且尺寸不变时，沿用源帧的透明通道。
+
+    Args:
+        frames: RGBA帧数组列表
+        func: 单帧处理函数
+        args: 处理函数的其余位置参数
+        kwargs: 处理函数的关键字参数
+
+    Returns:
+        处理后的RGBA帧数组列表，顺序与输入一致
+    """
+    results = []
+    for frame in frames:
+        source = Image.fromarray(frame)
+        result = func(source, *args, **(kwargs or {}))
+        if "A" not in result.getbands() and result.size == source.size and frame[..., 3].min() < 255:
+            result = result.convert("RGB")
+            result.putalpha(source.getchannel("A"))
+        results.append(np.asarray(result.convert("RGBA")))
+    return results
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def map_frame_chunks(
+    chunks: Iterator[List[Tuple[np.ndarray, Any]]],
+    func: Optional[FrameFunction],
+    consume: Callable[[List[np.ndarray], List[Any]], None],
+    args: Sequence[Any] = (),
+    kwargs: Optional[Dict[str, Any]] = None
+):
+    """
+    逐块解码、并行处理、按顺序消费
+
+    解码（chunks迭代）和消费（如调色板映射、写出）在线程中顺序执行，不阻塞事件循环；
+    每块帧作为一个计算任务提交，同时在途的块数不超过执行器的worker数，内存中的帧数有上限。
+
+    Args:
+        chunks: 同步迭代器，每次产生一块 (帧数组, 附带数据) 列表
+        func: 单帧处理函数，为空时不做处理
+        consume: 按原顺序接收每块处理结果 (帧数组列表, 附带数据列表)
+        args: 处理函数的其余位置参数
+        kwargs: 处理函数的关键字参数
+    """
+    in_flight: deque = deque()
+    max_in_flight = max(1, compute_executor.max_workers)
+
+    async def drain_one():
+        task, extras = in_flight.popleft()
+        frames = await task
+        await asyncio.to_thread(consume, frames, extras)
+
+    try:
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                break
+            frames = [frame for frame, _ in chunk]
+            extras = [extra for _, extra in chunk]
+            if func is None:
+                await asyncio.to_thread(consume, frames, extras)
+                continue
+            task = asyncio.ensure_future(run_compute(apply_frame_function, frames, func, tuple(args), kwargs))
+            in_flight.append((task, extras))
+            if len(in_flight) >= max_in_flight:
+                await drain_one()
+        while in_flight:
+            await drain_one()
+    finally:
+        for task, _ in in_flight:
+            task.cancel()
+
+
+async def process_animation(
+    data: bytes,
+    func: Optional[FrameFunction] = None,
+    args: Sequence[Any] = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+    target_fps: Optional[int] = None,
+    max_colors: int = 256,
+    loop: Optional[int] = 0,
+    chunk_size: Optional[int] = None,
+    output_format: str = "gif",
+    quality: Optional[int] = None
+) -> bytes:
+    """
+    对动画的每一帧并行执行单帧处理函数并输出GIF（或动画WebP、MP4）
+
+    GIF与 stream_gif 相同分两遍：第一遍只处理均匀抽取的少量帧并采样像素拟合全局调色板，
+    第二遍逐帧解码、抽帧、并行处理，按原顺序映射调色板并增量写出。WebP和MP4只解码一遍。
+
+    Args:
+        data: 输入动画字节数据
+        func: 单帧处理函数（需为确定性的，采样和编码时会分别调用）
+        args: 处理函数的其余位置参数
+        kwargs: 处理函数的关键字参数
+        target_fps: 目标帧率（按实际帧时长抽帧）
+        max_colors: 最大颜色数（含透明色，仅GIF）
+        loop: 循环次数（0为无限循环）
+        chunk_size: 每个计算任务包含的帧数，默认使用配置
+        output_format: 输出格式（gif / webp / mp4）
+        quality: WebP/MP4的质量（1-100）
+
+    Returns:
+        输出格式的字节数据
+    """
+    chunk_size = max(1, chunk_size or config.GIF_FRAME_CHUNK_SIZE)
+    image, frame_count = open_animation(data)
+    output = io.BytesIO()
+
+    if output_format == "gif":
+        # 第一遍：抽样帧 -> 并行处理 -> 采样像素
+        positions = palette_sample_positions(frame_count)
+        per_frame = GIF_PALETTE_SAMPLE_PIXELS // len(positions)
+        samples: List[np.ndarray] = []
+
+        def sampled_frames():
+            wanted = set(positions)
+            for index, frame in enumerate(ImageSequence.Iterator(image)):
+                if index in wanted:
+                    yield np.asarray(frame.convert("RGBA")), index
+                if index >= positions[-1]:
+                    return
+
+        def collect_samples(frames: List[np.ndarray], _):
+            samples.extend(sample_frame_pixels(frame, per_frame) for frame in frames)
+
+        await map_frame_chunks(_chunked(sampled_frames(), chunk_size), func, collect_samples, args, kwargs)
+        palette = fit_palette_from_samples(samples, min(max_colors, 256) - 1)
+        writer = GifEncoder(output, palette, loop)
+    else:
+        writer = create_writer(output_format, output, loop, quality)
+
+    # 第二遍：逐帧解码 -> 抽帧 -> 并行处理 -> 按顺序映射调色板并写出
+    source_frames = (
+        (np.asarray(frame), duration)
+        for frame, duration in decimate_frames(iter_frames(image), target_fps)
+    )
+
+    def write_frames(frames: List[np.ndarray], durations: List[int]):
+        for frame, duration in zip(frames, durations):
+            writer.add_frame(frame, duration)
+
+    await map_frame_chunks(_chunked(source_frames, chunk_size), func, write_frames, args, kwargs)
+    await asyncio.to_thread(writer.close)
+
+    logger.info(
+        f"动画逐帧并行处理完成({output_format}): {frame_count}帧 -> 写出{writer.frame_count}帧, "
+        f"{output.tell()}字节"
+    )
+    return output.getvalue()
@@ -0,0 +1,182 @@
+"""GIF流式处理功能：逐帧解码 -> 变换 -> 调色板映射 -> 增量写出，内存中只保留常数个帧"""
+from PIL import Image, ImageSequence
+from typing import Callable, Iterator, List, Optional, Tuple
+import io
+import numpy as np
+from app.config import config
+from app.utils.image_utils import ImageUtils
+from app.utils.logger import logger
+from .encoder import (
+    GIF_PALETTE_SAMPLE_PIXELS,
+    GifEncoder,
+    decimate_frames,
+    fit_palette_from_samples,
+    palette_sample_positions,
+    sample_frame_pixels
+)
+from .formats import create_writer
+
+# 单帧变换：输入输出均为RGBA图片
+FrameTransform = Callable[[Image.Image], Image.Image]
+
+
+def open_animation(
+    data: bytes,
+    max_frames: Optional[int] = None,
+    max_pixels: Optional[int] = None
+) -> Tuple[Image.Image, int]:
+    """
+    打开动画图片并检查帧数和像素预算（只读取文件头，不解码帧）
+
+    Args:
+        data: GIF（或其他动画格式）字节数据
+        max_frames: 最大帧数，默认使用配置
+        max_pixels: 所有帧画布像素数之和的上限，默认使用配置
+
+    Returns:
+        (图片对象, 帧数)
+    """
+    max_frames = config.GIF_MAX_FRAMES if max_frames is None else max_frames
+    max_pixels = config.GIF_MAX_PIXELS if max_pixels is None else max_pixels
+
+    image = Image.open(io.BytesIO(data))
+    frame_count = getattr(image, "n_frames", 1)
+    total_pixels = frame_count * image.width * image.height
+    if max_frames and frame_count > max_frames:
+        raise ValueError(f"动画帧数超过限制: {frame_count} > {max_frames}")
+    if max_pixels and total_pixels > max_pixels:
+        raise ValueError(
+            f"动画总像素数超过限制: {frame_count}帧 x {image.width}x{image.height} = {total_pixels} > {max_pixels}"
+        )
+    return image, frame_count
+
+
+def iter_frames(image: Image.Image) -> Iterator[Tuple[Image.Image, int]]:
+    """
+    逐帧解码（帧合成由Pillow处理，得到完整画面），每次只生成一帧
+
+    Yields:
+        (RGBA帧, 时长毫秒)
+    """
+    default_duration = image.info.get("duration", 100)
+    for frame in ImageSequence.Iterator(image):
+        yield frame.convert("RGBA"), frame.info.get("duration", default_duration)
+
+
+def resize_frame(frame: Image.Image, size: Tuple[int, int]) -> Image.Image:
+    """单帧缩放变换（配合 functools.partial 使用）"""
+    if frame.size == size:
+        return frame
+    return frame.resize(size, Image.Resampling.LANCZOS)
+
+
+def _apply(frame: Image.Image, transform: Optional[FrameTransform]) -> np.ndarray:
+    if transform is not None:
+        frame = transform(frame)
+        if frame.mode != "RGBA":
+            frame = frame.convert("RGBA")
+    return np.asarray(frame)
+
+
+def stream_gif(
+    data: bytes,
+    transform: Optional[FrameTransform] = None,
+    target_fps: Optional[int] = None,
+    max_colors: int = 256,
+    loop: Optional[int] = 0,
+    max_frames: Optional[int] = None,
+    max_pixels: Optional[int] = None,
+    output_format: str = "gif",
+    quality: Optional[int] = None
+) -> bytes:
+    """
+    流式处理动画并输出GIF（或动画WebP、MP4）
+
+    GIF第一遍解码时只对均匀抽取的少量帧做变换并采样像素，拟合全局调色板；
+    第二遍逐帧解码、抽帧、变换并写入编码器。两遍都只在内存中保留常数个帧。
+    WebP和MP4不需要调色板，只解码一遍。
+
+    Args:
+        data: 输入动画字节数据
+        transform: 单帧变换（需为确定性的，采样和编码时会分别调用）
+        target_fps: 目标帧率（按实际帧时长抽帧）
+        max_colors: 最大颜色数（含透明色，仅GIF）
+        loop: 循环次数（0为无限循环）
+        max_frames: 最大帧数，默认使用配置
+        max_pixels: 所有帧画布像素数之和的上限，默认使用配置
+        output_format: 输出格式（gif / webp / mp4）
+        quality: WebP/MP4的质量（1-100）
+
+    Returns:
+        输出格式的字节数据
+    """
+    image, frame_count = open_animation(data, max_frames, max_pixels)
+    output = io.BytesIO()
+
+    if output_format == "gif":
+        # 第一遍：抽样帧 -> 变换 -> 采样像素
+        positions = set(palette_sample_positions(frame_count))
+        per_frame = GIF_PALETTE_SAMPLE_PIXELS // max(1, len(positions))
+        samples = []
+        for index, frame in enumerate(ImageSequence.Iterator(image)):
+            if index in positions:
+                samples.append(sample_frame_pixels(_apply(frame.convert("RGBA"), transform), per_frame))
+            if index >= max(positions):
+                break
+        palette = fit_palette_from_samples(samples, min(max_colors, 256) - 1)
+        writer = GifEncoder(output, palette, loop)
+    else:
+        writer = create_writer(output_format, output, loop, quality)
+
+    # 第二遍：逐帧解码 -> 抽帧 -> 变换 -> 映射调色板 -> 写出
+    written = 0
+    for frame, duration in decimate_frames(iter_frames(image), target_fps):
+        writer.add_frame(_apply(frame, transform), duration)
+        written += 1
+    writer.close()
+
+    logger.info(
+        f"动画流式处理完成({output_format}): {frame_count}帧 -> {written}帧 (写出{writer.frame_count}帧), "
+        f"{output.tell()}字节"
+    )
+    return output.getvalue()
+
+
+def extract_frames(
+    data: bytes,
+    output_format: str = "JPEG",
+    quality: int = 90,
+    start_frame: int = 0,
+    end_frame: Optional[int] = None,
+    step: int = 1,
+    max_frames: Optional[int] = None,
+    max_pixels: Optional[int] = None
+) -> Tuple[List[Tuple[int, bytes]], int]:
+    """
+    逐帧解码并把选中的帧立即编码为图片字节，不在内存中保留解码后的帧
+
+    Args:
+        data: 动画字节数据
+        output_format: 输出格式（JPEG/PNG等）
+        quality: 输出质量
+        start_frame: 起始帧序号
+        end_frame: 结束帧序号（不包含），默认到最后一帧
+        step: 帧间隔
+        max_frames: 最大帧数，默认使用配置
+        max_pixels: 所有帧画布像素数之和的上限，默认使用配置
+
+    Returns:
+        ([(帧序号, 图片字节)], 总帧数)
+    """
+    image, frame_count = open_animation(data, max_frames, max_pixels)
+    end_frame = frame_count if end_frame is None else min(end_frame, frame_count)
+    step = max(1, step)
+
+    results = []
+    for index, frame in enumerate(ImageSequence.Iterator(image)):
+        if index >= end_frame:
+            break
+        if index < start_frame or (index - start_frame) % step:
+            continue
+        results.append((index, ImageUtils.image_to_bytes(frame.convert("RGB"), format=output_format, quality=quality)))
+    return results, frame_count
@@ -1,27 +1,197 @@
 """GIF视频转换功能"""
-from typing import Optional
-import tempfile
+from typing import List, Optional
+import asyncio
 import os
-import subprocess
+import tempfile
+from app.config import config
 from app.utils.logger import logger
+from .comprehensive_processor import quality_to_colors
+from .formats import quality_to_crf
+
+# 错误信息中保留的ffmpeg stderr末尾字符数
+FFMPEG_STDERR_TAIL = 2000
+
+
+def build_video_filter(
+    fps: Optional[int] = None,
+    width: Optional[int] = None,
+    height: Optional[int] = None
+) -> List[str]:
+    """
+    构建帧率和缩放滤镜（只指定宽或高时保持原始比例）
+
+    Returns:
+        滤镜列表，如 ["fps=10", "scale=480:-1:flags=lanczos"]
+    """
+    filters = []
+    if fps:
+        filters.append(f"fps={fps}")
+    if width or height:
+        filters.append(f"scale={width or -1}:{height or -1}:flags=lanczos")
+    return filters
+
+
+def build_gif_filter_graph(
+    fps: Optional[int] = None,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    max_colors: int = 256
+) -> str:
+    """
+    构建单个滤镜图：帧率、缩放后拆成两路，一路生成针对本片段的调色板，另一路用该调色板映射，
+    只解码一次即可得到自适应调色板的GIF
+
+    Args:
+        fps: 目标帧率
+        width: 目标宽度
+        height: 目标高度
+        max_colors: 调色板颜色数（2-256）
+
+    Returns:
+        ffmpeg -filter_complex 参数
+    """
+    prefix = ",".join(build_video_filter(fps, width, height))
+    return (
+        f"[0:v]{prefix + ',' if prefix else ''}split[frames][source];"
+        f"[source]palettegen=max_colors={max_colors}:stats_mode=diff[palette];"
+        f"[frames][palette]paletteuse=dither=bayer:bayer_scale=5:diff_mode=rectangle"
+    )
+
+
+def build_input_args(
+    input_path: str,
+    start_time: float = 0,
+    duration: Optional[float] = None,
+    threads: Optional[int] = None
+) -> List[str]:
+    """
+    构建ffmpeg输入参数：-ss/-t 放在 -i 之前作为输入选项，ffmpeg直接跳转到起点附近的关键帧，
+    并在片段结束后停止读取，只解码需要的部分
+
+    Args:
+        input_path: 输入文件路径
+        start_time: 开始时间（秒）
+        duration: 持续时间（秒，None表示到结尾）
+        threads: 解码和滤镜线程数上限（-vf 简单滤镜和 -filter_complex 滤镜图分别设置），默认使用配置
+    """
+    threads = threads or config.FFMPEG_THREADS
+    args = [
+        "-hide_banner", "-loglevel", "error", "-nostdin",
+        "-filter_threads", str(threads), "-filter_complex_threads", str(threads)
+    ]
+    if start_time and start_time > 0:
+        args.extend(["-ss", str(start_time)])
+    if duration:
+        args.extend(["-t", str(duration)])
+    args.extend(["-threads", str(threads), "-i", input_path])
+    return args
+
+
+async def run_ffmpeg(args: List[str], timeout: Optional[float] = None) -> bytes:
+    """
+    以异步子进程运行ffmpeg，从标准输出管道读取结果（输出到 pipe:1 时），不阻塞事件循环
+
+    超时或调用方取消（如客户端断开）时终止ffmpeg进程并等待其退出。
+
+    Args:
+        args: ffmpeg参数（不含可执行文件）
+        timeout: 超时时间（秒），默认使用配置
+
+    Returns:
+        ffmpeg标准输出的字节数据（输出到文件时为空）
+    """
+    timeout = config.FFMPEG_TIMEOUT if timeout is None else timeout
+    cmd = [config.FFMPEG_PATH, *args]
+    logger.info(f"执行ffmpeg命令: {' '.join(cmd)}")
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except FileNotFoundError:
+        raise RuntimeError(f"未找到ffmpeg可执行文件: {config.FFMPEG_PATH}")
+
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout or None)
+    except asyncio.TimeoutError:
+        raise RuntimeError(f"视频转换超时: 超过{timeout}秒")
+    finally:
+        # 超时、取消或异常时终止进程，避免遗留ffmpeg占用CPU
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+    if process.returncode != 0:
+        message = stderr.decode("utf-8", errors="replace")[-FFMPEG_STDERR_TAIL:]
+        logger.error(f"ffmpeg错误: {message}")
+        raise RuntimeError(f"视频转换失败: {message}")
+    return stdout
+
+
+def build_output_args(
+    output_format: str,
+    fps: Optional[int] = None,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    quality: Optional[int] = 90,
+    threads: Optional[int] = None
+) -> List[str]:
+    """
+    构建各输出格式的滤镜和编码参数（不含输出目标）
+
+    Args:
+        output_format: 输出格式（gif / webp / mp4）
+        fps: 目标帧率
+        width: 目标宽度
+        height: 目标高度
+        quality: 质量（1-100）
+        threads: 编码线程数上限（输出选项 -threads，-i 之前的 -threads 只限制解码），默认使用配置
+    """
+    threads = threads or config.FFMPEG_THREADS
+    if output_format == "gif":
+        return [
+            "-filter_complex", build_gif_filter_graph(fps, width, height, quality_to_colors(quality)),
+            "-an", "-loop", "0", "-f", "gif"
+        ]
+
+    filters = build_video_filter(fps, width, height)
+    if output_format == "webp":
+        args = [
+            "-c:v", "libwebp_anim", "-lossless", "0", "-quality", str(90 if quality is None else quality),
+            "-compression_level", "4", "-loop", "0", "-threads", str(threads), "-an", "-f", "webp"
+        ]
+    elif output_format == "mp4":
+        # yuv420p要求宽高为偶数
+        filters.append("pad=ceil(iw/2)*2:ceil(ih/2)*2")
+        args = [
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", str(quality_to_crf(quality)),
+            "-pix_fmt", "yuv420p", "-movflags", "+faststart", "-threads", str(threads), "-an", "-f", "mp4"
+        ]
+    else:
+        raise ValueError(f"不支持的输出格式: {output_format}")
+    return (["-vf", ",".join(filters)] if filters else []) + args
 
 
 class VideoConversion:
     """GIF视频转换功能"""
-    
+
     @staticmethod
-    def video_to_gif(
+    async def video_to_gif(
         video_bytes: bytes,
         fps: int = 10,
         width: Optional[int] = None,
         height: Optional[int] = None,
         start_time: float = 0,
         duration: Optional[float] = None,
-        quality: int = 90
+        quality: int = 90,
+        output_format: str = "gif"
     ) -> bytes:
         """
-        将视频转换为GIF
-        
+        将视频转换为GIF（或动画WebP、MP4）
+
         Args:
             video_bytes: 视频字节数据
             fps: 目标帧率
@@ -29,82 +199,58 @@ class VideoConversion:
             height: 目标高度（None表示保持原始比例）
             start_time: 开始时间（秒）
             duration: 持续时间（秒，None表示到结尾）
-            quality: 质量（1-100）
-            
+            quality: 质量（1-100），GIF决定调色板颜色数，WebP/MP4决定编码质量
+            output_format: 输出格式（gif / webp / mp4）
+
         Returns:
-            GIF字节数据
+            输出格式的字节数据
         """
-        logger.info(f"视频转GIF: FPS={fps}, 尺寸={width}x{height}, 开始时间={start_time}s, 持续时间={duration}s")
-        
+        logger.info(
+            f"视频转{output_format.upper()}: FPS={fps}, 尺寸={width}x{height}, "
+            f"开始时间={start_time}s, 持续时间={duration}s"
+        )
+
         temp_video_path = None
-        temp_gif_path = None
-        
+        temp_output_path = None
+
         try:
-            # 创建临时文件
-            with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_video:
-                temp_video.write(video_bytes)
+            # 输入写入临时文件：输入跳转和尾部moov的MP4都需要可随机读取的输入，管道无法满足
+            with tempfile.NamedTemporaryFile(suffix='.video', delete=False) as temp_video:
                 temp_video_path = temp_video.name
-            
-            with tempfile.NamedTemporaryFile(suffix='.gif', delete=False) as temp_gif:
-                temp_gif_path = temp_gif.name
-            
-            # 构建基础ffmpeg命令
-            cmd = ['ffmpeg', '-i', temp_video_path]
-            
-            # 添加开始时间
-            if start_time > 0:
-                cmd.extend(['-ss', str(start_time)])
-            
-            # 添加持续时间
-            if duration:
-                cmd.extend(['-t', str(duration)])
-            
-            # 构建视频滤镜
-            filters = [f'fps={fps}']
-            
-            # 添加尺寸滤镜
-            if width or height:
-                if width and height:
-                    filters.append(f'scale={width}:{height}')
-                elif width:
-                    filters.append(f'scale={width}:-1')
-                else:
-                    filters.append(f'scale=-1:{height}')
-            
-            # 应用滤镜
-            cmd.extend(['-vf', ','.join(filters)])
-            
-            # 添加输出参数
-            cmd.extend(['-y', temp_gif_path])
-            
-            # 执行ffmpeg命令
-            logger.info(f"执行ffmpeg命令: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                logger.error(f"ffmpeg错误: {result.stderr}")
-                raise RuntimeError(f"视频转换失败: {result.stderr}")
-            
-            # 检查输出文件是否存在
-            if not os.path.exists(temp_gif_path):
-                raise RuntimeError("GIF文件生成失败")
-            
-            # 读取生成的GIF
-            with open(temp_gif_path, 'rb') as f:
-                gif_data = f.read()
-            
-            if len(gif_data) == 0:
-                raise RuntimeError("生成的GIF文件为空")
-            
-            logger.info(f"成功将视频转换为GIF: {len(video_bytes)}字节 -> {len(gif_data)}字节")
-            return gif_data
-            
+            await asyncio.to_thread(_write_file, temp_video_path, video_bytes)
+
+            args = build_input_args(temp_video_path, start_time, duration)
+            args.extend(build_output_args(output_format, fps, width, height, quality))
+            if output_format == "gif":
+                output_data = await run_ffmpeg([*args, "pipe:1"])
+            else:
+                # WebP和MP4封装结束时需要回写文件头，只能输出到文件
+                with tempfile.NamedTemporaryFile(suffix=f'.{output_format}', delete=False) as temp_output:
+                    temp_output_path = temp_output.name
+                await run_ffmpeg([*args, "-y", temp_output_path])
+                output_data = await asyncio.to_thread(_read_file, temp_output_path)
+
+            if len(output_data) == 0:
+                raise RuntimeError(f"生成的{output_format.upper()}文件为空")
+
+            logger.info(f"成功将视频转换为{output_format.upper()}: {len(video_bytes)}字节 -> {len(output_data)}字节")
+            return output_data
+
         except Exception as e:
-            logger.error(f"视频转GIF失败: {str(e)}")
+            logger.error(f"视频转{output_format.upper()}失败: {str(e)}")
             raise
         finally:
             # 清理临时文件
-            if temp_video_path and os.path.exists(temp_video_path):
-                os.unlink(temp_video_path)
-            if temp_gif_path and os.path.exists(temp_gif_path):
-                os.unlink(temp_gif_path)
+            for path in (temp_video_path, temp_output_path):
+                if path and os.path.exists(path):
+                    os.unlink(path)
+
+
+def _write_file(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
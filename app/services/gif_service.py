@@ -12,6 +12,7 @@ from .gif import (
     VideoConversion,
     ComprehensiveProcessor
 )
+from .gif.streaming import extract_frames
 
 
 class GifService:
@@ -22,25 +23,38 @@ class GifService:
         images: List[Image.Image],
         duration: int = 500,
         loop: int = 0,
-        optimize: bool = True
+        optimize: bool = True,
+        output_format: str = "gif",
+        quality: Optional[int] = None
     ) -> bytes:
-        """将图片列表转换为GIF动画"""
-        return BasicConversion.images_to_gif(images, duration, loop, optimize)
+        """将图片列表转换为GIF动画（或动画WebP、MP4）"""
+        return BasicConversion.images_to_gif(images, duration, loop, optimize, output_format, quality)
     
     @staticmethod
-    def gif_to_images(gif_bytes: bytes) -> List[Image.Image]:
-        """将GIF动画分解为图片列表"""
-        return BasicConversion.gif_to_images(gif_bytes)
+    def extract_frames(
+        gif_bytes: bytes,
+        output_format: str = "JPEG",
+        quality: int = 90,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+        step: int = 1
+    ) -> Tuple[List[Tuple[int, bytes]], int]:
+        """逐帧提取GIF中选中的帧并编码为图片字节，返回 ([(帧序号, 图片字节)], 总帧数)"""
+        return extract_frames(gif_bytes, output_format, quality, start_frame, end_frame, step)
     
     @staticmethod
-    def optimize_gif(
+    async def optimize_gif(
         gif_bytes: bytes,
         max_colors: int = 128,
         resize_factor: float = 1.0,
-        target_fps: Optional[int] = None
+        target_fps: Optional[int] = None,
+        output_format: str = "gif",
+        quality: Optional[int] = None
     ) -> bytes:
-        """优化GIF文件大小"""
-        return Optimization.optimize_gif(gif_bytes, max_colors, resize_factor, target_fps)
+        """优化GIF文件大小（各帧并行缩放）"""
+        return await Optimization.optimize_gif_parallel(
+            gif_bytes, max_colors, resize_factor, target_fps, output_format, quality
+        )
     
     @staticmethod
     def create_animated_text_gif(
@@ -61,27 +75,31 @@ class GifService:
         )
     
     @staticmethod
-    def video_to_gif(
+    async def video_to_gif(
         video_bytes: bytes,
         fps: int = 10,
         width: Optional[int] = None,
         height: Optional[int] = None,
         start_time: float = 0,
         duration: Optional[float] = None,
-        quality: int = 90
+        quality: int = 90,
+        output_format: str = "gif"
     ) -> bytes:
-        """将视频转换为GIF"""
-        return VideoConversion.video_to_gif(
-            video_bytes, fps, width, height, start_time, duration, quality
+        """将视频转换为GIF（或动画WebP、MP4，异步ffmpeg子进程）"""
+        return await VideoConversion.video_to_gif(
+            video_bytes, fps, width, height, start_time, duration, quality, output_format
         )
     
     @staticmethod
-    def process_gif(
+    async def process_gif(
         gif_bytes: bytes,
         fps: Optional[int] = None,
         quality: Optional[int] = None,
         width: Optional[int] = None,
-        height: Optional[int] = None
+        height: Optional[int] = None,
+        output_format: str = "gif"
     ) -> bytes:
-        """处理GIF文件（优化、调整帧率等）"""
-        return ComprehensiveProcessor.process_gif(gif_bytes, fps, quality, width, height)
+        """处理GIF文件（优化、调整帧率等，各帧并行缩放）"""
+        return await ComprehensiveProcessor.process_gif_parallel(
+            gif_bytes, fps, quality, width, height, output_format
+        )
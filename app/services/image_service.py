@@ -51,6 +51,15 @@ class ImageService:
         """应用基础滤镜"""
         return FilterService.apply_filter(image_bytes, filter_type, intensity)
     
+    @staticmethod
+    async def apply_filter_animated(
+        image_bytes: bytes,
+        filter_type: str,
+        intensity: float = 1.0
+    ) -> bytes:
+        """对动图逐帧应用滤镜"""
+        return await FilterService.apply_filter_animated(image_bytes, filter_type, intensity)
+    
     @staticmethod
     def crop_rectangle(
         image_bytes: bytes,
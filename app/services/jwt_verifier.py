@@ -0,0 +1,136 @@
+"""
+JWT本地验证
+使用配置的密钥或JWKS文件在本地校验Cookie中JWT的签名和有效期，
+不再需要为每个浏览器请求访问用户中心。
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+import jwt
+
+from ..config import config
+from ..utils.logger import logger
+
+
+class JWTVerifier:
+    """JWT签名与有效期的本地校验器"""
+
+    def __init__(
+        self,
+        mode: str = "remote",
+        secret: str = "",
+        key_file: str = "",
+        jwks_file: str = "",
+        algorithms: Optional[List[str]] = None,
+        audience: str = "",
+        issuer: str = "",
+        subject_claim: str = "userId",
+        leeway: int = 0
+    ):
+        """
+        Args:
+            mode: remote（由用户中心验证）或 local（本地验证签名和有效期）
+            secret: HMAC密钥或PEM格式公钥
+            key_file: 密钥/公钥文件路径，优先于secret
+            jwks_file: JWKS文件路径，按token头中的kid选择公钥
+            algorithms: 允许的签名算法
+            audience: 期望的aud，为空则不校验
+            issuer: 期望的iss，为空则不校验
+            subject_claim: 用于标识用户的claim，缺失时回退到sub
+            leeway: 校验exp/nbf时允许的时钟偏差（秒）
+        """
+        self.mode = mode
+        self.algorithms = algorithms or ["HS512"]
+        self.audience = audience or None
+        self.issuer = issuer or None
+        self.subject_claim = subject_claim
+        self.leeway = leeway
+
+        self._key: Optional[Any] = None
+        self._jwks: Optional[jwt.PyJWKSet] = None
+        if self.mode == "local":
+            self._load_keys(secret, key_file, jwks_file)
+
+    def _load_keys(self, secret: str, key_file: str, jwks_file: str):
+        """加载验证密钥，失败时回退到用户中心验证"""
+        try:
+            if jwks_file:
+                with open(jwks_file, "r", encoding="utf-8") as f:
+                    self._jwks = jwt.PyJWKSet.from_dict(json.load(f))
+                logger.info(f"已加载JWKS文件: {jwks_file}, 共{len(self._jwks.keys)}个密钥")
+            elif key_file:
+                with open(key_file, "r", encoding="utf-8") as f:
+                    self._key = f.read().strip()
+                logger.info(f"已加载JWT验证密钥文件: {key_file}")
+            elif secret:
+                self._key = secret
+            else:
+                raise ValueError("未配置JWT_SECRET、JWT_KEY_FILE或JWT_JWKS_FILE")
+        except Exception as e:
+            logger.error(f"JWT本地验证密钥加载失败，回退到用户中心验证: {str(e)}")
+            self.mode = "remote"
+
+    @property
+    def enabled(self) -> bool:
+        """是否启用本地验证"""
+        return self.mode == "local"
+
+    def _get_signing_key(self, token: str) -> Any:
+        if self._jwks is None:
+            return self._key
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        for key in self._jwks.keys:
+            if kid is None or key.key_id == kid:
+                return key.key
+        raise jwt.InvalidKeyError(f"JWKS中不存在kid为{kid}的密钥")
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        校验JWT签名和有效期
+
+        Args:
+            token: JWT字符串
+
+        Returns:
+            校验通过时返回claims，否则返回None
+        """
+        try:
+            return jwt.decode(
+                token,
+                self._get_signing_key(token),
+                algorithms=self.algorithms,
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={
+                    "require": ["exp"],
+                    "verify_aud": self.audience is not None,
+                }
+            )
+        except jwt.ExpiredSignatureError:
+            logger.warning("JWT已过期")
+        except jwt.PyJWTError as e:
+            logger.warning(f"JWT校验失败: {str(e)}")
+        return None
+
+    def get_subject(self, claims: Dict[str, Any]) -> Optional[str]:
+        """从claims中提取用户标识"""
+        subject = claims.get(self.subject_claim)
+        if subject is None:
+            subject = claims.get("sub")
+        return str(subject) if subject is not None else None
+
+
+# 全局JWT校验器实例
+jwt_verifier = JWTVerifier(
+    mode=config.JWT_VERIFY_MODE,
+    secret=config.JWT_SECRET,
+    key_file=config.JWT_KEY_FILE,
+    jwks_file=config.JWT_JWKS_FILE,
+    algorithms=[alg.strip() for alg in config.JWT_ALGORITHMS.split(",") if alg.strip()],
+    audience=config.JWT_AUDIENCE,
+    issuer=config.JWT_ISSUER,
+    subject_claim=config.JWT_SUBJECT_CLAIM,
+    leeway=config.JWT_LEEWAY
+)
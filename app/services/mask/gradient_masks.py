@@ -5,6 +5,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from utils.logger import logger
+from utils import gradients
 
 
 class GradientMasks:
@@ -42,43 +43,15 @@ class GradientMasks:
             mask = Image.new("L", (width, height))
             
             if gradient_type == "linear":
-                # 线性渐变
-                mask_array = np.zeros((height, width), dtype=np.uint8)
-                
-                if direction == "horizontal":
-                    for x in range(width):
-                        alpha = start_opacity + (end_opacity - start_opacity) * x / width
-                        mask_array[:, x] = int(alpha * 255)
-                        
-                elif direction == "vertical":
-                    for y in range(height):
-                        alpha = start_opacity + (end_opacity - start_opacity) * y / height
-                        mask_array[y, :] = int(alpha * 255)
-                        
-                elif direction == "diagonal":
-                    for y in range(height):
-                        for x in range(width):
-                            progress = (x + y) / (width + height)
-                            alpha = start_opacity + (end_opacity - start_opacity) * progress
-                            mask_array[y, x] = int(alpha * 255)
-                
-                mask = Image.fromarray(mask_array)
+                # 线性渐变（水平、垂直、对角线）
+                if direction in ("horizontal", "vertical", "diagonal"):
+                    progress = gradients.linear((width, height), gradients.DIRECTION_ANGLES[direction])
+                    mask = Image.fromarray(gradients.interpolate_alpha(progress, start_opacity, end_opacity))
                 
             elif gradient_type == "radial":
-                # 径向渐变
-                center_x, center_y = width // 2, height // 2
-                max_radius = np.sqrt(center_x**2 + center_y**2)
-                
-                mask_array = np.zeros((height, width), dtype=np.uint8)
-                
-                for y in range(height):
-                    for x in range(width):
-                        distance = np.sqrt((x - center_x)**2 + (y - center_y)**2)
-                        progress = distance / max_radius
-                        alpha = start_opacity + (end_opacity - start_opacity) * progress
-                        mask_array[y, x] = int(np.clip(alpha * 255, 0, 255))
-                
-                mask = Image.fromarray(mask_array)
+                # 径向渐变：中心到角落
+                progress = gradients.radial((width, height), radius=np.hypot(width // 2, height // 2))
+                mask = Image.fromarray(gradients.interpolate_alpha(progress, start_opacity, end_opacity))
             
             # 应用蒙版
             img.putalpha(mask)
@@ -1,6 +1,8 @@
 """渐变和特效叠加功能"""
-from PIL import Image, ImageDraw, ImageFilter
+from PIL import Image
+import numpy as np
 from typing import Tuple
+from ...utils import gradients
 from ...utils.logger import logger
 from .base import OverlayBase
 
@@ -85,45 +87,13 @@ class GradientEffectService:
             处理后的图片
         """
         try:
-            # 转换为RGBA模式
-            base = image.convert("RGBA")
-            width, height = base.size
-            
-            # 创建暗角遮罩
-            mask = Image.new("L", (width, height), 255)
-            draw = ImageDraw.Draw(mask)
-            
-            # 计算中心点和半径
-            center_x, center_y = width // 2, height // 2
-            max_radius = min(width, height) * radius / 2
-            
-            # 创建径向渐变遮罩
-            for y in range(height):
-                for x in range(width):
-                    # 计算到中心的距离
-                    distance = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
-                    
-                    # 计算透明度
-                    if distance < max_radius:
-                        alpha = 255
-                    else:
-                        fade = min(1.0, (distance - max_radius) / (max_radius * 0.5))
-                        alpha = int(255 * (1 - fade * intensity))
-                    
-                    mask.putpixel((x, y), alpha)
-            
-            # 应用高斯模糊使边缘更平滑
-            mask = mask.filter(ImageFilter.GaussianBlur(radius=max_radius * 0.1))
-            
-            # 创建暗角图层
-            vignette = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-            vignette.putalpha(mask)
-            
-            # 合并图层
-            result = Image.alpha_composite(base, vignette)
+            # 半径（短边一半的radius倍）以内不变暗，向外在0.5倍半径内平滑过渡到最大暗度
+            result = gradients.apply_vignette(
+                image, intensity, inner=radius, outer=radius * 1.5, feather=1.0
+            )
             
             # 转回原始模式
-            if image.mode != "RGBA":
+            if result.mode != image.mode:
                 result = result.convert(image.mode)
             
             logger.info(f"暗角效果添加成功: 强度={intensity}, 半径={radius}")
@@ -139,40 +109,12 @@ class GradientEffectService:
         start_color: Tuple[int, int, int], end_color: Tuple[int, int, int],
         start_opacity: float, end_opacity: float
     ) -> Image.Image:
-        """创建线性渐变"""
-        gradient = Image.new("RGBA", (width, height))
+        """创建线性渐变（to_bottom / to_top / to_right / to_left）"""
+        if direction not in ("to_bottom", "to_top", "to_right", "to_left"):
+            return Image.new("RGBA", (width, height))
         
-        # 根据方向确定渐变参数
-        if direction == "to_bottom":
-            for y in range(height):
-                ratio = y / height
-                color = OverlayBase.interpolate_color(start_color, end_color, ratio)
-                opacity = int((start_opacity + (end_opacity - start_opacity) * ratio) * 255)
-                for x in range(width):
-                    gradient.putpixel((x, y), (*color, opacity))
-        elif direction == "to_top":
-            for y in range(height):
-                ratio = 1 - (y / height)
-                color = OverlayBase.interpolate_color(start_color, end_color, ratio)
-                opacity = int((start_opacity + (end_opacity - start_opacity) * ratio) * 255)
-                for x in range(width):
-                    gradient.putpixel((x, y), (*color, opacity))
-        elif direction == "to_right":
-            for x in range(width):
-                ratio = x / width
-                color = OverlayBase.interpolate_color(start_color, end_color, ratio)
-                opacity = int((start_opacity + (end_opacity - start_opacity) * ratio) * 255)
-                for y in range(height):
-                    gradient.putpixel((x, y), (*color, opacity))
-        elif direction == "to_left":
-            for x in range(width):
-                ratio = 1 - (x / width)
-                color = OverlayBase.interpolate_color(start_color, end_color, ratio)
-                opacity = int((start_opacity + (end_opacity - start_opacity) * ratio) * 255)
-                for y in range(height):
-                    gradient.putpixel((x, y), (*color, opacity))
-        
-        return gradient
+        progress = gradients.linear((width, height), gradients.DIRECTION_ANGLES[direction])
+        return gradients.gradient_image(progress, start_color, end_color, start_opacity, end_opacity)
     
     @staticmethod
     def _create_radial_gradient(
@@ -181,16 +123,7 @@ class GradientEffectService:
         start_opacity: float, end_opacity: float
     ) -> Image.Image:
         """创建径向渐变"""
-        gradient = Image.new("RGBA", (width, height))
-        center_x, center_y = width // 2, height // 2
-        max_radius = min(width, height) // 2
-        
-        for y in range(height):
-            for x in range(width):
-                distance = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
-                ratio = min(1.0, distance / max_radius)
-                color = OverlayBase.interpolate_color(start_color, end_color, ratio)
-                opacity = int((start_opacity + (end_opacity - start_opacity) * ratio) * 255)
-                gradient.putpixel((x, y), (*color, opacity))
-        
-        return gradient 
\ No newline at end of file
+        max_radius = max(1, min(width, height) // 2)
+        distance = gradients.radial((width, height), radius=max_radius)
+        progress = np.minimum(distance, 1.0)
+        return gradients.gradient_image(progress, start_color, end_color, start_opacity, end_opacity)
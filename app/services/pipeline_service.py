@@ -0,0 +1,251 @@
+"""
+图片处理管道
+按顺序对同一张内存中的图片执行多个操作（缩放、裁剪、滤镜、水印等），
+整个管道只解码一次、编码一次，避免多次调用接口时的重复解码和有损重编码。
+"""
+from PIL import Image, ImageColor
+import inspect
+import io
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel, Field, ValidationError, create_model
+from ..config import config
+from ..utils.logger import logger
+from ..utils.image_utils import ImageUtils
+from .resize_service import ResizeService
+from .crop_service import CropService
+from .filter_service import FilterService
+from .transform_service import TransformService
+from .watermark_service import WatermarkService
+
+
+def _flip(img: Image.Image, direction: str = "horizontal") -> Image.Image:
+    """水平/垂直翻转"""
+    if direction not in ("horizontal", "vertical"):
+        raise ValueError(f"不支持的翻转方向: {direction}")
+    return TransformService.transform_pil(img, f"flip-{direction}")
+
+
+class PipelineService:
+    """图片处理管道服务"""
+
+    # 操作名称 -> 内存处理函数（第一个参数为PIL图片，其余参数来自请求的params）
+    OPERATIONS: Dict[str, Callable[..., Image.Image]] = {
+        "resize": ResizeService.resize_pil,
+        "crop": CropService.crop_rectangle_pil,
+        "crop_circle": CropService.crop_circle_pil,
+        "crop_smart_center": CropService.crop_smart_center_pil,
+        "rotate": TransformService.rotate_pil,
+        "flip": _flip,
+        "transform": TransformService.transform_pil,
+        "filter": FilterService.apply_filter_pil,
+        "watermark": WatermarkService.add_watermark_pil,
+    }
+
+    # 操作名称 -> {参数名: 取值范围}，在签名的类型检查之外校验数值范围
+    PARAM_CONSTRAINTS: Dict[str, Dict[str, Dict[str, Any]]] = {
+        "resize": {"width": {"gt": 0}, "height": {"gt": 0}},
+        "crop": {"x": {"ge": 0}, "y": {"ge": 0}, "width": {"gt": 0}, "height": {"gt": 0}},
+        "crop_circle": {"center_x": {"ge": 0}, "center_y": {"ge": 0}, "radius": {"gt": 0}},
+        "crop_smart_center": {"target_width": {"gt": 0}, "target_height": {"gt": 0}},
+        "filter": {"intensity": {"ge": 0}},
+        "watermark": {
+            "opacity": {"ge": 0, "le": 1}, "font_size": {"gt": 0},
+            "margin_x": {"ge": 0}, "margin_y": {"ge": 0}, "stroke_width": {"ge": 0},
+        },
+    }
+
+    # 颜色参数名，取值需能被PIL解析
+    COLOR_PARAMS = ("fill_color", "color", "stroke_color", "shadow_color")
+
+    # 输出格式 -> (PIL格式, 是否支持透明度)
+    OUTPUT_FORMATS = {
+        "jpeg": ("JPEG", False),
+        "jpg": ("JPEG", False),
+        "png": ("PNG", True),
+        "webp": ("WEBP", True),
+    }
+
+    @staticmethod
+    def _get_params(op: str) -> List[str]:
+        """获取操作允许的参数名（不含图片参数）"""
+        signature = inspect.signature(PipelineService.OPERATIONS[op])
+        return list(signature.parameters)[1:]
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_params_model(op: str) -> Type[BaseModel]:
+        """按操作函数签名的类型注解和默认值生成参数模型，附加 PARAM_CONSTRAINTS 中的取值范围"""
+        signature = inspect.signature(PipelineService.OPERATIONS[op])
+        constraints = PipelineService.PARAM_CONSTRAINTS.get(op, {})
+        fields = {}
+        for name in PipelineService._get_params(op):
+            parameter = signature.parameters[name]
+            default = ... if parameter.default is inspect.Parameter.empty else parameter.default
+            fields[name] = (parameter.annotation, Field(default, **constraints.get(name, {})))
+        return create_model(f"{op.title().replace('_', '')}Params", **fields)
+
+    @staticmethod
+    def _format_errors(error: ValidationError) -> str:
+        """把参数模型的校验错误整理为 "参数名: 原因" 列表"""
+        return "; ".join(
+            f"{'.'.join(str(loc) for loc in item['loc'])}: {item['msg']}" for item in error.errors()
+        )
+
+    @staticmethod
+    def validate_operations(operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        校验操作列表，在扣费和处理之前发现无效请求
+
+        参数按对应处理函数签名的类型注解转换，并检查 PARAM_CONSTRAINTS 中的取值范围，
+        类型或取值错误的请求在这里失败，而不是扣费后在处理函数中失败。
+
+        Args:
+            operations: 操作列表，每项形如 {"op": "resize", "params": {...}}
+
+        Returns:
+            参数已按类型转换的操作列表
+
+        Raises:
+            ValueError: 操作为空、数量超限、操作未知、参数未知、缺少必需参数或参数类型/取值无效
+        """
+        if not operations:
+            raise ValueError("操作列表不能为空")
+        if len(operations) > config.PIPELINE_MAX_OPERATIONS:
+            raise ValueError(f"操作数量超过限制: {len(operations)} > {config.PIPELINE_MAX_OPERATIONS}")
+
+        validated = []
+        for index, operation in enumerate(operations, start=1):
+            op = operation.get("op")
+            if op not in PipelineService.OPERATIONS:
+                supported = ", ".join(PipelineService.OPERATIONS)
+                raise ValueError(f"第{index}步操作无效: {op}，支持的操作有: {supported}")
+
+            params = operation.get("params") or {}
+            if not isinstance(params, dict):
+                raise ValueError(f"第{index}步({op})的params必须是对象")
+            signature = inspect.signature(PipelineService.OPERATIONS[op])
+            allowed = PipelineService._get_params(op)
+            unknown = [name for name in params if name not in allowed]
+            if unknown:
+                raise ValueError(f"第{index}步({op})存在未知参数: {', '.join(unknown)}")
+            missing = [
+                name for name in allowed
+                if signature.parameters[name].default is inspect.Parameter.empty and name not in params
+            ]
+            if missing:
+                raise ValueError(f"第{index}步({op})缺少参数: {', '.join(missing)}")
+
+            try:
+                model = PipelineService._get_params_model(op)(**params)
+            except ValidationError as e:
+                raise ValueError(f"第{index}步({op})参数无效: {PipelineService._format_errors(e)}")
+            # 只保留请求中给出的参数，未给出的参数由处理函数使用自己的默认值
+            params = {name: getattr(model, name) for name in params}
+
+            for name in PipelineService.COLOR_PARAMS:
+                if name in params:
+                    try:
+                        ImageColor.getrgb(params[name])
+                    except ValueError:
+                        raise ValueError(f"第{index}步({op})颜色无效: {name}={params[name]}")
+            if op == "filter" and params["filter_type"] not in FilterService.FILTER_MAP:
+                raise ValueError(f"第{index}步滤镜类型无效: {params['filter_type']}")
+            if op == "transform" and params["transform_type"] not in (*TransformService.TRANSPOSE_MAP, "rotate"):
+                raise ValueError(f"第{index}步变换类型无效: {params['transform_type']}")
+
+            validated.append({"op": op, "params": params})
+
+        return validated
+
+    @staticmethod
+    def is_deterministic(operations: List[Dict[str, Any]]) -> bool:
+        """管道结果是否可复现（包含随机噪点滤镜时不可缓存）"""
+        return not any(
+            operation.get("op") == "filter"
+            and (operation.get("params") or {}).get("filter_type") in FilterService.NON_DETERMINISTIC_FILTERS
+            for operation in operations
+        )
+
+    @staticmethod
+    def _resolve_format(source_format: Optional[str], output_format: str, img: Image.Image) -> str:
+        """确定输出格式：auto时沿用原格式，原格式不支持透明度而结果带透明度时改用PNG"""
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+
+        if output_format != "auto":
+            if output_format not in PipelineService.OUTPUT_FORMATS:
+                raise ValueError(f"不支持的输出格式: {output_format}")
+            return PipelineService.OUTPUT_FORMATS[output_format][0]
+
+        source_format = (source_format or "JPEG").lower()
+        save_format, supports_alpha = PipelineService.OUTPUT_FORMATS.get(source_format, ("JPEG", False))
+        if has_alpha and not supports_alpha:
+            return "PNG"
+        return save_format
+
+    @staticmethod
+    def _decode(img: Image.Image, operations: List[Dict[str, Any]]) -> Tuple[Image.Image, List[Dict[str, Any]]]:
+        """
+        解码图片；首个操作为缩放时按目标尺寸缩小加载
+
+        Returns:
+            (已加载的图片, 操作列表)，首个缩放操作改写为按原图计算出的精确尺寸
+        """
+        first = operations[0]
+        if first["op"] != "resize":
+            img.load()
+            return img, operations
+
+        params = first.get("params") or {}
+        target = ResizeService._calculate_dimensions(
+            img.size, params.get("width"), params.get("height"), params.get("maintain_ratio", True)
+        )
+        img = ImageUtils.decode_for_size(img, target)
+        exact = {"op": "resize", "params": {"width": target[0], "height": target[1], "maintain_ratio": False}}
+        return img, [exact, *operations[1:]]
+
+    @staticmethod
+    def run_pipeline(
+        image_bytes: bytes,
+        operations: List[Dict[str, Any]],
+        output_format: str = "auto",
+        quality: int = 90
+    ) -> bytes:
+        """
+        依次执行操作列表，只解码和编码一次
+
+        Args:
+            image_bytes: 输入图片的字节数据
+            operations: 操作列表，每项形如 {"op": "resize", "params": {"width": 800}}
+            output_format: 输出格式 auto / jpeg / png / webp
+            quality: 输出图像质量 (1-100)
+
+        Returns:
+            处理后图片的字节数据
+        """
+        operations = PipelineService.validate_operations(operations)
+        steps = [operation["op"] for operation in operations]
+        logger.info(f"执行处理管道: {' -> '.join(steps)}")
+
+        try:
+            img = Image.open(io.BytesIO(image_bytes))
+            source_format = img.format
+            img, operations = PipelineService._decode(img, operations)
+
+            for operation in operations:
+                img = PipelineService.OPERATIONS[operation["op"]](img, **(operation.get("params") or {}))
+
+            save_format = PipelineService._resolve_format(source_format, output_format.lower(), img)
+            if save_format == "JPEG" and img.mode not in ("RGB", "L", "CMYK"):
+                img = img.convert("RGB")
+
+            # 保存并返回
+            output = io.BytesIO()
+            img.save(output, format=save_format, quality=quality)
+
+            logger.info(f"处理管道执行成功，输出格式: {save_format}")
+            return output.getvalue()
+
+        except Exception as e:
+            logger.error(f"处理管道执行失败: {e}")
+            raise
@@ -2,6 +2,7 @@ from PIL import Image
 import io
 from typing import Optional
 from ..utils.logger import logger
+from ..utils.image_utils import ImageUtils
 
 
 class ResizeService:
@@ -51,6 +52,33 @@ class ResizeService:
         
         return (new_width, new_height)
     
+    @staticmethod
+    def resize_pil(
+        img: Image.Image,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        maintain_ratio: bool = True
+    ) -> Image.Image:
+        """
+        调整已解码图片的大小（供处理管道等内存调用使用）
+
+        Args:
+            img: PIL图片
+            width: 目标宽度
+            height: 目标高度
+            maintain_ratio: 是否保持原始纵横比
+
+        Returns:
+            调整后的PIL图片
+        """
+        new_size = ResizeService._calculate_dimensions(
+            img.size, width, height, maintain_ratio
+        )
+        logger.info(f"原始尺寸: {img.size}, 目标尺寸: {new_size}")
+        if new_size == img.size:
+            return img
+        return img.resize(new_size, Image.LANCZOS)
+
     @staticmethod
     def resize_image(
         image_bytes: bytes,
@@ -76,21 +104,21 @@ class ResizeService:
         
         try:
             img = Image.open(io.BytesIO(image_bytes))
-            original_size = img.size
+            source_format = img.format
             
-            # 计算新尺寸
+            # 按文件头中的尺寸计算目标尺寸，缩小时以最低成本解码
             new_size = ResizeService._calculate_dimensions(
-                original_size, width, height, maintain_ratio
+                img.size, width, height, maintain_ratio
             )
-            
-            logger.info(f"原始尺寸: {original_size}, 目标尺寸: {new_size}")
+            logger.info(f"原始尺寸: {img.size}, 目标尺寸: {new_size}")
+            img = ImageUtils.decode_for_size(img, new_size)
             
             # 调整大小
-            resized_img = img.resize(new_size, Image.LANCZOS)
+            resized_img = img if img.size == new_size else img.resize(new_size, Image.LANCZOS)
             
             # 保存并返回
             output = io.BytesIO()
-            format = img.format if img.format else "JPEG"
+            format = source_format if source_format else "JPEG"
             resized_img.save(output, format=format, quality=quality)
             
             logger.info("图片大小调整成功")
@@ -0,0 +1,348 @@
+"""
+处理结果缓存
+按 (代码版本, 输入字节SHA-256, 操作, 规范化参数) 对处理结果做内容寻址缓存：
+进程内LRU（按字节预算淘汰）+ 本地磁盘或Redis二级缓存（按TTL过期）。
+同一用户重复上传相同结果时，直接返回之前的网盘文件记录。
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import PIL
+
+from ..config import config
+from ..utils.compute_executor import run_compute
+from ..utils.logger import logger
+
+
+def _canonicalize(value: Any) -> Any:
+    """将参数转换为可稳定序列化的形式，字节数据以哈希代替"""
+    if isinstance(value, Enum):
+        return _canonicalize(value.value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, dict):
+        return {str(k): _canonicalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(v) for v in value]
+    if isinstance(value, float):
+        # 1.0 与 1 视为同一参数
+        return int(value) if value.is_integer() else round(value, 6)
+    if value is None or isinstance(value, (str, int, bool)):
+        return value
+    raise TypeError(f"不支持缓存的参数类型: {type(value).__name__}")
+
+
+def compute_code_version() -> str:
+    """
+    计算处理代码的版本指纹：app包下所有Python源码与图像库版本的哈希。
+    部署修改了任何处理逻辑（包括服务方法调用的工具函数）或升级图像库后，
+    旧的缓存结果自动失效。
+    """
+    digest = hashlib.sha256()
+    digest.update(f"pillow={PIL.__version__};numpy={np.__version__}".encode("utf-8"))
+    try:
+        import cv2
+        digest.update(f";opencv={cv2.__version__}".encode("utf-8"))
+    except ImportError:
+        pass
+    app_root = Path(__file__).resolve().parent.parent
+    for path in sorted(app_root.rglob("*.py")):
+        digest.update(path.relative_to(app_root).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """内容寻址的处理结果缓存"""
+
+    KEY_PREFIX = "image_tools_api:result"
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        memory_bytes: int = 256 * 1024 * 1024,
+        max_item_bytes: int = 20 * 1024 * 1024,
+        backend: str = "disk",
+        cache_dir: str = "",
+        ttl: int = 86400,
+        upload_ttl: int = 86400,
+        version: str = ""
+    ):
+        """
+        Args:
+            enabled: 是否启用缓存
+            memory_bytes: 进程内缓存的字节预算
+            max_item_bytes: 单个结果的最大缓存大小
+            backend: 二级缓存后端 disk / redis / none
+            cache_dir: 磁盘缓存目录
+            ttl: 二级缓存中结果的有效期（秒）
+            upload_ttl: 网盘文件记录的有效期（秒）
+            version: 处理结果的版本，参与缓存键计算；为空时使用代码版本指纹
+        """
+        self.enabled = enabled
+        self.memory_bytes = memory_bytes
+        self.max_item_bytes = max_item_bytes
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.upload_ttl = upload_ttl
+        self.version = version or (compute_code_version() if enabled else "")
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_used = 0
+        self._uploads: "OrderedDict[str, tuple]" = OrderedDict()
+        self._writes = 0
+        self._hits = 0
+        self._misses = 0
+
+    # ------------------------------------------------------------------
+    # 缓存键
+    # ------------------------------------------------------------------
+    @staticmethod
+    def make_key(operation: str, params: Dict[str, Any], version: str = "") -> str:
+        """
+        生成缓存键
+
+        Args:
+            operation: 操作名称（端点或服务方法）
+            params: 参数，其中的字节数据（输入图片）以SHA-256参与计算
+            version: 处理代码版本，版本不同的结果互不命中
+
+        Returns:
+            缓存键（十六进制SHA-256）
+        """
+        payload = json.dumps(
+            {"version": version, "operation": operation, "params": _canonicalize(params)},
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # 进程内LRU
+    # ------------------------------------------------------------------
+    def _memory_get(self, key: str) -> Optional[bytes]:
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+        return data
+
+    def _memory_set(self, key: str, data: bytes):
+        if len(data) > self.memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_used -= len(old)
+        self._memory[key] = data
+        self._memory_used += len(data)
+        while self._memory_used > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+
+    # ------------------------------------------------------------------
+    # 二级缓存（磁盘 / Redis）
+    # ------------------------------------------------------------------
+    def _disk_path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}{suffix}")
+
+    def _disk_read(self, path: str, ttl: int) -> Optional[bytes]:
+        try:
+            if time.time() - os.path.getmtime(path) > ttl:
+                os.remove(path)
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _disk_write(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        self._writes += 1
+        if self._writes % 200 == 0:
+            self._disk_sweep()
+
+    def _disk_sweep(self):
+        """清理过期的磁盘缓存文件"""
+        now = time.time()
+        max_ttl = max(self.ttl, self.upload_ttl)
+        removed = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if now - os.path.getmtime(path) > max_ttl:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        if removed:
+            logger.info(f"清理过期结果缓存文件: {removed}个")
+
+    @staticmethod
+    def _get_redis():
+        from ..database import redis_client
+        return redis_client
+
+    def _tier2_get(self, name: str, ttl: int) -> Optional[bytes]:
+        if self.backend == "disk":
+            return self._disk_read(self._disk_path(name, ".bin"), ttl)
+        if self.backend == "redis":
+            redis_client = self._get_redis()
+            if redis_client is None:
+                return None
+            value = redis_client.get(f"{self.KEY_PREFIX}:{name}")
+            # Redis客户端使用decode_responses=True，二进制数据以base64存储
+            return base64.b64decode(value) if value else None
+        return None
+
+    def _tier2_set(self, name: str, data: bytes, ttl: int):
+        if self.backend == "disk":
+            self._disk_write(self._disk_path(name, ".bin"), data)
+        elif self.backend == "redis":
+            redis_client = self._get_redis()
+            if redis_client is not None:
+                redis_client.setex(f"{self.KEY_PREFIX}:{name}", ttl, base64.b64encode(data).decode("ascii"))
+
+    async def _tier2_call(self, func: Callable, *args) -> Any:
+        if self.backend not in ("disk", "redis"):
+            return None
+        try:
+            return await asyncio.to_thread(func, *args)
+        except Exception as e:
+            logger.warning(f"结果缓存二级存储访问失败: {str(e)}")
+            return None
+
+    # ------------------------------------------------------------------
+    # 处理结果
+    # ------------------------------------------------------------------
+    async def get(self, key: str) -> Optional[bytes]:
+        """读取缓存的处理结果"""
+        if not self.enabled:
+            return None
+        data = self._memory_get(key)
+        if data is None:
+            data = await self._tier2_call(self._tier2_get, key, self.ttl)
+            if data is not None:
+                self._memory_set(key, data)
+        if data is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return data
+
+    async def set(self, key: str, data: bytes):
+        """写入处理结果"""
+        if not self.enabled or not data or len(data) > self.max_item_bytes:
+            return
+        self._memory_set(key, data)
+        await self._tier2_call(self._tier2_set, key, data, self.ttl)
+
+    # ------------------------------------------------------------------
+    # 网盘文件记录（按用户隔离）
+    # ------------------------------------------------------------------
+    def _upload_key(self, result_bytes: bytes, content_type: str, api_token: str) -> str:
+        owner = hashlib.sha256(api_token.encode("utf-8")).hexdigest()
+        return self.make_key("upload", {"owner": owner, "content_type": content_type, "data": result_bytes})
+
+    async def get_upload(self, result_bytes: bytes, content_type: str, api_token: str) -> Optional[Dict[str, Any]]:
+        """查询同一用户之前上传过的相同结果的网盘文件记录"""
+        if not self.enabled:
+            return None
+        key = self._upload_key(result_bytes, content_type, api_token)
+        entry = self._uploads.get(key)
+        if entry is not None:
+            expires_at, record = entry
+            if expires_at > time.time():
+                return record
+            self._uploads.pop(key, None)
+
+        raw = await self._tier2_call(self._tier2_get, f"upload:{key}", self.upload_ttl)
+        if raw is None:
+            return None
+        record = json.loads(raw)
+        self._remember_upload(key, record)
+        return record
+
+    async def set_upload(self, result_bytes: bytes, content_type: str, api_token: str, record: Dict[str, Any]):
+        """记录结果对应的网盘文件"""
+        if not self.enabled:
+            return
+        key = self._upload_key(result_bytes, content_type, api_token)
+        self._remember_upload(key, record)
+        raw = json.dumps(record, ensure_ascii=False, default=str).encode("utf-8")
+        await self._tier2_call(self._tier2_set, f"upload:{key}", raw, self.upload_ttl)
+
+    def _remember_upload(self, key: str, record: Dict[str, Any]):
+        self._uploads[key] = (time.time() + self.upload_ttl, record)
+        self._uploads.move_to_end(key)
+        while len(self._uploads) > 10000:
+            self._uploads.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend,
+            "version": self.version,
+            "memory_items": len(self._memory),
+            "memory_bytes": self._memory_used,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+
+# 全局结果缓存实例
+result_cache = ResultCache(
+    enabled=config.RESULT_CACHE_ENABLED,
+    memory_bytes=config.RESULT_CACHE_MEMORY_BYTES,
+    max_item_bytes=config.RESULT_CACHE_MAX_ITEM_BYTES,
+    backend=config.RESULT_CACHE_BACKEND,
+    cache_dir=config.RESULT_CACHE_DIR,
+    ttl=config.RESULT_CACHE_TTL,
+    upload_ttl=config.RESULT_CACHE_UPLOAD_TTL,
+    version=config.RESULT_CACHE_VERSION
+)
+
+
+async def run_cached(func: Callable, **kwargs) -> Any:
+    """
+    带结果缓存的计算任务：命中时直接返回缓存的字节数据，不调用服务；
+    未命中时通过计算执行器运行并缓存字节结果
+
+    Args:
+        func: 服务方法（如 ResizeService.resize_image），以其限定名作为操作名
+        **kwargs: 服务方法参数（输入图片字节与其余参数一起参与缓存键计算）
+    """
+    if not result_cache.enabled:
+        return await run_compute(func, **kwargs)
+
+    try:
+        key = ResultCache.make_key(func.__qualname__, kwargs, result_cache.version)
+    except TypeError as e:
+        logger.debug(f"参数不支持缓存，直接计算: {str(e)}")
+        return await run_compute(func, **kwargs)
+
+    cached = await result_cache.get(key)
+    if cached is not None:
+        logger.info(f"命中结果缓存: {func.__qualname__}")
+        return cached
+
+    result = await run_compute(func, **kwargs)
+    if isinstance(result, bytes):
+        await result_cache.set(key, result)
+    return result
@@ -6,12 +6,69 @@ from PIL import Image, ImageDraw
 import io
 from typing import List, Tuple, Optional, Union
 import logging
+from ..utils.image_utils import ImageUtils
 
 logger = logging.getLogger(__name__)
 
 class StitchService:
     """图片拼接服务"""
 
+    @staticmethod
+    def _target_sizes(
+        sizes: List[Tuple[int, int]],
+        direction: str,
+        resize_mode: str
+    ) -> List[Tuple[int, int]]:
+        """
+        计算每张图片拼接时的尺寸
+
+        fit: 按比例缩放到最小的高度（水平拼接）或宽度（垂直拼接）
+        fill: 按比例缩放到最大的高度或宽度
+        none: 保持原尺寸
+        """
+        if resize_mode not in ("fit", "fill") or not sizes:
+            return list(sizes)
+
+        pick = min if resize_mode == "fit" else max
+        if direction == "horizontal":
+            common = pick(h for _, h in sizes)
+            return [(max(1, round(w * common / h)), common) for w, h in sizes]
+        common = pick(w for w, _ in sizes)
+        return [(common, max(1, round(h * common / w))) for w, h in sizes]
+
+    @staticmethod
+    def stitch_image_bytes(
+        images_bytes: List[bytes],
+        direction: str = "horizontal",
+        alignment: str = "center",
+        spacing: int = 0,
+        background_color: str = "white",
+        resize_mode: str = "none",
+        quality: int = 95
+    ) -> bytes:
+        """
+        拼接多张图片的字节数据并返回JPEG字节数据
+
+        先读取文件头中的尺寸计算每张图片的目标尺寸，需要缩小的图片以最低成本解码，
+        避免把大图完整解码后再缩小。
+
+        Args:
+            images_bytes: 图片字节数据列表
+            其余参数与stitch_images一致
+
+        Returns:
+            拼接后图片的JPEG字节数据
+        """
+        if not images_bytes:
+            raise ValueError("至少需要一张图片")
+
+        images = [ImageUtils.bytes_to_image(data) for data in images_bytes]
+        targets = StitchService._target_sizes([img.size for img in images], direction, resize_mode)
+        images = [ImageUtils.decode_for_size(img, target) for img, target in zip(images, targets)]
+
+        result = StitchService._compose(images, targets, direction, alignment, spacing, background_color)
+        return ImageUtils.image_to_bytes(result, format="JPEG", quality=quality)
+
     @staticmethod
     def stitch_images(
         images: List[Image.Image],
@@ -40,6 +97,24 @@ class StitchService:
         if not images:
             raise ValueError("至少需要一张图片")
 
+        targets = StitchService._target_sizes([img.size for img in images], direction, resize_mode)
+        return StitchService._compose(images, targets, direction, alignment, spacing, background_color)
+
+    @staticmethod
+    def _compose(
+        images: List[Image.Image],
+        targets: List[Tuple[int, int]],
+        direction: str,
+        alignment: str,
+        spacing: int,
+        background_color: str
+    ) -> Image.Image:
+        """将图片缩放到各自的目标尺寸后拼接到同一画布"""
+        images = [
+            img if img.size == target else img.resize(target, Image.LANCZOS)
+            for img, target in zip(images, targets)
+        ]
+
         # 简单的水平拼接实现
         if direction == "horizontal":
             total_width = sum(img.width for img in images) + spacing * (len(images) - 1)
@@ -4,7 +4,9 @@ import uuid
 from typing import Optional
 import textwrap
 import math
+from ..utils import gradients
 from ..utils.logger import logger
+from ..utils.fonts import font_registry
 
 class TextToImageService:
     def __init__(self):
@@ -19,53 +21,15 @@ class TextToImageService:
     def create_gradient_background(self, width: int, height: int, start_color: str, 
                                  end_color: str, direction: str) -> Image.Image:
         """创建渐变背景"""
-        image = Image.new('RGB', (width, height))
-        draw = ImageDraw.Draw(image)
+        if direction not in ("horizontal", "vertical", "diagonal"):
+            return Image.new('RGB', (width, height))
         
-        start_rgb = self.hex_to_rgb(start_color)
-        end_rgb = self.hex_to_rgb(end_color)
-        
-        if direction == "horizontal":
-            for x in range(width):
-                ratio = x / width
-                r = int(start_rgb[0] * (1 - ratio) + end_rgb[0] * ratio)
-                g = int(start_rgb[1] * (1 - ratio) + end_rgb[1] * ratio)
-                b = int(start_rgb[2] * (1 - ratio) + end_rgb[2] * ratio)
-                draw.line([(x, 0), (x, height)], fill=(r, g, b))
-        elif direction == "vertical":
-            for y in range(height):
-                ratio = y / height
-                r = int(start_rgb[0] * (1 - ratio) + end_rgb[0] * ratio)
-                g = int(start_rgb[1] * (1 - ratio) + end_rgb[1] * ratio)
-                b = int(start_rgb[2] * (1 - ratio) + end_rgb[2] * ratio)
-                draw.line([(0, y), (width, y)], fill=(r, g, b))
-        elif direction == "diagonal":
-            for x in range(width):
-                for y in range(height):
-                    ratio = (x + y) / (width + height)
-                    r = int(start_rgb[0] * (1 - ratio) + end_rgb[0] * ratio)
-                    g = int(start_rgb[1] * (1 - ratio) + end_rgb[1] * ratio)
-                    b = int(start_rgb[2] * (1 - ratio) + end_rgb[2] * ratio)
-                    image.putpixel((x, y), (r, g, b))
-        
-        return image
+        progress = gradients.linear((width, height), gradients.DIRECTION_ANGLES[direction])
+        return gradients.gradient_image(progress, self.hex_to_rgb(start_color), self.hex_to_rgb(end_color))
     
-    def get_font(self, font_family: str, font_size: int) -> ImageFont.ImageFont:
-        """获取字体对象"""
-        try:
-            # 尝试使用系统字体
-            if font_family == "Arial":
-                return ImageFont.truetype("arial.ttf", font_size)
-            elif font_family == "Times New Roman":
-                return ImageFont.truetype("times.ttf", font_size)
-            elif font_family == "Helvetica":
-                return ImageFont.truetype("helvetica.ttf", font_size)
-            else:
-                # 如果找不到指定字体，使用默认字体
-                return ImageFont.load_default()
-        except:
-            # 如果无法加载字体，使用默认字体
-            return ImageFont.load_default()
+    def get_font(self, font_family: str, font_size: int, text: Optional[str] = None) -> ImageFont.ImageFont:
+        """获取字体对象（通过全局字体注册表，包含中文时自动使用中文字体）"""
+        return font_registry.get_font(font_family, font_size, text)
     
     def wrap_text(self, text: str, font: ImageFont.ImageFont, max_width: int) -> list:
         """文字换行处理"""
@@ -119,7 +83,7 @@ class TextToImageService:
                 draw.rectangle([i, i, width-1-i, height-1-i], outline=border_rgb)
         
         # 获取字体
-        font = self.get_font(font_family, font_size)
+        font = self.get_font(font_family, font_size, text)
         
         # 文字换行
         max_text_width = width - 2 * padding
@@ -7,6 +7,66 @@ from ..utils.logger import logger
 class TransformService:
     """图片变换服务 - 旋转和翻转"""
 
+    # 无损变换类型 -> PIL转置方式
+    TRANSPOSE_MAP = {
+        "flip-horizontal": Image.FLIP_LEFT_RIGHT,
+        "flip-vertical": Image.FLIP_TOP_BOTTOM,
+        "rotate-90-cw": Image.ROTATE_270,  # PIL中ROTATE_270实际是顺时针90度
+        "rotate-90-ccw": Image.ROTATE_90,
+        "rotate-180": Image.ROTATE_180,
+    }
+
+    @staticmethod
+    def rotate_pil(
+        img: Image.Image,
+        angle: float,
+        expand: bool = True,
+        fill_color: str = "white"
+    ) -> Image.Image:
+        """任意角度旋转已解码图片（供处理管道等内存调用使用）"""
+        # 处理填充颜色
+        if fill_color.startswith('#'):
+            # 十六进制颜色
+            fill_color = fill_color[1:]
+            fill_rgb = tuple(int(fill_color[i:i+2], 16) for i in (0, 2, 4))
+        else:
+            # 颜色名称
+            fill_rgb = fill_color
+
+        return img.rotate(
+            angle,
+            expand=expand,
+            fillcolor=fill_rgb,
+            resample=Image.BICUBIC
+        )
+
+    @staticmethod
+    def transform_pil(
+        img: Image.Image,
+        transform_type: str,
+        angle: float = 0,
+        expand: bool = True,
+        fill_color: str = "white"
+    ) -> Image.Image:
+        """
+        对已解码图片执行变换（供处理管道等内存调用使用）
+
+        Args:
+            img: PIL图片
+            transform_type: 变换类型，与transform_image一致
+            angle: 旋转角度（仅用于rotate）
+            expand: 是否扩展画布（仅用于rotate）
+            fill_color: 填充颜色（仅用于rotate）
+
+        Returns:
+            变换后的PIL图片
+        """
+        if transform_type in TransformService.TRANSPOSE_MAP:
+            return img.transpose(TransformService.TRANSPOSE_MAP[transform_type])
+        if transform_type == "rotate":
+            return TransformService.rotate_pil(img, angle, expand, fill_color)
+        raise ValueError(f"不支持的变换类型: {transform_type}")
+
     @staticmethod
     def transform_image(
         image_bytes: bytes,
@@ -69,22 +129,8 @@ class TransformService:
         try:
             img = Image.open(io.BytesIO(image_bytes))
             
-            # 处理填充颜色
-            if fill_color.startswith('#'):
-                # 十六进制颜色
-                fill_color = fill_color[1:]
-                fill_rgb = tuple(int(fill_color[i:i+2], 16) for i in (0, 2, 4))
-            else:
-                # 颜色名称
-                fill_rgb = fill_color
-            
             # 执行旋转
-            rotated_img = img.rotate(
-                angle, 
-                expand=expand, 
-                fillcolor=fill_rgb,
-                resample=Image.BICUBIC
-            )
+            rotated_img = TransformService.rotate_pil(img, angle, expand, fill_color)
             
             # 保存并返回
             output = io.BytesIO()
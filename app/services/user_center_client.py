@@ -7,6 +7,7 @@ from ..schemas.user_models import (
     BillingResponse, BillingCallType, BillingOperationType
 )
 from ..utils.logger import logger
+from ..utils.http_client import http_client_manager
 
 
 class UserCenterClient:
@@ -16,14 +17,18 @@ class UserCenterClient:
         self.base_url = config.USER_CENTER_BASE_URL
         self.headers = config.get_user_center_headers()
         self.timeout = config.API_TIMEOUT
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """应用生命周期内复用的HTTP客户端"""
+        return http_client_manager.get_client("user_center", timeout=self.timeout)
     
     async def get_user_by_jwt_token(self, jwt_token: str) -> Optional[User]:
         """根据JWT token查询用户信息"""
         try:
             url = f"{self.base_url}/api/internal/users/by-jwt-token/{jwt_token}"
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=self.headers)
+            response = await self.client.get(url, headers=self.headers)
                 
             if response.status_code != 200:
                 logger.error(f"用户中心API请求失败: {response.status_code} - {response.text}")
@@ -47,8 +52,7 @@ class UserCenterClient:
         try:
             url = f"{self.base_url}/api/internal/users/by-api-token/{api_token}"
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=self.headers)
+            response = await self.client.get(url, headers=self.headers)
                 
             if response.status_code != 200:
                 logger.error(f"用户中心API请求失败: {response.status_code} - {response.text}")
@@ -72,12 +76,11 @@ class UserCenterClient:
         try:
             url = f"{self.base_url}/api/internal/billing/charge"
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    url, 
-                    headers=self.headers,
-                    json=request.dict()
-                )
+            response = await self.client.post(
+                url, 
+                headers=self.headers,
+                json=request.dict()
+            )
                 
             if response.status_code != 200:
                 logger.error(f"预扣费API请求失败: {response.status_code} - {response.text}")
@@ -102,12 +105,11 @@ class UserCenterClient:
         try:
             url = f"{self.base_url}/api/internal/billing/actual-charge"
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    url, 
-                    headers=self.headers,
-                    json=request.dict()
-                )
+            response = await self.client.post(
+                url, 
+                headers=self.headers,
+                json=request.dict()
+            )
                 
             if response.status_code != 200:
                 logger.error(f"实际扣费API请求失败: {response.status_code} - {response.text}")
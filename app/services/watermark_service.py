@@ -1,76 +1,20 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import io
-import os
 import math
-from typing import Tuple, List, Optional
+import functools
+from typing import Tuple, Optional
 from ..utils.logger import logger
+from ..utils.fonts import font_registry
+from .gif.comprehensive_processor import quality_to_colors
+from .gif.parallel import process_animation
+
+# 水印贴图缓存的条目数
+WATERMARK_SPRITE_CACHE_SIZE = 128
 
 
 class WatermarkService:
     """水印处理服务"""
     
-    @staticmethod
-    def _get_system_font(font_size: int, font_family: str = "Arial") -> ImageFont.FreeTypeFont:
-        """
-        获取系统字体
-
-        Args:
-            font_size: 字体大小
-            font_family: 字体族名称
-
-        Returns:
-            加载的字体对象
-        """
-        # 字体映射
-        font_map = {
-            "Arial": [
-                "/System/Library/Fonts/Supplemental/Arial.ttf",  # macOS
-                "C:\\Windows\\Fonts\\arial.ttf",  # Windows
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
-            ],
-            "Times": [
-                "/System/Library/Fonts/Times.ttc",  # macOS
-                "C:\\Windows\\Fonts\\times.ttf",  # Windows
-                "/usr/share/fonts/truetype/dejavu/DejaVuSerif.ttf",  # Linux
-            ],
-            "Helvetica": [
-                "/System/Library/Fonts/Helvetica.ttc",  # macOS
-                "C:\\Windows\\Fonts\\arial.ttf",  # Windows fallback
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
-            ],
-            "Georgia": [
-                "/System/Library/Fonts/Georgia.ttf",  # macOS
-                "C:\\Windows\\Fonts\\georgia.ttf",  # Windows
-                "/usr/share/fonts/truetype/dejavu/DejaVuSerif.ttf",  # Linux
-            ],
-            "Chinese": [
-                "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",  # Linux
-                "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",  # Linux
-                "/System/Library/Fonts/PingFang.ttc",  # macOS
-                "/System/Library/Fonts/STHeiti Light.ttc",  # macOS
-                "C:\\Windows\\Fonts\\msyh.ttc",  # Windows 微软雅黑
-                "C:\\Windows\\Fonts\\simhei.ttf",  # Windows 黑体
-            ]
-        }
-
-        # 获取字体路径列表
-        font_paths = font_map.get(font_family, font_map["Arial"])
-
-        # 如果是中文字符，优先使用中文字体
-        if any('\u4e00' <= char <= '\u9fff' for char in font_family):
-            font_paths = font_map["Chinese"] + font_paths
-        
-        for font_path in font_paths:
-            if os.path.exists(font_path):
-                try:
-                    return ImageFont.truetype(font_path, font_size)
-                except Exception as e:
-                    logger.warning(f"无法加载字体 {font_path}: {e}")
-                    continue
-        
-        logger.info("使用默认字体")
-        return ImageFont.load_default()
-    
     @staticmethod
     def _parse_color(color: str) -> Tuple[int, int, int]:
         """
@@ -182,66 +126,194 @@ class WatermarkService:
         return position_map.get(position, position_map["center"])
 
     @staticmethod
-    def _draw_text_with_effects(
-        draw: ImageDraw.ImageDraw,
-        position: Tuple[int, int],
+    @functools.lru_cache(maxsize=WATERMARK_SPRITE_CACHE_SIZE)
+    def _render_sprite(
         text: str,
-        font: ImageFont.FreeTypeFont,
+        font_family: str,
+        font_size: int,
         fill_color: Tuple[int, int, int, int],
         stroke_width: int = 0,
         stroke_color: Tuple[int, int, int, int] = (0, 0, 0, 255),
         shadow_offset_x: int = 0,
         shadow_offset_y: int = 0,
-        shadow_color: Tuple[int, int, int, int] = (0, 0, 0, 128)
-    ):
+        shadow_color: Tuple[int, int, int, int] = (0, 0, 0, 128),
+        angle: int = 0
+    ) -> Tuple[Image.Image, Tuple[int, int]]:
         """
-        绘制带效果的文字（阴影、描边）
+        把一个水印单元（多行文字及阴影、描边）渲染为小尺寸RGBA贴图，结果按参数缓存
 
         Args:
-            draw: ImageDraw对象
-            position: 文字位置
-            text: 文字内容
-            font: 字体
+            text: 文字内容（可包含换行）
+            font_family: 字体族名称
+            font_size: 字体大小
             fill_color: 填充颜色
-            stroke_width: 描边宽度
+            stroke_width: 描边宽度（使用Pillow原生描边）
             stroke_color: 描边颜色
             shadow_offset_x: 阴影X偏移
             shadow_offset_y: 阴影Y偏移
             shadow_color: 阴影颜色
+            angle: 旋转角度，非0时以文字起点为中心旋转
+
+        Returns:
+            (贴图, 偏移)：贴图左上角相对文字起点的偏移，贴图不可修改
         """
-        x, y = position
+        font = font_registry.get_font(font_family, font_size, text)
+        has_shadow = shadow_offset_x != 0 or shadow_offset_y != 0
 
-        # 绘制阴影
-        if shadow_offset_x != 0 or shadow_offset_y != 0:
-            shadow_x = x + shadow_offset_x
-            shadow_y = y + shadow_offset_y
+        # 计算每行的位置和所有内容（文字、描边、阴影）的包围盒，坐标相对文字起点
+        lines = []
+        left, top, right, bottom = 0, 0, 0, 0
+        current_y = 0
+        for line in text.split('\n'):
+            bbox = font.getbbox(line)
+            stroke_bbox = font.getbbox(line, stroke_width=stroke_width) if stroke_width > 0 else bbox
+            boxes = [stroke_bbox]
+            if has_shadow:
+                boxes.append((bbox[0] + shadow_offset_x, bbox[1] + shadow_offset_y,
+                              bbox[2] + shadow_offset_x, bbox[3] + shadow_offset_y))
+            for box in boxes:
+                left, top = min(left, box[0]), min(top, box[1] + current_y)
+                right, bottom = max(right, box[2]), max(bottom, box[3] + current_y)
+            lines.append((line, current_y))
+            current_y += bbox[3] - bbox[1]
+
+        if angle != 0:
+            # 以文字起点为中心对称扩展，旋转后起点仍位于贴图中心
+            half_width = max(-left, right)
+            half_height = max(-top, bottom)
+            left, top, right, bottom = -half_width, -half_height, half_width, half_height
+
+        sprite = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(sprite)
+        for line, line_y in lines:
+            x, y = -left, line_y - top
+            if has_shadow:
+                draw.text((x + shadow_offset_x, y + shadow_offset_y), line, font=font, fill=shadow_color)
             draw.text(
-                (shadow_x, shadow_y),
-                text,
-                font=font,
-                fill=shadow_color
+                (x, y), line, font=font, fill=fill_color,
+                stroke_width=stroke_width, stroke_fill=stroke_color
             )
 
-        # 绘制描边
-        if stroke_width > 0:
-            for dx in range(-stroke_width, stroke_width + 1):
-                for dy in range(-stroke_width, stroke_width + 1):
-                    if dx != 0 or dy != 0:
-                        draw.text(
-                            (x + dx, y + dy),
-                            text,
-                            font=font,
-                            fill=stroke_color
-                        )
+        if angle == 0:
+            return sprite, (left, top)
 
-        # 绘制主文字
-        draw.text(
-            (x, y),
+        rotated = sprite.rotate(angle, resample=Image.BICUBIC, expand=True)
+        return rotated, (-(rotated.width // 2), -(rotated.height // 2))
+
+    @staticmethod
+    def _composite_sprite(img: Image.Image, sprite: Image.Image, position: Tuple[int, int]):
+        """把贴图合成到图片上，超出图片的部分裁掉"""
+        x, y = position
+        crop_left, crop_top = max(0, -x), max(0, -y)
+        crop_right = min(sprite.width, img.width - x)
+        crop_bottom = min(sprite.height, img.height - y)
+        if crop_left >= crop_right or crop_top >= crop_bottom:
+            return
+        if (crop_left, crop_top, crop_right, crop_bottom) != (0, 0, sprite.width, sprite.height):
+            sprite = sprite.crop((crop_left, crop_top, crop_right, crop_bottom))
+        img.alpha_composite(sprite, (x + crop_left, y + crop_top))
+
+    @staticmethod
+    def add_watermark_pil(
+        img: Image.Image,
+        text: str,
+        position: str = "center",
+        opacity: float = 0.5,
+        color: str = "white",
+        font_size: int = 40,
+        angle: int = 0,
+        font_family: str = "Arial",
+        margin_x: int = 20,
+        margin_y: int = 20,
+        stroke_width: int = 0,
+        stroke_color: str = "#000000",
+        shadow_offset_x: int = 0,
+        shadow_offset_y: int = 0,
+        shadow_color: str = "#000000",
+        repeat_mode: str = "none"
+    ) -> Image.Image:
+        """
+        给已解码图片添加文字水印（供处理管道等内存调用使用）
+
+        参数含义与add_watermark一致。水印单元只渲染一次（按参数缓存的小贴图），
+        重复模式下按位置逐个合成贴图。
+
+        Returns:
+            添加水印后的RGB图片
+        """
+        img = img.convert("RGBA")
+
+        # 获取字体和颜色
+        font = font_registry.get_font(font_family, font_size, text)
+        rgb = WatermarkService._parse_color(color)
+        rgba = (*rgb, int(255 * opacity))
+
+        # 描边和阴影颜色
+        stroke_rgb = WatermarkService._parse_color(stroke_color)
+        stroke_rgba = (*stroke_rgb, int(255 * opacity))
+        shadow_rgb = WatermarkService._parse_color(shadow_color)
+        shadow_rgba = (*shadow_rgb, int(255 * opacity * 0.5))
+
+        # 计算总高度和最大宽度
+        max_width = 0
+        total_height = 0
+        for line in text.split('\n'):
+            text_bbox = font.getbbox(line)
+            max_width = max(max_width, text_bbox[2] - text_bbox[0])
+            total_height += text_bbox[3] - text_bbox[1]
+
+        # 平铺和对角线模式沿用原有行为，不旋转
+        sprite_angle = angle if repeat_mode not in ("tile", "diagonal") else 0
+        sprite, (offset_x, offset_y) = WatermarkService._render_sprite(
             text,
-            font=font,
-            fill=fill_color
+            font_family,
+            font_size,
+            rgba,
+            stroke_width,
+            stroke_rgba,
+            shadow_offset_x,
+            shadow_offset_y,
+            shadow_rgba,
+            sprite_angle
         )
-    
+
+        # 各水印单元的文字起点
+        if repeat_mode == "tile":
+            # 平铺水印
+            tile_spacing_x = max_width + 50
+            tile_spacing_y = total_height + 30
+            origins = [
+                (tile_x, tile_y)
+                for tile_x in range(0, img.width, tile_spacing_x)
+                for tile_y in range(0, img.height, tile_spacing_y)
+            ]
+        elif repeat_mode == "diagonal":
+            # 对角线重复水印，从左上到右下
+            diagonal_spacing = max(max_width, total_height) + 100
+            origins = [
+                (offset + y_pos, y_pos)
+                for offset in range(-img.height, img.width + img.height, diagonal_spacing)
+                for y_pos in range(0, img.height, total_height + 50)
+                if 0 <= offset + y_pos < img.width
+            ]
+        elif sprite_angle != 0:
+            # 旋转水印以图片中心为起点
+            origins = [(img.width - img.width // 2, img.height - img.height // 2)]
+        else:
+            origins = [WatermarkService._calculate_position(
+                img.size,
+                (max_width, total_height),
+                position,
+                angle,
+                margin_x,
+                margin_y
+            )]
+
+        for origin_x, origin_y in origins:
+            WatermarkService._composite_sprite(img, sprite, (int(origin_x) + offset_x, int(origin_y) + offset_y))
+
+        return img.convert("RGB")
+
     @staticmethod
     def add_watermark(
         image_bytes: bytes,
@@ -281,172 +353,26 @@ class WatermarkService:
         logger.info(f"添加水印: {text}, 位置: {position}, 透明度: {opacity}")
         
         try:
-            # 打开图片并转换为RGBA模式
-            img = Image.open(io.BytesIO(image_bytes)).convert("RGBA")
-            watermark = Image.new("RGBA", img.size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(watermark)
-            
-            # 获取字体和颜色
-            font = WatermarkService._get_system_font(font_size, font_family)
-            rgb = WatermarkService._parse_color(color)
-            rgba = (*rgb, int(255 * opacity))
-
-            # 描边和阴影颜色
-            stroke_rgb = WatermarkService._parse_color(stroke_color)
-            stroke_rgba = (*stroke_rgb, int(255 * opacity))
-            shadow_rgb = WatermarkService._parse_color(shadow_color)
-            shadow_rgba = (*shadow_rgb, int(255 * opacity * 0.5))
-            
-            # 处理多行文字
-            lines = text.split('\n')
-            max_width = 0
-            total_height = 0
-            line_heights: List[int] = []
-            
-            # 计算总高度和最大宽度
-            for line in lines:
-                text_bbox = draw.textbbox((0, 0), line, font=font)
-                line_width = text_bbox[2] - text_bbox[0]
-                line_height = text_bbox[3] - text_bbox[1]
-                max_width = max(max_width, line_width)
-                line_heights.append(line_height)
-                total_height += line_height
-            
-            # 计算整体位置
-            x, y = WatermarkService._calculate_position(
-                img.size,
-                (max_width, total_height),
-                position,
-                angle,
-                margin_x,
-                margin_y
+            img = Image.open(io.BytesIO(image_bytes))
+            result_img = WatermarkService.add_watermark_pil(
+                img,
+                text,
+                position=position,
+                opacity=opacity,
+                color=color,
+                font_size=font_size,
+                angle=angle,
+                font_family=font_family,
+                margin_x=margin_x,
+                margin_y=margin_y,
+                stroke_width=stroke_width,
+                stroke_color=stroke_color,
+                shadow_offset_x=shadow_offset_x,
+                shadow_offset_y=shadow_offset_y,
+                shadow_color=shadow_color,
+                repeat_mode=repeat_mode
             )
             
-            if angle != 0:
-                # 旋转水印处理
-                big_watermark = Image.new(
-                    "RGBA",
-                    (img.width * 2, img.height * 2),
-                    (0, 0, 0, 0)
-                )
-                big_draw = ImageDraw.Draw(big_watermark)
-                
-                # 绘制每行文字
-                current_y = img.height
-                for i, line in enumerate(lines):
-                    WatermarkService._draw_text_with_effects(
-                        big_draw,
-                        (img.width, current_y),
-                        line,
-                        font,
-                        rgba,
-                        stroke_width,
-                        stroke_rgba,
-                        shadow_offset_x,
-                        shadow_offset_y,
-                        shadow_rgba
-                    )
-                    current_y += line_heights[i]
-                
-                # 旋转并裁剪
-                rotated = big_watermark.rotate(
-                    angle,
-                    resample=Image.BICUBIC,
-                    expand=False
-                )
-                offset_x = (rotated.width - img.width) // 2
-                offset_y = (rotated.height - img.height) // 2
-                watermark = rotated.crop((
-                    offset_x,
-                    offset_y,
-                    offset_x + img.width,
-                    offset_y + img.height
-                ))
-            else:
-                # 直接绘制每行文字
-                current_y = y
-                for i, line in enumerate(lines):
-                    WatermarkService._draw_text_with_effects(
-                        draw,
-                        (x, current_y),
-                        line,
-                        font,
-                        rgba,
-                        stroke_width,
-                        stroke_rgba,
-                        shadow_offset_x,
-                        shadow_offset_y,
-                        shadow_rgba
-                    )
-                    current_y += line_heights[i]
-            
-            # 处理重复水印
-            if repeat_mode == "tile":
-                # 平铺水印
-                tile_watermark = Image.new("RGBA", img.size, (0, 0, 0, 0))
-                tile_draw = ImageDraw.Draw(tile_watermark)
-
-                # 计算平铺间距
-                tile_spacing_x = max_width + 50
-                tile_spacing_y = total_height + 30
-
-                for tile_x in range(0, img.width, tile_spacing_x):
-                    for tile_y in range(0, img.height, tile_spacing_y):
-                        current_y = tile_y
-                        for i, line in enumerate(lines):
-                            if current_y < img.height:
-                                WatermarkService._draw_text_with_effects(
-                                    tile_draw,
-                                    (tile_x, current_y),
-                                    line,
-                                    font,
-                                    rgba,
-                                    stroke_width,
-                                    stroke_rgba,
-                                    shadow_offset_x,
-                                    shadow_offset_y,
-                                    shadow_rgba
-                                )
-                            current_y += line_heights[i]
-
-                watermark = tile_watermark
-
-            elif repeat_mode == "diagonal":
-                # 对角线重复水印
-                diag_watermark = Image.new("RGBA", img.size, (0, 0, 0, 0))
-                diag_draw = ImageDraw.Draw(diag_watermark)
-
-                # 计算对角线间距
-                diagonal_spacing = max(max_width, total_height) + 100
-
-                # 从左上到右下的对角线
-                for offset in range(-img.height, img.width + img.height, diagonal_spacing):
-                    for y_pos in range(0, img.height, total_height + 50):
-                        x_pos = offset + y_pos
-                        if 0 <= x_pos < img.width:
-                            current_y = y_pos
-                            for i, line in enumerate(lines):
-                                if current_y < img.height:
-                                    WatermarkService._draw_text_with_effects(
-                                        diag_draw,
-                                        (x_pos, current_y),
-                                        line,
-                                        font,
-                                        rgba,
-                                        stroke_width,
-                                        stroke_rgba,
-                                        shadow_offset_x,
-                                        shadow_offset_y,
-                                        shadow_rgba
-                                    )
-                                current_y += line_heights[i]
-
-                watermark = diag_watermark
-
-            # 合并图像
-            watermarked_img = Image.alpha_composite(img, watermark)
-            result_img = watermarked_img.convert("RGB")
-            
             # 保存并返回
             output = io.BytesIO()
             result_img.save(output, format="JPEG", quality=quality)
@@ -456,4 +382,68 @@ class WatermarkService:
             
         except Exception as e:
             logger.error(f"添加水印失败: {e}")
-            raise 
\ No newline at end of file
+            raise 
+
+    @staticmethod
+    async def add_watermark_animated(
+        image_bytes: bytes,
+        text: str,
+        position: str = "center",
+        opacity: float = 0.5,
+        color: str = "white",
+        font_size: int = 40,
+        angle: int = 0,
+        quality: int = 90,
+        font_family: str = "Arial",
+        margin_x: int = 20,
+        margin_y: int = 20,
+        stroke_width: int = 0,
+        stroke_color: str = "#000000",
+        shadow_offset_x: int = 0,
+        shadow_offset_y: int = 0,
+        shadow_color: str = "#000000",
+        repeat_mode: str = "none"
+    ) -> bytes:
+        """
+        给动图的每一帧添加文字水印，参数与add_watermark一致
+
+        各帧按块分发到计算执行器并行处理，保留源帧的透明区域。
+        quality 换算为GIF颜色数。
+
+        Returns:
+            处理后GIF的字节数据
+        """
+        logger.info(f"动图逐帧添加水印: {text}, 位置: {position}, 透明度: {opacity}")
+
+        try:
+            img = Image.open(io.BytesIO(image_bytes))
+            result = await process_animation(
+                image_bytes,
+                WatermarkService.add_watermark_pil,
+                args=(text,),
+                kwargs={
+                    "position": position,
+                    "opacity": opacity,
+                    "color": color,
+                    "font_size": font_size,
+                    "angle": angle,
+                    "font_family": font_family,
+                    "margin_x": margin_x,
+                    "margin_y": margin_y,
+                    "stroke_width": stroke_width,
+                    "stroke_color": stroke_color,
+                    "shadow_offset_x": shadow_offset_x,
+                    "shadow_offset_y": shadow_offset_y,
+                    "shadow_color": shadow_color,
+                    "repeat_mode": repeat_mode
+                },
+                max_colors=quality_to_colors(quality),
+                loop=img.info.get("loop", 0)
+            )
+
+            logger.info("动图水印添加成功")
+            return result
+
+        except Exception as e:
+            logger.error(f"动图添加水印失败: {e}")
+            raise
@@ -0,0 +1,291 @@
+"""
+计算任务执行器
+将CPU密集型的图片处理任务从事件循环卸载到进程池（不可用时回退到线程池），
+使单个uvicorn worker在多核处理像素的同时仍能继续响应认证、计费、健康检查等I/O请求。
+"""
+import asyncio
+import inspect
+import multiprocessing
+import pickle
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..config import config
+from .logger import logger
+
+
+def _timed_call(func: Callable, args: tuple, kwargs: dict) -> Tuple[Any, float]:
+    """在工作进程/线程中执行任务，并返回结果和纯执行耗时（秒）"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _task_name(func: Callable) -> str:
+    """获取任务名称，用于统计"""
+    return getattr(func, "__qualname__", None) or getattr(func, "__name__", None) or repr(func)
+
+
+class ComputeExecutor:
+    """共享的计算任务执行器"""
+
+    MODE_PROCESS = "process"
+    MODE_THREAD = "thread"
+    MODE_INLINE = "inline"
+
+    def __init__(
+        self,
+        mode: str = MODE_PROCESS,
+        max_workers: int = 2,
+        start_method: str = "spawn",
+        slow_task_ms: int = 5000
+    ):
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.start_method = start_method
+        self.slow_task_ms = slow_task_ms
+
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # 统计信息
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._fallbacks = 0
+        self._task_stats: Dict[str, Dict[str, float]] = {}
+
+    # ------------------------------------------------------------------
+    # 生命周期
+    # ------------------------------------------------------------------
+    def start(self):
+        """创建执行池（应用启动时调用，首次提交任务时也会自动调用）"""
+        with self._lock:
+            if self.mode == self.MODE_PROCESS and self._process_pool is None:
+                self._process_pool = self._create_process_pool()
+            if self._thread_pool is None and self.mode != self.MODE_INLINE:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="compute"
+                )
+
+    def shutdown(self, wait: bool = True):
+        """关闭执行池（应用关闭时调用）"""
+        with self._lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=wait, cancel_futures=not wait)
+                self._process_pool = None
+            if self._thread_pool is not None:
+                self._thread_pool.shutdown(wait=wait, cancel_futures=not wait)
+                self._thread_pool = None
+        logger.info("计算任务执行器已关闭")
+
+    def _create_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """创建进程池，失败时返回None（回退到线程池）"""
+        try:
+            context = multiprocessing.get_context(self.start_method)
+            pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            logger.info(f"计算任务进程池已启动: workers={self.max_workers}, start_method={self.start_method}")
+            return pool
+        except Exception as e:
+            logger.warning(f"进程池创建失败，回退到线程池: {str(e)}")
+            return None
+
+    def _get_executor(self) -> Optional[Executor]:
+        """获取首选执行池"""
+        if self.mode == self.MODE_INLINE:
+            return None
+        if self._thread_pool is None:
+            self.start()
+        if self.mode == self.MODE_PROCESS and self._process_pool is not None:
+            return self._process_pool
+        return self._thread_pool
+
+    def _reset_process_pool(self, broken: ProcessPoolExecutor):
+        """进程池损坏（如工作进程被OOM kill）后重建，并发任务只重建一次"""
+        with self._lock:
+            if self._process_pool is not broken:
+                return
+            self._process_pool = self._create_process_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # 任务执行
+    # ------------------------------------------------------------------
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        在执行池中运行同步函数并等待结果
+
+        Args:
+            func: 同步函数（进程池模式下需可pickle，如模块级函数或类的静态方法）
+            *args, **kwargs: 函数参数
+
+        Returns:
+            函数返回值
+        """
+        name = _task_name(func)
+        self._on_submit()
+        submitted_at = time.perf_counter()
+        exec_seconds = 0.0
+        success = False
+
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                result, exec_seconds = _timed_call(func, args, kwargs)
+            else:
+                result, exec_seconds = await self._submit(executor, func, args, kwargs)
+            success = True
+            return result
+        finally:
+            total_seconds = time.perf_counter() - submitted_at
+            self._on_complete(name, total_seconds, exec_seconds, success)
+
+    async def _submit(self, executor: Executor, func: Callable, args: tuple, kwargs: dict) -> Tuple[Any, float]:
+        """
+        提交任务，参数不可序列化时回退到线程池
+
+        进程池损坏（工作进程崩溃或被OOM kill）时重建进程池并在新进程池中重试一次，
+        再次损坏则任务失败；导致工作进程崩溃的任务不会在API进程内执行。
+        """
+        loop = asyncio.get_running_loop()
+        if executor is not self._process_pool:
+            return await loop.run_in_executor(executor, _timed_call, func, args, kwargs)
+
+        try:
+            return await loop.run_in_executor(executor, _timed_call, func, args, kwargs)
+        except BrokenProcessPool:
+            logger.warning(f"计算进程池已损坏，重建后重试一次: {_task_name(func)}")
+            self._reset_process_pool(executor)
+            retry_pool = self._process_pool
+            if retry_pool is None:
+                raise RuntimeError(f"计算进程池重建失败: {_task_name(func)}")
+            try:
+                return await loop.run_in_executor(retry_pool, _timed_call, func, args, kwargs)
+            except BrokenProcessPool:
+                logger.error(f"计算任务导致工作进程再次崩溃，任务失败: {_task_name(func)}")
+                self._reset_process_pool(retry_pool)
+                raise RuntimeError(f"计算任务导致工作进程崩溃: {_task_name(func)}")
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            # 函数或参数无法跨进程传递（例如lambda、绑定了不可序列化对象的方法）
+            if not self._is_pickling_error(e):
+                raise
+            logger.debug(f"任务无法序列化，回退到线程池执行: {_task_name(func)} - {str(e)}")
+
+        with self._lock:
+            self._fallbacks += 1
+        return await loop.run_in_executor(self._thread_pool, _timed_call, func, args, kwargs)
+
+    @staticmethod
+    def _is_pickling_error(error: Exception) -> bool:
+        """判断异常是否来自参数序列化，而不是任务本身抛出"""
+        if isinstance(error, pickle.PicklingError):
+            return True
+        message = str(error).lower()
+        return "pickle" in message or "serializ" in message
+
+    # ------------------------------------------------------------------
+    # 统计
+    # ------------------------------------------------------------------
+    def _on_submit(self):
+        with self._lock:
+            self._submitted += 1
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+    def _on_complete(self, name: str, total_seconds: float, exec_seconds: float, success: bool):
+        total_ms = total_seconds * 1000
+        exec_ms = exec_seconds * 1000
+        with self._lock:
+            self._in_flight -= 1
+            if success:
+                self._completed += 1
+            else:
+                self._failed += 1
+
+            stats = self._task_stats.setdefault(name, {
+                "count": 0,
+                "total_ms": 0.0,
+                "exec_ms": 0.0,
+                "max_ms": 0.0,
+                "last_ms": 0.0,
+            })
+            stats["count"] += 1
+            stats["total_ms"] += total_ms
+            stats["exec_ms"] += exec_ms
+            stats["max_ms"] = max(stats["max_ms"], total_ms)
+            stats["last_ms"] = total_ms
+
+        if total_ms >= self.slow_task_ms:
+            logger.warning(
+                f"慢计算任务: {name} 总耗时 {total_ms:.1f}ms "
+                f"(执行 {exec_ms:.1f}ms, 排队 {total_ms - exec_ms:.1f}ms)"
+            )
+        else:
+            logger.debug(f"计算任务完成: {name} 总耗时 {total_ms:.1f}ms (执行 {exec_ms:.1f}ms)")
+
+    @property
+    def queue_depth(self) -> int:
+        """等待空闲worker的任务数"""
+        return max(0, self._in_flight - self.max_workers)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取执行器状态和各任务耗时统计"""
+        with self._lock:
+            if self.mode == self.MODE_INLINE:
+                active_backend = self.MODE_INLINE
+            elif self._process_pool is not None:
+                active_backend = self.MODE_PROCESS
+            else:
+                active_backend = self.MODE_THREAD
+
+            tasks = {}
+            for name, stats in self._task_stats.items():
+                count = stats["count"] or 1
+                tasks[name] = {
+                    "count": int(stats["count"]),
+                    "avg_ms": round(stats["total_ms"] / count, 2),
+                    "avg_exec_ms": round(stats["exec_ms"] / count, 2),
+                    "avg_wait_ms": round((stats["total_ms"] - stats["exec_ms"]) / count, 2),
+                    "max_ms": round(stats["max_ms"], 2),
+                    "last_ms": round(stats["last_ms"], 2),
+                }
+
+            return {
+                "mode": self.mode,
+                "active_backend": active_backend,
+                "max_workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "queue_depth": self.queue_depth,
+                "max_in_flight": self._max_in_flight,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "thread_fallbacks": self._fallbacks,
+                "tasks": tasks,
+            }
+
+
+# 全局计算任务执行器实例
+compute_executor = ComputeExecutor(
+    mode=config.COMPUTE_EXECUTOR_MODE,
+    max_workers=config.COMPUTE_MAX_WORKERS,
+    start_method=config.COMPUTE_MP_START_METHOD,
+    slow_task_ms=config.COMPUTE_SLOW_TASK_MS
+)
+
+
+async def run_compute(func: Callable, *args, **kwargs) -> Any:
+    """
+    在共享计算执行器中运行CPU密集型函数；
+    协程函数（如逐帧并行处理动画的服务）自行向执行器分发任务，直接等待
+    """
+    if inspect.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    return await compute_executor.run(func, *args, **kwargs)
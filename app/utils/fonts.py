@@ -0,0 +1,234 @@
+"""
+字体注册表
+启动时扫描一次系统和配置的字体目录，按字体族名称（读取字体文件中的family名）建立索引，
+常用字体名（Arial、Times New Roman等）通过别名映射到已安装的替代字体，包含中日韩文字时
+自动改用CJK字体。已加载的字体对象按 (路径, 字号) 放入LRU缓存，各文字绘制服务共用。
+"""
+import os
+import threading
+import functools
+from typing import Dict, List, Optional, Set, Tuple
+
+from PIL import ImageFont
+
+from ..config import config
+from .logger import logger
+
+# 默认扫描的字体目录
+SYSTEM_FONT_DIRS = (
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/.local/share/fonts"),
+    "/System/Library/Fonts",
+    "/Library/Fonts",
+    "C:\\Windows\\Fonts",
+)
+
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+# 常用字体名 -> 依次尝试的已安装字体族（第一个为字体本身）
+FONT_ALIASES = {
+    "arial": ["Arial", "Liberation Sans", "DejaVu Sans", "Helvetica"],
+    "helvetica": ["Helvetica", "Arial", "Liberation Sans", "DejaVu Sans"],
+    "times": ["Times", "Times New Roman", "Liberation Serif", "DejaVu Serif"],
+    "times new roman": ["Times New Roman", "Times", "Liberation Serif", "DejaVu Serif"],
+    "georgia": ["Georgia", "DejaVu Serif", "Liberation Serif"],
+    "courier new": ["Courier New", "Courier", "Liberation Mono", "DejaVu Sans Mono"],
+    "verdana": ["Verdana", "DejaVu Sans", "Liberation Sans"],
+    "tahoma": ["Tahoma", "DejaVu Sans", "Liberation Sans"],
+    "trebuchet ms": ["Trebuchet MS", "DejaVu Sans", "Liberation Sans"],
+    "impact": ["Impact", "DejaVu Sans", "Liberation Sans"],
+    "comic sans ms": ["Comic Sans MS", "DejaVu Sans", "Liberation Sans"],
+}
+
+# 可显示中日韩文字的字体族，按优先级排列
+CJK_FAMILIES = [
+    "Noto Sans CJK SC",
+    "Noto Sans SC",
+    "Source Han Sans SC",
+    "Droid Sans Fallback",
+    "WenQuanYi Micro Hei",
+    "WenQuanYi Zen Hei",
+    "PingFang SC",
+    "Heiti SC",
+    "STHeiti",
+    "Microsoft YaHei",
+    "SimHei",
+    "SimSun",
+]
+
+# 找不到指定字体时使用的字体族
+DEFAULT_FAMILIES = ["Arial", "Liberation Sans", "DejaVu Sans", "Helvetica"]
+
+# 同一字体族有多个字重时优先选择的样式
+_REGULAR_STYLES = ("regular", "book", "normal", "roman", "medium")
+
+
+def contains_cjk(text: Optional[str]) -> bool:
+    """文字中是否包含中日韩文字"""
+    if not text:
+        return False
+    return any(
+        "\u4e00" <= char <= "\u9fff"  # CJK统一汉字
+        or "\u3400" <= char <= "\u4dbf"  # 扩展A
+        or "\u3040" <= char <= "\u30ff"  # 日文假名
+        or "\uac00" <= char <= "\ud7af"  # 韩文
+        or "\u3000" <= char <= "\u303f"  # CJK标点
+        or "\uff00" <= char <= "\uffef"  # 全角字符
+        for char in text
+    )
+
+
+class FontRegistry:
+    """字体注册表：字体族 -> 字体文件路径的索引，以及已加载字体对象的缓存"""
+
+    def __init__(self, font_dirs: Optional[List[str]] = None):
+        self.font_dirs = list(font_dirs) if font_dirs is not None else [
+            *[path for path in config.FONT_DIRS.split(",") if path.strip()],
+            *SYSTEM_FONT_DIRS,
+        ]
+        self._families: Dict[str, Tuple[str, str]] = {}
+        self._paths: Dict[str, str] = {}
+        self._files: Set[str] = set()
+        self._scanned = False
+        self._lock = threading.Lock()
+
+    def scan(self):
+        """扫描字体目录建立索引（只执行一次，之后的调用直接返回）"""
+        if self._scanned:
+            return
+        with self._lock:
+            if self._scanned:
+                return
+            candidates: Dict[str, List[Tuple[int, str, str]]] = {}
+            for font_dir in self.font_dirs:
+                font_dir = font_dir.strip()
+                if not os.path.isdir(font_dir):
+                    continue
+                for root, _, files in os.walk(font_dir):
+                    for filename in sorted(files):
+                        if not filename.lower().endswith(FONT_EXTENSIONS):
+                            continue
+                        path = os.path.join(root, filename)
+                        self._index_file(path, candidates)
+
+            # 每个字体族保留最接近常规字重的文件
+            for key, entries in candidates.items():
+                _, name, path = min(entries)
+                self._families[key] = (name, path)
+            self._scanned = True
+            logger.info(f"字体索引完成: {len(self._families)} 个字体族, {len(self._paths)} 个字体文件")
+
+    def _index_file(self, path: str, candidates: Dict[str, List[Tuple[int, str, str]]]):
+        # 按文件名索引，兼容 "arial.ttf" 这样的写法；完整路径只接受扫描到的字体文件
+        self._files.add(os.path.normpath(path))
+        self._paths.setdefault(os.path.basename(path).lower(), path)
+        self._paths.setdefault(os.path.splitext(os.path.basename(path))[0].lower(), path)
+        try:
+            family, style = ImageFont.truetype(path, 10).getname()
+        except Exception as e:
+            logger.debug(f"无法读取字体 {path}: {e}")
+            return
+        if not family:
+            return
+        style = (style or "").lower()
+        rank = _REGULAR_STYLES.index(style) if style in _REGULAR_STYLES else len(_REGULAR_STYLES)
+        candidates.setdefault(family.lower(), []).append((rank, family, path))
+
+    def _lookup(self, name: str) -> Optional[str]:
+        name = name.strip()
+        if os.path.isabs(name):
+            # 客户端传入的路径只有在字体目录索引中时才使用，不读取服务器上的任意文件
+            path = os.path.normpath(name)
+            return path if path in self._files else None
+        key = name.lower()
+        if key in self._families:
+            return self._families[key][1]
+        return self._paths.get(key)
+
+    def _first_installed(self, names: List[str]) -> Optional[str]:
+        for name in names:
+            path = self._lookup(name)
+            if path:
+                return path
+        return None
+
+    def is_cjk_font(self, path: str) -> bool:
+        """字体文件是否属于已知的CJK字体族"""
+        cjk_paths = {self._lookup(name) for name in CJK_FAMILIES}
+        return path in cjk_paths
+
+    def resolve(self, font_family: str, text: Optional[str] = None) -> Optional[str]:
+        """
+        把字体族名称解析为已安装字体文件的路径
+
+        Args:
+            font_family: 字体族名称、别名、字体文件名或已索引字体文件的路径
+            text: 要绘制的文字，包含中日韩文字且所选字体不是CJK字体时改用CJK字体
+
+        Returns:
+            字体文件路径，没有任何可用字体时返回None
+        """
+        self.scan()
+        font_family = font_family or ""
+
+        if font_family.lower() == "chinese" or contains_cjk(font_family):
+            path = self._first_installed(CJK_FAMILIES)
+        else:
+            names = FONT_ALIASES.get(font_family.strip().lower(), [font_family])
+            path = self._first_installed(names)
+            if path is None:
+                path = self._first_installed(DEFAULT_FAMILIES)
+
+        if contains_cjk(text) and (path is None or not self.is_cjk_font(path)):
+            path = self._first_installed(CJK_FAMILIES) or path
+
+        if path is None and self._families:
+            # 连默认字体都没有时，使用任意一个已安装的字体
+            path = min(self._families.values())[1]
+        return path
+
+    def get_font(self, font_family: str, font_size: int, text: Optional[str] = None) -> ImageFont.ImageFont:
+        """
+        获取字体对象
+
+        Args:
+            font_family: 字体族名称
+            font_size: 字体大小
+            text: 要绘制的文字（用于选择CJK字体）
+
+        Returns:
+            字体对象，系统中没有可用字体时返回Pillow内置字体
+        """
+        path = self.resolve(font_family, text)
+        if path is not None:
+            try:
+                return _load_font(path, font_size)
+            except Exception as e:
+                logger.warning(f"无法加载字体 {path}: {e}")
+        return _load_default_font(font_size)
+
+    def list_families(self) -> List[str]:
+        """已安装的字体族名称列表"""
+        self.scan()
+        return sorted(name for name, _ in self._families.values())
+
+
+@functools.lru_cache(maxsize=config.FONT_CACHE_SIZE)
+def _load_font(path: str, font_size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(path, font_size)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_default_font(font_size: int) -> ImageFont.ImageFont:
+    logger.info("没有可用的系统字体，使用默认字体")
+    try:
+        # Pillow 10.1+ 内置可缩放的默认字体
+        return ImageFont.load_default(font_size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+# 全局字体注册表实例
+font_registry = FontRegistry()
@@ -0,0 +1,339 @@
+"""
+渐变与遮罩生成
+用NumPy一次性计算整张图的渐变进度（0表示起点，1表示终点），支持任意角度的线性渐变、
+对角线渐变、径向渐变和锥形渐变，再把进度映射为颜色或透明度；
+暗角遮罩在低分辨率网格上解析计算后放大到原尺寸。
+进度图和遮罩按 (类型, 尺寸, 参数) 做LRU缓存（按字节预算淘汰），相同尺寸的重复请求无需重新计算。
+
+缓存中的数组是只读的，需要修改时请先复制。
+"""
+import math
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+# 进度图缓存的字节预算（float32，4K图约33MB）
+FIELD_CACHE_BYTES = 128 * 1024 * 1024
+
+# 计算暗角衰减的低分辨率网格的长边像素数（衰减平滑，放大后与逐像素计算无明显差别）
+VIGNETTE_GRID_SIZE = 256
+
+# 线性渐变方向名称 -> 角度（0度从左到右，90度从上到下）
+DIRECTION_ANGLES = {
+    "to_right": 0.0,
+    "horizontal": 0.0,
+    "to_bottom": 90.0,
+    "vertical": 90.0,
+    "to_left": 180.0,
+    "to_top": 270.0,
+    "diagonal": 45.0,
+}
+
+_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def _cached(key: tuple, build) -> np.ndarray:
+    """按键读取或生成进度图/遮罩"""
+    global _cache_bytes
+    with _cache_lock:
+        field = _cache.get(key)
+        if field is not None:
+            _cache.move_to_end(key)
+            return field
+
+    field = build()
+    field.flags.writeable = False
+    if field.nbytes > FIELD_CACHE_BYTES:
+        return field
+
+    with _cache_lock:
+        if key not in _cache:
+            _cache[key] = field
+            _cache_bytes += field.nbytes
+        while _cache_bytes > FIELD_CACHE_BYTES:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= evicted.nbytes
+    return field
+
+
+def _center(size: Tuple[int, int], center: Optional[Tuple[float, float]]) -> Tuple[float, float]:
+    """默认中心为 (width // 2, height // 2)"""
+    width, height = size
+    return (width // 2, height // 2) if center is None else (float(center[0]), float(center[1]))
+
+
+def linear(size: Tuple[int, int], angle: float = 0.0) -> np.ndarray:
+    """
+    任意角度的线性渐变进度
+
+    进度为像素坐标在渐变方向上的投影，按整张图在该方向上的投影范围归一化：
+    0度时为 x / width，90度时为 y / height，45度时为 (x + y) / (width + height)。
+
+    Args:
+        size: (宽, 高)
+        angle: 渐变方向角度（度），0度从左到右，顺时针增加
+
+    Returns:
+        形状为 (高, 宽) 的只读float32数组，取值 [0, 1)
+    """
+    width, height = size
+    angle = float(angle) % 360
+
+    def build():
+        radians = math.radians(angle)
+        dx, dy = round(math.cos(radians), 12), round(math.sin(radians), 12)
+        extent = abs(dx) * width + abs(dy) * height
+        offset = min(0.0, dx * width) + min(0.0, dy * height)
+        xs = (np.arange(width, dtype=np.float64) * dx)[None, :]
+        ys = (np.arange(height, dtype=np.float64) * dy)[:, None]
+        return ((xs + ys - offset) / extent).astype(np.float32)
+
+    return _cached(("linear", width, height, angle), build)
+
+
+def radial(
+    size: Tuple[int, int],
+    center: Optional[Tuple[float, float]] = None,
+    radius: Optional[float] = None,
+    aspect: float = 1.0
+) -> np.ndarray:
+    """
+    径向渐变进度：到中心的距离除以半径（不截断，超出半径的位置大于1）
+
+    Args:
+        size: (宽, 高)
+        center: 中心坐标，默认 (width // 2, height // 2)
+        radius: 半径，默认为中心到最远角的距离
+        aspect: 椭圆的水平/垂直半径比，1为圆形
+
+    Returns:
+        形状为 (高, 宽) 的只读float32数组
+    """
+    width, height = size
+    cx, cy = _center(size, center)
+    if radius is None:
+        radius = math.hypot(max(cx, width - cx), max(cy, height - cy))
+    radius = max(float(radius), 1e-6)
+
+    def build():
+        dx = ((np.arange(width, dtype=np.float64) - cx) / aspect)[None, :]
+        dy = (np.arange(height, dtype=np.float64) - cy)[:, None]
+        return (np.sqrt(dx * dx + dy * dy) / radius).astype(np.float32)
+
+    return _cached(("radial", width, height, cx, cy, radius, float(aspect)), build)
+
+
+def diagonal(size: Tuple[int, int]) -> np.ndarray:
+    """对角线渐变进度 (x + y) / (width + height)，即45度线性渐变"""
+    return linear(size, 45.0)
+
+
+def conic(
+    size: Tuple[int, int],
+    center: Optional[Tuple[float, float]] = None,
+    start_angle: float = 0.0
+) -> np.ndarray:
+    """
+    锥形（角度）渐变进度：绕中心顺时针旋转的角度 / 360
+
+    Args:
+        size: (宽, 高)
+        center: 中心坐标，默认 (width // 2, height // 2)
+        start_angle: 进度为0的方向（度），0度指向右侧
+
+    Returns:
+        形状为 (高, 宽) 的只读float32数组，取值 [0, 1)
+    """
+    width, height = size
+    cx, cy = _center(size, center)
+    start_angle = float(start_angle) % 360
+
+    def build():
+        dx = (np.arange(width, dtype=np.float64) - cx)[None, :]
+        dy = (np.arange(height, dtype=np.float64) - cy)[:, None]
+        angles = np.degrees(np.arctan2(dy, dx)) - start_angle
+        return (np.mod(angles, 360.0) / 360.0).astype(np.float32)
+
+    return _cached(("conic", width, height, cx, cy, start_angle), build)
+
+
+def vignette_mask(
+    size: Tuple[int, int],
+    intensity: float,
+    inner: float = 0.0,
+    outer: float = 1.0,
+    feather: float = 0.0,
+    shape: str = "circle"
+) -> np.ndarray:
+    """
+    暗角遮罩：在长边不超过VIGNETTE_GRID_SIZE的网格上按到中心的归一化距离解析计算衰减，
+    双线性放大到原尺寸
+
+    归一化距离 d：circle 以短边的一半为单位（圆形暗角），ellipse 以宽、高的一半为单位（贴合画面的椭圆）。
+    暗度 = intensity * t，t 在 d <= inner 时为0，在 d >= outer 时为1，之间线性过渡；
+    feather 为0-1，越大过渡越接近平滑的S形曲线。
+
+    Args:
+        size: (宽, 高)
+        intensity: 暗角强度，1为最外侧全黑
+        inner: 开始变暗的归一化距离
+        outer: 达到最大暗度的归一化距离
+        feather: 边缘羽化程度
+        shape: circle / ellipse
+
+    Returns:
+        形状为 (高, 宽) 的只读uint8数组，255表示完全变暗
+    """
+    if shape not in ("circle", "ellipse"):
+        raise ValueError(f"不支持的暗角形状: {shape}")
+    width, height = size
+    key = ("vignette", width, height, float(intensity), float(inner), float(outer), float(feather), shape)
+
+    def build():
+        scale = min(1.0, VIGNETTE_GRID_SIZE / max(width, height))
+        grid_width, grid_height = max(1, round(width * scale)), max(1, round(height * scale))
+        if shape == "circle":
+            radius_x = radius_y = min(width, height) / 2
+        else:
+            radius_x, radius_y = width / 2, height / 2
+
+        # 网格单元中心在原图中的坐标（相对画面中心）
+        xs = ((np.arange(grid_width) + 0.5) * (width / grid_width) - width / 2) / max(radius_x, 1e-6)
+        ys = ((np.arange(grid_height) + 0.5) * (height / grid_height) - height / 2) / max(radius_y, 1e-6)
+        distance = np.sqrt(xs[None, :] ** 2 + ys[:, None] ** 2)
+
+        t = np.clip((distance - inner) / max(outer - inner, 1e-6), 0.0, 1.0)
+        t += feather * (t * t * (3 - 2 * t) - t)
+        grid = np.clip(t * (intensity * 255), 0, 255).astype(np.uint8)
+        if (grid_width, grid_height) == (width, height):
+            return grid
+        return np.asarray(Image.fromarray(grid).resize((width, height), Image.BILINEAR))
+
+    return _cached(key, build)
+
+
+def apply_vignette(
+    img: Image.Image,
+    intensity: float,
+    inner: float = 0.0,
+    outer: float = 1.0,
+    feather: float = 0.0,
+    shape: str = "circle",
+    color: Tuple[int, int, int] = (0, 0, 0)
+) -> Image.Image:
+    """
+    给图片添加暗角（参数见 vignette_mask），透明通道保持不变
+
+    Returns:
+        RGB或L图片（输入带透明通道时为RGBA/LA）
+    """
+    alpha = None
+    if img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        alpha = img.getchannel("A")
+        img = img.convert("RGB")
+    elif img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    mask = Image.fromarray(vignette_mask(img.size, intensity, inner, outer, feather, shape))
+    fill = color if img.mode == "RGB" else int(sum(color) / 3)
+    result = Image.composite(Image.new(img.mode, img.size, fill), img, mask)
+    if alpha is not None:
+        result.putalpha(alpha)
+    return result
+
+
+def _lerp_into(out: np.ndarray, progress: np.ndarray, start: float, end: float, scratch: np.ndarray):
+    """out = clip(start + (end - start) * progress) 截断为uint8，逐通道计算以减少临时数组"""
+    np.multiply(progress, end - start, out=scratch)
+    scratch += start
+    np.clip(scratch, 0, 255, out=scratch)
+    out[...] = scratch
+
+
+def interpolate_colors(
+    progress: np.ndarray,
+    start_color: Sequence[int],
+    end_color: Sequence[int]
+) -> np.ndarray:
+    """
+    按进度在两个颜色之间插值（与逐像素 int(start + (end - start) * t) 的结果一致）
+
+    Returns:
+        形状为 (高, 宽, 通道数) 的uint8数组
+    """
+    colors = np.empty((*progress.shape, len(start_color)), dtype=np.uint8)
+    scratch = np.empty(progress.shape, dtype=np.float32)
+    for channel, (start, end) in enumerate(zip(start_color, end_color)):
+        _lerp_into(colors[:, :, channel], progress, float(start), float(end), scratch)
+    return colors
+
+
+def interpolate_alpha(progress: np.ndarray, start_opacity: float, end_opacity: float) -> np.ndarray:
+    """
+    按进度在两个不透明度（0-1）之间插值
+
+    Returns:
+        形状为 (高, 宽) 的uint8数组，值为 int(opacity * 255)
+    """
+    alpha = np.empty(progress.shape, dtype=np.uint8)
+    scratch = np.empty(progress.shape, dtype=np.float32)
+    _lerp_into(alpha, progress, start_opacity * 255, end_opacity * 255, scratch)
+    return alpha
+
+
+def gradient_image(
+    progress: np.ndarray,
+    start_color: Sequence[int],
+    end_color: Sequence[int],
+    start_opacity: Optional[float] = None,
+    end_opacity: Optional[float] = None
+) -> Image.Image:
+    """
+    把进度图渲染为渐变图片
+
+    Args:
+        progress: 进度图（超出 [0, 1] 的部分由调用方决定是否截断）
+        start_color: 起始RGB颜色
+        end_color: 结束RGB颜色
+        start_opacity: 起始不透明度，与end_opacity同时提供时输出RGBA
+        end_opacity: 结束不透明度
+
+    Returns:
+        RGB或RGBA图片
+    """
+    starts = list(start_color[:3])
+    ends = list(end_color[:3])
+    if start_opacity is not None and end_opacity is not None:
+        # 透明度作为第四个通道一起插值
+        starts.append(start_opacity * 255)
+        ends.append(end_opacity * 255)
+    return Image.fromarray(interpolate_colors(progress, starts, ends))
+
+
+def hue_colors(progress: np.ndarray) -> np.ndarray:
+    """
+    按进度生成色相环颜色（进度0-1对应色相0-360度，饱和度和明度为1）
+
+    Returns:
+        形状为 (高, 宽, 3) 的float32数组，取值 0-255
+    """
+    hue = np.mod(progress, 1.0) * 6.0
+    # HSV(h, 1, 1) 到RGB：各通道为 clip(|h - k| - 1) 形式的分段线性函数
+    r = np.clip(np.abs(hue - 3.0) - 1.0, 0.0, 1.0)
+    g = np.clip(2.0 - np.abs(hue - 2.0), 0.0, 1.0)
+    b = np.clip(2.0 - np.abs(hue - 4.0), 0.0, 1.0)
+    return np.stack([r, g, b], axis=-1).astype(np.float32) * 255
+
+
+def clear_cache():
+    """清空进度图缓存"""
+    global _cache_bytes
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
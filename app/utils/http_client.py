@@ -0,0 +1,81 @@
+"""
+HTTP客户端连接池管理
+为用户中心、AIGC网盘等外部服务提供应用生命周期内复用的httpx.AsyncClient，
+避免每次请求都重新建立TCP+TLS连接。
+"""
+from typing import Dict
+
+import httpx
+
+from ..config import config
+from .logger import logger
+
+
+def _http2_available() -> bool:
+    """检查是否安装了HTTP/2依赖（h2）"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HttpClientManager:
+    """共享的httpx.AsyncClient管理器，按名称复用连接池"""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._http2 = config.HTTP2_ENABLED
+        if self._http2 and not _http2_available():
+            logger.warning("已启用HTTP2_ENABLED，但未安装h2依赖（pip install httpx[http2]），回退到HTTP/1.1")
+            self._http2 = False
+
+    def _create_client(self, timeout: float, base_url: str = "") -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY
+        )
+        return httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=limits,
+            http2=self._http2
+        )
+
+    def get_client(self, name: str, timeout: float, base_url: str = "") -> httpx.AsyncClient:
+        """
+        获取指定名称的共享客户端，不存在或已关闭时创建
+
+        Args:
+            name: 客户端名称（如 user_center、aigc_storage）
+            timeout: 默认超时时间（秒）
+            base_url: 基础URL
+
+        Returns:
+            共享的httpx.AsyncClient
+        """
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create_client(timeout, base_url)
+            self._clients[name] = client
+            logger.info(
+                f"创建HTTP连接池: {name}, max_connections={config.HTTP_MAX_CONNECTIONS}, "
+                f"keepalive={config.HTTP_MAX_KEEPALIVE_CONNECTIONS}, http2={self._http2}"
+            )
+        return client
+
+    async def close_all(self):
+        """关闭所有共享客户端（应用关闭时调用）"""
+        clients = list(self._clients.items())
+        self._clients.clear()
+        for name, client in clients:
+            try:
+                await client.aclose()
+                logger.info(f"HTTP连接池已关闭: {name}")
+            except Exception as e:
+                logger.warning(f"关闭HTTP连接池失败: {name} - {str(e)}")
+
+
+# 全局HTTP客户端管理器实例
+http_client_manager = HttpClientManager()
@@ -1,21 +1,26 @@
-import requests
 import io
-from typing import Optional
-from PIL import Image
+from typing import List, Optional, Tuple, Union
+from PIL import ExifTags, Image
 from ..utils.logger import logger
+from .url_fetcher import url_fetcher
 
 
 class ImageUtils:
     """图片工具类"""
     
     @staticmethod
-    def download_image_from_url(url: str, timeout: int = 30) -> tuple[bytes, str]:
+    async def download_image_from_url(
+        url: str,
+        max_bytes: Optional[int] = None,
+        allow_video: bool = False
+    ) -> tuple[bytes, str]:
         """
-        从URL下载图片
+        从URL异步下载图片（流式读取，超过大小限制或内容不是图片时立即中断）
 
         Args:
             url: 图片URL
-            timeout: 超时时间（秒）
+            max_bytes: 最大允许字节数，默认使用 URL_FETCH_MAX_BYTES
+            allow_video: 是否允许下载视频（视频转GIF使用）
 
         Returns:
             (图片的字节数据, 内容类型)
@@ -23,33 +28,20 @@ class ImageUtils:
         Raises:
             Exception: 下载失败时抛出异常
         """
-        logger.info(f"开始从URL下载图片: {url}")
+        return await url_fetcher.fetch_bytes(url, max_bytes=max_bytes, allow_video=allow_video)
+    
+    @staticmethod
+    async def download_images_from_urls(urls: List[str]) -> List[Tuple[Image.Image, int]]:
+        """
+        并发下载并解码多张URL图片（受并发数、单主机连接数和总字节预算限制）
 
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-
-            response = requests.get(url, headers=headers, timeout=timeout)
-            response.raise_for_status()
-
-            # 检查内容类型
-            content_type = response.headers.get('content-type', '')
-            if not content_type.startswith('image/'):
-                raise ValueError(f"URL返回的不是图片类型: {content_type}")
-
-            logger.info(f"成功下载图片，大小: {len(response.content)} bytes")
-            return response.content, content_type
-
-        except requests.exceptions.Timeout:
-            logger.error(f"下载图片超时: {url}")
-            raise Exception("下载图片超时")
-        except requests.exceptions.RequestException as e:
-            logger.error(f"下载图片失败: {e}")
-            raise Exception(f"下载图片失败: {str(e)}")
-        except Exception as e:
-            logger.error(f"处理图片URL时出错: {e}")
-            raise
+        Args:
+            urls: 图片URL列表
+
+        Returns:
+            与urls顺序一致的 (PIL图片, 下载字节数) 列表
+        """
+        return await url_fetcher.fetch_images(urls)
     
     @staticmethod
     def validate_image_url(url: str) -> bool:
@@ -132,6 +124,96 @@ class ImageUtils:
             logger.error(f"字节数据转换为图片失败: {e}")
             raise Exception(f"无效的图片数据: {str(e)}")
     
+    @staticmethod
+    def is_animated(image_bytes: bytes) -> bool:
+        """
+        判断图片是否为多帧动画（GIF、APNG、动画WebP），只读取文件头，不解码像素
+        
+        Args:
+            image_bytes: 图片的字节数据
+            
+        Returns:
+            是否包含多于一帧
+        """
+        try:
+            return bool(getattr(Image.open(io.BytesIO(image_bytes)), "is_animated", False))
+        except Exception:
+            return False
+    
+    @staticmethod
+    def _load_exif_thumbnail(image: Image.Image) -> Optional[Image.Image]:
+        """读取JPEG中EXIF内嵌的缩略图，不存在或损坏时返回None"""
+        raw = image.info.get("exif")
+        if not raw:
+            return None
+        try:
+            ifd1 = image.getexif().get_ifd(ExifTags.IFD.IFD1)
+            offset = ifd1.get(0x0201)  # JPEGInterchangeFormat
+            length = ifd1.get(0x0202)  # JPEGInterchangeFormatLength
+            if not offset or not length:
+                return None
+            # 偏移量相对于TIFF头，原始数据以 "Exif\0\0" 开头
+            start = offset + 6 if raw.startswith(b"Exif\x00\x00") else offset
+            thumbnail = Image.open(io.BytesIO(raw[start:start + length]))
+            thumbnail.load()
+            return thumbnail
+        except Exception as e:
+            logger.debug(f"读取EXIF缩略图失败: {e}")
+            return None
+
+    @staticmethod
+    def decode_for_size(
+        image: Union[bytes, Image.Image],
+        target_size: Tuple[int, int],
+        reducing_gap: float = 2.0,
+        use_exif_thumbnail: bool = True
+    ) -> Image.Image:
+        """
+        以满足目标尺寸的最低成本解码图片（缩小加载）
+
+        依次尝试：比例一致的EXIF缩略图；JPEG的DCT域缩放解码（draft）；其他情况完整解码。
+        缩略图和缩小解码的尺寸都至少为目标的reducing_gap倍，以保证后续LANCZOS缩放的质量。
+        调用方仍需将结果缩放到精确的目标尺寸。
+
+        Args:
+            image: 图片字节数据，或尚未加载像素的PIL图片（Image.open的返回值）
+            target_size: 整张图片需要的最小尺寸 (宽, 高)
+            reducing_gap: 解码尺寸相对目标尺寸的最小倍数
+            use_exif_thumbnail: 是否允许使用EXIF缩略图
+
+        Returns:
+            已加载的PIL图片，format与原图一致
+        """
+        if isinstance(image, (bytes, bytearray)):
+            image = ImageUtils.bytes_to_image(image)
+
+        target_width, target_height = max(1, target_size[0]), max(1, target_size[1])
+        width, height = image.size
+        if image.format != "JPEG" or target_width >= width or target_height >= height:
+            image.load()
+            return image
+
+        if use_exif_thumbnail:
+            thumbnail = ImageUtils._load_exif_thumbnail(image)
+            if (
+                thumbnail is not None
+                and thumbnail.width >= target_width * reducing_gap
+                and thumbnail.height >= target_height * reducing_gap
+                and abs(thumbnail.width / thumbnail.height - width / height) < 0.01
+            ):
+                logger.info(f"使用EXIF缩略图解码: {width}x{height} -> {thumbnail.size}")
+                return thumbnail
+
+        requested = (
+            min(width, int(target_width * reducing_gap)),
+            min(height, int(target_height * reducing_gap))
+        )
+        image.draft(image.mode, requested)
+        image.load()
+        if image.size != (width, height):
+            logger.info(f"JPEG缩小加载: {width}x{height} -> {image.size}")
+        return image
+
     @staticmethod
     def image_to_bytes(image: Image.Image, format: str = "JPEG", quality: int = 95) -> bytes:
         """
@@ -0,0 +1,270 @@
+"""
+逐像素运算编译器
+把一串色调调整（亮度、对比度、通道缩放、伽马、曲线、饱和度、通道矩阵等）
+编译成尽量少的处理阶段：相邻的逐通道查找表合成为一张表，相邻的通道矩阵相乘为一个矩阵，
+每个阶段只遍历一次像素（查找表用 Image.point，矩阵用 Image.convert 的matrix参数）。
+编译结果按操作参数缓存。
+
+操作以元组表示，第一个元素为操作名，其余为参数，例如::
+
+    apply_point_ops(img, [("color", 0.7), ("contrast", 1.2), ("scale", (1.05, 1.025, 0.95))])
+
+逐通道查找表操作与 ImageEnhance / point(lambda) 的逐步计算结果一致（每步截断并限制在0-255）；
+矩阵操作（color / grayscale / matrix）对灰度不做中间取整，与逐步计算通常相差不超过1个色阶
+（经后续对比度等操作放大后可能相差2-3个色阶）。
+"""
+import functools
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageStat
+
+# ITU-R 601-2 亮度权重（与PIL转换为L模式一致）
+LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+
+# 统计当前灰度均值时的最大采样像素数，超过时最近邻抽样
+STAT_SAMPLE_PIXELS = 256 * 256
+
+# 编译结果缓存的条目数
+KERNEL_CACHE_SIZE = 256
+
+_LEVELS = np.arange(256, dtype=np.float64)
+
+
+# ----------------------------------------------------------------------
+# 逐通道查找表操作：输入0-255的色阶，返回每个通道的输出值（形状为 (256,) 或 (3, 256)）
+# ----------------------------------------------------------------------
+def _brightness(levels: np.ndarray, factor: float) -> np.ndarray:
+    """等同 ImageEnhance.Brightness(img).enhance(factor)"""
+    # ImageEnhance 基于 Image.blend，以单精度浮点计算后截断
+    return levels.astype(np.float32) * np.float32(factor)
+
+
+def _contrast(levels: np.ndarray, factor: float, mean: int) -> np.ndarray:
+    """等同 ImageEnhance.Contrast(img).enhance(factor)，mean为当前图片的灰度均值"""
+    mean = np.float32(mean)
+    return mean + (levels.astype(np.float32) - mean) * np.float32(factor)
+
+
+def _scale(levels: np.ndarray, factors: Tuple[float, float, float]) -> np.ndarray:
+    """各通道分别乘以系数，等同 channel.point(lambda x: min(255, int(x * factor)))"""
+    return levels[None, :] * np.asarray(factors, dtype=np.float64)[:, None]
+
+
+def _gamma(levels: np.ndarray, gamma: float) -> np.ndarray:
+    """伽马校正"""
+    return 255 * (levels / 255) ** (1 / gamma)
+
+
+def _curve(levels: np.ndarray, points: Tuple[Tuple[int, int], ...], intensity: float = 1.0) -> np.ndarray:
+    """按控制点线性插值的曲线，intensity控制与原值的混合程度"""
+    xs = [point[0] for point in points]
+    ys = [point[1] for point in points]
+    values = np.trunc(np.interp(levels, xs, ys))
+    return np.trunc(levels + (values - levels) * intensity)
+
+
+def _invert(levels: np.ndarray) -> np.ndarray:
+    """反相"""
+    return 255 - levels
+
+
+def _lut(levels: np.ndarray, table: Tuple[int, ...]) -> np.ndarray:
+    """自定义查找表（256项共用或768项分通道）"""
+    return np.asarray(table, dtype=np.float64).reshape(-1, 256)
+
+
+# ----------------------------------------------------------------------
+# 通道矩阵操作：返回 3x4 仿射矩阵（前三列为通道系数，最后一列为偏移）
+# ----------------------------------------------------------------------
+def _color(factor: float) -> np.ndarray:
+    """等同 ImageEnhance.Color(img).enhance(factor)：在原色与灰度之间插值（与其一样向下取整）"""
+    gray = np.tile(LUMA_WEIGHTS, (3, 1))
+    # Image.convert的矩阵运算四舍五入，偏移-0.5使结果变为截断
+    return np.hstack([factor * np.eye(3) + (1 - factor) * gray, np.full((3, 1), -0.5)])
+
+
+def _grayscale() -> np.ndarray:
+    """转换为灰度（三个通道都等于亮度）"""
+    return np.hstack([np.tile(LUMA_WEIGHTS, (3, 1)), np.zeros((3, 1))])
+
+
+def _matrix(matrix: Tuple[Tuple[float, float, float], ...], offset: Tuple[float, float, float] = (0, 0, 0)) -> np.ndarray:
+    """自定义3x3通道矩阵（输出通道 = 矩阵行 · (R, G, B) + 偏移）"""
+    return np.hstack([np.asarray(matrix, dtype=np.float64), np.asarray(offset, dtype=np.float64)[:, None]])
+
+
+LUT_OPS: Dict[str, Callable[..., np.ndarray]] = {
+    "brightness": _brightness,
+    "contrast": _contrast,
+    "scale": _scale,
+    "gamma": _gamma,
+    "curve": _curve,
+    "invert": _invert,
+    "lut": _lut,
+}
+
+MATRIX_OPS: Dict[str, Callable[..., np.ndarray]] = {
+    "color": _color,
+    "grayscale": _grayscale,
+    "matrix": _matrix,
+}
+
+# 依赖当前图片灰度均值的操作，编译时在参数末尾追加均值
+STAT_OPS = {"contrast"}
+
+
+class PointKernel:
+    """编译后的逐像素运算：依次执行的查找表/矩阵阶段"""
+
+    def __init__(self, stages: Tuple[Tuple[str, tuple], ...]):
+        """
+        Args:
+            stages: 阶段列表，("lut", 768项查找表) 或 ("matrix", 12项矩阵)
+        """
+        self.stages = stages
+
+    def apply(self, img: Image.Image) -> Image.Image:
+        """对RGB图片执行所有阶段"""
+        if not self.stages:
+            return img.copy()
+        for kind, data in self.stages:
+            if kind == "lut":
+                img = img.point(data)
+            else:
+                img = img.convert("RGB", data)
+        return img
+
+
+def _freeze(value: Any) -> Any:
+    """把列表参数转换为元组，使操作可以作为缓存键"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _normalize_ops(ops: Sequence[Sequence[Any]]) -> Tuple[tuple, ...]:
+    normalized = []
+    for op in ops:
+        op = _freeze(op)
+        if not op or (op[0] not in LUT_OPS and op[0] not in MATRIX_OPS):
+            supported = ", ".join([*LUT_OPS, *MATRIX_OPS])
+            raise ValueError(f"不支持的逐像素操作: {op[0] if op else op}，支持的操作有: {supported}")
+        normalized.append(op)
+    return tuple(normalized)
+
+
+@functools.lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def _compile(ops: Tuple[tuple, ...], stats: Tuple[int, ...]) -> PointKernel:
+    """
+    编译操作序列
+
+    Args:
+        ops: 规范化后的操作序列
+        stats: 按顺序对应每个STAT_OPS操作的灰度均值
+    """
+    stages: List[Tuple[str, tuple]] = []
+    lut: Optional[np.ndarray] = None
+    matrix: Optional[np.ndarray] = None
+    stat_values = iter(stats)
+
+    def flush_lut():
+        if lut is not None and not np.array_equal(lut, np.tile(np.arange(256), (3, 1))):
+            stages.append(("lut", tuple(int(value) for value in lut.ravel())))
+
+    def flush_matrix():
+        if matrix is not None:
+            stages.append(("matrix", tuple(float(value) for value in matrix.ravel())))
+
+    for name, *args in ops:
+        if name in STAT_OPS:
+            args.append(next(stat_values))
+
+        if name in LUT_OPS:
+            if matrix is not None:
+                flush_matrix()
+                matrix = None
+            values = np.broadcast_to(LUT_OPS[name](_LEVELS, *args), (3, 256))
+            table = np.clip(values, 0, 255).astype(np.intp)
+            # 与已有查找表合成：新表[旧表]
+            lut = table if lut is None else np.take_along_axis(table, lut, axis=1)
+        else:
+            if lut is not None:
+                flush_lut()
+                lut = None
+            affine = MATRIX_OPS[name](*args)
+            if matrix is None:
+                matrix = affine
+            else:
+                # 与已有矩阵相乘：M2 · (A1·x + b1) + b2
+                matrix = np.hstack([affine[:, :3] @ matrix[:, :3], affine[:, :3] @ matrix[:, 3:] + affine[:, 3:]])
+
+    flush_lut()
+    flush_matrix()
+    return PointKernel(tuple(stages))
+
+
+def _stat_sample(img: Image.Image) -> Image.Image:
+    """用于统计均值的采样图片（最近邻抽样保留原始像素值）"""
+    pixels = img.width * img.height
+    if pixels <= STAT_SAMPLE_PIXELS:
+        return img
+    ratio = (STAT_SAMPLE_PIXELS / pixels) ** 0.5
+    size = (max(1, int(img.width * ratio)), max(1, int(img.height * ratio)))
+    return img.resize(size, Image.NEAREST)
+
+
+def _mean_luma(img: Image.Image) -> int:
+    """与 ImageEnhance.Contrast 相同的灰度均值计算"""
+    return int(ImageStat.Stat(img.convert("L")).mean[0] + 0.5)
+
+
+def compile_point_ops(ops: Sequence[Sequence[Any]], img: Optional[Image.Image] = None) -> PointKernel:
+    """
+    编译操作序列
+
+    Args:
+        ops: 操作序列，如 [("brightness", 1.1), ("contrast", 0.9)]
+        img: RGB图片，操作中包含对比度等依赖图片统计量的操作时必须提供
+
+    Returns:
+        编译后的运算
+    """
+    ops = _normalize_ops(ops)
+    stats: List[int] = []
+    sample = None
+    for index, op in enumerate(ops):
+        if op[0] not in STAT_OPS:
+            continue
+        if img is None:
+            raise ValueError(f"操作 {op[0]} 依赖图片统计量，编译时需要提供图片")
+        if sample is None:
+            sample = _stat_sample(img)
+        # 对抽样图片执行前面的操作后统计均值
+        prefix = _compile(ops[:index], tuple(stats))
+        stats.append(_mean_luma(prefix.apply(sample)))
+    return _compile(ops, tuple(stats))
+
+
+def apply_point_ops(img: Image.Image, ops: Sequence[Sequence[Any]]) -> Image.Image:
+    """
+    对图片执行逐像素操作序列
+
+    Args:
+        img: 输入图片，非RGB模式先转换为RGB，透明通道保持不变
+        ops: 操作序列，如 [("color", 0.5), ("brightness", 1.2), ("contrast", 0.8)]
+
+    Returns:
+        RGB图片（输入带透明通道时为RGBA）
+    """
+    alpha = None
+    if img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        alpha = img.getchannel("A")
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+
+    result = compile_point_ops(ops, img).apply(img)
+    if alpha is not None:
+        result.putalpha(alpha)
+    return result
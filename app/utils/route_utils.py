@@ -30,7 +30,7 @@ def create_url_endpoint(original_handler: Callable) -> Callable:
                 raise HTTPException(status_code=400, detail="无效的图片URL")
             
             # 下载图片
-            image_data = ImageUtils.download_image_from_url(image_url)
+            image_data, _ = await ImageUtils.download_image_from_url(image_url)
             
             # 创建一个模拟的UploadFile对象
             class FakeUploadFile:
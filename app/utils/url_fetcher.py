@@ -0,0 +1,350 @@
+"""
+异步URL资源下载
+基于共享连接池流式下载远程图片/视频：超过大小限制立即中断，
+首个数据块即校验Content-Type和文件头魔数，数据写入SpooledTemporaryFile，
+可直接从缓冲区解码而无需再复制一份字节数据。
+"""
+import asyncio
+import tempfile
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from PIL import Image
+
+from ..config import config
+from .http_client import http_client_manager
+from .logger import logger
+
+
+# 图片文件头魔数 -> MIME类型
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"\x00\x00\x01\x00", "image/x-icon"),
+)
+
+# 视频文件头魔数 -> MIME类型
+VIDEO_SIGNATURES = (
+    (b"\x1a\x45\xdf\xa3", "video/webm"),
+    (b"FLV", "video/x-flv"),
+)
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """根据文件头魔数识别内容类型，无法识别时返回None"""
+    for signature, mime in IMAGE_SIGNATURES + VIDEO_SIGNATURES:
+        if head.startswith(signature):
+            return mime
+
+    if head[:4] == b"RIFF" and len(head) >= 12:
+        if head[8:12] == b"WEBP":
+            return "image/webp"
+        if head[8:12] == b"AVI ":
+            return "video/x-msvideo"
+
+    # ISO BMFF 容器（HEIC/AVIF图片，MP4/MOV视频）
+    if head[4:8] == b"ftyp" and len(head) >= 12:
+        brand = head[8:12]
+        if brand in (b"heic", b"heix", b"mif1", b"msf1"):
+            return "image/heic"
+        if brand in (b"avif", b"avis"):
+            return "image/avif"
+        if brand == b"qt  ":
+            return "video/quicktime"
+        return "video/mp4"
+
+    stripped = head.lstrip()[:256].lower()
+    if stripped.startswith(b"<svg") or (stripped.startswith(b"<?xml") and b"<svg" in stripped):
+        return "image/svg+xml"
+
+    return None
+
+
+class ByteBudget:
+    """多个下载共享的总字节预算"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+
+    def consume(self, size: int):
+        self.used += size
+        if self.used > self.limit:
+            raise ValueError(f"下载总大小超过限制: > {self.limit} bytes")
+
+
+class FetchedFile:
+    """已下载的远程文件，内容保存在SpooledTemporaryFile中（小文件在内存，大文件落盘）"""
+
+    def __init__(self, buffer: tempfile.SpooledTemporaryFile, url: str, content_type: str, size: int):
+        self.buffer = buffer
+        self.url = url
+        self.content_type = content_type
+        self.size = size
+        self._content: Optional[bytes] = None
+
+    @property
+    def content(self) -> bytes:
+        """完整的字节数据（首次访问时读取）"""
+        if self._content is None:
+            self.buffer.seek(0)
+            self._content = self.buffer.read()
+        return self._content
+
+    def open_image(self) -> Image.Image:
+        """直接从缓冲区解码图片"""
+        self.buffer.seek(0)
+        image = Image.open(self.buffer)
+        image.load()
+        return image
+
+    def close(self):
+        self.buffer.close()
+
+    def __enter__(self) -> "FetchedFile":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class UrlFetcher:
+    """异步流式URL下载器"""
+
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+    def __init__(
+        self,
+        max_bytes: int = 50 * 1024 * 1024,
+        timeout: float = 30,
+        spool_max_size: int = 8 * 1024 * 1024,
+        chunk_size: int = 64 * 1024,
+        max_concurrency: int = 8,
+        per_host_limit: int = 4,
+        total_max_bytes: int = 200 * 1024 * 1024
+    ):
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.spool_max_size = spool_max_size
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.total_max_bytes = total_max_bytes
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return http_client_manager.get_client("url_fetcher", timeout=self.timeout)
+
+    @staticmethod
+    def _check_content_type(header_type: str, head: bytes, allow_video: bool) -> str:
+        """根据响应头和文件头确定内容类型，不是图片（或允许时的视频）则抛出异常"""
+        header_type = header_type.split(";")[0].strip().lower()
+        sniffed = sniff_content_type(head)
+        allowed_prefixes = ("image/", "video/") if allow_video else ("image/",)
+
+        if sniffed:
+            if not sniffed.startswith(allowed_prefixes):
+                raise ValueError(f"URL返回的不是图片类型: {sniffed}")
+            # 以魔数为准，响应头可能是 application/octet-stream 等通用类型
+            return header_type if header_type.startswith(allowed_prefixes) else sniffed
+
+        if header_type.startswith(allowed_prefixes):
+            return header_type
+        raise ValueError(f"URL返回的不是图片类型: {header_type or '未知'}")
+
+    async def fetch(
+        self,
+        url: str,
+        max_bytes: Optional[int] = None,
+        allow_video: bool = False,
+        timeout: Optional[float] = None,
+        budget: Optional[ByteBudget] = None
+    ) -> FetchedFile:
+        """
+        流式下载URL内容
+
+        Args:
+            url: 资源URL
+            max_bytes: 最大允许字节数，默认使用配置值
+            allow_video: 是否允许视频内容
+            timeout: 超时时间（秒），默认使用配置值
+            budget: 多个下载共享的总字节预算
+
+        Returns:
+            FetchedFile，使用完毕后应调用close()
+
+        Raises:
+            Exception: 下载失败、超出大小限制或内容类型不符时抛出
+        """
+        limit = max_bytes or self.max_bytes
+        logger.info(f"开始从URL下载: {url}")
+
+        buffer = tempfile.SpooledTemporaryFile(max_size=self.spool_max_size)
+        try:
+            async with self.client.stream(
+                "GET",
+                url,
+                headers={"User-Agent": self.USER_AGENT},
+                follow_redirects=True,
+                timeout=timeout or self.timeout
+            ) as response:
+                response.raise_for_status()
+
+                content_length = response.headers.get("content-length")
+                if content_length and content_length.isdigit() and int(content_length) > limit:
+                    raise ValueError(f"文件大小超过限制: {int(content_length)} > {limit} bytes")
+
+                header_type = response.headers.get("content-type", "")
+                content_type = None
+                size = 0
+                async for chunk in response.aiter_bytes(self.chunk_size):
+                    if content_type is None:
+                        content_type = self._check_content_type(header_type, chunk[:512], allow_video)
+                    size += len(chunk)
+                    if size > limit:
+                        raise ValueError(f"文件大小超过限制: > {limit} bytes")
+                    if budget is not None:
+                        budget.consume(len(chunk))
+                    buffer.write(chunk)
+
+                if size == 0:
+                    raise ValueError("URL返回的内容为空")
+
+            logger.info(f"下载完成，大小: {size} bytes, 类型: {content_type}")
+            return FetchedFile(buffer, url, content_type, size)
+
+        except httpx.TimeoutException:
+            buffer.close()
+            logger.error(f"下载超时: {url}")
+            raise Exception("下载图片超时")
+        except httpx.HTTPError as e:
+            buffer.close()
+            logger.error(f"下载失败: {e}")
+            raise Exception(f"下载图片失败: {str(e)}")
+        except Exception as e:
+            buffer.close()
+            logger.error(f"处理URL时出错: {e}")
+            raise
+
+    async def fetch_bytes(
+        self,
+        url: str,
+        max_bytes: Optional[int] = None,
+        allow_video: bool = False
+    ) -> Tuple[bytes, str]:
+        """下载URL内容并返回 (字节数据, 内容类型)"""
+        with await self.fetch(url, max_bytes=max_bytes, allow_video=allow_video) as fetched:
+            return fetched.content, fetched.content_type
+
+    async def fetch_many(
+        self,
+        urls: Sequence[str],
+        max_bytes: Optional[int] = None,
+        total_max_bytes: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        per_host_limit: Optional[int] = None,
+        allow_video: bool = False,
+        return_exceptions: bool = False
+    ) -> List[FetchedFile]:
+        """
+        并发下载多个URL，结果顺序与输入一致
+
+        默认任一下载失败时取消其余下载并释放已下载的缓冲区。
+
+        Args:
+            urls: URL列表
+            max_bytes: 单个文件最大字节数
+            total_max_bytes: 所有文件的总字节预算
+            max_concurrency: 最大并发下载数
+            per_host_limit: 同一主机的最大并发连接数
+            allow_video: 是否允许视频内容
+            return_exceptions: 为True时单个下载失败不影响其余下载，对应位置返回异常对象
+
+        Returns:
+            与urls顺序一致的FetchedFile列表（return_exceptions时可能包含异常）
+        """
+        return await self._gather_ordered(
+            urls, self._make_limiter(max_concurrency, per_host_limit, total_max_bytes),
+            lambda fetched: fetched, max_bytes, allow_video, return_exceptions
+        )
+
+    async def fetch_images(
+        self,
+        urls: Sequence[str],
+        max_bytes: Optional[int] = None,
+        total_max_bytes: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        per_host_limit: Optional[int] = None
+    ) -> List[Tuple[Image.Image, int]]:
+        """
+        并发下载并解码多张图片，每张图片下载完成后立即开始解码（不等待全部下载完成）
+
+        Returns:
+            与urls顺序一致的 (PIL图片, 下载字节数) 列表
+        """
+        async def decode(fetched: FetchedFile) -> Tuple[Image.Image, int]:
+            with fetched:
+                # Pillow解码时释放GIL，放到线程中与其余下载并行
+                image = await asyncio.to_thread(fetched.open_image)
+                return image, fetched.size
+
+        return await self._gather_ordered(
+            urls, self._make_limiter(max_concurrency, per_host_limit, total_max_bytes),
+            decode, max_bytes, False
+        )
+
+    def _make_limiter(
+        self,
+        max_concurrency: Optional[int],
+        per_host_limit: Optional[int],
+        total_max_bytes: Optional[int]
+    ) -> Tuple[asyncio.Semaphore, Dict[str, asyncio.Semaphore], ByteBudget]:
+        host_limit = per_host_limit or self.per_host_limit
+        return (
+            asyncio.Semaphore(max_concurrency or self.max_concurrency),
+            defaultdict(lambda: asyncio.Semaphore(host_limit)),
+            ByteBudget(total_max_bytes or self.total_max_bytes)
+        )
+
+    async def _gather_ordered(self, urls, limiter, handle, max_bytes, allow_video, return_exceptions=False) -> list:
+        """按输入顺序并发执行 下载 -> handle，失败时取消其余任务（return_exceptions时返回异常对象）"""
+        global_limit, host_limits, budget = limiter
+
+        async def run_one(url: str):
+            host = urlsplit(url).netloc.lower()
+            async with global_limit, host_limits[host]:
+                fetched = await self.fetch(url, max_bytes=max_bytes, allow_video=allow_video, budget=budget)
+            result = handle(fetched)
+            if asyncio.iscoroutine(result):
+                result = await result
+            return result
+
+        tasks = [asyncio.create_task(run_one(url)) for url in urls]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, FetchedFile):
+                    result.close()
+            raise
+
+
+# 全局URL下载器实例
+url_fetcher = UrlFetcher(
+    max_bytes=config.URL_FETCH_MAX_BYTES,
+    timeout=config.URL_FETCH_TIMEOUT,
+    spool_max_size=config.URL_FETCH_SPOOL_MAX_SIZE,
+    max_concurrency=config.URL_FETCH_MAX_CONCURRENCY,
+    per_host_limit=config.URL_FETCH_PER_HOST_LIMIT,
+    total_max_bytes=config.URL_FETCH_TOTAL_MAX_BYTES
+)
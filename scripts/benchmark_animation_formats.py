@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+动画输出格式基准测试
+对同一段动画分别输出 GIF / 动画WebP / H.264 MP4，比较文件体积与编码耗时。
+输出体积直接决定上传网盘的耗时和按MB计费的上传费用。
+
+默认使用生成的测试动画（渐变背景 + 纹理 + 移动物体，接近照片类内容），
+也可以用 --input 指定一个GIF文件。MP4需要系统安装ffmpeg（带libx264），找不到时跳过。
+
+用法:
+    python scripts/benchmark_animation_formats.py [--input FILE] [--frames N] [--size WxH] [--quality Q] [--repeat N]
+"""
+
+import io
+import sys
+import time
+import shutil
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from app.config import config
+from app.services.gif.comprehensive_processor import quality_to_colors
+from app.services.gif.formats import OUTPUT_FORMATS
+from app.services.gif.streaming import stream_gif
+
+
+def make_animation(frames: int, size, duration: int = 40) -> bytes:
+    """生成测试动画（GIF字节数据）：渐变背景、静态纹理和一个移动的圆"""
+    width, height = size
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 1, width, dtype=np.float32)[None, :]
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    texture = rng.normal(0, 12, (height, width, 1)).astype(np.float32)
+    background = np.stack([
+        np.broadcast_to(200 * x + 30, (height, width)),
+        np.broadcast_to(180 * y + 40, (height, width)),
+        120 + 80 * x * y,
+    ], axis=-1) + texture
+
+    yy, xx = np.mgrid[0:height, 0:width]
+    radius = min(width, height) // 6
+    images = []
+    for i in range(frames):
+        phase = 2 * np.pi * i / frames
+        cx = width / 2 + width / 3 * np.cos(phase)
+        cy = height / 2 + height / 3 * np.sin(phase)
+        pixels = background.copy()
+        mask = (xx - cx) ** 2 + (yy - cy) ** 2 < radius ** 2
+        pixels[mask] = (240, 200 - 100 * np.sin(phase), 60)
+        images.append(Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)))
+
+    # 所有帧共用第一帧的调色板且不抖动，静止区域在帧间保持不变（与常见GIF一致）
+    palette = images[0].quantize(colors=256)
+    images = [image.quantize(palette=palette, dither=Image.Dither.NONE) for image in images]
+
+    output = io.BytesIO()
+    images[0].save(output, format="GIF", save_all=True, append_images=images[1:], duration=duration, loop=0)
+    return output.getvalue()
+
+
+def measure(data: bytes, output_format: str, quality: int, repeat: int):
+    """返回 (输出字节数, 多次运行中的最短耗时秒)"""
+    best = float("inf")
+    result = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = stream_gif(
+            data,
+            max_colors=quality_to_colors(quality),
+            output_format=output_format,
+            quality=quality
+        )
+        best = min(best, time.perf_counter() - start)
+    return len(result), best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="动画输出格式基准测试")
+    parser.add_argument("--input", help="输入GIF文件（默认使用生成的测试动画）")
+    parser.add_argument("--frames", type=int, default=60, help="生成的测试动画帧数")
+    parser.add_argument("--size", default="480x360", help="生成的测试动画尺寸，如 480x360")
+    parser.add_argument("--quality", type=int, default=90, help="输出质量（1-100）")
+    parser.add_argument("--repeat", type=int, default=3, help="每种格式的重复次数，取最短耗时")
+    args = parser.parse_args()
+
+    if args.input:
+        data = Path(args.input).read_bytes()
+        source = args.input
+    else:
+        width, height = (int(value) for value in args.size.lower().split("x"))
+        data = make_animation(args.frames, (width, height))
+        source = f"生成动画 {args.frames}帧 {width}x{height}"
+
+    formats = list(OUTPUT_FORMATS)
+    if shutil.which(config.FFMPEG_PATH) is None:
+        print(f"未找到ffmpeg（{config.FFMPEG_PATH}），跳过MP4")
+        formats.remove("mp4")
+
+    print(f"输入: {source}, {len(data) / 1024:.1f}KB, 质量={args.quality}")
+    print("=" * 60)
+    print(f"{'格式':<8}{'体积(KB)':>14}{'相对GIF':>12}{'编码耗时(ms)':>18}")
+    print("=" * 60)
+
+    gif_size = None
+    for output_format in formats:
+        size, seconds = measure(data, output_format, args.quality, args.repeat)
+        if output_format == "gif":
+            gif_size = size
+        ratio = f"{size / gif_size:.2f}x" if gif_size else "-"
+        print(f"{output_format:<8}{size / 1024:>14.1f}{ratio:>12}{seconds * 1000:>18.1f}")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
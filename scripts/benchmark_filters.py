@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+滤镜性能基准测试
+对比逐像素实现（getpixel/putpixel、getdata/putdata）与当前查找表/NumPy实现的耗时，
+测试尺寸为 1MP / 12MP / 48MP。逐像素实现在大图上非常慢，默认只在1MP上实测，
+其余尺寸按像素数线性外推（加 --full 实测所有尺寸）。
+
+用法:
+    python scripts/benchmark_filters.py [--full] [--repeat N]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from app.services.filters.basic_filters import BasicFilters
+from app.services.filters.vintage_filters import VintageFilters
+from app.services.filters.special_filters import SpecialFilters
+
+# 测试尺寸: 名称 -> (宽, 高)
+SIZES = {
+    "1MP": (1224, 816),
+    "12MP": (4240, 2832),
+    "48MP": (8480, 5664),
+}
+
+
+def legacy_sepia(img: Image.Image, intensity: float) -> Image.Image:
+    """逐像素棕褐色滤镜（旧实现）"""
+    img_gray = img.convert("L")
+    img_sepia = Image.new("RGB", img.size)
+    for x in range(img.width):
+        for y in range(img.height):
+            gray_value = img_gray.getpixel((x, y))
+            r = min(int(gray_value * 1.07 * intensity), 255)
+            g = min(int(gray_value * 0.74 * intensity), 255)
+            b = min(int(gray_value * 0.43 * intensity), 255)
+            img_sepia.putpixel((x, y), (r, g, b))
+    return img_sepia
+
+
+def legacy_film_grain(img: Image.Image, intensity: float) -> Image.Image:
+    """逐像素胶片颗粒滤镜（旧实现，noise/analog同样基于它）"""
+    noisy_pixels = []
+    for r, g, b in img.getdata():
+        noise = random.randint(-int(intensity * 20), int(intensity * 20))
+        noisy_pixels.append((
+            max(0, min(255, r + noise)),
+            max(0, min(255, g + noise)),
+            max(0, min(255, b + noise))
+        ))
+    film_grain = Image.new("RGB", img.size)
+    film_grain.putdata(noisy_pixels)
+    return film_grain
+
+
+def make_image(size) -> Image.Image:
+    """生成带渐变和随机纹理的测试图片"""
+    width, height = size
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)[None, :]
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    pixels[..., 0] = x
+    pixels[..., 1] = y
+    pixels[..., 2] = rng.integers(0, 256, (height, width), dtype=np.uint8)
+    return Image.fromarray(pixels)
+
+
+def measure(func, img: Image.Image, repeat: int) -> float:
+    """返回多次运行中的最短耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(img, 1.0)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="滤镜性能基准测试")
+    parser.add_argument("--full", action="store_true", help="在所有尺寸上实测逐像素实现（48MP需要数分钟）")
+    parser.add_argument("--repeat", type=int, default=3, help="当前实现的重复次数，取最短耗时")
+    args = parser.parse_args()
+
+    cases = [
+        ("sepia", legacy_sepia, BasicFilters._apply_sepia),
+        ("film_grain", legacy_film_grain, VintageFilters._apply_film_grain),
+        ("analog", None, VintageFilters._apply_analog),
+        ("noise", None, SpecialFilters._apply_noise),
+    ]
+
+    print("=" * 72)
+    print(f"{'滤镜':<12}{'尺寸':<8}{'旧实现(s)':>14}{'新实现(ms)':>14}{'加速比':>12}")
+    print("=" * 72)
+
+    legacy_per_pixel = {}
+    for size_name, size in SIZES.items():
+        img = make_image(size)
+        pixels = size[0] * size[1]
+        for name, legacy, current in cases:
+            current_time = measure(current, img, args.repeat)
+
+            legacy_text, speedup_text = "-", "-"
+            if legacy is not None:
+                if size_name == "1MP" or args.full:
+                    legacy_time = measure(legacy, img, 1)
+                    legacy_per_pixel[name] = legacy_time / pixels
+                    legacy_text = f"{legacy_time:.2f}"
+                else:
+                    legacy_time = legacy_per_pixel[name] * pixels
+                    legacy_text = f"~{legacy_time:.2f}"
+                speedup_text = f"{legacy_time / current_time:.0f}x"
+
+            print(f"{name:<12}{size_name:<8}{legacy_text:>14}{current_time * 1000:>14.1f}{speedup_text:>12}")
+        del img
+
+    print("=" * 72)
+    if not args.full:
+        print("带 ~ 的旧实现耗时按1MP实测值线性外推")
+
+
+if __name__ == "__main__":
+    main()
@@ -349,18 +349,17 @@ def generate_extract_gif_examples():
 
             # 提取帧
             print(f"提取帧: {example['description']}")
-            extracted_frames = GifService.gif_to_images(original_gif_bytes)
+            extracted_frames, total_frames = GifService.extract_frames(
+                original_gif_bytes, output_format='JPEG', quality=95, end_frame=1
+            )
 
             # 上传提取的帧（作为示例展示第一帧）
             if extracted_frames:
-                first_frame_bytes = io.BytesIO()
-                extracted_frames[0].save(first_frame_bytes, format='JPEG', quality=95)
-
                 extracted_filename = f"extract-gif/extracted-{example['name']}.jpg"
-                extracted_url = upload_to_oss(first_frame_bytes.getvalue(), extracted_filename)
+                extracted_url = upload_to_oss(extracted_frames[0][1], extracted_filename)
 
                 if extracted_url:
-                    print(f"✅ 提取帧上传成功: {extracted_url} (共提取{len(extracted_frames)}帧)")
+                    print(f"✅ 提取帧上传成功: {extracted_url} (共{total_frames}帧)")
                     success_count += 1
                 else:
                     print(f"❌ 提取帧上传失败: {example['title']}")
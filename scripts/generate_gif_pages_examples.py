@@ -310,21 +310,18 @@ def generate_extract_gif_examples():
             
             # 提取帧
             print(f"🔍 提取帧: {example['description']}")
-            extracted_frames = GifService.gif_to_images(original_gif_bytes)
+            # 只编码第一帧作为展示
+            frame_format = 'PNG' if example['extract_type'] == 'png' else 'JPEG'
+            extracted_frames, total_frames = GifService.extract_frames(
+                original_gif_bytes, output_format=frame_format, quality=95, end_frame=1
+            )
             
             if extracted_frames:
-                # 保存第一帧作为展示
-                first_frame_bytes = io.BytesIO()
-                if example['extract_type'] == 'png':
-                    extracted_frames[0].save(first_frame_bytes, format='PNG')
-                    ext = 'png'
-                else:
-                    extracted_frames[0].save(first_frame_bytes, format='JPEG', quality=95)
-                    ext = 'png'  # 前端配置用的都是png
+                ext = 'png'  # 前端配置用的都是png
                 
                 extracted_filename = f"gif/extracted-{example['name']}-frames.{ext}"
-                extracted_url = upload_to_oss(first_frame_bytes.getvalue(), extracted_filename)
-                print(f"✅ 提取帧上传成功: {extracted_url} (共提取{len(extracted_frames)}帧)")
+                extracted_url = upload_to_oss(extracted_frames[0][1], extracted_filename)
+                print(f"✅ 提取帧上传成功: {extracted_url} (共{total_frames}帧)")
                 
                 success_count += 1
             else:
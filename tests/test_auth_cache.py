@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime
+
+from app.schemas.user_models import User, UserStatus
+from app.services.auth_cache import UserCache
+
+
+class FakeRedis:
+    """记录写入内容的内存Redis"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def make_user(api_token: str) -> User:
+    return User(
+        id=1,
+        nickname="tester",
+        token_balance=100,
+        created_at=datetime(2024, 1, 1),
+        status=UserStatus.ACTIVE,
+        api_token=api_token
+    )
+
+
+def make_cache(monkeypatch, redis, **kwargs) -> UserCache:
+    cache = UserCache(namespace="api_token", ttl=60, **kwargs)
+    monkeypatch.setattr(cache, "_get_redis", lambda: redis)
+    return cache
+
+
+def test_redis_entry_does_not_contain_token(monkeypatch):
+    """Redis中不保存明文api_token，从Redis读取时用凭证还原"""
+    redis = FakeRedis()
+    token = "secret-token-value"
+    cache = make_cache(monkeypatch, redis)
+
+    async def loader(credential):
+        return make_user(credential)
+
+    user = asyncio.run(cache.get_or_load(token, loader))
+    assert user.api_token == token
+    assert all(token not in value for value in redis.data.values())
+
+    # 另一个进程（本地缓存为空）从Redis读取
+    other = make_cache(monkeypatch, redis)
+
+    async def failing_loader(credential):
+        raise AssertionError("应命中Redis缓存")
+
+    restored = asyncio.run(other.get_or_load(token, failing_loader))
+    assert restored == user
+    assert other.get_stats()["redis_hits"] == 1
+
+
+def test_redis_ttl_not_longer_than_local_ttl(monkeypatch):
+    redis = FakeRedis()
+    cache = make_cache(monkeypatch, redis, redis_ttl=300)
+    assert cache.redis_ttl == 60
+
+    async def loader(credential):
+        return make_user(credential)
+
+    asyncio.run(cache.get_or_load("token", loader))
+    assert list(redis.ttls.values()) == [60]
+
+
+def test_non_token_credential_skips_redis(monkeypatch):
+    """凭证不是api_token时无法还原token，不使用Redis"""
+    redis = FakeRedis()
+    cache = make_cache(monkeypatch, redis, credential_is_token=False)
+
+    async def loader(credential):
+        return make_user("token-of-" + credential)
+
+    user = asyncio.run(cache.get_or_load("subject", loader))
+    assert user.api_token == "token-of-subject"
+    assert redis.data == {}
@@ -0,0 +1,211 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services import batch_service
+from app.services.batch_service import BatchItem, BatchProcessor
+from app.services.billing_service import BillingService
+
+
+class StubBillingService(BillingService):
+    """只替换与用户中心的交互，记录每笔扣费，结算逻辑使用真实实现"""
+
+    def __init__(self):
+        super().__init__()
+        self.charges = {}
+        self.refunded = set()
+        self.calls = []
+
+    async def pre_charge(self, api_token, api_path, context, estimated_tokens=None, call_type=None, remark=""):
+        call_id = f"call-{len(self.charges) + 1}"
+        self.charges[call_id] = estimated_tokens
+        self.calls.append(("pre_charge", estimated_tokens))
+        return call_id
+
+    async def refund_all(self, call_id, remark=""):
+        self.refunded.add(call_id)
+        self.calls.append(("refund_all", call_id))
+        return True
+
+    async def charge_more(self, call_id, additional_tokens, remark=""):
+        self.charges[call_id] += additional_tokens
+        self.calls.append(("charge_more", additional_tokens))
+        return True
+
+    @property
+    def net_charged(self) -> int:
+        return sum(tokens for call_id, tokens in self.charges.items() if call_id not in self.refunded)
+
+
+class StubUploadService:
+    def __init__(self):
+        self.uploaded = []
+
+    async def upload_processed_image(self, image_bytes, api_token, operation_type, parameters,
+                                     original_filename, content_type):
+        self.uploaded.append(parameters["batch_index"])
+        return {"file": {
+            "id": len(self.uploaded), "filename": original_filename, "original_name": original_filename,
+            "file_size": len(image_bytes), "file_type": content_type, "url": "http://files/x",
+            "preview_url": "http://files/x", "description": "", "upload_time": "2024-01-01T00:00:00",
+        }}
+
+
+@pytest.fixture
+def billing(monkeypatch):
+    stub = StubBillingService()
+    monkeypatch.setattr(batch_service, "billing_service", stub)
+    return stub
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    stub = StubUploadService()
+    monkeypatch.setattr(batch_service, "file_upload_service", stub)
+    return stub
+
+
+def make_items(*sizes):
+    return [BatchItem(index, f"{index}.png", content=b"x" * size, content_type="image/png")
+            for index, size in enumerate(sizes)]
+
+
+def make_processor(process):
+    return BatchProcessor(
+        api_token="token",
+        api_path="/api/v1/batch/test",
+        operation_type="test",
+        parameters={},
+        process=process,
+        billing_func=lambda input_size, result_size: {"total_cost": result_size},
+    )
+
+
+async def collect(processor, items):
+    lines = [json.loads(line) async for line in processor.stream(items)]
+    await processor.finish()
+    return lines
+
+
+def test_settle_batch_all_failed_refunds_everything():
+    billing = StubBillingService()
+
+    async def run():
+        call_id = await billing.pre_charge("token", "/path", {}, estimated_tokens=300)
+        return await billing.settle_batch(call_id, "token", "/path", {}, 300, 0)
+
+    assert asyncio.run(run()) is None
+    assert billing.net_charged == 0
+
+
+def test_settle_batch_partial_success_recharges_actual_amount():
+    billing = StubBillingService()
+
+    async def run():
+        call_id = await billing.pre_charge("token", "/path", {}, estimated_tokens=300)
+        return await billing.settle_batch(call_id, "token", "/path", {}, 300, 120)
+
+    assert asyncio.run(run()) == "call-2"
+    assert billing.calls == [("pre_charge", 300), ("refund_all", "call-1"), ("pre_charge", 120)]
+    assert billing.net_charged == 120
+
+
+def test_settle_batch_actual_above_estimate_charges_more():
+    billing = StubBillingService()
+
+    async def run():
+        call_id = await billing.pre_charge("token", "/path", {}, estimated_tokens=300)
+        return await billing.settle_batch(call_id, "token", "/path", {}, 300, 450)
+
+    assert asyncio.run(run()) == "call-1"
+    assert billing.calls == [("pre_charge", 300), ("charge_more", 150)]
+    assert billing.net_charged == 450
+
+
+def test_all_items_failed_refunds_everything(billing, uploads):
+    async def process(contents):
+        raise ValueError("损坏的图片")
+
+    async def run():
+        processor = make_processor(process)
+        items = make_items(100, 200)
+        assert await processor.pre_charge(items, "batch")
+        return await collect(processor, items)
+
+    lines = asyncio.run(run())
+    assert lines[-1]["succeeded"] == 0 and lines[-1]["tokens_consumed"] == 0
+    assert billing.net_charged == 0
+
+
+def test_partial_success_charges_successful_items(billing, uploads):
+    async def process(contents):
+        if len(contents) == 200:
+            raise ValueError("损坏的图片")
+        return contents
+
+    async def run():
+        processor = make_processor(process)
+        items = make_items(100, 200, 50)
+        assert await processor.pre_charge(items, "batch")
+        return await collect(processor, items)
+
+    lines = asyncio.run(run())
+    assert billing.charges["call-1"] == 350
+    assert lines[-1]["tokens_consumed"] == 150
+    assert billing.net_charged == 150
+
+
+def test_actual_above_estimate_charges_more(billing, uploads):
+    async def process(contents):
+        return contents * 3
+
+    async def run():
+        processor = make_processor(process)
+        items = make_items(100)
+        assert await processor.pre_charge(items, "batch")
+        return await collect(processor, items)
+
+    asyncio.run(run())
+    assert ("charge_more", 200) in billing.calls
+    assert billing.net_charged == 300
+
+
+def test_disconnect_mid_stream_charges_only_uploaded_items(billing, uploads):
+    """客户端读到第一条结果后断开：未完成的图片被取消，只对已上传的图片计费"""
+    async def process(contents):
+        if len(contents) != 100:
+            await asyncio.Event().wait()
+        return contents
+
+    async def run():
+        processor = make_processor(process)
+        items = make_items(100, 200, 300)
+        assert await processor.pre_charge(items, "batch")
+        stream = processor.stream(items)
+        assert json.loads(await stream.__anext__())["type"] == "start"
+        assert json.loads(await stream.__anext__())["index"] == 0
+        # 与Starlette一样不关闭生成器，只在响应结束后执行后台任务
+        await processor.finish()
+        await stream.aclose()
+
+    asyncio.run(run())
+    assert uploads.uploaded == [0]
+    assert billing.net_charged == 100
+
+
+def test_disconnect_before_stream_starts_refunds_everything(billing, uploads):
+    """响应体从未开始迭代时，后台任务整笔退还预扣费"""
+    async def process(contents):
+        return contents
+
+    async def run():
+        processor = make_processor(process)
+        items = make_items(100, 200)
+        assert await processor.pre_charge(items, "batch")
+        processor.stream(items)
+        return await processor.finish()
+
+    assert asyncio.run(run()) is None
+    assert uploads.uploaded == []
+    assert billing.net_charged == 0
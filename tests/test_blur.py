@@ -0,0 +1,69 @@
+import cv2
+import numpy as np
+import pytest
+from PIL import Image, ImageFilter
+
+from app.utils.blur import gaussian_blur, gaussian_blur_image, pyramid_factor
+
+
+def hard_edges(size=400) -> np.ndarray:
+    """锐利边缘（金字塔误差的最坏情况）"""
+    img = np.zeros((size, size), dtype=np.uint8)
+    img[:, size // 2:] = 255
+    img[size // 3:2 * size // 3, size // 3:2 * size // 3] = 128
+    return img
+
+
+@pytest.mark.parametrize("sigma", [8, 10, 20, 40, 80])
+def test_pyramid_error_within_bound_against_cv2(sigma):
+    """误差上限以 cv2.GaussianBlur（真实高斯核）为参照"""
+    img = hard_edges()
+    assert pyramid_factor(sigma, 1.0) > 1
+
+    result = gaussian_blur(img.astype(np.float32), sigma, max_error=1.0)
+    reference = cv2.GaussianBlur(img.astype(np.float32), (0, 0), sigma)
+    assert np.abs(result - reference).max() <= 1.0
+
+    # uint8输入另有±1的取整差异
+    result = gaussian_blur(img, sigma, max_error=1.0)
+    reference = cv2.GaussianBlur(img, (0, 0), sigma)
+    assert np.abs(result.astype(int) - reference.astype(int)).max() <= 2
+
+
+def test_pyramid_preserves_shape_and_dtype():
+    img = np.dstack([hard_edges(101)[:, :73]] * 3)
+    result = gaussian_blur(img, 30)
+    assert result.shape == img.shape
+    assert result.dtype == np.uint8
+
+
+def test_small_sigma_matches_direct_calls():
+    img = hard_edges()
+    assert pyramid_factor(3, 1.0) == 1
+    assert np.array_equal(gaussian_blur(img, 3), cv2.GaussianBlur(img, (0, 0), 3))
+    assert np.array_equal(gaussian_blur(img, ksize=8), cv2.GaussianBlur(img, (9, 9), 0))
+
+    pil = Image.fromarray(img)
+    assert np.array_equal(
+        np.asarray(gaussian_blur_image(pil, 3)),
+        np.asarray(pil.filter(ImageFilter.GaussianBlur(3)))
+    )
+
+
+def test_disabled_pyramid_uses_pil():
+    pil = Image.fromarray(hard_edges())
+    assert np.array_equal(
+        np.asarray(gaussian_blur_image(pil, 20, max_error=0)),
+        np.asarray(pil.filter(ImageFilter.GaussianBlur(20)))
+    )
+
+
+def test_pil_difference_comes_from_box_approximation():
+    """与PIL的差异不超过PIL自身与真实高斯的差异加上误差上限"""
+    img = hard_edges()
+    pil = Image.fromarray(img)
+    for sigma in (10, 40):
+        result = np.asarray(gaussian_blur_image(pil, sigma)).astype(int)
+        reference = np.asarray(pil.filter(ImageFilter.GaussianBlur(sigma))).astype(int)
+        true_gaussian = cv2.GaussianBlur(img, (0, 0), sigma).astype(int)
+        assert np.abs(result - reference).max() <= np.abs(reference - true_gaussian).max() + 2
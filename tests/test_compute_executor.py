@@ -0,0 +1,41 @@
+import asyncio
+import os
+
+import pytest
+
+from app.utils.compute_executor import ComputeExecutor
+
+
+def _crash_worker():
+    """模拟工作进程崩溃（如被OOM kill）"""
+    os._exit(1)
+
+
+def _worker_pid():
+    return os.getpid()
+
+
+@pytest.fixture
+def executor():
+    executor = ComputeExecutor(mode=ComputeExecutor.MODE_PROCESS, max_workers=1)
+    executor.start()
+    yield executor
+    executor.shutdown()
+
+
+def test_crashing_task_fails_without_running_in_api_process(executor):
+    """导致工作进程崩溃的任务应失败，而不是回退到API进程内执行"""
+    with pytest.raises(RuntimeError):
+        asyncio.run(executor.run(_crash_worker))
+
+    stats = executor.get_stats()
+    assert stats["failed"] == 1
+    assert stats["thread_fallbacks"] == 0
+
+    # 进程池已重建，后续任务仍在工作进程中执行
+    assert asyncio.run(executor.run(_worker_pid)) != os.getpid()
+    assert executor.get_stats()["active_backend"] == ComputeExecutor.MODE_PROCESS
+
+
+def test_queue_depth_matches_stats(executor):
+    assert executor.queue_depth == executor.get_stats()["queue_depth"] == 0
@@ -0,0 +1,39 @@
+import glob
+import shutil
+
+import pytest
+
+from app.utils.fonts import FontRegistry
+
+SYSTEM_FONTS = sorted(glob.glob("/usr/share/fonts/**/DejaVuSans.ttf", recursive=True))
+
+pytestmark = pytest.mark.skipif(not SYSTEM_FONTS, reason="需要DejaVu Sans字体")
+
+
+@pytest.fixture
+def registry(tmp_path):
+    font_dir = tmp_path / "fonts"
+    font_dir.mkdir()
+    shutil.copy(SYSTEM_FONTS[0], font_dir / "DejaVuSans.ttf")
+    return FontRegistry([str(font_dir)])
+
+
+def test_resolves_family_alias_and_filename(registry, tmp_path):
+    indexed = str(tmp_path / "fonts" / "DejaVuSans.ttf")
+    assert registry.resolve("DejaVu Sans") == indexed
+    assert registry.resolve("arial") == indexed
+    assert registry.resolve("dejavusans.ttf") == indexed
+    assert registry.resolve(indexed) == indexed
+
+
+def test_unindexed_paths_are_not_opened(registry, tmp_path):
+    """客户端传入的任意服务器路径与未知字体名一样回退到默认字体，不读取该文件"""
+    outside = tmp_path / "other" / "Outside.ttf"
+    outside.parent.mkdir()
+    shutil.copy(SYSTEM_FONTS[0], outside)
+    default = registry.resolve("no such font")
+
+    assert registry.resolve(str(outside)) == default
+    assert registry.resolve("/etc/passwd") == default
+    assert registry.resolve("/nonexistent/font.ttf") == default
+    assert registry.resolve("../other/Outside.ttf") == default
@@ -0,0 +1,151 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+
+from app.services.gif.encoder import DISPOSAL_BACKGROUND, GifEncoder, decimate_frames
+
+# 颜色间隔足够大，颜色立方体查表可以精确映射
+PALETTE = np.array([
+    [0, 0, 0], [255, 255, 255], [255, 0, 0], [0, 255, 0],
+    [0, 0, 255], [255, 255, 0], [0, 255, 255], [255, 0, 255],
+], dtype=np.uint8)
+
+
+def rgba(indices: np.ndarray, alpha: np.ndarray = None) -> np.ndarray:
+    """调色板序号 -> RGBA帧（alpha为空时完全不透明）"""
+    frame = np.empty((*indices.shape, 4), dtype=np.uint8)
+    frame[..., :3] = PALETTE[indices]
+    frame[..., 3] = 255 if alpha is None else alpha
+    return frame
+
+
+def encode(frames, delta=True, loop=0) -> bytes:
+    output = io.BytesIO()
+    encoder = GifEncoder(output, PALETTE, loop=loop, delta=delta)
+    for frame, duration in frames:
+        encoder.add_frame(frame, duration)
+    encoder.close()
+    return output.getvalue()
+
+
+def decode(data: bytes):
+    """解码GIF，返回 [(合成后的RGBA帧, 时长毫秒)]"""
+    image = Image.open(io.BytesIO(data))
+    return [
+        (np.asarray(frame.convert("RGBA")).copy(), frame.info.get("duration", 0))
+        for frame in ImageSequence.Iterator(image)
+    ]
+
+
+def assert_same_frame(decoded: np.ndarray, source: np.ndarray):
+    """不透明区域颜色一致，透明区域alpha为0"""
+    opaque = source[..., 3] >= 128
+    assert np.array_equal(decoded[..., 3] > 0, opaque)
+    assert np.array_equal(decoded[opaque][:, :3], source[opaque][:, :3])
+
+
+def moving_square_frames(count=6, size=(40, 30)):
+    width, height = size
+    frames = []
+    for i in range(count):
+        indices = np.full((height, width), 1, dtype=np.uint8)
+        indices[5:15, 3 + i * 5:13 + i * 5] = 2 + i % 3
+        frames.append((rgba(indices), 40))
+    return frames
+
+
+@pytest.mark.parametrize("delta", [True, False])
+def test_composited_frames_match_source(delta):
+    frames = moving_square_frames()
+    decoded = decode(encode(frames, delta=delta))
+    assert len(decoded) == len(frames)
+    for (result, duration), (source, source_duration) in zip(decoded, frames):
+        assert_same_frame(result, source)
+        assert duration == source_duration
+
+
+def test_delta_frames_are_cropped():
+    data = encode(moving_square_frames())
+    image = Image.open(io.BytesIO(data))
+    image.seek(1)
+    # 第二帧只写出变化的矩形
+    assert image.tile[0][1] != (0, 0, 40, 30)
+    assert len(data) < len(encode(moving_square_frames(), delta=False))
+
+
+def test_identical_frames_are_merged():
+    frames = moving_square_frames(3)
+    frames = [frames[0], frames[0], frames[0], frames[1], frames[1], frames[2]]
+    decoded = decode(encode(frames))
+    assert [duration for _, duration in decoded] == [120, 80, 40]
+    for (result, _), source in zip(decoded, (frames[0][0], frames[3][0], frames[5][0])):
+        assert_same_frame(result, source)
+
+
+def test_transparent_pixels_cleared():
+    """像素从不透明变为透明时，上一帧使用恢复背景处置"""
+    indices = np.full((20, 20), 3, dtype=np.uint8)
+    alpha = np.full((20, 20), 255, dtype=np.uint8)
+    first = rgba(indices, alpha)
+
+    alpha_hole = alpha.copy()
+    alpha_hole[5:10, 5:10] = 0
+    second = rgba(indices, alpha_hole)
+
+    third_indices = indices.copy()
+    third_indices[0:3, 15:20] = 4
+    third = rgba(third_indices, alpha_hole)
+
+    frames = [(first, 50), (second, 50), (third, 50), (first, 50)]
+    data = encode(frames)
+    decoded = decode(data)
+    assert len(decoded) == len(frames)
+    for (result, _), (source, _) in zip(decoded, frames):
+        assert_same_frame(result, source)
+
+    image = Image.open(io.BytesIO(data))
+    assert image.disposal_method == DISPOSAL_BACKGROUND
+
+
+def test_total_duration_preserved_with_centisecond_rounding():
+    """GIF时长以10毫秒为单位，按累计时间取整，总时长不漂移"""
+    frames = [(frame, 33) for frame, _ in moving_square_frames(6)] * 5
+    decoded = decode(encode(frames))
+    durations = [duration for _, duration in decoded]
+    assert all(duration % 10 == 0 for duration in durations)
+    assert sum(durations) == round(33 * len(frames) / 10) * 10
+    assert set(durations) <= {30, 40}
+
+
+def test_loop_and_errors():
+    image = Image.open(io.BytesIO(encode(moving_square_frames(2), loop=3)))
+    assert image.info["loop"] == 3
+    assert "loop" not in Image.open(io.BytesIO(encode(moving_square_frames(2), loop=None))).info
+
+    with pytest.raises(ValueError):
+        GifEncoder(io.BytesIO(), np.zeros((256, 3), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        GifEncoder(io.BytesIO(), PALETTE).close()
+    encoder = GifEncoder(io.BytesIO(), PALETTE)
+    encoder.add_frame(rgba(np.zeros((10, 10), dtype=np.uint8)), 10)
+    with pytest.raises(ValueError):
+        encoder.add_frame(rgba(np.ones((10, 12), dtype=np.uint8)), 10)
+
+
+def test_decimate_frames_keeps_total_duration():
+    frames = [(index, 20) for index in range(50)]
+    result = list(decimate_frames(frames, 10))
+    assert [frame for frame, _ in result] == list(range(0, 50, 5))
+    assert all(duration == 100 for _, duration in result)
+    assert sum(duration for _, duration in result) == 1000
+
+
+def test_decimate_frames_uneven_durations():
+    frames = [("a", 30), ("b", 150), ("c", 10), ("d", 10), ("e", 90), ("f", 10)]
+    result = list(decimate_frames(frames, 10))
+    # 每100毫秒保留第一个开始的帧：a(0ms) c(180ms) e(200ms)，其余帧的时长并入前一个保留帧
+    assert result == [("a", 180), ("c", 20), ("e", 100)]
+    assert list(decimate_frames(frames, None)) == frames
+    assert list(decimate_frames([], 10)) == []
@@ -0,0 +1,51 @@
+import io
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from PIL import Image, ImageSequence
+
+from app.routers.gif import validate_output_format
+from app.services.gif.formats import WebPWriter
+
+
+def frame(value: int, size=(20, 10)) -> np.ndarray:
+    width, height = size
+    return np.full((height, width, 4), value, dtype=np.uint8)
+
+
+def test_webp_writer_roundtrip_merges_identical_frames():
+    output = io.BytesIO()
+    writer = WebPWriter(output, lossless=True)
+    for value, duration in ((10, 40), (10, 60), (200, 50)):
+        writer.add_frame(frame(value), duration)
+    writer.close()
+
+    assert writer.frame_count == 2
+    image = Image.open(io.BytesIO(output.getvalue()))
+    frames = [(np.asarray(f.convert("RGBA")), f.info["duration"]) for f in ImageSequence.Iterator(image)]
+    assert [duration for _, duration in frames] == [100, 50]
+    assert np.array_equal(frames[0][0], frame(10))
+    assert np.array_equal(frames[1][0], frame(200))
+
+
+def test_webp_writer_pixel_budget():
+    """缓存的帧像素数超过预算时抛出ValueError，不再继续占用内存"""
+    writer = WebPWriter(io.BytesIO(), max_pixels=20 * 10 * 3)
+    for value in range(3):
+        writer.add_frame(frame(value), 40)
+    with pytest.raises(ValueError):
+        writer.add_frame(frame(3), 40)
+
+    unlimited = WebPWriter(io.BytesIO(), max_pixels=0)
+    for value in range(5):
+        unlimited.add_frame(frame(value), 40)
+    assert unlimited.frame_count == 5
+
+
+def test_invalid_output_format_is_client_error():
+    assert validate_output_format(None) == "gif"
+    assert validate_output_format("WEBP") == "webp"
+    with pytest.raises(HTTPException) as exc_info:
+        validate_output_format("avi")
+    assert exc_info.value.status_code == 400
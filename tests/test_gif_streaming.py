@@ -0,0 +1,91 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+
+from app.services.gif.streaming import extract_frames, stream_gif
+
+COLORS = [(255, 255, 255), (255, 0, 0), (0, 160, 0), (0, 0, 255)]
+TRANSPARENT_INDEX = len(COLORS)
+
+
+def make_gif(count=8, size=(48, 32), durations=None, transparent_hole=False) -> bytes:
+    """移动方块动画（调色板帧），可选在奇数帧中留出透明区域"""
+    width, height = size
+    durations = durations or [50] * count
+    palette = [value for color in COLORS for value in color] + [0, 0, 0]
+    frames = []
+    for i in range(count):
+        indices = np.zeros((height, width), dtype=np.uint8)
+        indices[6:16, 4 + i * 4:14 + i * 4] = 1 + i % 3
+        if transparent_hole and i % 2:
+            indices[20:28, 30:40] = TRANSPARENT_INDEX
+        frame = Image.fromarray(indices, "P")
+        frame.putpalette(palette)
+        frames.append(frame)
+    output = io.BytesIO()
+    frames[0].save(output, format="GIF", save_all=True, append_images=frames[1:], duration=durations,
+                   loop=0, disposal=2, transparency=TRANSPARENT_INDEX, optimize=False)
+    return output.getvalue()
+
+
+def decode(data: bytes):
+    image = Image.open(io.BytesIO(data))
+    return [
+        (np.asarray(frame.convert("RGBA")).astype(int), frame.info.get("duration", 0))
+        for frame in ImageSequence.Iterator(image)
+    ]
+
+
+def assert_frames_close(result, source, tolerance=8):
+    assert len(result) == len(source)
+    for (frame, duration), (expected, expected_duration) in zip(result, source):
+        assert duration == expected_duration
+        opaque = expected[..., 3] > 0
+        assert np.array_equal(frame[..., 3] > 0, opaque)
+        assert np.abs(frame[opaque][:, :3] - expected[opaque][:, :3]).max() <= tolerance
+
+
+def test_stream_gif_roundtrip_matches_source():
+    data = make_gif()
+    assert_frames_close(decode(stream_gif(data)), decode(data))
+
+
+def test_stream_gif_keeps_transparency():
+    data = make_gif(transparent_hole=True)
+    assert_frames_close(decode(stream_gif(data)), decode(data))
+
+
+def test_stream_gif_applies_transform_to_every_frame():
+    data = make_gif()
+    result = decode(stream_gif(data, transform=lambda frame: frame.transpose(Image.FLIP_LEFT_RIGHT)))
+    source = [(frame[:, ::-1], duration) for frame, duration in decode(data)]
+    assert_frames_close(result, source)
+
+
+def test_stream_gif_target_fps_keeps_total_duration():
+    durations = [30, 150, 10, 10, 90, 10, 40, 60]
+    data = make_gif(len(durations), durations=durations)
+    result = decode(stream_gif(data, target_fps=10))
+    assert len(result) < len(durations)
+    assert sum(duration for _, duration in result) == sum(durations)
+
+
+def test_stream_gif_limits():
+    data = make_gif(10)
+    with pytest.raises(ValueError):
+        stream_gif(data, max_frames=5)
+    with pytest.raises(ValueError):
+        stream_gif(data, max_pixels=48 * 32 * 5)
+
+
+def test_extract_frames_selects_range():
+    data = make_gif(10)
+    frames, total = extract_frames(data, output_format="PNG", start_frame=2, end_frame=9, step=3)
+    assert total == 10
+    assert [index for index, _ in frames] == [2, 5, 8]
+    source = decode(data)
+    for index, png in frames:
+        decoded = np.asarray(Image.open(io.BytesIO(png)).convert("RGB")).astype(int)
+        assert np.array_equal(decoded, source[index][0][..., :3])
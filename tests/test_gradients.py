@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from app.utils import gradients
+
+
+SIZE = (37, 23)
+
+
+def old_linear_mask(size, direction, start_opacity, end_opacity):
+    """改写前 gradient_masks 的逐像素线性渐变遮罩"""
+    width, height = size
+    mask = np.zeros((height, width), dtype=np.uint8)
+    for y in range(height):
+        for x in range(width):
+            if direction == "horizontal":
+                progress = x / width
+            elif direction == "vertical":
+                progress = y / height
+            else:
+                progress = (x + y) / (width + height)
+            mask[y, x] = int((start_opacity + (end_opacity - start_opacity) * progress) * 255)
+    return mask
+
+
+def old_radial_mask(size, start_opacity, end_opacity):
+    """改写前 gradient_masks 的逐像素径向渐变遮罩"""
+    width, height = size
+    center_x, center_y = width // 2, height // 2
+    max_radius = np.sqrt(center_x ** 2 + center_y ** 2)
+    mask = np.zeros((height, width), dtype=np.uint8)
+    for y in range(height):
+        for x in range(width):
+            progress = np.sqrt((x - center_x) ** 2 + (y - center_y) ** 2) / max_radius
+            alpha = start_opacity + (end_opacity - start_opacity) * progress
+            mask[y, x] = int(np.clip(alpha * 255, 0, 255))
+    return mask
+
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical", "diagonal"])
+def test_linear_mask_matches_pixel_loop(direction):
+    progress = gradients.linear(SIZE, gradients.DIRECTION_ANGLES[direction])
+    result = gradients.interpolate_alpha(progress, 0.2, 0.9)
+    assert np.array_equal(result, old_linear_mask(SIZE, direction, 0.2, 0.9))
+
+
+def test_linear_directions():
+    width, height = SIZE
+    xs = np.arange(width) / width
+    ys = np.arange(height) / height
+    assert np.allclose(gradients.linear(SIZE, 0)[0], xs, atol=1e-6)
+    assert np.allclose(gradients.linear(SIZE, 180)[0], 1 - xs, atol=1e-6)
+    assert np.allclose(gradients.linear(SIZE, 90)[:, 0], ys, atol=1e-6)
+    assert np.allclose(gradients.linear(SIZE, 270)[:, 0], 1 - ys, atol=1e-6)
+
+
+def test_radial_mask_matches_pixel_loop():
+    """径向进度默认以中心到 (0, 0) 角的距离为半径（中心取整时与最远角相同）"""
+    width, height = SIZE
+    center = (width // 2, height // 2)
+    radius = np.sqrt(center[0] ** 2 + center[1] ** 2)
+    progress = gradients.radial(SIZE, center, radius)
+    result = gradients.interpolate_alpha(np.clip(progress, 0, None), 1.0, 0.1)
+    assert np.array_equal(result, old_radial_mask(SIZE, 1.0, 0.1))
+
+
+def test_interpolate_colors_matches_int_truncation():
+    progress = gradients.linear(SIZE, 0)
+    start, end = (255, 10, 0), (0, 200, 90)
+    colors = gradients.interpolate_colors(progress, start, end)
+    width = SIZE[0]
+    for x in range(width):
+        t = x / width
+        expected = [int(s + (e - s) * t) for s, e in zip(start, end)]
+        assert colors[0, x].tolist() == expected
+
+
+def test_conic_quadrants():
+    size = (101, 101)
+    progress = gradients.conic(size)
+    assert progress[50, 100] == pytest.approx(0.0, abs=1e-6)
+    assert progress[100, 50] == pytest.approx(0.25, abs=1e-6)
+    assert progress[50, 0] == pytest.approx(0.5, abs=1e-6)
+    assert progress[0, 50] == pytest.approx(0.75, abs=1e-6)
+    assert gradients.conic(size, start_angle=90)[100, 50] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_fields_are_cached_and_read_only():
+    gradients.clear_cache()
+    first = gradients.radial((64, 48))
+    assert gradients.radial((64, 48)) is first
+    assert not first.flags.writeable
+    with pytest.raises(ValueError):
+        first[0, 0] = 1
+    gradients.clear_cache()
+    assert gradients.radial((64, 48)) is not first
+
+
+
+def test_vignette_mask():
+    mask = gradients.vignette_mask((300, 200), intensity=1.0, inner=0.5, outer=1.2)
+    assert mask.shape == (200, 300)
+    assert mask[100, 150] == 0
+    assert mask[0, 0] >= 250
+    # 从中心向外单调不减
+    assert np.all(np.diff(mask[100, 150:].astype(int)) >= 0)
+    with pytest.raises(ValueError):
+        gradients.vignette_mask((10, 10), 1.0, shape="square")
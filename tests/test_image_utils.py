@@ -0,0 +1,53 @@
+import io
+import struct
+
+import numpy as np
+from PIL import Image
+
+from app.utils.image_utils import ImageUtils
+
+ORIGINAL_COLOR = (200, 30, 30)
+THUMBNAIL_COLOR = (30, 30, 200)
+
+
+def jpeg_with_thumbnail(size=(1600, 1200), thumbnail_size=(160, 120)) -> bytes:
+    """原图与EXIF缩略图颜色不同，便于区分解码结果来自哪一个"""
+    thumb_output = io.BytesIO()
+    Image.new("RGB", thumbnail_size, THUMBNAIL_COLOR).save(thumb_output, format="JPEG", quality=95)
+    thumb = thumb_output.getvalue()
+
+    # TIFF头 + 空的IFD0 + 只包含缩略图偏移和长度的IFD1
+    ifd1_offset = 8 + 2 + 4
+    thumb_offset = ifd1_offset + 2 + 2 * 12 + 4
+    tiff = b"II*\x00" + struct.pack("<I", 8)
+    tiff += struct.pack("<HI", 0, ifd1_offset)
+    tiff += struct.pack("<H", 2)
+    tiff += struct.pack("<HHII", 0x0201, 4, 1, thumb_offset)
+    tiff += struct.pack("<HHII", 0x0202, 4, 1, len(thumb))
+    tiff += struct.pack("<I", 0) + thumb
+
+    output = io.BytesIO()
+    Image.new("RGB", size, ORIGINAL_COLOR).save(output, format="JPEG", quality=95, exif=b"Exif\x00\x00" + tiff)
+    return output.getvalue()
+
+
+def mean_color(image: Image.Image):
+    return tuple(np.asarray(image.convert("RGB")).reshape(-1, 3).mean(axis=0).round())
+
+
+def test_exif_thumbnail_used_when_large_enough():
+    """缩略图不小于目标的reducing_gap倍时直接使用"""
+    image = ImageUtils.decode_for_size(jpeg_with_thumbnail(), (80, 60), reducing_gap=2.0)
+    assert image.size == (160, 120)
+    assert np.allclose(mean_color(image), THUMBNAIL_COLOR, atol=3)
+
+
+def test_small_exif_thumbnail_skipped():
+    """缩略图只比目标大一点时不使用，按reducing_gap倍缩小解码原图"""
+    image = ImageUtils.decode_for_size(jpeg_with_thumbnail(), (100, 75), reducing_gap=2.0)
+    assert image.width >= 200 and image.height >= 150
+    assert np.allclose(mean_color(image), ORIGINAL_COLOR, atol=3)
+
+    image = ImageUtils.decode_for_size(jpeg_with_thumbnail(), (80, 60), use_exif_thumbnail=False)
+    assert image.width >= 160 and image.width < 1600
+    assert np.allclose(mean_color(image), ORIGINAL_COLOR, atol=3)
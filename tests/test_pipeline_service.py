@@ -0,0 +1,49 @@
+import io
+
+import pytest
+from PIL import Image
+
+from app.services.pipeline_service import PipelineService
+
+
+def make_png(size=(80, 60)) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", size, (200, 100, 50)).save(output, format="PNG")
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("operation", [
+    {"op": "resize", "params": {"width": "abc"}},
+    {"op": "resize", "params": {"width": -10}},
+    {"op": "crop", "params": {"x": -1, "y": 0, "width": 10, "height": 10}},
+    {"op": "crop", "params": {"x": 0, "y": 0, "width": 0, "height": 10}},
+    {"op": "crop_circle", "params": {"center_x": 10, "center_y": 10, "radius": 1.5}},
+    {"op": "rotate", "params": {"angle": "left"}},
+    {"op": "rotate", "params": {"angle": 30, "fill_color": "not-a-color"}},
+    {"op": "transform", "params": {"transform_type": "skew"}},
+    {"op": "watermark", "params": {"text": "hi", "opacity": 2}},
+    {"op": "watermark", "params": {"text": "hi", "font_size": 0}},
+    {"op": "filter", "params": "sepia"},
+])
+def test_invalid_params_rejected_before_processing(operation):
+    """类型或取值错误的参数在校验阶段失败（路由据此在扣费前返回400）"""
+    with pytest.raises(ValueError):
+        PipelineService.validate_operations([operation])
+
+
+def test_params_are_coerced_to_annotations():
+    operations = PipelineService.validate_operations([
+        {"op": "resize", "params": {"width": "40"}},
+        {"op": "rotate", "params": {"angle": "90", "fill_color": "#ff0000"}},
+    ])
+    assert operations == [
+        {"op": "resize", "params": {"width": 40}},
+        {"op": "rotate", "params": {"angle": 90.0, "fill_color": "#ff0000"}},
+    ]
+
+
+def test_run_pipeline_uses_coerced_params():
+    result = PipelineService.run_pipeline(
+        make_png(), [{"op": "resize", "params": {"width": "40"}}], output_format="png"
+    )
+    assert Image.open(io.BytesIO(result)).size == (40, 30)
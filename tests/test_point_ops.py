@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageEnhance
+
+from app.services.filters.color_filters import ColorFilters
+from app.utils.point_ops import apply_point_ops, compile_point_ops
+
+
+def make_image(size=(96, 64), seed=0) -> Image.Image:
+    """渐变加噪声的测试图片"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    x = np.linspace(0, 255, width)[None, :, None]
+    y = np.linspace(0, 255, height)[:, None, None]
+    pixels = np.concatenate([np.broadcast_to(x, (height, width, 1)),
+                             np.broadcast_to(y, (height, width, 1)),
+                             (x + y) / 2 * np.ones((height, width, 1))], axis=2)
+    pixels = pixels + rng.normal(0, 20, pixels.shape)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def max_diff(a: Image.Image, b: Image.Image) -> int:
+    return int(np.abs(np.asarray(a, dtype=np.int16) - np.asarray(b, dtype=np.int16)).max())
+
+
+def test_lut_chain_matches_image_enhance_exactly():
+    """查找表操作与 ImageEnhance / point(lambda) 的逐步计算完全一致"""
+    img = make_image()
+
+    expected = ImageEnhance.Brightness(img).enhance(1.15)
+    expected = ImageEnhance.Contrast(expected).enhance(1.3)
+    r, g, b = expected.split()
+    expected = Image.merge("RGB", (
+        r.point(lambda x: min(255, int(x * 1.1))),
+        g.point(lambda x: min(255, int(x * 1.05))),
+        b.point(lambda x: max(0, int(x * 0.9))),
+    ))
+
+    result = apply_point_ops(img, [("brightness", 1.15), ("contrast", 1.3), ("scale", (1.1, 1.05, 0.9))])
+    assert max_diff(result, expected) == 0
+
+
+def test_adjacent_lut_ops_fuse_into_one_stage():
+    img = make_image()
+    kernel = compile_point_ops([("brightness", 1.1), ("contrast", 0.9), ("gamma", 1.4)], img)
+    assert [kind for kind, _ in kernel.stages] == ["lut"]
+    assert compile_point_ops([("brightness", 1.1), ("contrast", 0.9), ("gamma", 1.4)], img) is kernel
+
+
+def test_color_matches_image_enhance_within_one_level():
+    img = make_image()
+    for factor in (0.0, 0.5, 0.8, 1.5):
+        expected = ImageEnhance.Color(img).enhance(factor)
+        assert max_diff(apply_point_ops(img, [("color", factor)]), expected) <= 1
+
+
+def test_mixed_chain_matches_old_vintage_filter():
+    """复古滤镜（棕褐色 -> 饱和度 -> 对比度 -> 暖色调）与改写前的逐步实现相差不超过3个色阶"""
+    img = make_image()
+    intensity = 0.7
+
+    sepia = intensity * 0.6
+    gray = img.convert("L")
+    expected = Image.merge("RGB", (
+        gray.point(lambda x: min(255, int(x * 1.07 * sepia))),
+        gray.point(lambda x: min(255, int(x * 0.74 * sepia))),
+        gray.point(lambda x: min(255, int(x * 0.43 * sepia))),
+    ))
+    expected = ImageEnhance.Color(expected).enhance(0.8)
+    expected = ImageEnhance.Contrast(expected).enhance(0.9)
+    warm = intensity * 0.3
+    r, g, b = expected.split()
+    expected = Image.merge("RGB", (
+        r.point(lambda x: min(255, int(x * (1 + warm * 0.1)))),
+        g.point(lambda x: min(255, int(x * (1 + warm * 0.05)))),
+        b.point(lambda x: max(0, int(x * (1 - warm * 0.1)))),
+    ))
+
+    result = ColorFilters._apply_vintage(img, intensity)
+    assert result.size == img.size
+    assert max_diff(result, expected) <= 3
+
+
+def test_contrast_uses_mean_after_preceding_ops():
+    """对比度使用前面操作执行后的灰度均值"""
+    img = make_image()
+    expected = ImageEnhance.Contrast(ImageEnhance.Brightness(img).enhance(0.5)).enhance(1.8)
+    result = apply_point_ops(img, [("brightness", 0.5), ("contrast", 1.8)])
+    assert max_diff(result, expected) == 0
+
+
+def test_alpha_and_mode_handling():
+    img = make_image().convert("RGBA")
+    alpha = Image.linear_gradient("L").resize(img.size)
+    img.putalpha(alpha)
+
+    result = apply_point_ops(img, [("brightness", 1.2)])
+    assert result.mode == "RGBA"
+    assert max_diff(result.getchannel("A"), alpha) == 0
+
+    gray = make_image().convert("L")
+    assert apply_point_ops(gray, [("scale", (1.1, 1.0, 0.9))]).mode == "RGB"
+
+
+def test_unknown_op_raises():
+    with pytest.raises(ValueError):
+        apply_point_ops(make_image(), [("unknown", 1)])
@@ -0,0 +1,97 @@
+import cv2
+import numpy as np
+import pytest
+
+from app.filters import quantize
+from app.filters.utils import add_texture
+
+
+def make_photo(size=(160, 120), seed=0) -> np.ndarray:
+    """平滑渐变加噪声的测试图片"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    x = np.linspace(0, 1, width)[None, :]
+    y = np.linspace(0, 1, height)[:, None]
+    pixels = np.stack([200 * x + 30 + 0 * y, 180 * y + 40 + 0 * x, 120 + 80 * x * y], axis=-1)
+    pixels = pixels + rng.normal(0, 10, pixels.shape)
+    return np.clip(pixels, 0, 255).astype(np.uint8)
+
+
+def exact_nearest(img: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    pixels = img.reshape(-1, 1, 3).astype(np.int32)
+    distance = np.square(pixels - palette[None, :, :].astype(np.int32)).sum(axis=2)
+    return palette[distance.argmin(axis=1)].reshape(img.shape)
+
+
+def mse(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.mean(np.square(a.astype(np.float64) - b.astype(np.float64))))
+
+
+def test_sample_pixels_is_stratified_and_deterministic():
+    pixels = np.arange(30000 * 3, dtype=np.int64).reshape(-1, 3)
+    sample = quantize.sample_pixels(pixels, 1000, seed=1)
+    assert len(sample) == 1000
+    assert np.array_equal(sample, quantize.sample_pixels(pixels, 1000, seed=1))
+    # 每段恰好取一个像素
+    segments = sample[:, 0] // 3 // 30
+    assert np.array_equal(segments, np.arange(1000))
+    assert len(quantize.sample_pixels(pixels[:10], 1000)) == 10
+
+
+def test_quantize_recovers_distinct_colors():
+    colors = np.array([[250, 10, 10], [10, 250, 10], [10, 10, 250], [240, 240, 240]], dtype=np.uint8)
+    img = np.repeat(colors, 50, axis=0).reshape(20, 10, 3)
+    result = quantize.quantize_colors(img, 4)
+    assert np.array_equal(result, img)
+
+
+def test_full_resolution_cube_matches_exact_nearest():
+    """8位立方体的格子即单个颜色，映射结果与逐像素最近颜色搜索一致"""
+    img = make_photo()
+    palette = quantize.fit_palette(img, 8)
+    assert np.array_equal(quantize.map_to_palette(img, palette, bits=8), exact_nearest(img, palette))
+
+
+def test_default_cube_close_to_exact_nearest():
+    img = make_photo()
+    palette = quantize.fit_palette(img, 12)
+    result = quantize.map_to_palette(img, palette)
+    exact = exact_nearest(img, palette)
+    mismatched = np.any(result != exact, axis=2).mean()
+    assert mismatched < 0.1
+    assert mse(result, img) - mse(exact, img) < 2
+
+
+def test_quality_close_to_full_kmeans():
+    """抽样拟合的量化误差与改写前对全部像素做k-means相近"""
+    img = make_photo(size=(400, 300))
+    n_colors = 8
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
+    cv2.setRNGSeed(0)
+    _, labels, centers = cv2.kmeans(np.float32(img.reshape(-1, 3)), n_colors, None, criteria, 10,
+                                    cv2.KMEANS_RANDOM_CENTERS)
+    full = np.uint8(centers)[labels.flatten()].reshape(img.shape)
+
+    result = quantize.quantize_colors(img, n_colors, sample_size=4096)
+    assert len(np.unique(result.reshape(-1, 3), axis=0)) <= n_colors
+    assert mse(result, img) < mse(full, img) * 1.25
+
+
+def test_map_to_indices_matches_palette_colors():
+    img = make_photo()
+    palette = quantize.fit_palette(img, 6)
+    indices = quantize.map_to_indices(img, palette)
+    assert indices.shape == img.shape[:2]
+    assert np.array_equal(palette[indices], quantize.map_to_palette(img, palette))
+
+
+def test_build_color_cube_validates_arguments():
+    with pytest.raises(ValueError):
+        quantize.build_color_cube(np.zeros((0, 3), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        quantize.build_color_cube(np.zeros((2, 3), dtype=np.uint8), bits=9)
+
+
+def test_add_texture_non_square():
+    img = make_photo(size=(50, 30))
+    assert add_texture(img, 0.1, seed=0).shape == img.shape
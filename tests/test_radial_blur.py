@@ -0,0 +1,42 @@
+import io
+
+import numpy as np
+from PIL import Image
+
+from app.services.enhance.blur_effects import BlurEffects
+
+
+def noise_png(size=(300, 200)) -> bytes:
+    rng = np.random.default_rng(0)
+    width, height = size
+    output = io.BytesIO()
+    Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8)).save(output, format="PNG")
+    return output.getvalue()
+
+
+def decode(data: bytes) -> np.ndarray:
+    return np.asarray(Image.open(io.BytesIO(data)), dtype=np.float64)
+
+
+def test_default_strength_blurs_corners_only():
+    """默认强度（0.1）在角落产生可见模糊，中心保持清晰"""
+    data = noise_png()
+    reference = decode(BlurEffects.radial_blur(data, strength=0))
+    result = decode(BlurEffects.radial_blur(data))
+    corner = np.abs(result - reference)[:20, :20].mean()
+    center = np.abs(result - reference)[95:105, 145:155].mean()
+    assert corner > 20
+    assert center == 0
+
+
+def test_strength_is_clamped_to_unit_range():
+    data = noise_png()
+    assert BlurEffects.radial_blur(data, strength=5) == BlurEffects.radial_blur(data, strength=1)
+
+
+def test_zoom_mode_keeps_center():
+    data = noise_png()
+    result = decode(BlurEffects.radial_blur(data, strength=0.3, mode="zoom"))
+    reference = decode(BlurEffects.radial_blur(data, strength=0))
+    assert np.abs(result - reference)[:20, :20].mean() > 20
+    assert np.abs(result - reference)[99:101, 149:151].mean() < 20
@@ -0,0 +1,71 @@
+import asyncio
+from enum import Enum
+
+import pytest
+from PIL import Image
+
+from app.services import result_cache as result_cache_module
+from app.services.result_cache import ResultCache
+
+
+class Mode(str, Enum):
+    FAST = "fast"
+
+
+def test_make_key_is_stable():
+    """参数顺序、浮点整数值和枚举不影响缓存键"""
+    key = ResultCache.make_key("op", {"image_bytes": b"abc", "width": 100, "mode": Mode.FAST})
+    assert key == ResultCache.make_key("op", {"mode": "fast", "width": 100.0, "image_bytes": b"abc"})
+    assert key == ResultCache.make_key("op", {"mode": "fast", "width": 100, "image_bytes": bytearray(b"abc")})
+    # 固定值：缓存键算法变化会让已有缓存全部失效，需要有意为之
+    assert ResultCache.make_key("op", {"a": 1}, "v1") == (
+        "d45546a1594b41120fbd812861d7c971d710dddbe015b7c758411c8dd3a6603b"
+    )
+
+
+def test_make_key_distinguishes_inputs():
+    base = ResultCache.make_key("op", {"image_bytes": b"abc", "width": 100})
+    assert base != ResultCache.make_key("op", {"image_bytes": b"abd", "width": 100})
+    assert base != ResultCache.make_key("op", {"image_bytes": b"abc", "width": 101})
+    assert base != ResultCache.make_key("other", {"image_bytes": b"abc", "width": 100})
+    assert base != ResultCache.make_key("op", {"image_bytes": b"abc", "width": 100}, "v2")
+
+
+def test_make_key_rejects_images():
+    with pytest.raises(TypeError):
+        ResultCache.make_key("op", {"images": [Image.new("RGB", (1, 1))]})
+
+
+def test_code_version_is_deterministic():
+    assert result_cache_module.compute_code_version() == result_cache_module.compute_code_version()
+    assert ResultCache(version="fixed").version == "fixed"
+
+
+def resize(image_bytes: bytes, width: int) -> bytes:
+    return image_bytes * width
+
+
+def test_run_cached_hits_without_recomputing(monkeypatch):
+    cache = ResultCache(backend="none", version="test")
+    calls = []
+
+    async def fake_run_compute(func, **kwargs):
+        calls.append(kwargs)
+        return func(**kwargs)
+
+    monkeypatch.setattr(result_cache_module, "result_cache", cache)
+    monkeypatch.setattr(result_cache_module, "run_compute", fake_run_compute)
+
+    async def run():
+        first = await result_cache_module.run_cached(resize, image_bytes=b"ab", width=2)
+        second = await result_cache_module.run_cached(resize, image_bytes=b"ab", width=2.0)
+        return first, second
+
+    assert asyncio.run(run()) == (b"abab", b"abab")
+    assert len(calls) == 1
+    assert cache.get_stats()["hits"] == 1
+
+    # 版本变化（部署新代码）后不命中旧结果
+    monkeypatch.setattr(cache, "version", "test2")
+    asyncio.run(result_cache_module.run_cached(resize, image_bytes=b"ab", width=2))
+    assert len(calls) == 2
@@ -0,0 +1,96 @@
+import asyncio
+import io
+
+import httpx
+import pytest
+from PIL import Image
+
+from app.utils.url_fetcher import UrlFetcher, sniff_content_type
+
+
+def png_bytes(size=(8, 8), color=(255, 0, 0)) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", size, color).save(output, format="PNG")
+    return output.getvalue()
+
+
+class MockFetcher(UrlFetcher):
+    """使用httpx.MockTransport响应请求的下载器"""
+
+    def __init__(self, handler, **kwargs):
+        super().__init__(**kwargs)
+        self._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client
+
+
+def test_sniff_content_type():
+    assert sniff_content_type(png_bytes()) == "image/png"
+    assert sniff_content_type(b"GIF89a....") == "image/gif"
+    assert sniff_content_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+    assert sniff_content_type(b"\x00\x00\x00\x18ftypisom") == "video/mp4"
+    assert sniff_content_type(b"  <svg xmlns='http://www.w3.org/2000/svg'>") == "image/svg+xml"
+    assert sniff_content_type(b"<html></html>") is None
+
+
+def test_fetch_sniffs_generic_content_type():
+    """响应头为通用类型时以文件头魔数为准"""
+    data = png_bytes()
+    fetcher = MockFetcher(lambda request: httpx.Response(
+        200, content=data, headers={"content-type": "application/octet-stream"}
+    ))
+
+    async def run():
+        with await fetcher.fetch("http://example.com/a") as fetched:
+            return fetched.content, fetched.content_type, fetched.open_image().size
+
+    content, content_type, size = asyncio.run(run())
+    assert content == data
+    assert content_type == "image/png"
+    assert size == (8, 8)
+
+
+def test_fetch_rejects_non_image():
+    fetcher = MockFetcher(lambda request: httpx.Response(
+        200, content=b"<html></html>", headers={"content-type": "text/html"}
+    ))
+    with pytest.raises(ValueError):
+        asyncio.run(fetcher.fetch("http://example.com/page"))
+
+
+def test_fetch_stops_at_size_limit():
+    """未声明Content-Length时按实际读取字节数中断"""
+    data = png_bytes(size=(256, 256)) + b"\x00" * 4096
+
+    async def stream():
+        for start in range(0, len(data), 1024):
+            yield data[start:start + 1024]
+
+    fetcher = MockFetcher(
+        lambda request: httpx.Response(200, content=stream(), headers={"content-type": "image/png"}),
+        max_bytes=2048
+    )
+    with pytest.raises(ValueError):
+        asyncio.run(fetcher.fetch("http://example.com/big"))
+
+
+def test_fetch_many_keeps_order_and_total_budget():
+    images = {f"/{index}": png_bytes(color=(index * 40, 0, 0)) for index in range(4)}
+    fetcher = MockFetcher(lambda request: httpx.Response(
+        200, content=images[request.url.path], headers={"content-type": "image/png"}
+    ))
+    urls = [f"http://example.com/{index}" for index in (3, 1, 0, 2)]
+
+    async def run(total_max_bytes=None):
+        results = await fetcher.fetch_many(urls, total_max_bytes=total_max_bytes)
+        contents = [fetched.content for fetched in results]
+        for fetched in results:
+            fetched.close()
+        return contents
+
+    assert asyncio.run(run()) == [images[f"/{index}"] for index in (3, 1, 0, 2)]
+
+    with pytest.raises(ValueError):
+        asyncio.run(run(total_max_bytes=len(images["/0"]) * 2))
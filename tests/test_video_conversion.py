@@ -0,0 +1,31 @@
+import pytest
+
+from app.services.gif.video_conversion import build_input_args, build_output_args
+
+
+def option_values(args, option):
+    return [args[i + 1] for i, arg in enumerate(args) if arg == option]
+
+
+def test_input_args_cap_decoder_and_both_filter_kinds():
+    args = build_input_args("/tmp/in.mp4", start_time=1.5, duration=3, threads=3)
+    assert option_values(args, "-filter_threads") == ["3"]
+    assert option_values(args, "-filter_complex_threads") == ["3"]
+    # -i 之前的 -threads 是解码器选项，-ss/-t 同样是输入选项
+    input_index = args.index("-i")
+    assert args.index("-threads") < input_index
+    assert args.index("-ss") < input_index and args.index("-t") < input_index
+
+
+@pytest.mark.parametrize("output_format", ["webp", "mp4"])
+def test_encoder_threads_are_output_options(output_format):
+    args = build_output_args(output_format, fps=10, width=320, quality=80, threads=3)
+    assert option_values(args, "-threads") == ["3"]
+    assert args.index("-threads") < args.index("-f")
+
+
+def test_gif_output_uses_filter_complex():
+    args = build_output_args("gif", fps=10, width=320, quality=80)
+    assert "-filter_complex" in args and "-vf" not in args
+    with pytest.raises(ValueError):
+        build_output_args("avi")